@@ -2,10 +2,9 @@
 import sys
 import os
 import logging
-import configparser
-import shutil
 from PySide6.QtWidgets import QApplication, QMessageBox
-from PySide6.QtGui import QIcon
+from PySide6.QtGui import QIcon, QAction
+from PySide6.QtCore import QTimer
 import ctypes  # 【新增】导入 ctypes 用于Windows AppUserModelID
 if sys.platform == "win32":
     try:
@@ -14,31 +13,34 @@ if sys.platform == "win32":
     except ImportError:
         logging.warning("pywin32 is not installed, cannot create Start Menu shortcut.")
         pythoncom = None
-import logging.handlers
 
 # --- 1. 导入项目核心模块 ---
 # 遵循先导入服务、再导入UI、最后导入管理器的逻辑顺序
-from src.services.config_service import ConfigService
 from src.services.notification_service import NotificationService
-from src.services.webhook_service import WebhookService
 from src.services.data_source_initializer import DataSourceInitializerService
 from src.services.data_source_switch_service import DataSourceSwitchService
+from src.services.async_db_executor import AsyncDbExecutor
 from src.ui.main_window import MainWindow
 from src.ui.settings_page import SettingsPageWidget
+from src.ui.performance_page import PerformancePageWidget
+from src.ui.task_panel import TaskPanelWidget, TaskStatusButton
 from src.ui.action_manager import ActionManager
 from src.utils.tray_manager import TrayManager
+from src.utils.gui_dispatcher import GuiDispatcher
+from src.utils.timeline import startup_timeline, shutdown_timeline
+from src.utils.metrics import metrics
 from src.utils.exception_handler import setup_exception_handler
 from src.core.context import ApplicationContext
 from src.core.plugin_manager import PluginManager
+# 【变更】与无界面守护进程共用的常量、启动函数和核心服务创建逻辑移至 src.core.bootstrap
+from src.core.bootstrap import (APP_NAME_DEFAULT, DB_FILE, PlatformBootstrap, get_app_data_dir, get_resource_path,
+                                prepare_config_file, setup_logging)
 
 
-# --- 2. 全局应用程序常量 ---
-# 将所有硬编码的字符串和配置集中在此处，便于管理
-APP_VERSION = "5.3.8-Code-Refinement"
-APP_NAME_DEFAULT = "HelpSelf"
-CONFIG_FILE = 'config.ini'
-DB_FILE = 'history.db'
-LOG_FILE = 'app.log'
+# --- 2. 桌面版专用常量 ---
+SNAPSHOT_ACTION_NAME = 'platform.snapshot_databases'
+PROFILER_ACTION_NAME = 'platform.toggle_sampling_profiler'
+TASKS_PAGE_TITLE = '任务'
 PNG_ICON_FILE = 'icon.png'  # 用于窗口、托盘等
 ICO_ICON_FILE = 'icon.ico'  # 专门用于Windows原生通知
 
@@ -46,95 +48,7 @@ ICO_ICON_FILE = 'icon.ico'  # 专门用于Windows原生通知
 APP_USER_MODEL_ID = "Cj.Helpself.MonitoringCenter"
 
 
-def get_app_data_dir():
-    """获取并确保应用数据根目录存在。"""
-    app_data_dir = os.path.join(os.path.expanduser('~'), APP_NAME_DEFAULT)
-    os.makedirs(app_data_dir, exist_ok=True)
-    return app_data_dir
-
-def get_resource_path(relative_path):
-    """获取资源的绝对路径，兼容开发环境和PyInstaller打包环境。"""
-    if getattr(sys, 'frozen', False) and hasattr(sys, '_MEIPASS'):
-        # PyInstaller环境
-        base_path = sys._MEIPASS
-    else:
-        # 开发环境
-        base_path = os.path.abspath(os.path.dirname(__file__))
-    return os.path.join(base_path, relative_path)
-
-def prepare_config_file():
-    """
-    准备配置文件。如果用户数据目录中不存在，则从包内复制一份。
-    返回可用的配置文件路径。
-    """
-    app_data_dir = get_app_data_dir()
-    config_path_in_data_dir = os.path.join(app_data_dir, CONFIG_FILE)
-
-    if not os.path.exists(config_path_in_data_dir):
-        logging.info(f"配置文件在 '{config_path_in_data_dir}' 未找到，将从程序包中复制默认配置。")
-        default_config_path = get_resource_path(CONFIG_FILE)
-        if os.path.exists(default_config_path):
-            try:
-                shutil.copy(default_config_path, config_path_in_data_dir)
-                logging.info(f"默认配置文件已成功复制到: {config_path_in_data_dir}")
-            except Exception as e:
-                logging.error(f"复制默认配置文件失败: {e}", exc_info=True)
-                return None # 复制失败，无法继续
-        else:
-            logging.warning(f"在程序包内也未找到默认配置文件: {default_config_path}")
-            return None # 找不到源文件，无法继续
-            
-    return config_path_in_data_dir
-
-def setup_logging():
-    """
-    配置全局日志记录器。
-    此函数设计为在应用生命周期中最早被调用，它会预读配置文件以获取日志级别。
-    """
-    log_level_str = "INFO"
-    
-    config_path = prepare_config_file()
-    if config_path:
-        try:
-            pre_parser = configparser.ConfigParser()
-            if pre_parser.read(config_path, encoding='utf-8-sig'):
-                log_level_str = pre_parser.get('Logging', 'level', fallback='INFO').upper()
-        except (configparser.Error, IOError):
-            import warnings
-            warnings.warn(f"无法预读配置文件 '{config_path}' 以获取日志级别，将使用默认的 'INFO' 级别。")
-
-    log_level = getattr(logging, log_level_str, logging.INFO)
-
-    # 将日志文件输出到用户主目录下的特定子目录
-    log_dir = os.path.join(get_app_data_dir(), 'logs')
-    os.makedirs(log_dir, exist_ok=True)
-    log_file_path = os.path.join(log_dir, LOG_FILE)
-
-    file_handler = logging.handlers.RotatingFileHandler(
-        log_file_path,
-        maxBytes=2 * 1024 * 1024,
-        backupCount=5,
-        encoding='utf-8',
-        mode='a'
-    )
-    stream_handler = logging.StreamHandler(sys.stdout)
-
-    logging.basicConfig(
-        level=log_level,
-        format='%(asctime)s - %(levelname)s - [%(threadName)s] - %(message)s',
-        handlers=[
-            file_handler,    # 使用配置好的轮转文件处理器
-            stream_handler
-        ]
-    )
-    # 打印启动横幅
-    logging.info("=" * 80)
-    logging.info(f"--- 应用程序启动流程开始 (v{APP_VERSION}) ---")
-    logging.info("=" * 80)
-    logging.info(f"[STEP 0] 日志系统初始化完成。日志级别设置为: {log_level_str}")
-
-
-class ApplicationOrchestrator:
+class ApplicationOrchestrator(PlatformBootstrap):
     """
     【平台核心】应用协调器。
     
@@ -146,6 +60,7 @@ class ApplicationOrchestrator:
         logging.info("[STEP 1.0] ApplicationOrchestrator: 开始初始化平台核心...")
 
         # --- 1.1 基础环境准备 ---
+        startup_timeline.phase("1.1 基础环境准备")
         self.app_data_dir = get_app_data_dir()
         self.config_path = prepare_config_file()
         if not self.config_path:
@@ -159,6 +74,7 @@ class ApplicationOrchestrator:
         logging.info(f"  - 配置文件路径: {self.config_path}")
 
         # --- 1.2 初始化Qt应用实例 ---
+        startup_timeline.phase("1.2 Qt应用实例")
         self.app = QApplication(sys.argv)
         
         # 【变更】为Windows设置AppUserModelID，以确保任务栏图标的正确关联
@@ -175,11 +91,16 @@ class ApplicationOrchestrator:
         logging.info("  - Qt Application实例初始化完成。")
 
         # --- 1.3 初始化核心后台服务 ---
+        startup_timeline.phase("1.3 核心后台服务")
         # 这些服务不依赖UI，是应用的基础数据和配置提供者
-        self.config_service = ConfigService(self.config_path)
+        # 【新增】日志级别配置变化时立即生效
+        self.config_service = self._create_config_service(self.config_path)
         # 【修复】在config_service初始化后调用快捷方式创建，因为快捷方式需要读取app_name
         if sys.platform == "win32":
             self._create_shortcut()
+        # SQL 性能分析器必须在任何插件打开数据库之前配置
+        self._configure_query_profiler()
+        self._configure_frame_cache()
         # 通知服务依赖于配置服务，因此在其后初始化
         app_name = self.config_service.get_value("General", "app_name", APP_NAME_DEFAULT)
         self.notification_service = NotificationService(
@@ -188,13 +109,22 @@ class ApplicationOrchestrator:
             config_service=self.config_service,
             app_id=APP_USER_MODEL_ID
         )
-        # 【新增】实例化 WebhookService 具体配置参数应该在插件平台设置
-        self.webhook_service = WebhookService()
+        # 【新增】实例化 WebhookService，未送达的持久化推送保存在发件箱中，启动时重新投递
+        self.webhook_service = self._create_webhook_service()
         self.initializer = DataSourceInitializerService()
         self.switch_service = DataSourceSwitchService()
-        logging.info("  - 核心后台服务 (Config, Notification, Webhook, DB Initializer, DB Switcher) 初始化完成。")
+        self.backup_service = self._create_backup_service()
+        # 异步数据库执行器的回调通过 GuiDispatcher 回到 GUI 线程
+        self.gui_dispatcher = GuiDispatcher(self.app)
+        self.db_executor = AsyncDbExecutor(dispatcher=self.gui_dispatcher.post)
+        # 【新增】插件共享的后台任务线程池
+        self.task_manager = self._create_task_manager(self.gui_dispatcher.post)
+        # 【新增】监视 config.ini 的外部修改，变更通知投递到GUI线程
+        self._start_config_watcher(self.gui_dispatcher.post)
+        logging.info("  - 核心后台服务 (Config, Notification, Webhook, DB Initializer, DB Switcher, Backup, DB Executor, Task Manager) 初始化完成。")
 
         # --- 1.4 初始化核心UI组件 ---
+        startup_timeline.phase("1.4 核心UI组件")
         # 这些是平台级的UI元素，所有插件都可能与之交互
         self.window = MainWindow()
         self.window.setWindowTitle(app_name)
@@ -203,6 +133,7 @@ class ApplicationOrchestrator:
         logging.info("  - 核心UI组件 (MainWindow, TrayManager, ActionManager) 初始化完成。")
 
         # --- 1.5 创建共享上下文 (ApplicationContext) ---
+        startup_timeline.phase("1.5 共享上下文")
         # 这是整个架构的核心，它像一个“工具箱”，被传递给所有插件，
         # 使插件能够安全地访问所有共享的平台资源。
         self.context = ApplicationContext(
@@ -215,45 +146,99 @@ class ApplicationOrchestrator:
             webhook_service=self.webhook_service,
             initializer=self.initializer,
             switch_service=self.switch_service,
-            app_data_dir=self.app_data_dir
+            app_data_dir=self.app_data_dir,
+            backup_service=self.backup_service,
+            db_executor=self.db_executor,
+            metrics=metrics,
+            task_manager=self.task_manager
         )
+        self._register_platform_metrics()
         logging.info("  - 共享的 ApplicationContext 创建完成。")
 
         # --- 1.6 初始化插件系统 ---
+        startup_timeline.phase("2.1 加载插件")
         self.plugin_manager = PluginManager(self.context)
         logging.info("[STEP 2.0] 开始加载和初始化所有插件...")
-        self.plugin_manager.load_plugins()
+        self._load_plugins()
+        startup_timeline.phase("2.2 初始化插件")
         self.plugin_manager.initialize_plugins()
         logging.info("[STEP 2.3] 所有插件加载和初始化完毕。")
         
         # --- 1.7 添加平台级页面 ---
         # 某些页面（如“设置”）是平台的一部分，不属于任何插件
         logging.info("[STEP 3.0] 添加平台级页面...")
+        startup_timeline.phase("3.0 平台级页面")
         self._add_core_pages()
 
         # --- 1.8 连接全局信号与槽 ---
         # 这是最后一步，将所有组件连接起来，形成完整的应用逻辑
         logging.info("[STEP 4.0] 连接应用程序全局信号...")
+        startup_timeline.phase("4.0 全局信号")
         # 【变更】将信号连接放在启动后台服务之前，避免竞态条件
         self.tray_manager.quit_requested.connect(self.app.quit)
+        self._register_snapshot_action()
+        self._register_profiler_action()
         self.app.aboutToQuit.connect(self.shutdown)
         logging.info("  - 信号连接完成。")
         
         logging.info("[STEP 4.1] 平台核心初始化流程结束。")
 
+    def _register_snapshot_action(self):
+        """注册“立即备份数据库”全局动作，并与托盘菜单连接。"""
+        snapshot_action = QAction("立即备份数据库", self.window)
+        snapshot_action.triggered.connect(self.backup_service.snapshot_now)
+        self.action_manager.register_action(SNAPSHOT_ACTION_NAME, snapshot_action)
+        self.tray_manager.snapshot_requested.connect(snapshot_action.trigger)
+
+    def _register_profiler_action(self):
+        """【新增】注册可勾选的“性能采样”全局动作，并与托盘菜单连接。"""
+        self.profiler_action = QAction("性能采样", self.window)
+        self.profiler_action.setCheckable(True)
+        self.profiler_action.toggled.connect(self._on_profiler_toggled)
+        self.action_manager.register_action(PROFILER_ACTION_NAME, self.profiler_action)
+        self.tray_manager.profiler_toggle_requested.connect(self.profiler_action.toggle)
+
+    def _on_profiler_toggled(self, checked: bool):
+        """开始或停止性能采样；停止时通知结果文件的位置。"""
+        if checked:
+            self._start_sampling_profiler()
+        else:
+            path = self._stop_sampling_profiler()
+            if path:
+                self.notification_service.show(title="性能采样已保存",
+                                               message=f"调用栈采样结果（可生成火焰图）已写入 {path}")
+        self.tray_manager.set_profiling_active(checked)
+
     def _add_core_pages(self):
-        """将不属于任何插件的核心页面（如设置页面）添加到主窗口。"""
-        self.settings_page = SettingsPageWidget(self.config_service)
+        """将不属于任何插件的核心页面（如设置页面、性能页面）添加到主窗口。"""
+        self.settings_page = SettingsPageWidget(self.config_service, startup_timeline=startup_timeline)
         self.window.add_page("设置", self.settings_page)
-        logging.info("  - 核心页面 '设置' 已添加。")
+        # 【新增】性能页面在首次打开时才构建
+        self.window.add_page("性能", lambda: PerformancePageWidget(metrics, os.path.join(self.app_data_dir, 'logs')))
+        # 【新增】所有插件共享的后台任务页面，状态栏中的指示器可直接打开它
+        self.window.add_page(TASKS_PAGE_TITLE, lambda: TaskPanelWidget(self.task_manager))
+        self.task_status_button = TaskStatusButton(self.task_manager)
+        self.task_status_button.clicked.connect(self._show_tasks_page)
+        self.window.statusBar().addPermanentWidget(self.task_status_button)
+        logging.info(f"  - 核心页面 '设置'、'性能'、'{TASKS_PAGE_TITLE}' 已添加。")
+
+    def _show_tasks_page(self):
+        """显示主窗口并切换到“任务”页面。"""
+        self.window.show()
+        self.window.activateWindow()
+        self.window.select_page(TASKS_PAGE_TITLE)
 
     def run(self):
         """启动应用程序的事件循环，并处理启动时的UI逻辑。"""
         logging.info("[STEP 5.0] 启动Qt事件循环...")
+        startup_timeline.phase("5.0 启动后台服务与显示窗口")
         try:
             # 启动托盘图标的后台监听
             # 【变更】信号已在init阶段连接，此处只负责启动
             self.tray_manager.run()
+
+            # 插件数据库均已注册，启动后台备份线程
+            self.backup_service.start()
             
             # 发送启动通知（如果配置允许）
             if self.config_service.get_value("General", "show_startup_notification", "true").lower() == 'true':
@@ -266,6 +251,15 @@ class ApplicationOrchestrator:
             if self.config_service.get_value("General", "start_minimized", "false").lower() != 'true':
                 self.window.center_on_screen()
                 self.window.show()
+
+            # 事件循环处理完第一批事件（窗口首次绘制）后视为启动完成
+            QTimer.singleShot(0, self._finish_startup_timeline)
+
+            # 【新增】启动完成后开始检测GUI事件循环卡顿，卡顿日志中带上当前页面
+            self._start_stall_detector(self.gui_dispatcher.post)
+            if self.stall_detector is not None:
+                self.window.page_changed.connect(self.stall_detector.set_active_page)
+                self.stall_detector.set_active_page(self.window.current_page_title())
                 
             # 阻塞并开始执行Qt事件循环
             sys.exit(self.app.exec())
@@ -273,25 +267,12 @@ class ApplicationOrchestrator:
             logging.critical(f"应用程序顶层发生未捕获的异常: {e}", exc_info=True)
             sys.exit(1)
 
-    def shutdown(self):
-        """
-        【变更】执行集中的、安全的关闭流程，确保所有资源被正确释放。
-        """
-        logging.info("[STEP 6.0] 应用程序关闭流程开始...")
-        
+    def _shutdown_ui(self):
+        """关闭流程的第一步：停止系统托盘图标。其余步骤见 PlatformBootstrap.shutdown。"""
         logging.info("  - [6.1] 停止系统托盘图标...")
+        shutdown_timeline.phase("6.1 停止托盘图标")
         # 【新增】将托盘图标的关闭操作集中到此处
         self.tray_manager.stop_icon()
-        
-        logging.info("  - [6.2] 关闭所有插件...")
-        self.plugin_manager.shutdown_plugins()
-        
-        # 【新增】安全地关闭 WebhookService 线程池
-        logging.info("  - [6.3] 清理 Webhook 服务线程池...")
-        self.webhook_service.thread_pool.clear()
-        self.webhook_service.thread_pool.waitForDone()
-
-        logging.info("[STEP 6.4] 应用程序关闭流程结束。")
 
     def _create_shortcut(self):
         """
@@ -356,7 +337,8 @@ if __name__ == '__main__':
         # 2. 其次设置全局异常处理，作为最后一道安全防线
         setup_exception_handler()
         
-        # 3. 实例化并运行应用协调器
+        # 3. 实例化并运行应用协调器（时间线以此为起点，日志初始化不计入）
+        startup_timeline.start()
         main_app = ApplicationOrchestrator()
         main_app.run()
         
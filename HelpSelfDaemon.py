@@ -0,0 +1,18 @@
+# desktop_center/HelpSelfDaemon.py
+"""
+HelpSelf 无界面守护进程入口。
+
+只运行配置服务、数据服务和支持无界面模式的插件后台服务（例如告警接收），
+不创建任何窗口，适合服务器部署:
+
+    python HelpSelfDaemon.py
+"""
+import os
+import sys
+
+from src.core.headless import main
+
+if __name__ == '__main__':
+    # 确保所有相对路径都是基于此文件所在目录的
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    sys.exit(main())
@@ -0,0 +1 @@
+# desktop_center/benchmarks/__init__.py
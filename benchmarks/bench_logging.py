@@ -0,0 +1,87 @@
+# desktop_center/benchmarks/bench_logging.py
+"""
+告警接收路径的日志开销基准。
+
+模拟 AlertReceiverThread 处理一条告警的过程（日志、SQLite 插入、速率突增检测），
+在 {同步处理器, 队列管道} × {DEBUG, INFO} 四种组合下测量吞吐量。
+SQLite 使用内存数据库，使日志开销不被磁盘 fsync 淹没。
+`--io-latency-ms` 为每条输出的记录附加写入延迟，模拟慢磁盘或被阻塞的控制台：
+同步处理器下延迟直接落在接收线程上，队列管道下只影响后台监听线程。
+
+用法:
+    python -m benchmarks.bench_logging [--count 20000] [--io-latency-ms 0.2]
+"""
+import os
+import time
+import logging
+import sqlite3
+import argparse
+import tempfile
+
+from src.features.alert_center.services.rate_spike_detector import RateSpikeDetector
+from src.utils.logging_pipeline import LoggingPipeline, create_default_handlers, lazy
+
+
+def _ingest(conn: sqlite3.Connection, detector: RateSpikeDetector, i: int) -> None:
+    """与 AlertReceiverThread._ingest_alert / trigger_desktop_notification 相同的日志调用模式。"""
+    alert = {'source_ip': f"10.0.0.{i % 50}", 'type': f"type-{i % 7}", 'message': f"benchmark alert #{i}", 'severity': 'INFO'}
+    logging.info("ALERT from %s | Severity: %s | Type: %s", alert['source_ip'], alert['severity'], alert['type'])
+    conn.execute("INSERT INTO alerts(timestamp, severity, type, source_ip, message) VALUES(datetime('now', 'localtime'),?,?,?,?)",
+                 (alert['severity'], alert['type'], alert['source_ip'], alert['message']))
+    logging.debug("告警已存入数据库。")
+    detector.observe(alert['type'], alert['source_ip'])
+    logging.debug("信息等级 '%s' 低于阈值 '%s'，已跳过弹窗通知。", alert['severity'], 'WARNING')
+    logging.debug("告警内容: %s", lazy(repr, alert))
+
+
+def _run(count: int, level: int, use_queue: bool, log_path: str, io_latency: float = 0.0) -> float:
+    handlers = create_default_handlers(log_path)
+    # 控制台输出到空设备，只保留格式化和写入的开销
+    handlers[1].setStream(open(os.devnull, 'w', encoding='utf-8'))
+    if io_latency > 0:
+        handlers[0].addFilter(lambda record: time.sleep(io_latency) or True)
+    root = logging.getLogger()
+    pipeline = None
+    if use_queue:
+        pipeline = LoggingPipeline(handlers, level=level).install()
+    else:
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        for handler in handlers:
+            root.addHandler(handler)
+        root.setLevel(level)
+
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE alerts (id INTEGER PRIMARY KEY, timestamp TEXT, severity TEXT, type TEXT, source_ip TEXT, message TEXT)")
+    detector = RateSpikeDetector()
+    start = time.perf_counter()
+    for i in range(count):
+        _ingest(conn, detector, i)
+    elapsed = time.perf_counter() - start
+
+    if pipeline is not None:
+        pipeline.stop()
+    for handler in handlers:
+        root.removeHandler(handler)
+        handler.close()
+    conn.close()
+    return count / elapsed
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=20000, help="每种组合模拟的告警数量")
+    parser.add_argument("--io-latency-ms", type=float, default=0.0, help="每条日志记录附加的模拟写入延迟（毫秒）")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'处理器':<8}{'级别':<8}{'吞吐量 (条/秒)':>16}")
+        for use_queue in (False, True):
+            for level in (logging.DEBUG, logging.INFO):
+                rate = _run(args.count, level, use_queue, os.path.join(tmp, f"bench_{use_queue}_{level}.log"),
+                            args.io_latency_ms / 1000)
+                print(f"{'队列' if use_queue else '同步':<8}{logging.getLevelName(level):<8}{rate:>16,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+# desktop_center/benchmarks/cases.py
+"""
+核心服务的性能回归基准。
+
+所有数据都在临时目录中按固定随机种子生成，结果只与代码和机器有关。
+依赖 pandas / PySide6 的基准在缺少依赖时会被跳过并记录在结果的 `skipped` 中。
+"""
+import os
+import random
+import sqlite3
+from datetime import datetime, timedelta
+
+from benchmarks.harness import benchmark
+
+# 告警库等按行数扩展的基准使用的规模；10^6 行只在 --large 时运行
+ROW_SIZES = (10_000, 100_000)
+LARGE_ROW_SIZES = (1_000_000,)
+SEED = 20240601
+
+SEVERITIES = ("INFO", "WARNING", "ERROR", "CRITICAL")
+ALERT_TYPES = tuple(f"type-{i:02d}" for i in range(20))
+SOURCE_IPS = tuple(f"10.0.{i // 250}.{i % 250}" for i in range(200))
+ALERT_DAYS = 30
+ALERT_END = datetime(2024, 6, 30, 23, 59, 59)
+# 每次插入基准写入的告警条数（逐条提交，与 AlertReceiverThread 的写入方式相同）
+INSERT_BATCH = 500
+
+
+# --- 数据生成 ---
+
+def _alert_rows(n: int):
+    rng = random.Random(SEED)
+    span = ALERT_DAYS * 86400
+    start = ALERT_END - timedelta(seconds=span)
+    for i in range(n):
+        timestamp = start + timedelta(seconds=span * i // n)
+        alert_type = rng.choice(ALERT_TYPES)
+        yield (timestamp.strftime("%Y-%m-%d %H:%M:%S"), rng.choice(SEVERITIES), alert_type,
+               rng.choice(SOURCE_IPS), f"{alert_type} threshold exceeded on host-{rng.randrange(1000)} (#{i})")
+
+
+def _build_alert_db(directory: str, n: int) -> str:
+    """用告警服务建表，再批量写入 n 行，返回数据库路径。"""
+    from src.features.alert_center.services.alert_database_service import AlertDatabaseService
+
+    path = os.path.join(directory, "history.db")
+    service = AlertDatabaseService(path)
+    service.conn.executemany("INSERT INTO alerts(timestamp, severity, type, source_ip, message) VALUES(?,?,?,?,?)",
+                             _alert_rows(n))
+    service.conn.commit()
+    service.close()
+    return path
+
+
+def _alert_db(b, n) -> str:
+    return b.fixture("alert_db", lambda d: _build_alert_db(d, n))
+
+
+def _alert_service(b, n):
+    """共享的只读告警服务（连接在运行结束时关闭）。"""
+    from src.features.alert_center.services.alert_database_service import AlertDatabaseService
+    return b.fixture("alert_service", lambda d: AlertDatabaseService(_alert_db(b, n)))
+
+
+def _date_range(days: int):
+    end = ALERT_END.date()
+    return str(end - timedelta(days=days - 1)), str(end)
+
+
+# --- ConfigService ---
+
+def _write_config(directory: str) -> str:
+    path = os.path.join(directory, "config.ini")
+    with open(path, "w", encoding="utf-8") as f:
+        for s in range(100):
+            f.write(f"[section_{s}]\n")
+            for o in range(20):
+                f.write(f"option_{o} = {o * s}\n")
+            f.write("enabled = true\n\n")
+    return path
+
+
+@benchmark("config.load")
+def config_load(b, n):
+    """解析 100 个区段 x 20 项的 config.ini 并构建快照。"""
+    from src.services.config_service import ConfigService
+    path = b.fixture("config", _write_config)
+    with b.timed():
+        ConfigService(path).get_value("section_0", "option_0")
+
+
+@benchmark("config.read")
+def config_read(b, n):
+    """10 万次 get_value / get_int / get_bool 读取。"""
+    from src.services.config_service import ConfigService
+    service = ConfigService(b.fixture("config", _write_config))
+    with b.timed():
+        for i in range(20_000):
+            section = f"section_{i % 100}"
+            service.get_value(section, f"option_{i % 20}")
+            service.get_value(section, "missing", "fallback")
+            service.get_int(section, f"option_{i % 20}")
+            service.get_int(section, "missing", 0)
+            service.get_bool(section, "enabled")
+
+
+@benchmark("config.write")
+def config_write(b, n):
+    """修改 200 项后原子写回文件。"""
+    from src.services.config_service import ConfigService
+    service = ConfigService(b.copy_file(b.fixture("config", _write_config)))
+    with b.timed():
+        for i in range(200):
+            service.set_option(f"section_{i % 100}", f"option_{i % 20}", f"value-{i}")
+        service.save_config()
+
+
+# --- SqlDataService / AlertDatabaseService ---
+
+@benchmark("sql.open_validate", sizes=ROW_SIZES, large_sizes=LARGE_ROW_SIZES)
+def sql_open_validate(b, n):
+    """打开已有的告警数据库（建表、建索引、注册备份）并完成结构验证。"""
+    from src.features.alert_center.services.alert_database_service import AlertDatabaseService
+    path = _alert_db(b, n)
+    with b.timed():
+        service = AlertDatabaseService(path)
+        service.validate_database_schema()
+        service.close()
+
+
+@benchmark("alert_db.insert", sizes=ROW_SIZES, large_sizes=LARGE_ROW_SIZES)
+def alert_db_insert(b, n):
+    """向已有 n 行的告警库逐条插入 500 条告警（每条一次提交）。"""
+    from src.features.alert_center.services.alert_database_service import AlertDatabaseService
+    service = AlertDatabaseService(b.copy_file(_alert_db(b, n)))
+    alert = {"severity": "WARNING", "type": "type-01", "source_ip": "10.0.0.1", "message": "benchmark insert"}
+    try:
+        with b.timed():
+            for _ in range(INSERT_BATCH):
+                service.add_alert(alert)
+    finally:
+        service.close()
+
+
+@benchmark("alert_db.search_page", sizes=ROW_SIZES, large_sizes=LARGE_ROW_SIZES)
+def alert_db_search_page(b, n):
+    """历史查询：最近 7 天、两种级别、第 1 页和第 20 页。"""
+    service = _alert_service(b, n)
+    start, end = _date_range(7)
+    with b.timed():
+        for page in (1, 20):
+            service.search_alerts(start_date=start, end_date=end, severities=["ERROR", "CRITICAL"], page=page)
+
+
+@benchmark("alert_db.search_keyword", sizes=ROW_SIZES, large_sizes=LARGE_ROW_SIZES)
+def alert_db_search_keyword(b, n):
+    """历史查询：全字段关键字搜索（LIKE '%...%'）第 1 页。"""
+    service = _alert_service(b, n)
+    with b.timed():
+        service.search_alerts(keyword="host-42", search_field="all")
+
+
+@benchmark("alert_db.stats", sizes=ROW_SIZES, large_sizes=LARGE_ROW_SIZES)
+def alert_db_stats(b, n):
+    """统计对话框的一次完整刷新：按类型、按 IP、按小时明细和两维自定义分析。"""
+    service = _alert_service(b, n)
+    start, end = _date_range(ALERT_DAYS)
+    with b.timed():
+        service.get_stats_by_type(start, end)
+        service.get_stats_by_ip_activity(start, end)
+        service.get_detailed_hourly_stats(start, end)
+        service.get_custom_stats(["severity", "type"], start, end)
+
+
+@benchmark("custom_analysis.build_tree", sizes=ROW_SIZES, large_sizes=LARGE_ROW_SIZES)
+def custom_analysis_build_tree(b, n):
+    """CustomAnalysisModel 把四维分组结果（日期/级别/类型/IP）构建为树。"""
+    from src.features.alert_center.models.custom_analysis_model import CustomAnalysisModel
+    dimensions = ["dim_date", "severity", "type", "source_ip"]
+    rows = b.fixture("custom_rows", lambda d: _alert_service(b, n).get_custom_stats(dimensions))
+    model = CustomAnalysisModel()
+    with b.timed():
+        model.build_tree_from_data(rows, dimensions)
+
+
+# --- MultidimTableModel ---
+
+def _build_sales_db(directory: str, n: int) -> str:
+    path = os.path.join(directory, "multidim.db")
+    rng = random.Random(SEED)
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE "sales" (region TEXT, product TEXT, month INTEGER, quantity INTEGER, amount REAL)')
+    conn.executemany('INSERT INTO "sales" VALUES (?,?,?,?,?)',
+                     ((f"region-{rng.randrange(10)}", f"product-{rng.randrange(50)}", rng.randrange(1, 13),
+                       rng.randrange(1, 100), round(rng.uniform(1, 1000), 2)) for _ in range(n)))
+    conn.commit()
+    conn.close()
+    return path
+
+
+def _multidim_model(b, n):
+    from src.features.multidim_table.models.multidim_table_model import MultidimTableModel
+    model = MultidimTableModel()
+    ok, error = model.connect_to_db(b.fixture("sales_db", lambda d: _build_sales_db(d, n)))
+    if not ok:
+        raise RuntimeError(error)
+    return model
+
+
+@benchmark("multidim.load", sizes=ROW_SIZES, large_sizes=LARGE_ROW_SIZES, requires=("pandas", "PySide6"))
+def multidim_load(b, n):
+    """MultidimTableModel.load_from_db 读取整张表到 DataFrame。"""
+    model = _multidim_model(b, n)
+    try:
+        with b.timed():
+            ok, error = model.load_from_db("sales")
+        if not ok:
+            raise RuntimeError(error)
+    finally:
+        model.conn.close()
+
+
+@benchmark("multidim.pivot", sizes=ROW_SIZES, large_sizes=LARGE_ROW_SIZES, requires=("pandas", "PySide6"))
+def multidim_pivot(b, n):
+    """对已加载的表做 地区 x 月份 的金额/数量汇总透视。"""
+    model = _multidim_model(b, n)
+    try:
+        model.load_from_db("sales")
+        with b.timed():
+            ok, error = model.create_pivot_table({"rows": ["region"], "columns": ["month"], "values": ["amount", "quantity"]})
+        if not ok:
+            raise RuntimeError(error)
+    finally:
+        model.conn.close()
+
+
+# --- LauncherModel ---
+
+def _build_launcher_db(directory: str, n: int) -> str:
+    from src.features.program_launcher.services.program_launcher_database_service import ProgramLauncherDatabaseService
+
+    path = os.path.join(directory, "launcher.db")
+    service = ProgramLauncherDatabaseService(path)
+    groups = max(1, n // 50)
+    service.conn.executemany("INSERT INTO groups VALUES (?,?,?)", ((f"g{g}", f"Group {g}", g) for g in range(groups)))
+    service.conn.executemany("INSERT INTO programs VALUES (?,?,?,?,?,?)",
+                             ((f"p{i}", f"g{i % groups}", f"Program {i} chrome-tool-{i % 97}",
+                               f"C:/Programs/app{i}.exe", 0, i // groups) for i in range(n)))
+    service.conn.commit()
+    service.close()
+    return path
+
+
+@benchmark("launcher.filter_data", sizes=(1_000, 10_000), requires=("PySide6",))
+def launcher_filter_data(b, n):
+    """模拟在搜索框中逐字输入 'chrome-tool-4'，每个按键调用一次 filter_data。"""
+    from src.features.program_launcher.models.launcher_model import LauncherModel
+    from src.features.program_launcher.services.program_launcher_database_service import ProgramLauncherDatabaseService
+
+    service = ProgramLauncherDatabaseService(b.fixture("launcher_db", lambda d: _build_launcher_db(d, n)))
+    try:
+        model = LauncherModel(service)
+        query = "chrome-tool-4"
+        with b.timed():
+            for i in range(1, len(query) + 1):
+                model.filter_data(query[:i])
+    finally:
+        service.close()
+
+
+# --- GameDataService ---
+
+GAME_IDS = 100
+MEMBERS_PER_ID = 5
+
+
+def _build_account_db(directory: str, n: int) -> str:
+    path = os.path.join(directory, "accounts.db")
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE "账号数据" ("角色名" TEXT, "账号" TEXT)')
+    conn.executemany('INSERT INTO "账号数据" VALUES (?,?)', ((f"角色{i}", f"account{i}----pwd{i}") for i in range(n)))
+    conn.commit()
+    conn.close()
+    return path
+
+
+def _game_config(n: int) -> dict:
+    rng = random.Random(SEED)
+    members = rng.sample(range(n), GAME_IDS * MEMBERS_PER_ID)
+    return {f"{i + 1:03d}": [f"角色{m}" for m in members[i * MEMBERS_PER_ID:(i + 1) * MEMBERS_PER_ID]]
+            for i in range(GAME_IDS)}
+
+
+@benchmark("game_data.extract", sizes=ROW_SIZES, large_sizes=LARGE_ROW_SIZES)
+def game_data_extract(b, n):
+    """从 n 行账号库中为 100 个分机 x 5 个角色提取账号并写出文件。"""
+    from src.features.Game_data.services.game_data_service import GameDataService
+    db_path = b.fixture("account_db", lambda d: _build_account_db(d, n))
+    config = b.fixture("game_config", lambda d: _game_config(n))
+    service = GameDataService(db_path)
+    with b.timed():
+        service.extract_data(b.path("root"), config, {"table_name": "账号数据", "member_col": "角色名", "account_col": "账号"})
+
+
+@benchmark("game_data.aggregate", sizes=(1_000,), large_sizes=(10_000,))
+def game_data_aggregate(b, n):
+    """把 100 个分机目录下共 n 个角色配置文件汇总到 all 目录。"""
+    from src.features.Game_data.services.game_data_service import GameDataService
+    per_id = max(1, n // GAME_IDS)
+    root = b.path("root")
+    config = {}
+    for i in range(GAME_IDS):
+        an_id = f"{i + 1:03d}"
+        source_dir = os.path.join(root, an_id, "角色配置")
+        os.makedirs(source_dir)
+        config[an_id] = [f"角色{i}_{j}" for j in range(per_id)]
+        for member in config[an_id]:
+            with open(os.path.join(source_dir, f"{member}.ini"), "w", encoding="gbk") as f:
+                f.write("[Role]\nname=%s\n" % member + "x" * 512)
+    service = GameDataService(os.path.join(root, "unused.db"))
+    with b.timed():
+        service.aggregate_files(root, config)
@@ -0,0 +1,271 @@
+# desktop_center/benchmarks/harness.py
+"""
+性能回归基准的运行框架。
+
+基准用 `@benchmark` 注册，函数签名为 `func(b: BenchContext, n)`：函数内做准备工作，
+只把需要计时的部分放进 `with b.timed():`（每次调用恰好一个计时块）。
+`n` 是数据规模（行数、条目数等），不带规模的基准 `n` 为 None。
+
+每个（基准, 规模）重复运行 `repeat` 次，每次都在新的临时目录中进行；
+只读的共享数据（例如预先灌好 10^6 行的数据库）用 `b.fixture()` 构建，
+按（名称, 规模）缓存，在同一次运行的所有重复和所有基准之间复用。
+结果记录 min / median 毫秒数，回归比较使用最稳定的 min。
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import platform
+import statistics
+import tempfile
+import importlib.util
+from datetime import datetime
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+RESULT_FORMAT_VERSION = 1
+DEFAULT_REPEAT = 3
+# 默认认为慢于基线 20% 以上才算回归
+DEFAULT_THRESHOLD = 0.20
+# 绝对差值低于该值（毫秒）时视为噪声，不报告回归
+DEFAULT_MIN_DELTA_MS = 1.0
+
+
+@dataclass
+class Benchmark:
+    name: str
+    func: Callable
+    sizes: Tuple = (None,)
+    large_sizes: Tuple = ()
+    requires: Tuple[str, ...] = ()
+    description: str = ""
+
+    def missing_requirements(self) -> List[str]:
+        return [module for module in self.requires if importlib.util.find_spec(module) is None]
+
+    @staticmethod
+    def key(name: str, n) -> str:
+        return name if n is None else f"{name}[n={n}]"
+
+
+# 已注册的全部基准，按注册顺序
+BENCHMARKS: List[Benchmark] = []
+
+
+def benchmark(name: str, sizes: Sequence = (None,), large_sizes: Sequence = (), requires: Sequence[str] = (),
+              description: str = ""):
+    """注册一个基准。`large_sizes` 只在 `--large` 时运行；`requires` 中的模块缺失时跳过。"""
+    def decorator(func):
+        summary = description or (func.__doc__ or "").strip().split("\n")[0]
+        BENCHMARKS.append(Benchmark(name, func, tuple(sizes), tuple(large_sizes), tuple(requires), summary))
+        return func
+    return decorator
+
+
+class BenchContext:
+    """传给基准函数的上下文：临时目录、跨重复缓存的数据和计时块。"""
+
+    def __init__(self, workdir: str, n, fixtures: Dict, fixture_dir: str):
+        self.workdir = workdir
+        self.n = n
+        self._fixtures = fixtures
+        self._fixture_dir = fixture_dir
+        self.elapsed_ms: Optional[float] = None
+
+    def path(self, *parts: str) -> str:
+        """本次运行的临时目录中的路径（父目录会被创建）。"""
+        path = os.path.join(self.workdir, *parts)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return path
+
+    def fixture(self, name: str, factory: Callable[[str], object]):
+        """
+        返回当前规模下名为 `name` 的共享数据。首次调用时执行 `factory(directory)` 构建，
+        `directory` 是该数据专属、在整个运行期间保留的目录。基准函数不得修改返回的数据；
+        返回对象若有 `close()`，会在运行结束时被调用。
+        """
+        key = (name, self.n)
+        if key not in self._fixtures:
+            directory = os.path.join(self._fixture_dir, str(len(self._fixtures)))
+            os.makedirs(directory, exist_ok=True)
+            self._fixtures[key] = factory(directory)
+        return self._fixtures[key]
+
+    def copy_file(self, source: str, name: Optional[str] = None) -> str:
+        """把 fixture 中的文件复制到本次运行的临时目录，供会修改文件的基准使用。"""
+        target = self.path(name or os.path.basename(source))
+        shutil.copyfile(source, target)
+        return target
+
+    @contextmanager
+    def timed(self):
+        if self.elapsed_ms is not None:
+            raise RuntimeError("每次基准调用只能有一个计时块")
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.elapsed_ms = (time.perf_counter() - start) * 1000
+
+
+def select_benchmarks(patterns: Sequence[str] = ()) -> List[Benchmark]:
+    """按名称子串筛选基准；没有给出模式时返回全部。"""
+    if not patterns:
+        return list(BENCHMARKS)
+    return [b for b in BENCHMARKS if any(p in b.name for p in patterns)]
+
+
+def run_benchmarks(benchmarks: Sequence[Benchmark], repeat: int = DEFAULT_REPEAT, large: bool = False,
+                   sizes: Optional[Sequence[int]] = None, progress: Optional[Callable[[str], None]] = None) -> Dict:
+    """
+    运行基准并返回可直接写入 JSON 的结果。
+
+    Args:
+        benchmarks: 要运行的基准。
+        repeat: 每个（基准, 规模）的重复次数。
+        large: 是否同时运行 `large_sizes`（例如 10^6 行）。
+        sizes: 覆盖所有带规模基准的规模（用于快速冒烟测试）。
+        progress: 每完成一项时调用，参数为一行可读的进度文本。
+    """
+    results: Dict[str, Dict] = {}
+    skipped: Dict[str, str] = {}
+    # 被测代码的 INFO/WARNING 日志不计入测量，也不刷屏
+    previous_disable = logging.root.manager.disable
+    logging.disable(logging.WARNING)
+    root = tempfile.mkdtemp(prefix="helpself_bench_")
+    fixtures: Dict = {}
+    fixture_dir = os.path.join(root, "fixtures")
+    try:
+        for bench in benchmarks:
+            missing = bench.missing_requirements()
+            if missing:
+                skipped[bench.name] = f"缺少依赖: {', '.join(missing)}"
+                if progress:
+                    progress(f"{bench.name:<40} 跳过（{skipped[bench.name]}）")
+                continue
+            bench_sizes = bench.sizes + (bench.large_sizes if large else ())
+            if sizes is not None and bench.sizes != (None,):
+                bench_sizes = tuple(sizes)
+            for n in bench_sizes:
+                key = Benchmark.key(bench.name, n)
+                runs: List[float] = []
+                for _ in range(repeat):
+                    workdir = tempfile.mkdtemp(dir=root)
+                    context = BenchContext(workdir, n, fixtures, fixture_dir)
+                    bench.func(context, n)
+                    if context.elapsed_ms is None:
+                        raise RuntimeError(f"基准 '{key}' 没有计时块")
+                    runs.append(context.elapsed_ms)
+                    shutil.rmtree(workdir, ignore_errors=True)
+                results[key] = {
+                    "benchmark": bench.name,
+                    "n": n,
+                    "min_ms": round(min(runs), 3),
+                    "median_ms": round(statistics.median(runs), 3),
+                    "runs_ms": [round(r, 3) for r in runs],
+                }
+                if progress:
+                    progress(f"{key:<40} min {min(runs):>10.2f} ms   median {statistics.median(runs):>10.2f} ms")
+    finally:
+        for value in fixtures.values():
+            close = getattr(value, "close", None)
+            if callable(close):
+                close()
+        logging.disable(previous_disable)
+        shutil.rmtree(root, ignore_errors=True)
+
+    return {
+        "version": RESULT_FORMAT_VERSION,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "repeat": repeat,
+        "results": results,
+        "skipped": skipped,
+    }
+
+
+def write_results(data: Dict, path: str) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def load_results(path: str) -> Dict:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != RESULT_FORMAT_VERSION:
+        raise ValueError(f"不支持的结果格式版本: {data.get('version')}（{path}）")
+    return data
+
+
+@dataclass
+class Comparison:
+    key: str
+    baseline_ms: float
+    current_ms: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current_ms / self.baseline_ms if self.baseline_ms > 0 else float("inf")
+
+
+@dataclass
+class ComparisonReport:
+    threshold: float
+    min_delta_ms: float
+    compared: List[Comparison] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)   # 基线中有、本次没有（或被跳过）
+    added: List[str] = field(default_factory=list)     # 本次新增
+
+    def _beyond(self, c: Comparison, slower: bool) -> bool:
+        delta = c.current_ms - c.baseline_ms if slower else c.baseline_ms - c.current_ms
+        limit = c.baseline_ms * (1 + self.threshold) if slower else c.baseline_ms / (1 + self.threshold)
+        beyond = c.current_ms > limit if slower else c.current_ms < limit
+        return beyond and delta >= self.min_delta_ms
+
+    @property
+    def regressions(self) -> List[Comparison]:
+        return [c for c in self.compared if self._beyond(c, slower=True)]
+
+    @property
+    def improvements(self) -> List[Comparison]:
+        return [c for c in self.compared if self._beyond(c, slower=False)]
+
+    def format(self) -> str:
+        regressed = {c.key for c in self.regressions}
+        improved = {c.key for c in self.improvements}
+        lines = [f"{'基准':<40}{'基线 (ms)':>12}{'本次 (ms)':>12}{'变化':>10}"]
+        for c in self.compared:
+            mark = "  回归" if c.key in regressed else ("  提升" if c.key in improved else "")
+            lines.append(f"{c.key:<40}{c.baseline_ms:>12.2f}{c.current_ms:>12.2f}{(c.ratio - 1) * 100:>+9.1f}%{mark}")
+        for key in self.missing:
+            lines.append(f"{key:<40}  本次未运行")
+        for key in self.added:
+            lines.append(f"{key:<40}  基线中没有")
+        lines.append(f"共比较 {len(self.compared)} 项：回归 {len(regressed)} 项，提升 {len(improved)} 项"
+                     f"（阈值 {self.threshold:.0%}，噪声下限 {self.min_delta_ms:g} ms）。")
+        return "\n".join(lines)
+
+
+def compare_results(baseline: Dict, current: Dict, threshold: float = DEFAULT_THRESHOLD,
+                    min_delta_ms: float = DEFAULT_MIN_DELTA_MS) -> ComparisonReport:
+    """按 min_ms 比较两份结果。"""
+    report = ComparisonReport(threshold, min_delta_ms)
+    base_results, current_results = baseline["results"], current["results"]
+    for key, base in base_results.items():
+        if key in current_results:
+            report.compared.append(Comparison(key, base["min_ms"], current_results[key]["min_ms"]))
+        else:
+            report.missing.append(key)
+    report.added = [key for key in current_results if key not in base_results]
+    return report
+
+
+def print_progress(line: str) -> None:
+    print(line, file=sys.stderr, flush=True)
@@ -0,0 +1,105 @@
+# desktop_center/benchmarks/suite.py
+"""
+核心服务性能回归基准套件的命令行入口。
+
+运行全部基准并把结果写入 JSON（默认 benchmarks/results/ 下以时间命名），或保存为命名基线:
+    python -m benchmarks.suite run [--filter alert_db] [--repeat 3] [--large] [--save-baseline linux-ci]
+
+与基线比较，超过阈值的变慢项视为回归，存在回归时退出码为 1:
+    python -m benchmarks.suite compare benchmarks/baselines/linux-ci.json [结果.json] [--threshold 0.2]
+    不给出结果文件时先运行一遍基准（可配合 --filter / --repeat / --large）再比较。
+
+列出所有基准:
+    python -m benchmarks.suite list
+
+基线与机器相关，只应和同一台机器（或同规格的 CI 机器）上的结果比较。
+"""
+import os
+import sys
+import argparse
+from datetime import datetime
+
+from benchmarks import cases  # noqa: F401  注册全部基准
+from benchmarks.harness import (DEFAULT_MIN_DELTA_MS, DEFAULT_REPEAT, DEFAULT_THRESHOLD, compare_results,
+                                load_results, print_progress, run_benchmarks, select_benchmarks, write_results)
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_DIR = os.path.join(BENCHMARKS_DIR, "baselines")
+RESULTS_DIR = os.path.join(BENCHMARKS_DIR, "results")
+
+
+def _add_run_options(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--filter", action="append", default=[], help="只运行名称包含该子串的基准（可重复）")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="每项的重复次数，取最小值比较")
+    parser.add_argument("--large", action="store_true", help="同时运行 10^6 行等大规模数据")
+    parser.add_argument("--sizes", type=int, nargs="+", help="覆盖所有带规模基准的规模（快速冒烟）")
+
+
+def _run(args) -> dict:
+    benchmarks = select_benchmarks(args.filter)
+    if not benchmarks:
+        raise SystemExit(f"没有名称匹配 {args.filter} 的基准。")
+    return run_benchmarks(benchmarks, repeat=max(1, args.repeat), large=args.large, sizes=args.sizes,
+                          progress=print_progress)
+
+
+def cmd_run(args) -> int:
+    data = _run(args)
+    if args.save_baseline:
+        path = os.path.join(BASELINE_DIR, f"{args.save_baseline}.json")
+    else:
+        path = args.output or os.path.join(RESULTS_DIR, f"bench_{datetime.now():%Y%m%d_%H%M%S}.json")
+    write_results(data, path)
+    print(f"结果已写入: {path}")
+    return 0
+
+
+def cmd_compare(args) -> int:
+    baseline = load_results(args.baseline)
+    current = load_results(args.current) if args.current else _run(args)
+    if args.filter:
+        # 只比较本次选中的基准，基线中其余的项不算“本次未运行”
+        selected = {bench.name for bench in select_benchmarks(args.filter)}
+        baseline["results"] = {key: value for key, value in baseline["results"].items()
+                               if value.get("benchmark") in selected}
+    report = compare_results(baseline, current, threshold=args.threshold, min_delta_ms=args.min_delta_ms)
+    print(report.format())
+    return 1 if report.regressions else 0
+
+
+def cmd_list(args) -> int:
+    for bench in select_benchmarks():
+        sizes = ", ".join(str(n) for n in bench.sizes if n is not None)
+        large = ", ".join(str(n) for n in bench.large_sizes)
+        scale = f" [n={sizes}{'; --large: ' + large if large else ''}]" if sizes else ""
+        print(f"{bench.name:<30}{bench.description}{scale}")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="运行基准并写入 JSON 结果")
+    _add_run_options(run_parser)
+    run_parser.add_argument("--output", help="结果文件路径")
+    run_parser.add_argument("--save-baseline", metavar="NAME", help=f"保存为基线 {os.path.relpath(BASELINE_DIR)}/NAME.json")
+    run_parser.set_defaults(func=cmd_run)
+
+    compare_parser = subparsers.add_parser("compare", help="与基线比较，存在回归时退出码为 1")
+    compare_parser.add_argument("baseline", help="基线 JSON 文件")
+    compare_parser.add_argument("current", nargs="?", help="本次结果 JSON 文件；省略时立即运行基准")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="变慢超过该比例视为回归（默认 0.2）")
+    compare_parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS, help="低于该绝对差值（毫秒）的变化视为噪声")
+    _add_run_options(compare_parser)
+    compare_parser.set_defaults(func=cmd_compare)
+
+    list_parser = subparsers.add_parser("list", help="列出所有基准")
+    list_parser.set_defaults(func=cmd_list)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,357 @@
+# desktop_center/src/core/bootstrap.py
+"""
+桌面版（HelpSelf.py）与无界面守护进程（HelpSelfDaemon.py）共用的启动代码。
+
+这里只包含与界面无关的部分：应用常量、数据目录与配置文件的准备、日志管道，
+以及 `PlatformBootstrap` 中配置服务、Webhook、备份、SQL 分析器等核心服务的创建与关闭。
+本模块不得导入 `PySide6.QtWidgets` / `QtGui` 或 pandas，否则无界面模式会失去意义。
+"""
+import sys
+import os
+import logging
+import configparser
+import shutil
+
+from src.services.config_service import ConfigService
+from src.services.webhook_service import WebhookService
+from src.services.sqlite_base_service import query_profiler
+from src.services.database_backup_service import DatabaseBackupService
+from src.services.task_manager import DEFAULT_MAX_WORKERS, DEFAULT_PLUGIN_LIMIT, TaskManager
+from src.services.frame_cache import frame_cache
+from src.utils.import_profiler import import_profiler
+from src.utils.sampling_profiler import DEFAULT_INTERVAL_MS, sampling_profiler
+from src.utils.stall_detector import DEFAULT_THRESHOLD_MS, EventLoopWatchdog
+from src.utils.timeline import startup_timeline, shutdown_timeline
+from src.utils.metrics import metrics
+from src.utils.logging_pipeline import LoggingPipeline, create_default_handlers, parse_level, parse_module_levels
+
+
+# --- 全局应用程序常量 ---
+APP_VERSION = "5.3.8-Code-Refinement"
+APP_NAME_DEFAULT = "HelpSelf"
+CONFIG_FILE = 'config.ini'
+DB_FILE = 'history.db'
+LOG_FILE = 'app.log'
+QUERY_PROFILE_FILE = 'query_profile.txt'
+IMPORT_PROFILE_FILE = 'import_profile.txt'
+STARTUP_TIMELINE_FILE = 'startup_timeline.json'
+SHUTDOWN_TIMELINE_FILE = 'shutdown_timeline.json'
+STALL_REPORT_FILE = 'stall_report.txt'
+BACKUP_DIR = 'backups'
+WEBHOOK_OUTBOX_FILE = 'webhook_outbox.db'
+FRAME_CACHE_DIR = os.path.join('cache', 'frames')
+
+# 项目根目录（src 的上一级），开发环境下资源文件相对于此目录
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def get_app_data_dir():
+    """获取并确保应用数据根目录存在。"""
+    app_data_dir = os.path.join(os.path.expanduser('~'), APP_NAME_DEFAULT)
+    os.makedirs(app_data_dir, exist_ok=True)
+    return app_data_dir
+
+def get_resource_path(relative_path):
+    """获取资源的绝对路径，兼容开发环境和PyInstaller打包环境。"""
+    if getattr(sys, 'frozen', False) and hasattr(sys, '_MEIPASS'):
+        # PyInstaller环境
+        base_path = sys._MEIPASS
+    else:
+        # 开发环境
+        base_path = _PROJECT_ROOT
+    return os.path.join(base_path, relative_path)
+
+def prepare_config_file():
+    """
+    准备配置文件。如果用户数据目录中不存在，则从包内复制一份。
+    返回可用的配置文件路径。
+    """
+    app_data_dir = get_app_data_dir()
+    config_path_in_data_dir = os.path.join(app_data_dir, CONFIG_FILE)
+
+    if not os.path.exists(config_path_in_data_dir):
+        logging.info(f"配置文件在 '{config_path_in_data_dir}' 未找到，将从程序包中复制默认配置。")
+        default_config_path = get_resource_path(CONFIG_FILE)
+        if os.path.exists(default_config_path):
+            try:
+                shutil.copy(default_config_path, config_path_in_data_dir)
+                logging.info(f"默认配置文件已成功复制到: {config_path_in_data_dir}")
+            except Exception as e:
+                logging.error(f"复制默认配置文件失败: {e}", exc_info=True)
+                return None # 复制失败，无法继续
+        else:
+            logging.warning(f"在程序包内也未找到默认配置文件: {default_config_path}")
+            return None # 找不到源文件，无法继续
+
+    return config_path_in_data_dir
+
+# 由 setup_logging 创建，[Logging] 配置变化时用它调整级别
+logging_pipeline = None
+
+
+def setup_logging():
+    """
+    配置全局日志记录器。
+    此函数设计为在应用生命周期中最早被调用，它会预读配置文件以获取日志级别。
+    """
+    log_level_str = "INFO"
+    module_levels_spec = ""
+
+    config_path = prepare_config_file()
+    if config_path:
+        try:
+            pre_parser = configparser.ConfigParser()
+            if pre_parser.read(config_path, encoding='utf-8-sig'):
+                log_level_str = pre_parser.get('Logging', 'level', fallback='INFO').upper()
+                module_levels_spec = pre_parser.get('Logging', 'module_levels', fallback='')
+        except (configparser.Error, IOError):
+            import warnings
+            warnings.warn(f"无法预读配置文件 '{config_path}' 以获取日志级别，将使用默认的 'INFO' 级别。")
+
+    log_level = parse_level(log_level_str)
+
+    # 将日志文件输出到用户主目录下的特定子目录
+    log_dir = os.path.join(get_app_data_dir(), 'logs')
+    os.makedirs(log_dir, exist_ok=True)
+    log_file_path = os.path.join(log_dir, LOG_FILE)
+
+    # 文件与控制台输出由日志管道的后台线程完成，调用方线程只负责入队
+    global logging_pipeline
+    logging_pipeline = LoggingPipeline(
+        create_default_handlers(log_file_path),
+        level=log_level,
+        module_levels=parse_module_levels(module_levels_spec)
+    ).install()
+    # 打印启动横幅
+    logging.info("=" * 80)
+    logging.info(f"--- 应用程序启动流程开始 (v{APP_VERSION}) ---")
+    logging.info("=" * 80)
+    logging.info(f"[STEP 0] 日志系统初始化完成。日志级别设置为: {log_level_str}")
+
+
+class PlatformBootstrap:
+    """
+    【平台核心】与界面无关的核心服务的创建、配置与关闭。
+
+    桌面版的 `ApplicationOrchestrator` 与无界面的 `HeadlessOrchestrator` 都继承此类，
+    子类负责创建 Qt 应用实例并按各自的顺序调用这里的方法。
+    子类需要在调用前设置 `app_data_dir`、`config_service` 等属性。
+    """
+    # 事件循环卡顿检测，由 _start_stall_detector 创建；禁用时为 None
+    stall_detector = None
+
+    def _create_config_service(self, config_path: str) -> ConfigService:
+        """创建配置服务，并让 [Logging] 的级别配置变化立即生效。"""
+        config_service = ConfigService(config_path)
+        config_service.subscribe(self._on_logging_config_changed, section="Logging")
+        return config_service
+
+    def _configure_query_profiler(self):
+        """根据 [Database] 配置节启用可选的 SQL 性能分析器。"""
+        enabled = self.config_service.get_value("Database", "profile_queries", "false").lower() == 'true'
+        slow_ms_str = self.config_service.get_value("Database", "slow_query_ms", "100")
+        try:
+            slow_ms = float(slow_ms_str)
+        except ValueError:
+            logging.warning(f"  - 无效的 slow_query_ms 配置 '{slow_ms_str}'，将使用默认值 100。")
+            slow_ms = 100.0
+        query_profiler.configure(enabled, slow_ms)
+
+    def _on_logging_config_changed(self, section, option, old_value, new_value):
+        """[Logging] 的 level / module_levels 变化时调整日志管道的级别，无需重启。"""
+        if option not in ("level", "module_levels") or logging_pipeline is None:
+            return
+        level_str = self.config_service.get_value("Logging", "level", "INFO")
+        module_levels = parse_module_levels(self.config_service.get_value("Logging", "module_levels", ""))
+        logging_pipeline.set_levels(parse_level(level_str), module_levels)
+        logging.info(f"[{type(self).__name__}] 日志级别已调整为 {level_str.upper()}，模块级别覆盖: {module_levels or '无'}")
+
+    def _configure_frame_cache(self):
+        """根据 [Cache] 配置节启用 Excel/CSV 解析结果的磁盘缓存。"""
+        if self.config_service.get_value("Cache", "frame_cache_enabled", "true").lower() != 'true':
+            frame_cache.configure(None)
+            return
+        max_mb_str = self.config_service.get_value("Cache", "frame_cache_max_mb", "512")
+        try:
+            max_mb = int(max_mb_str)
+        except ValueError:
+            logging.warning(f"  - 无效的 frame_cache_max_mb 配置 '{max_mb_str}'，将使用默认值 512。")
+            max_mb = 512
+        frame_cache.configure(os.path.join(self.app_data_dir, FRAME_CACHE_DIR), max_mb * 1024 * 1024)
+
+    def _create_webhook_service(self) -> WebhookService:
+        """根据 [WebhookDefaults] 创建 Webhook 推送服务，并重新投递发件箱中上次未送达的持久化事件。"""
+        webhook_service = WebhookService(
+            outbox_path=os.path.join(self.app_data_dir, WEBHOOK_OUTBOX_FILE),
+            timeout=self.config_service.get_float("WebhookDefaults", "timeout_seconds", 5.0),
+            max_retries=self.config_service.get_int("WebhookDefaults", "max_retries", 5),
+            retry_base_delay=self.config_service.get_float("WebhookDefaults", "retry_base_seconds", 1.0),
+            batch_window=self.config_service.get_int("WebhookDefaults", "batch_window_ms", 200) / 1000
+        )
+        webhook_service.replay_outbox()
+        return webhook_service
+
+    def _create_backup_service(self) -> DatabaseBackupService:
+        """根据 [Backup] 配置节创建数据库在线备份服务。"""
+        def get_number(key, default):
+            value = self.config_service.get_value("Backup", key, str(default))
+            try:
+                return float(value)
+            except ValueError:
+                logging.warning(f"  - 无效的 Backup.{key} 配置 '{value}'，将使用默认值 {default}。")
+                return default
+
+        enabled = self.config_service.get_value("Backup", "enabled", "true").lower() == 'true'
+        backup_dir = self.config_service.get_value("Backup", "backup_dir", "").strip() or os.path.join(self.app_data_dir, BACKUP_DIR)
+        return DatabaseBackupService(
+            backup_dir=backup_dir,
+            # 禁用定时备份时间隔为 0，仍然支持手动“立即备份”
+            interval_hours=get_number("interval_hours", 24) if enabled else 0,
+            keep_count=int(get_number("keep_count", 7))
+        )
+
+    def _create_task_manager(self, dispatcher) -> TaskManager:
+        """根据 [Tasks] 配置节创建后台任务管理器，状态与进度通知通过 `dispatcher` 投递到主线程。"""
+        return TaskManager(
+            dispatcher=dispatcher,
+            max_workers=self.config_service.get_int("Tasks", "max_workers", DEFAULT_MAX_WORKERS),
+            plugin_limit=self.config_service.get_int("Tasks", "plugin_limit", DEFAULT_PLUGIN_LIMIT)
+        )
+
+    def _start_config_watcher(self, dispatcher):
+        """监视 config.ini 的外部修改，变更通知通过 `dispatcher` 投递到主线程。"""
+        if self.config_service.get_bool("General", "watch_config_file", True):
+            self.config_service.start_watching(dispatcher=dispatcher)
+
+    def _register_platform_metrics(self):
+        """把共享服务自带的统计登记为回调式指标，在性能页面上统一展示。"""
+        for key in ("shown", "merged", "dropped", "pending"):
+            metrics.gauge(f"notifications.{key}", f"桌面通知 {key} 计数",
+                          func=lambda key=key: self.notification_service.stats()[key])
+        for key in ("delivered", "retried", "failed", "pending", "outbox"):
+            metrics.gauge(f"webhook.{key}", f"Webhook 推送 {key} 计数",
+                          func=lambda key=key: self.webhook_service.stats()[key])
+
+    def _load_plugins(self):
+        """加载插件，按 [Logging] profile_imports 配置记录插件导入耗时。"""
+        profile_imports = self.config_service.get_value("Logging", "profile_imports", "false").lower() == 'true'
+        if profile_imports:
+            import_profiler.start()
+        self.plugin_manager.load_plugins()
+        if profile_imports:
+            import_profiler.stop()
+            self._write_import_profile_report()
+
+    def _start_sampling_profiler(self) -> bool:
+        """按 [Logging] sampling_interval_ms 开始对所有线程做栈采样。"""
+        interval_ms = self.config_service.get_float("Logging", "sampling_interval_ms", DEFAULT_INTERVAL_MS)
+        return sampling_profiler.start(interval_ms)
+
+    def _stop_sampling_profiler(self):
+        """停止栈采样，把 collapsed stack 结果写入日志目录，返回文件路径。"""
+        path = sampling_profiler.stop(os.path.join(self.app_data_dir, 'logs'))
+        if path:
+            logging.info(f"  - 性能采样结果已写入: {path}")
+        return path
+
+    def _start_stall_detector(self, dispatcher):
+        """按 [Logging] stall_threshold_ms 启动事件循环卡顿检测（0 为禁用），需在主线程中调用。"""
+        threshold_ms = self.config_service.get_float("Logging", "stall_threshold_ms", DEFAULT_THRESHOLD_MS)
+        if threshold_ms <= 0:
+            logging.info("  - 事件循环卡顿检测已禁用。")
+            return
+        self.stall_detector = EventLoopWatchdog(dispatcher, threshold_ms=threshold_ms, registry=metrics)
+        self.stall_detector.start()
+
+    def _write_stall_report(self):
+        """将按累计卡顿时间排序的阻塞热点报告写入日志目录。"""
+        report_path = os.path.join(self.app_data_dir, 'logs', STALL_REPORT_FILE)
+        try:
+            with open(report_path, 'w', encoding='utf-8') as f:
+                f.write(self.stall_detector.report())
+            logging.info(f"  - GUI 卡顿热点报告已写入: {report_path}")
+        except IOError as e:
+            logging.error(f"  - 写入 GUI 卡顿热点报告失败: {e}")
+
+    def _write_query_profile_report(self):
+        """将 SQL 性能分析报告写入日志目录。"""
+        report_path = os.path.join(self.app_data_dir, 'logs', QUERY_PROFILE_FILE)
+        try:
+            with open(report_path, 'w', encoding='utf-8') as f:
+                f.write(query_profiler.report(limit=50))
+            logging.info(f"  - SQL 性能分析报告已写入: {report_path}")
+        except IOError as e:
+            logging.error(f"  - 写入 SQL 性能分析报告失败: {e}")
+
+    def _write_import_profile_report(self):
+        """将插件导入耗时报告写入日志目录。"""
+        logging.info(f"  - {import_profiler.summary()}")
+        report_path = os.path.join(self.app_data_dir, 'logs', IMPORT_PROFILE_FILE)
+        try:
+            with open(report_path, 'w', encoding='utf-8') as f:
+                f.write(import_profiler.report())
+            logging.info(f"  - 导入耗时报告已写入: {report_path}")
+        except IOError as e:
+            logging.error(f"  - 写入导入耗时报告失败: {e}")
+
+    def _finish_startup_timeline(self):
+        """结束启动时间线，写入 JSON 文件并输出摘要日志。"""
+        startup_timeline.finish()
+        logging.info(f"[STEP 5.1] {startup_timeline.summary()}")
+        path = os.path.join(self.app_data_dir, 'logs', STARTUP_TIMELINE_FILE)
+        if startup_timeline.write_json(path):
+            logging.info(f"  - 启动时间线已写入: {path}")
+
+    def _shutdown_ui(self):
+        """关闭流程的第一步：停止界面相关的组件。无界面模式下什么也不做。"""
+        pass
+
+    def shutdown(self):
+        """
+        执行集中的、安全的关闭流程，确保所有资源被正确释放。
+        """
+        logging.info("[STEP 6.0] 应用程序关闭流程开始...")
+        shutdown_timeline.start()
+
+        self._shutdown_ui()
+
+        if self.stall_detector is not None:
+            self.stall_detector.stop()
+            if self.stall_detector.hotspots():
+                self._write_stall_report()
+        # 关闭时仍在采样则保存已采集的结果
+        if sampling_profiler.running:
+            self._stop_sampling_profiler()
+
+        logging.info("  - [6.2] 停止数据库备份服务...")
+        shutdown_timeline.phase("6.2 停止备份服务")
+        self.backup_service.stop()
+
+        logging.info("  - [6.3] 关闭所有插件...")
+        shutdown_timeline.phase("6.3 关闭插件")
+        # 先取消后台任务，避免任务在插件释放资源后继续访问它们
+        with shutdown_timeline.span("task_manager.shutdown"):
+            self.task_manager.shutdown()
+        self.plugin_manager.shutdown_plugins()
+        with shutdown_timeline.span("db_executor.shutdown"):
+            self.db_executor.shutdown()
+        with shutdown_timeline.span("notification_service.shutdown"):
+            self.notification_service.shutdown()
+
+        if query_profiler.enabled:
+            self._write_query_profile_report()
+
+        # 安全地关闭 WebhookService 推送线程，未送达的持久化事件保留在发件箱中
+        logging.info("  - [6.4] 停止 Webhook 推送线程...")
+        shutdown_timeline.phase("6.4 停止Webhook推送")
+        self.webhook_service.shutdown()
+
+        # 写出尚未执行的延迟配置保存
+        shutdown_timeline.phase("6.5 写出配置")
+        self.config_service.stop_watching()
+        self.config_service.flush()
+
+        shutdown_timeline.finish()
+        logging.info(f"[STEP 6.5] {shutdown_timeline.summary()}")
+        shutdown_timeline.write_json(os.path.join(self.app_data_dir, 'logs', SHUTDOWN_TIMELINE_FILE))
+        logging.info("[STEP 6.5] 应用程序关闭流程结束。")
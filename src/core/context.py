@@ -1,28 +1,40 @@
 # desktop_center/src/core/context.py
 import os
 from typing import TYPE_CHECKING
-from PySide6.QtWidgets import QApplication
 
-# 【修改】使用类型检查块来避免循环导入
+# 【修改】使用类型检查块来避免循环导入；无界面模式下不能导入 QtWidgets
 if TYPE_CHECKING:
+    from PySide6.QtCore import QCoreApplication
     from src.services.config_service import ConfigService
     from src.services.notification_service import NotificationService
     from src.services.webhook_service import WebhookService
     from src.services.data_source_initializer import DataSourceInitializerService
     from src.services.data_source_switch_service import DataSourceSwitchService
+    from src.services.database_backup_service import DatabaseBackupService
+    from src.services.async_db_executor import AsyncDbExecutor
+    from src.services.task_manager import TaskManager
+    from src.utils.metrics import MetricsRegistry
     from src.utils.tray_manager import TrayManager
     from src.ui.action_manager import ActionManager
     from src.ui.main_window import MainWindow
 
 class ApplicationContext:
-    """一个数据类，持有所有核心/共享服务和组件的引用，供插件使用。"""
-    def __init__(self, app: QApplication, main_window: 'MainWindow',
+    """
+    一个数据类，持有所有核心/共享服务和组件的引用，供插件使用。
+    【新增】无界面模式（HelpSelfDaemon.py）下 `app` 是 QCoreApplication，
+    `main_window`、`tray_manager`、`action_manager` 和 `switch_service` 均为 None。
+    """
+    def __init__(self, app: 'QCoreApplication', main_window: 'MainWindow',
                  config_service: 'ConfigService',
                  tray_manager: 'TrayManager', action_manager: 'ActionManager',
                  notification_service: 'NotificationService', webhook_service: 'WebhookService',
                  initializer: 'DataSourceInitializerService',
                  switch_service: 'DataSourceSwitchService',
-                 app_data_dir: str):
+                 app_data_dir: str,
+                 backup_service: 'DatabaseBackupService' = None,
+                 db_executor: 'AsyncDbExecutor' = None,
+                 metrics: 'MetricsRegistry' = None,
+                 task_manager: 'TaskManager' = None):
         self.app = app
         self.main_window = main_window
         self.config_service = config_service
@@ -33,6 +45,12 @@ class ApplicationContext:
         self.initializer = initializer
         self.switch_service = switch_service
         self.app_data_dir = app_data_dir
+        self.backup_service = backup_service
+        self.db_executor = db_executor
+        # 【新增】平台级运行指标注册表，插件在此登记计数器、瞬时值和耗时分布
+        self.metrics = metrics
+        # 【新增】平台级后台任务管理器，耗时操作作为可取消、带进度的任务提交到这里
+        self.task_manager = task_manager
 
     def get_data_path(self, relative_path: str) -> str:
         """
@@ -0,0 +1,169 @@
+# desktop_center/src/core/headless.py
+"""
+无界面守护进程模式。
+
+在 QCoreApplication 上只组装配置服务、数据服务和声明了 `"headless": true` 的插件的后台服务，
+不创建主窗口、托盘和任何 QWidget，也不导入 `PySide6.QtWidgets` / `QtGui` 或 pandas，
+适合在没有桌面环境的服务器上运行告警接收等后台功能。
+
+入口为项目根目录下的 `HelpSelfDaemon.py`；SIGINT / SIGTERM 会触发与桌面版相同的关闭流程，
+SIGUSR1（仅 POSIX）开始 / 停止性能采样，相当于桌面版托盘菜单中的“性能采样”。
+"""
+import sys
+import signal
+import logging
+
+from PySide6.QtCore import QCoreApplication, QTimer
+
+from src.services.notification_service import NotificationService
+from src.services.data_source_initializer import DataSourceInitializerService
+from src.services.async_db_executor import AsyncDbExecutor
+from src.utils.gui_dispatcher import GuiDispatcher
+from src.utils.timeline import startup_timeline
+from src.utils.sampling_profiler import sampling_profiler
+from src.utils.metrics import metrics
+from src.core.context import ApplicationContext
+from src.core.plugin_manager import PluginManager
+from src.core.bootstrap import APP_NAME_DEFAULT, PlatformBootstrap, get_app_data_dir, prepare_config_file, setup_logging
+
+# Python 信号处理函数只能在解释器执行字节码时运行，Qt 事件循环空闲时需要定期唤醒一次
+SIGNAL_POLL_INTERVAL_MS = 500
+
+
+def log_notification(title: str, message: str, timeout: int = None):
+    """无界面模式下的通知后端：只写日志，不弹出桌面通知。"""
+    logging.info("[src.core.headless.log_notification] 通知: %s - %s", title, message)
+
+
+def log_unhandled_exception(exctype, value, tb):
+    """无界面模式下的全局异常钩子：记录日志后交给默认钩子，不弹出对话框。"""
+    logging.critical("捕获到未处理的全局异常", exc_info=(exctype, value, tb))
+    sys.__excepthook__(exctype, value, tb)
+
+
+class HeadlessOrchestrator(PlatformBootstrap):
+    """
+    【平台核心】无界面应用协调器。
+
+    启动顺序与桌面版 `ApplicationOrchestrator` 一致，但跳过所有界面步骤（1.4 核心UI组件、3.0 平台级页面），
+    插件管理器以无界面模式只加载和挂载声明了 headless 的插件。
+    """
+    def __init__(self, argv=None):
+        logging.info("[STEP 1.0] HeadlessOrchestrator: 开始以无界面模式初始化平台核心...")
+
+        # --- 1.1 基础环境准备 ---
+        startup_timeline.phase("1.1 基础环境准备")
+        self.app_data_dir = get_app_data_dir()
+        self.config_path = prepare_config_file()
+        if not self.config_path:
+            raise RuntimeError("无法创建或找到配置文件，应用程序无法启动。")
+        logging.info(f"  - 应用数据目录: {self.app_data_dir}")
+        logging.info(f"  - 配置文件路径: {self.config_path}")
+
+        # --- 1.2 初始化Qt核心应用实例（无GUI） ---
+        startup_timeline.phase("1.2 Qt核心应用实例")
+        self.app = QCoreApplication.instance() or QCoreApplication(argv if argv is not None else sys.argv)
+        logging.info("  - QCoreApplication实例初始化完成。")
+
+        # --- 1.3 初始化核心后台服务 ---
+        startup_timeline.phase("1.3 核心后台服务")
+        self.config_service = self._create_config_service(self.config_path)
+        self._configure_query_profiler()
+        self._configure_frame_cache()
+        app_name = self.config_service.get_value("General", "app_name", APP_NAME_DEFAULT)
+        # 没有桌面环境，通知只写入日志；合并与限流规则保持不变
+        self.notification_service = NotificationService(
+            app_name=app_name,
+            app_icon="",
+            config_service=self.config_service,
+            notifier=log_notification
+        )
+        self.webhook_service = self._create_webhook_service()
+        self.initializer = DataSourceInitializerService()
+        self.backup_service = self._create_backup_service()
+        # 回调投递到主线程的事件循环，与桌面版的 GUI 线程语义相同
+        self.dispatcher = GuiDispatcher(self.app)
+        self.db_executor = AsyncDbExecutor(dispatcher=self.dispatcher.post)
+        # 【新增】插件共享的后台任务线程池
+        self.task_manager = self._create_task_manager(self.dispatcher.post)
+        self._start_config_watcher(self.dispatcher.post)
+        logging.info("  - 核心后台服务 (Config, Notification, Webhook, DB Initializer, Backup, DB Executor, Task Manager) 初始化完成。")
+
+        # --- 1.5 创建共享上下文 ---
+        startup_timeline.phase("1.5 共享上下文")
+        self.context = ApplicationContext(
+            app=self.app,
+            main_window=None,
+            config_service=self.config_service,
+            tray_manager=None,
+            action_manager=None,
+            notification_service=self.notification_service,
+            webhook_service=self.webhook_service,
+            initializer=self.initializer,
+            switch_service=None,
+            app_data_dir=self.app_data_dir,
+            backup_service=self.backup_service,
+            db_executor=self.db_executor,
+            metrics=metrics,
+            task_manager=self.task_manager
+        )
+        self._register_platform_metrics()
+        logging.info("  - 共享的 ApplicationContext 创建完成（无界面）。")
+
+        # --- 1.6 初始化插件系统（仅 headless 插件） ---
+        startup_timeline.phase("2.1 加载插件")
+        self.plugin_manager = PluginManager(self.context, headless=True)
+        logging.info("[STEP 2.0] 开始加载和初始化支持无界面模式的插件...")
+        self._load_plugins()
+        startup_timeline.phase("2.2 初始化插件")
+        self.plugin_manager.initialize_plugins()
+        logging.info("[STEP 2.3] 所有插件加载和初始化完毕。")
+
+        # --- 1.8 连接退出信号 ---
+        startup_timeline.phase("4.0 全局信号")
+        self.app.aboutToQuit.connect(self.shutdown)
+        self._install_signal_handlers()
+        logging.info("[STEP 4.1] 平台核心初始化流程结束（无界面模式）。")
+
+    def _install_signal_handlers(self):
+        """SIGINT / SIGTERM 时退出事件循环，由 aboutToQuit 触发统一的关闭流程；SIGUSR1 切换性能采样。"""
+        def request_quit(signum, frame):
+            logging.info(f"[HeadlessOrchestrator] 收到信号 {signum}，准备退出...")
+            self.app.quit()
+
+        def toggle_profiler(signum, frame):
+            if sampling_profiler.running:
+                self._stop_sampling_profiler()
+            else:
+                self._start_sampling_profiler()
+
+        for name in ("SIGINT", "SIGTERM"):
+            if hasattr(signal, name):
+                signal.signal(getattr(signal, name), request_quit)
+        if hasattr(signal, "SIGUSR1"):
+            signal.signal(signal.SIGUSR1, toggle_profiler)
+        self._signal_timer = QTimer()
+        self._signal_timer.timeout.connect(lambda: None)
+        self._signal_timer.start(SIGNAL_POLL_INTERVAL_MS)
+
+    def run(self) -> int:
+        """启动后台服务并进入事件循环，返回退出码。"""
+        logging.info("[STEP 5.0] 启动Qt核心事件循环（无界面模式）...")
+        startup_timeline.phase("5.0 启动后台服务")
+        self.backup_service.start()
+        QTimer.singleShot(0, self._finish_startup_timeline)
+        self._start_stall_detector(self.dispatcher.post)
+        return self.app.exec()
+
+
+def main() -> int:
+    """无界面守护进程的主入口。"""
+    setup_logging()
+    sys.excepthook = log_unhandled_exception
+    startup_timeline.start()
+    try:
+        orchestrator = HeadlessOrchestrator()
+    except Exception as e:
+        logging.critical(f"无界面模式在初始化阶段发生致命错误，无法启动: {e}", exc_info=True)
+        return 1
+    return orchestrator.run()
@@ -0,0 +1,230 @@
+# desktop_center/src/core/plugin_discovery.py
+"""
+基于清单（manifest）的插件发现。
+
+每个插件目录下放置一个 `plugin.json`:
+
+    {
+      "name": "memo_pad",              // 插件唯一名称，与 IFeaturePlugin.name() 一致
+      "entry": "plugin:MemoPadPlugin", // 入口模块:入口类
+      "priority": 100,                 // 默认加载优先级（[PluginOrder] 中没有配置时使用）
+      "background": false,             // 是否提供后台服务；为 true 时启动即初始化，不参与延迟加载
+      "depends": [],                   // 依赖的其他插件名称；被依赖的插件总是先完成准备和挂载
+      "headless": false                // 是否支持无界面模式；为 true 时守护进程会加载它并调用 initialize_headless()
+    }
+
+发现过程只读取清单文件，不导入任何模块；解析结果缓存在索引文件中，
+清单未变化时直接复用。没有清单的旧插件会退回到约定的 `plugin.py` 入口。
+"""
+import os
+import json
+import heapq
+import logging
+import threading
+from dataclasses import dataclass, asdict, field
+from typing import Dict, List, Optional, Tuple
+
+MANIFEST_FILE = "plugin.json"
+DEFAULT_ENTRY_MODULE = "plugin"
+DEFAULT_PRIORITY = 100
+# 索引缓存格式版本，清单字段变化时递增以使旧缓存失效
+INDEX_VERSION = 4
+
+
+@dataclass
+class PluginManifest:
+    """单个插件的清单信息。"""
+    package: str                       # 插件目录名，例如 'memo_pad'
+    name: str                          # 插件唯一名称
+    entry_module: str = DEFAULT_ENTRY_MODULE
+    entry_class: Optional[str] = None  # 为 None 时在入口模块中查找 IFeaturePlugin 子类
+    priority: int = DEFAULT_PRIORITY
+    background: bool = False          # 提供后台服务的插件总是在启动时初始化
+    depends: List[str] = field(default_factory=list)
+    has_manifest: bool = True
+    headless: bool = False             # 无界面模式下只加载声明了 headless 的插件
+
+    def module_name(self, root_package: str = "src.features") -> str:
+        return f"{root_package}.{self.package}.{self.entry_module}"
+
+
+def parse_manifest(package: str, data: dict) -> PluginManifest:
+    """
+    将清单字典解析为 PluginManifest。
+
+    Raises:
+        ValueError: 清单缺少必需字段或格式错误。
+    """
+    if not isinstance(data, dict) or not data.get("name"):
+        raise ValueError("清单缺少 'name' 字段")
+    entry = data.get("entry") or DEFAULT_ENTRY_MODULE
+    entry_module, _, entry_class = entry.partition(":")
+    return PluginManifest(
+        package=package,
+        name=str(data["name"]),
+        entry_module=entry_module or DEFAULT_ENTRY_MODULE,
+        entry_class=entry_class or None,
+        priority=int(data.get("priority", DEFAULT_PRIORITY)),
+        background=bool(data.get("background", False)),
+        depends=_parse_depends(data.get("depends", [])),
+        headless=bool(data.get("headless", False)),
+    )
+
+
+def _parse_depends(value) -> List[str]:
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise ValueError("'depends' 必须是插件名称列表")
+    return list(dict.fromkeys(value))
+
+
+def resolve_load_order(names: List[str], dependencies: Dict[str, List[str]]) -> Tuple[List[str], Dict[str, str]]:
+    """
+    按依赖关系对插件做拓扑排序。没有依赖约束的插件之间保持 `names` 的原有顺序（即优先级顺序）。
+
+    Args:
+        names: 按优先级排好序的插件名称。
+        dependencies: 插件名称 -> 其依赖的插件名称列表。
+
+    Returns:
+        (加载顺序, 无法加载的插件 -> 原因)。缺少依赖、依赖无法加载或处于循环依赖中的插件会被排除。
+    """
+    position = {name: i for i, name in enumerate(names)}
+    deps = {name: set(dependencies.get(name, [])) for name in names}
+    skipped: Dict[str, str] = {}
+    for name in names:
+        missing = sorted(d for d in deps[name] if d not in position)
+        if missing:
+            skipped[name] = f"缺少依赖插件: {', '.join(missing)}"
+
+    # 依赖了无法加载的插件的插件同样无法加载
+    changed = True
+    while changed:
+        changed = False
+        for name in names:
+            if name in skipped:
+                continue
+            broken = sorted(d for d in deps[name] if d in skipped)
+            if broken:
+                skipped[name] = f"依赖的插件无法加载: {', '.join(broken)}"
+                changed = True
+
+    remaining = [name for name in names if name not in skipped]
+    indegree = {name: len(deps[name]) for name in remaining}
+    dependents: Dict[str, List[str]] = {name: [] for name in remaining}
+    for name in remaining:
+        for dep in deps[name]:
+            dependents[dep].append(name)
+
+    ready = [(position[name], name) for name in remaining if indegree[name] == 0]
+    heapq.heapify(ready)
+    order: List[str] = []
+    while ready:
+        _, name = heapq.heappop(ready)
+        order.append(name)
+        for dependent in dependents[name]:
+            indegree[dependent] -= 1
+            if indegree[dependent] == 0:
+                heapq.heappush(ready, (position[dependent], dependent))
+
+    for name in remaining:
+        if indegree[name] > 0:
+            skipped[name] = "存在循环依赖（或依赖于循环中的插件）"
+    return order, skipped
+
+
+class PluginIndex:
+    """
+    插件清单索引，缓存在 JSON 文件中。
+
+    缓存以每个插件目录中清单文件（或入口文件）的 [大小, mtime_ns] 作为签名，
+    签名不变时直接复用缓存的解析结果；新增或删除插件目录会在扫描时被发现。
+    """
+    def __init__(self, cache_path: Optional[str] = None):
+        self.cache_path = cache_path
+        self._lock = threading.Lock()
+
+    def discover(self, plugins_root: str) -> List[PluginManifest]:
+        """扫描插件根目录，返回按目录名排序的清单列表。"""
+        if not os.path.isdir(plugins_root):
+            logging.warning(f"[src.core.plugin_discovery.PluginIndex.discover] 插件目录不存在: {plugins_root}")
+            return []
+
+        cache = self._read_cache(plugins_root)
+        new_entries: Dict[str, dict] = {}
+        manifests: List[PluginManifest] = []
+        reused = 0
+
+        for entry in sorted(os.scandir(plugins_root), key=lambda e: e.name):
+            if not entry.is_dir() or entry.name.startswith(("_", ".")):
+                continue
+            manifest_path = os.path.join(entry.path, MANIFEST_FILE)
+            fallback_path = os.path.join(entry.path, DEFAULT_ENTRY_MODULE + ".py")
+            source_path = manifest_path if os.path.isfile(manifest_path) else fallback_path
+            signature = self._signature(source_path)
+            if signature is None:
+                continue  # 既没有清单也没有 plugin.py，不是插件目录
+
+            cached = cache.get(entry.name)
+            if cached and cached.get("signature") == signature:
+                manifest = PluginManifest(**cached["manifest"])
+                reused += 1
+            else:
+                manifest = self._load_manifest(entry.name, manifest_path)
+                if manifest is None:
+                    continue
+            manifests.append(manifest)
+            new_entries[entry.name] = {"signature": signature, "manifest": asdict(manifest)}
+
+        if new_entries != cache:
+            self._write_cache(plugins_root, new_entries)
+        logging.info(f"[src.core.plugin_discovery.PluginIndex.discover] 发现 {len(manifests)} 个插件（其中 {reused} 个来自索引缓存）。")
+        return manifests
+
+    @staticmethod
+    def _load_manifest(package: str, manifest_path: str) -> Optional[PluginManifest]:
+        if not os.path.isfile(manifest_path):
+            logging.warning(f"[src.core.plugin_discovery.PluginIndex._load_manifest] 插件目录 '{package}' 缺少 {MANIFEST_FILE}，将使用默认入口 {DEFAULT_ENTRY_MODULE}.py。")
+            return PluginManifest(package=package, name=package, has_manifest=False)
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                return parse_manifest(package, json.load(f))
+        except (OSError, ValueError, TypeError) as e:
+            logging.error(f"[src.core.plugin_discovery.PluginIndex._load_manifest] 插件清单无效，已跳过 '{manifest_path}': {e}")
+            return None
+
+    @staticmethod
+    def _signature(path: str) -> Optional[List[int]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return [st.st_size, st.st_mtime_ns]
+
+    def _read_cache(self, plugins_root: str) -> Dict[str, dict]:
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != INDEX_VERSION or data.get("root") != os.path.normcase(os.path.abspath(plugins_root)):
+                return {}
+            return data.get("entries", {})
+        except (OSError, ValueError, AttributeError) as e:
+            logging.warning(f"[src.core.plugin_discovery.PluginIndex._read_cache] 插件索引缓存损坏，将重新扫描: {e}")
+            return {}
+
+    def _write_cache(self, plugins_root: str, entries: Dict[str, dict]) -> None:
+        if not self.cache_path:
+            return
+        data = {"version": INDEX_VERSION, "root": os.path.normcase(os.path.abspath(plugins_root)), "entries": entries}
+        tmp_path = self.cache_path + ".tmp"
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(tmp_path, self.cache_path)
+            except OSError as e:
+                logging.warning(f"[src.core.plugin_discovery.PluginIndex._write_cache] 写入插件索引缓存失败: {e}")
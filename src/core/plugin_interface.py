@@ -1,7 +1,12 @@
 # desktop_center/src/core/plugin_interface.py
 from abc import ABC, abstractmethod
-from PySide6.QtWidgets import QWidget
+from typing import TYPE_CHECKING
 from .context import ApplicationContext
+from src.utils.timeline import shutdown_timeline
+
+# 无界面模式下会导入本模块，QWidget 只用于类型标注
+if TYPE_CHECKING:
+    from PySide6.QtWidgets import QWidget
 
 class IFeaturePlugin(ABC):
     """
@@ -55,11 +60,30 @@ class IFeaturePlugin(ABC):
         """
         pass
 
+    def prepare(self, context: ApplicationContext):
+        """
+        【新增】准备阶段：在后台线程池中执行、与其他插件并发进行的初始化工作。
+
+        适合放在这里的是与界面无关的 I/O 密集型工作，例如打开并验证数据库、读取配置文件、
+        加载历史数据等。结果保存在插件实例上，供随后的 `initialize` 使用。
+
+        约束：
+        - 不得创建或访问任何 QWidget，也不得连接信号（这些属于 `initialize`）。
+        - 只能依赖插件清单 `depends` 中声明的插件已完成准备阶段。
+        - 抛出异常表示准备失败，该插件（以及依赖它的插件）不会被初始化。
+
+        默认实现什么也不做。
+
+        Args:
+            context (ApplicationContext): 应用上下文。
+        """
+        pass
+
     def initialize(self, context: ApplicationContext):
         """
-        初始化插件。
+        初始化插件（挂载阶段）。
 
-        平台核心在加载所有插件后会调用此方法。插件应该在这里：
+        平台核心在插件的 `prepare` 完成后，在GUI线程中调用此方法。插件应该在这里：
         1. 保存 `context` 的引用，以便后续访问共享服务。
         2. 创建并准备其UI页面（如果需要）。
         3. 创建并准备其后台服务（如果需要）。
@@ -73,7 +97,22 @@ class IFeaturePlugin(ABC):
         self.background_services = []
         self.page_widget = None
 
-    def get_page_widget(self) -> QWidget | None:
+    def initialize_headless(self, context: ApplicationContext):
+        """
+        【新增】无界面模式下的挂载阶段，替代 `initialize` 被调用。
+
+        只有清单中声明了 `"headless": true` 的插件才会在无界面模式（HelpSelfDaemon.py）下被导入。
+        此时 `context.app` 是 QCoreApplication，`main_window`、`tray_manager`、`action_manager`
+        均为 None。插件应只创建其后台服务，不得导入或创建任何 QWidget。
+
+        默认实现只保存 `context` 引用，不创建任何服务；声明了 headless 的插件应重写此方法。
+
+        Args:
+            context (ApplicationContext): 应用上下文。
+        """
+        IFeaturePlugin.initialize(self, context)
+
+    def get_page_widget(self) -> 'QWidget | None':
         """
         返回此插件的主UI页面控件实例。
 
@@ -114,4 +153,6 @@ class IFeaturePlugin(ABC):
                 if service.running:
                     service.running = False
                     service.quit()
-                    service.wait(5000)
\ No newline at end of file
+                    # 每个服务最多等待 5 秒，记录到关闭时间线中以便定位拖慢退出的服务
+                    with shutdown_timeline.span(f"wait:{type(service).__name__}", "service"):
+                        service.wait(5000)
\ No newline at end of file
@@ -1,112 +1,288 @@
 # desktop_center/src/core/plugin_manager.py
+import os
+import sys
+import time
+import functools
 import importlib
-import pkgutil
+import importlib.util
 import logging
-from PySide6.QtWidgets import QWidget
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING
 from PySide6.QtCore import QThread
 from src.core.plugin_interface import IFeaturePlugin
+from src.core.plugin_discovery import PluginIndex, PluginManifest, resolve_load_order
+from src.utils.import_profiler import import_profiler
+from src.utils.timeline import startup_timeline, shutdown_timeline
+
+# 无界面模式下不能导入 QtWidgets，QWidget 只在检查页面时按需导入
+if TYPE_CHECKING:
+    from PySide6.QtWidgets import QWidget
+
+# 插件清单索引缓存（相对于应用数据目录）
+PLUGIN_INDEX_RELATIVE_PATH = os.path.join("cache", "plugin_index.json")
+# 插件准备阶段的默认并发线程数
+DEFAULT_INIT_WORKERS = 4
 
 class PluginManager:
-    """负责发现、加载和管理所有插件的管理器。"""
-    def __init__(self, context):
+    """
+    负责发现、加载和管理所有插件的管理器。
+
+    【新增】`headless=True` 时只加载清单中声明了 `"headless": true` 的插件，
+    调用其 `initialize_headless()` 而不是 `initialize()`，也不注册任何页面。
+    """
+    def __init__(self, context, headless: bool = False):
         self.context = context
+        self.headless = headless
         self.plugins: list[IFeaturePlugin] = []
+        # 插件名称 -> 清单
+        self.manifests: dict[str, PluginManifest] = {}
+        # 已调用过 initialize() 的插件（无论成功与否，关闭时都需要清理）与其中初始化成功的插件
+        self._attempted: set[str] = set()
+        self._initialized: set[str] = set()
 
     def load_plugins(self):
         """
-        使用 walk_packages 递归地发现并加载所有在 src.features 包下的插件。
+        基于插件清单发现并加载插件。
+        只导入每个插件清单中声明的入口模块（默认 plugin.py），开发环境与 PyInstaller 打包环境共用同一条路径。
         """
-        import os
-        import sys
-        import importlib.util # 【新增】导入 importlib.util
+        import src.features
 
         logging.info("[STEP 2.1] PluginManager: 开始扫描 'src/features' 目录以发现插件...")
+        # 打包环境下 src.features.__path__ 指向 _MEIPASS 中的目录，因此无需区分环境
+        plugins_root = src.features.__path__[0]
+        logging.info(f"  - 插件根目录: {plugins_root}")
 
-        if getattr(sys, 'frozen', False) and hasattr(sys, '_MEIPASS'):
-            # PyInstaller 打包环境
-            plugins_root_path = os.path.join(sys._MEIPASS, 'src', 'features')
-            logging.info(f"  - 检测到PyInstaller环境，扫描插件路径: {plugins_root_path}")
-            if os.path.exists(plugins_root_path):
-                for plugin_dir in os.listdir(plugins_root_path):
-                    plugin_path = os.path.join(plugins_root_path, plugin_dir)
-                    plugin_main_file = os.path.join(plugin_path, 'plugin.py')
-                    if os.path.isdir(plugin_path) and os.path.exists(plugin_main_file):
-                        try:
-                            # 动态加载插件模块
-                            spec = importlib.util.spec_from_file_location(f"src.features.{plugin_dir}.plugin", plugin_main_file)
-                            if spec and spec.loader:
-                                module = importlib.util.module_from_spec(spec)
-                                sys.modules[spec.name] = module
-                                spec.loader.exec_module(module)
-                                
-                                for item_name in dir(module):
-                                    item = getattr(module, item_name)
-                                    if isinstance(item, type) and issubclass(item, IFeaturePlugin) and item is not IFeaturePlugin:
-                                        if not any(isinstance(p, item) for p in self.plugins):
-                                            plugin_instance = item()
-                                            self.plugins.append(plugin_instance)
-                                            logging.info(f"  - 插件已发现并加载: {plugin_instance.name()} (from {plugin_dir}/plugin.py)")
-                        except Exception as e:
-                            logging.error(f"加载插件模块 {plugin_dir}/plugin.py 时失败: {e}", exc_info=True)
-            else:
-                logging.warning(f"  - PyInstaller环境下未找到插件目录: {plugins_root_path}")
-        else:
-            # 开发环境
-            import src.features
-            for module_info in pkgutil.walk_packages(path=src.features.__path__, prefix=src.features.__name__ + '.'):
-                try:
-                    module = importlib.import_module(module_info.name)
-                    for item_name in dir(module):
-                        item = getattr(module, item_name)
-                        if isinstance(item, type) and issubclass(item, IFeaturePlugin) and item is not IFeaturePlugin:
-                            if not any(isinstance(p, item) for p in self.plugins):
-                                plugin_instance = item()
-                                self.plugins.append(plugin_instance)
-                                logging.info(f"  - 插件已发现并加载: {plugin_instance.name()} (from {module_info.name})")
-                except Exception as e:
-                    logging.error(f"加载插件模块 {module_info.name} 时失败: {e}", exc_info=True)
+        index = PluginIndex(self.context.get_data_path(PLUGIN_INDEX_RELATIVE_PATH))
+        for manifest in index.discover(plugins_root):
+            if self.headless and not manifest.headless:
+                logging.info(f"  - 插件 '{manifest.name}' 未声明支持无界面模式，已跳过（不导入其模块）。")
+                continue
+            try:
+                with import_profiler.section(manifest.package), startup_timeline.span(f"import:{manifest.package}", "plugin"):
+                    plugin_class = self._import_entry_class(manifest, plugins_root)
+                if plugin_class is None:
+                    logging.warning(f"  - 在 {manifest.module_name()} 中未找到 IFeaturePlugin 实现，已跳过。")
+                    continue
+                if any(isinstance(p, plugin_class) for p in self.plugins):
+                    continue
+                plugin_instance = plugin_class()
+                if manifest.has_manifest and plugin_instance.name() != manifest.name:
+                    logging.warning(f"  - 插件清单名称 '{manifest.name}' 与 name() 返回的 '{plugin_instance.name()}' 不一致，以 name() 为准。")
+                self.manifests[plugin_instance.name()] = manifest
+                self.plugins.append(plugin_instance)
+                logging.info(f"  - 插件已发现并加载: {plugin_instance.name()} (from {manifest.module_name()})")
+            except Exception as e:
+                logging.error(f"加载插件模块 {manifest.module_name()} 时失败: {e}", exc_info=True)
         logging.info("[STEP 2.1] PluginManager: 插件扫描和加载完成。")
 
+    @staticmethod
+    def _import_entry_class(manifest: PluginManifest, plugins_root: str):
+        """
+        导入插件入口模块并返回入口类。
+        模块可被正常导入时（开发环境，或已被打包进归档）使用 import_module；
+        否则从插件目录中的源文件加载（打包时作为数据文件附带的插件）。
+        """
+        module_name = manifest.module_name()
+        try:
+            spec = importlib.util.find_spec(module_name)
+        except ModuleNotFoundError:
+            spec = None
+        if spec is not None:
+            module = importlib.import_module(module_name)
+        else:
+            file_path = os.path.join(plugins_root, manifest.package, manifest.entry_module + ".py")
+            spec = importlib.util.spec_from_file_location(module_name, file_path)
+            if spec is None or spec.loader is None:
+                raise ImportError(f"找不到插件入口文件: {file_path}")
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[module_name] = module
+            spec.loader.exec_module(module)
+
+        if manifest.entry_class:
+            plugin_class = getattr(module, manifest.entry_class, None)
+            if not (isinstance(plugin_class, type) and issubclass(plugin_class, IFeaturePlugin)):
+                raise ImportError(f"入口 '{manifest.entry_class}' 不是 IFeaturePlugin 的子类")
+            return plugin_class
+        # 没有清单的旧插件：在入口模块中查找 IFeaturePlugin 子类
+        for item in vars(module).values():
+            if isinstance(item, type) and issubclass(item, IFeaturePlugin) and item is not IFeaturePlugin:
+                return item
+        return None
+
 
     def initialize_plugins(self):
-        """初始化所有已加载的插件。"""
+        """
+        初始化所有已加载的插件。
+
+        初始化分为两个阶段：
+        - 准备阶段 `prepare()`：在线程池中执行。插件按清单中声明的 `depends` 构成依赖图，
+          互不依赖的插件并发准备，依赖方会等待被依赖插件准备完成。
+        - 挂载阶段 `initialize()`：在GUI线程中按拓扑顺序执行，创建页面、连接信号、启动后台服务。
+
+        启用延迟加载（[General] lazy_plugin_pages）时，带清单且不提供后台服务的插件只在主窗口注册一个占位页面，
+        直到用户第一次切换到该页面时才依次执行两个阶段。提供后台服务的插件（例如告警接收服务）、
+        没有清单的旧插件，以及它们所依赖的插件仍在启动时立即初始化。
+        """
         logging.info("[STEP 2.2] PluginManager: 开始初始化所有已加载的插件...")
         self._sort_plugins_with_config()
-        logging.info(f"  - 插件将按以下优先级顺序初始化: {[p.name() for p in self.plugins]}")
-        
+        self._order_by_dependencies()
+        logging.info(f"  - 插件将按以下顺序初始化: {[p.name() for p in self.plugins]}")
+        config_service = self.context.config_service
+        # 无界面模式下没有页面可以延迟，所有插件都在启动时初始化
+        lazy_enabled = not self.headless and config_service.get_value("General", "lazy_plugin_pages", "true").lower() == 'true'
+        try:
+            workers = max(1, int(config_service.get_value("General", "plugin_init_workers", str(DEFAULT_INIT_WORKERS))))
+        except (ValueError, TypeError):
+            workers = DEFAULT_INIT_WORKERS
+
+        # 需要立即初始化的插件，以及它们依赖的插件
+        eager = {p.name() for p in self.plugins if not (lazy_enabled and self._can_defer(p))}
+        for plugin in reversed(self.plugins):
+            if plugin.name() in eager:
+                eager.update(self._dependencies_of(plugin.name()))
+
+        start = time.perf_counter()
+        prepare_futures = self._submit_prepares([p for p in self.plugins if p.name() in eager], workers)
+        # 按顺序挂载，导航栏中的页面顺序与插件顺序保持一致
         for plugin in self.plugins:
-            try:
-                logging.info(f"  - 正在初始化插件: '{plugin.name()}' (优先级: {plugin.load_priority()})...")
-                plugin.initialize(self.context)
-                
-                # 【修改】对插件返回值进行健壮性检查
-                page_widget = plugin.get_page_widget()
-                if page_widget:
-                    if isinstance(page_widget, QWidget):
-                        self.context.main_window.add_page(plugin.display_name(), page_widget)
-                        logging.info(f"    - 插件 '{plugin.name()}' 的主页面已添加到主窗口。")
+            if plugin.name() not in eager:
+                self.context.main_window.add_page(plugin.display_name(), functools.partial(self._build_deferred_page, plugin))
+                logging.info(f"  - 插件 '{plugin.name()}' 已注册为延迟加载，将在首次打开其页面时初始化。")
+                continue
+            if not prepare_futures[plugin.name()].result():
+                continue
+            if not all(d in self._initialized for d in self._dependencies_of(plugin.name())):
+                logging.error(f"插件 '{plugin.name()}' 依赖的插件初始化失败，已跳过。")
+                continue
+            if self._attach_plugin(plugin) and not self.headless:
+                self._attach_page(plugin)
+        logging.info(f"[STEP 2.2] PluginManager: {len(eager)} 个插件已在 {(time.perf_counter() - start) * 1000:.0f}ms 内完成初始化（准备线程数: {workers}）。")
+
+    def ensure_initialized(self, plugin_name: str) -> bool:
+        """
+        【新增】确保指定插件（及其依赖）已初始化，用于需要在页面打开前访问插件的场景。
+        页面仍以占位形式保留在导航栏中，首次切换时直接使用已构建好的页面。
+        """
+        plugin = next((p for p in self.plugins if p.name() == plugin_name), None)
+        if plugin is None:
+            return False
+        if plugin_name in self._attempted:
+            return plugin_name in self._initialized
+        for dependency in self._dependencies_of(plugin_name):
+            if not self.ensure_initialized(dependency):
+                logging.error(f"插件 '{plugin_name}' 依赖的插件 '{dependency}' 初始化失败，已跳过。")
+                return False
+        return self._prepare_plugin(plugin) and self._attach_plugin(plugin)
+
+    def _can_defer(self, plugin: IFeaturePlugin) -> bool:
+        manifest = self.manifests.get(plugin.name())
+        return manifest is not None and manifest.has_manifest and not manifest.background
+
+    def _dependencies_of(self, plugin_name: str) -> list[str]:
+        manifest = self.manifests.get(plugin_name)
+        return list(manifest.depends) if manifest else []
+
+    def _order_by_dependencies(self) -> None:
+        """在优先级顺序的基础上按依赖关系做拓扑排序，并移除依赖无法满足的插件。"""
+        names = [p.name() for p in self.plugins]
+        order, skipped = resolve_load_order(names, {name: self._dependencies_of(name) for name in names})
+        for name, reason in skipped.items():
+            msg = f"插件 '{name}' 无法加载: {reason}"
+            logging.error(f"  - {msg}")
+            self.context.notification_service.show("插件依赖错误", msg, level="warning")
+        by_name = {p.name(): p for p in self.plugins}
+        self.plugins = [by_name[name] for name in order]
+
+    def _submit_prepares(self, plugins: list[IFeaturePlugin], workers: int) -> dict[str, Future]:
+        """
+        按拓扑顺序把插件的准备阶段提交到线程池。
+        任务按提交顺序被取出，依赖总是先于依赖方提交，因此在任务中等待依赖的结果不会造成死锁。
+        """
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="PluginPrepare")
+        futures: dict[str, Future] = {}
+        for plugin in plugins:
+            dependency_futures = [futures[d] for d in self._dependencies_of(plugin.name()) if d in futures]
+            futures[plugin.name()] = executor.submit(self._prepare_after, plugin, dependency_futures)
+        executor.shutdown(wait=False)
+        return futures
+
+    def _prepare_after(self, plugin: IFeaturePlugin, dependency_futures: list[Future]) -> bool:
+        if not all(future.result() for future in dependency_futures):
+            logging.error(f"插件 '{plugin.name()}' 依赖的插件准备失败，已跳过。")
+            return False
+        return self._prepare_plugin(plugin)
+
+    def _prepare_plugin(self, plugin: IFeaturePlugin) -> bool:
+        """执行插件的准备阶段（可在任意线程中调用）。成功返回 True。"""
+        self._attempted.add(plugin.name())
+        try:
+            start = time.perf_counter()
+            with startup_timeline.span(f"prepare:{plugin.name()}", "plugin"):
+                plugin.prepare(self.context)
+            logging.info(f"  - 插件 '{plugin.name()}' 准备完成，耗时 {(time.perf_counter() - start) * 1000:.0f}ms。")
+            return True
+        except Exception as e:
+            logging.error(f"准备插件 {plugin.name()} 失败: {e}", exc_info=True)
+            return False
+
+    def _build_deferred_page(self, plugin: IFeaturePlugin) -> 'QWidget | None':
+        """主窗口首次切换到延迟页面时调用：初始化插件并返回其页面。"""
+        if not self.ensure_initialized(plugin.name()):
+            return None
+        return self._get_valid_page(plugin)
+
+    def _attach_plugin(self, plugin: IFeaturePlugin) -> bool:
+        """在GUI线程中调用插件的 initialize() 并启动其后台服务。成功返回 True。"""
+        try:
+            logging.info(f"  - 正在初始化插件: '{plugin.name()}' (优先级: {plugin.load_priority()})...")
+            with startup_timeline.span(f"initialize:{plugin.name()}", "plugin"):
+                if self.headless:
+                    plugin.initialize_headless(self.context)
+                else:
+                    plugin.initialize(self.context)
+            self._initialized.add(plugin.name())
+
+            background_services = plugin.get_background_services()
+            if background_services:
+                for service in background_services:
+                    if isinstance(service, QThread) and hasattr(service, 'start'):
+                        service.start()
+                        logging.info(f"    - 已启动插件 '{plugin.name()}' 的后台服务: {type(service).__name__}")
                     else:
-                        logging.warning(f"    - 插件 '{plugin.name()}' 的 get_page_widget() 返回的不是有效QWidget，已忽略。")
-
-                background_services = plugin.get_background_services()
-                if background_services:
-                    for service in background_services:
-                        if isinstance(service, QThread) and hasattr(service, 'start'):
-                            service.start()
-                            logging.info(f"    - 已启动插件 '{plugin.name()}' 的后台服务: {type(service).__name__}")
-                        else:
-                            logging.warning(f"    - 插件 '{plugin.name()}' 返回的后台服务 {type(service).__name__} 不是有效的QThread，已忽略。")
-                
-                logging.info(f"  - 插件 '{plugin.name()}' 初始化完成。")
-            except Exception as e:
-                logging.error(f"初始化插件 {plugin.name()} 失败: {e}", exc_info=True)
+                        logging.warning(f"    - 插件 '{plugin.name()}' 返回的后台服务 {type(service).__name__} 不是有效的QThread，已忽略。")
+
+            logging.info(f"  - 插件 '{plugin.name()}' 初始化完成。")
+            return True
+        except Exception as e:
+            logging.error(f"初始化插件 {plugin.name()} 失败: {e}", exc_info=True)
+            return False
+
+    def _attach_page(self, plugin: IFeaturePlugin) -> None:
+        """把已初始化插件的页面添加到主窗口。"""
+        page_widget = self._get_valid_page(plugin)
+        if page_widget:
+            self.context.main_window.add_page(plugin.display_name(), page_widget)
+            logging.info(f"    - 插件 '{plugin.name()}' 的主页面已添加到主窗口。")
+
+    @staticmethod
+    def _get_valid_page(plugin: IFeaturePlugin) -> 'QWidget | None':
+        from PySide6.QtWidgets import QWidget
+        # 【修改】对插件返回值进行健壮性检查
+        page_widget = plugin.get_page_widget()
+        if page_widget and not isinstance(page_widget, QWidget):
+            logging.warning(f"    - 插件 '{plugin.name()}' 的 get_page_widget() 返回的不是有效QWidget，已忽略。")
+            return None
+        return page_widget
 
     def shutdown_plugins(self):
         """安全关闭所有插件。"""
         # 【增强】使用启动顺序的逆序来关闭，确保依赖关系被正确处理 (LIFO)。
         for plugin in reversed(self.plugins):
+            if plugin.name() not in self._attempted:
+                continue  # 延迟加载且从未被打开的插件无需关闭
             try:
-                plugin.shutdown()
+                with shutdown_timeline.span(f"shutdown:{plugin.name()}", "plugin"):
+                    plugin.shutdown()
                 logging.info(f"  - 插件 '{plugin.name()}' 已成功关闭。")
             except Exception as e:
                 logging.error(f"关闭插件 {plugin.name()} 时发生错误: {e}", exc_info=True)
@@ -129,8 +305,9 @@ class PluginManager:
         for plugin in self.plugins:
             plugin_name = plugin.name()
             if plugin_name not in plugin_order_config:
-                # 这是一个新插件，或者配置文件是空的
-                default_priority = plugin.load_priority()
+                # 这是一个新插件，或者配置文件是空的；默认优先级优先取自插件清单
+                manifest = self.manifests.get(plugin_name)
+                default_priority = manifest.priority if manifest and manifest.has_manifest else plugin.load_priority()
                 config_service.set_option(section, plugin_name, str(default_priority))
                 plugin_order_config[plugin_name] = str(default_priority)
                 config_updated = True
@@ -138,7 +315,7 @@ class PluginManager:
 
         # 3. 如果配置被更新过，则保存
         if config_updated:
-            config_service.save_config()
+            config_service.schedule_save()
             
         # 4. 使用最终的配置进行排序
         def get_priority(p: IFeaturePlugin) -> int:
@@ -5,6 +5,7 @@ from src.core.context import ApplicationContext
 from src.features.Game_data.models.game_data_model import GameDataModel
 from src.features.Game_data.views.game_data_view import GameDataView
 from src.features.Game_data.services.game_data_service import GameDataService
+from src.services.task_manager import Task, TaskState
 
 class GameDataController:
     """
@@ -82,7 +83,10 @@ class GameDataController:
             self.model.save_settings()
 
     def _execute_service_action(self, action, action_name: str):
-        """通用服务执行模板。"""
+        """
+        通用服务执行模板。
+        【变更】优先作为平台后台任务执行：复制大量文件时不再阻塞界面，进度和取消见主窗口的“任务”页面。
+        """
         self.view.clear_log()
         self.view.append_log(f"开始执行 '{action_name}' 操作...")
         logging.info(f"开始执行 '{action_name}' 操作...")
@@ -98,23 +102,43 @@ class GameDataController:
                 return
             
             # 调用具体的服务方法
+            args = (root_path, config)
             if action_name == "提取账号信息":
                 db_config = {
                     'table_name': self.model.db_table_name,
                     'member_col': self.model.db_member_col,
                     'account_col': self.model.db_account_col
                 }
-                action(root_path, config, db_config)
-            else:
-                action(root_path, config)
-            
-            self.view.append_log(f"'{action_name}' 操作成功完成。")
-            logging.info(f"'{action_name}' 操作成功完成。")
+                args += (db_config,)
+
+            task_manager = getattr(self.context, 'task_manager', None)
+            if task_manager is None:
+                action(*args)
+                self.view.append_log(f"'{action_name}' 操作成功完成。")
+                logging.info(f"'{action_name}' 操作成功完成。")
+                return
+
+            self.view.set_actions_enabled(False)
+            task = task_manager.submit("game_data", action_name, lambda task: action(*args, task=task))
+            task.add_done_callback(lambda task: self._on_action_finished(task, action_name))
+            self.view.append_log("操作正在后台执行，可在“任务”页面查看进度或取消。")
             
         except Exception as e:
             self.view.append_log(f"错误：'{action_name}' 操作失败。详情请查看日志。")
             logging.error(f"执行 '{action_name}' 操作时发生异常: {e}", exc_info=True)
 
+    def _on_action_finished(self, task: Task, action_name: str):
+        """【新增】后台任务结束的回调（在GUI线程中执行），恢复按钮并输出结果。"""
+        self.view.set_actions_enabled(True)
+        if task.state == TaskState.FINISHED:
+            self.view.append_log(f"'{action_name}' 操作成功完成。")
+            logging.info(f"'{action_name}' 操作成功完成。")
+        elif task.state == TaskState.CANCELLED:
+            self.view.append_log(f"'{action_name}' 操作已取消，已处理的部分不会回滚。")
+        else:
+            # 异常已由任务管理器连同堆栈写入日志
+            self.view.append_log(f"错误：'{action_name}' 操作失败。详情请查看日志。")
+
     def _on_extract_data(self):
         """处理提取数据按钮点击事件。"""
         self._execute_service_action(self.service.extract_data, "提取账号信息")
@@ -96,7 +96,7 @@ class GameDataModel:
             should_save = True
         
         if should_save:
-            self.config_service.save_config()
+            self.config_service.schedule_save()
 
         self.db_table_name = self.config_service.get_value("game_data", "db_table_name")
         self.db_member_col = self.config_service.get_value("game_data", "db_member_col")
@@ -6,12 +6,13 @@ import shutil
 import logging
 from typing import Dict, List
 
-try:
-    import pandas as pd
-    # openpyxl is a dependency of pandas for reading .xlsx files
-    import openpyxl
-except ImportError:
-    raise ImportError("缺少必要的库，请通过 'pip install pandas openpyxl' 来安装。")
+from src.services.frame_cache import frame_cache
+from src.services.task_manager import TaskCancelledError
+from src.utils.lazy_import import lazy_import
+
+# openpyxl is a dependency of pandas for reading .xlsx files
+# 两者都延迟到首次读取Excel时才导入
+pd = lazy_import("pandas", "缺少必要的库，请通过 'pip install pandas openpyxl' 来安装。")
 
 class GameDataService:
     """
@@ -28,7 +29,15 @@ class GameDataService:
         self.db_path = db_path
         logging.info(f"GameDataService 初始化，数据源路径: {self.db_path}")
 
-    def extract_data(self, root_path: str, config: Dict[str, List[str]], db_config: Dict[str, str]):
+    @staticmethod
+    def _step(task, index: int, total: int, an_id: str):
+        """【新增】作为平台后台任务运行时，在处理每个分机ID前响应取消并报告进度；同步调用时 task 为 None。"""
+        if task is None:
+            return
+        task.check_cancelled()
+        task.report_progress(index, total, f"正在处理 {an_id} ({index + 1}/{total})")
+
+    def extract_data(self, root_path: str, config: Dict[str, List[str]], db_config: Dict[str, str], task=None):
         """
         根据配置从数据源提取账号信息，并生成对应的txt文件。
         根据db_path的扩展名自动选择使用数据库或Excel。
@@ -39,18 +48,21 @@ class GameDataService:
         
         try:
             if file_ext in ['.db', '.sqlite', '.sqlite3']:
-                self._extract_from_db(root_path, config, db_config)
+                self._extract_from_db(root_path, config, db_config, task)
             elif file_ext in ['.xlsx', '.xls', '.xlsm']:
-                self._extract_from_excel(root_path, config, db_config)
+                self._extract_from_excel(root_path, config, db_config, task)
             else:
                 logging.error(f"不支持的数据源文件类型: {file_ext}")
                 raise ValueError(f"不支持的数据源文件类型: {file_ext}")
+        except TaskCancelledError:
+            logging.info("数据提取已被取消。")
+            raise
         except Exception as e:
             logging.error(f"数据提取过程中发生错误: {e}", exc_info=True)
             # 可以在这里重新抛出异常，让上层控制器捕获并显示在UI
             raise
 
-    def _extract_from_db(self, root_path: str, config: Dict[str, List[str]], db_config: Dict[str, str]):
+    def _extract_from_db(self, root_path: str, config: Dict[str, List[str]], db_config: Dict[str, str], task=None):
         """从SQLite数据库提取数据。"""
         logging.info("从SQLite数据库提取数据...")
         table = db_config.get('table_name', '账号数据')
@@ -61,7 +73,8 @@ class GameDataService:
 
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
-            for an_id, members in config.items():
+            for index, (an_id, members) in enumerate(config.items()):
+                self._step(task, index, len(config), an_id)
                 account_info_parts = []
                 for member in members:
                     cursor.execute(query, (member,))
@@ -73,7 +86,7 @@ class GameDataService:
                 
                 self._write_account_file(root_path, an_id, account_info_parts)
 
-    def _extract_from_excel(self, root_path: str, config: Dict[str, List[str]], db_config: Dict[str, str]):
+    def _extract_from_excel(self, root_path: str, config: Dict[str, List[str]], db_config: Dict[str, str], task=None):
         """从Excel文件提取数据。"""
         logging.info("从Excel文件提取数据...")
         member_col = db_config.get('member_col', '角色名')
@@ -81,7 +94,8 @@ class GameDataService:
 
         try:
             # engine='openpyxl' is required for .xlsx files
-            df = pd.read_excel(self.db_path, engine='openpyxl')
+            # 通过平台的解析缓存读取，文件未变化时无需重新解析整个工作簿
+            df = frame_cache.load(self.db_path, lambda: pd.read_excel(self.db_path, engine='openpyxl'))
             
             # 确保列名是字符串类型，以便进行比较
             df.columns = df.columns.astype(str)
@@ -90,7 +104,8 @@ class GameDataService:
                 logging.error(f"Excel文件中缺少必要的列: '{member_col}' 或 '{account_col}'")
                 raise ValueError(f"Excel文件中缺少必要的列: '{member_col}' 或 '{account_col}'")
 
-            for an_id, members in config.items():
+            for index, (an_id, members) in enumerate(config.items()):
+                self._step(task, index, len(config), an_id)
                 account_info_parts = []
                 for member in members:
                     # 查询匹配的行
@@ -107,6 +122,8 @@ class GameDataService:
         except FileNotFoundError:
             logging.error(f"Excel文件未找到: {self.db_path}")
             raise
+        except TaskCancelledError:
+            raise
         except Exception as e:
             logging.error(f"读取或处理Excel文件时出错: {e}")
             raise
@@ -122,7 +139,7 @@ class GameDataService:
             f.write(full_account_info)
         logging.info(f"为ID '{an_id}' 成功创建账号文件: {output_file_path} (GBK编码)")
 
-    def aggregate_files(self, root_path: str, config: Dict[str, List[str]]):
+    def aggregate_files(self, root_path: str, config: Dict[str, List[str]], task=None):
         """
         将各ID目录下的角色配置，根据角色名聚合到'all'目录。
         对应原 '2-copy-onetoall3.0.lua' 的功能。
@@ -130,13 +147,15 @@ class GameDataService:
         Args:
             root_path (str): 操作的根目录。
             config (Dict[str, List[str]]): 分机ID到角色名列表的映射。
+            task (Task, optional): 【新增】作为平台后台任务运行时的任务句柄，用于报告进度和响应取消。
         """
         logging.info("开始执行文件汇总...")
         all_dir = os.path.join(root_path, "all")
         os.makedirs(all_dir, exist_ok=True)
 
         try:
-            for an_id, members in config.items():
+            for index, (an_id, members) in enumerate(config.items()):
+                self._step(task, index, len(config), an_id)
                 source_sub_dir = os.path.join(root_path, an_id, "角色配置")
                 if not os.path.isdir(source_sub_dir):
                     logging.warning(f"源目录不存在，跳过: {source_sub_dir}")
@@ -160,8 +179,10 @@ class GameDataService:
                             break
         except (IOError, shutil.Error) as e:
             logging.error(f"文件汇总操作失败: {e}")
+            # 【变更】重新抛出，让后台任务以“失败”结束，而不是被报告为成功完成
+            raise
 
-    def distribute_files(self, root_path: str, config: Dict[str, List[str]]):
+    def distribute_files(self, root_path: str, config: Dict[str, List[str]], task=None):
         """
         将'all'目录中的文件，根据角色名分发到对应的ID目录。
         对应原 '3-copy-alltoone3.0.lua' 的功能。
@@ -169,15 +190,17 @@ class GameDataService:
         Args:
             root_path (str): 操作的根目录。
             config (Dict[str, List[str]]): 分机ID到角色名列表的映射。
+            task (Task, optional): 【新增】作为平台后台任务运行时的任务句柄，用于报告进度和响应取消。
         """
         logging.info("开始执行文件分发...")
         source_dir = os.path.join(root_path, "all")
         if not os.path.isdir(source_dir):
             logging.error(f"源目录 'all' 不存在，无法执行分发: {source_dir}")
-            return
+            raise FileNotFoundError(f"源目录 'all' 不存在，无法执行分发: {source_dir}")
 
         try:
-            for an_id, members in config.items():
+            for index, (an_id, members) in enumerate(config.items()):
+                self._step(task, index, len(config), an_id)
                 dest_sub_dir = os.path.join(root_path, an_id, "角色配置")
                 os.makedirs(dest_sub_dir, exist_ok=True)
 
@@ -197,3 +220,5 @@ class GameDataService:
                             break
         except (IOError, shutil.Error) as e:
             logging.error(f"文件分发操作失败: {e}")
+            # 【变更】重新抛出，让后台任务以“失败”结束，而不是被报告为成功完成
+            raise
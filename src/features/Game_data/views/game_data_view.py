@@ -120,6 +120,11 @@ class GameDataView(QWidget):
         """向日志浏览器追加一条消息。"""
         self.log_browser.append(message)
 
+    def set_actions_enabled(self, enabled: bool):
+        """【新增】启用或禁用三个操作按钮，避免后台任务运行期间重复提交。"""
+        for button in (self.extract_button, self.aggregate_button, self.distribute_button):
+            button.setEnabled(enabled)
+
     def clear_log(self):
         """清空日志浏览器。"""
         self.log_browser.clear()
@@ -5,4 +5,21 @@
 """
 
 DEFAULT_HOST = "0.0.0.0"
-DEFAULT_PORT = 9527
\ No newline at end of file
+DEFAULT_PORT = 9527
+
+# --- 告警速率突增检测 ---
+# 合成元告警使用的告警类型
+RATE_SPIKE_ALERT_TYPE = "Rate Spike"
+# 以下为 [alert_center] 配置节中 spike_* 配置项的默认值
+DEFAULT_SPIKE_DETECTION_ENABLED = True
+DEFAULT_SPIKE_WINDOW_SECONDS = 10
+DEFAULT_SPIKE_SIGMA = 3.0
+DEFAULT_SPIKE_MIN_COUNT = 10
+DEFAULT_SPIKE_MAX_KEYS = 1000
+DEFAULT_SPIKE_IDLE_TIMEOUT = 600
+
+# --- 请求体与消息大小限制 ---
+# [alert_center] max_body_bytes: 请求体（压缩前与解压后）允许的最大字节数
+DEFAULT_MAX_BODY_BYTES = 1024 * 1024
+# [alert_center] max_message_length: 存入 alerts 主表的 message 最大字符数
+DEFAULT_MAX_MESSAGE_LENGTH = 4096
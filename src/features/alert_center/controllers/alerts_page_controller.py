@@ -2,7 +2,6 @@
 import logging
 from PySide6.QtCore import QObject, Slot
 from PySide6.QtWidgets import QMessageBox
-from ..constants import DEFAULT_HOST, DEFAULT_PORT
 
 from src.core.context import ApplicationContext
 from ..views.alerts_page_view import AlertsPageView
@@ -17,6 +16,7 @@ class AlertsPageController(QObject):
         self.plugin_name = plugin_name
         self.view = AlertsPageView()
         self._connect_signals()
+        self.context.config_service.subscribe(self._on_config_changed, section=self.plugin_name)
         
         self._load_history_on_startup()
 
@@ -62,10 +62,10 @@ class AlertsPageController(QObject):
     @Slot()
     def toggle_popup_status(self):
         config = self.context.config_service
-        is_enabled = config.get_value(self.plugin_name, "enable_desktop_popup", "true").lower() == 'true'
+        is_enabled = config.get_bool(self.plugin_name, "enable_desktop_popup", True)
         new_status = not is_enabled
         config.set_option(self.plugin_name, "enable_desktop_popup", str(new_status).lower())
-        config.save_config()
+        config.schedule_save()
         self.update_toolbar_status()
         logging.info(f"桌面弹窗状态已切换为: {'启用' if new_status else '禁用'}")
 
@@ -73,37 +73,22 @@ class AlertsPageController(QObject):
     def set_notification_level(self, level: str):
         config = self.context.config_service
         config.set_option(self.plugin_name, "notification_level", level)
-        config.save_config()
+        config.schedule_save()
         self.update_toolbar_status()
         logging.info(f"通知级别已设置为: {level}")
 
     @Slot()
     def show_settings_dialog(self):
-        """显示插件专属的设置对话框，并在网络设置变更时提示重启。"""
-        config = self.context.config_service
-        plugin = self.plugin_name
-
-        # 1. 保存修改前的网络设置
-        old_host = config.get_value(plugin, "host", DEFAULT_HOST)
-        old_port = config.get_value(plugin, "port", str(DEFAULT_PORT))
-
-        # 2. 显示对话框
-        controller = SettingsDialogController(self.context, plugin, self.view)
+        """显示插件专属的设置对话框。监听地址的变更由插件订阅配置后实时生效，无需重启。"""
+        controller = SettingsDialogController(self.context, self.plugin_name, self.view)
         if controller.show_dialog():
-            logging.info(f"[{plugin}] 设置已更新，正在刷新工具栏状态。")
+            logging.info(f"[{self.plugin_name}] 设置已更新，正在刷新工具栏状态。")
             self.update_toolbar_status()
 
-            # 3. 检查网络设置是否变更
-            new_host = config.get_value(plugin, "host", DEFAULT_HOST)
-            new_port = config.get_value(plugin, "port", str(DEFAULT_PORT))
-
-            if old_host != new_host or old_port != new_port:
-                QMessageBox.information(
-                    self.view,
-                    "需要重启",
-                    "监听地址或端口已更改。\n请重启应用程序以使新设置生效。",
-                    QMessageBox.StandardButton.Ok
-                )
+    def _on_config_changed(self, section: str, option: str, old_value, new_value):
+        """【新增】弹窗开关或通知级别被外部修改时刷新工具栏。"""
+        if option in ("enable_desktop_popup", "notification_level"):
+            self.update_toolbar_status()
 
     @Slot()
     def show_history_dialog(self):
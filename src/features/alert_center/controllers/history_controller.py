@@ -26,6 +26,7 @@ class HistoryController(QObject):
         self.view.sort_requested.connect(self._sort_table)
         self.view.delete_alerts_requested.connect(self._delete_selected_alerts)
         self.view.export_requested.connect(self._export_data)
+        self.view.full_message_requested.connect(self._show_full_message)
 
         self.view.first_page_button.clicked.connect(lambda: self._go_to_page(1))
         self.view.prev_page_button.clicked.connect(lambda: self._go_to_page(self.model.current_page - 1))
@@ -109,6 +110,11 @@ class HistoryController(QObject):
             else:
                 QMessageBox.critical(self.view, "失败", "删除记录时发生错误。")
 
+    @Slot(int)
+    def _show_full_message(self, alert_id: int):
+        message = self.db_service.get_full_message(alert_id)
+        self.view.show_full_message(message if message is not None else "")
+
     @Slot()
     def _export_data(self):
         default_filename = os.path.join(self._last_export_dir, "alerts_history.csv")
@@ -1,12 +1,16 @@
 # desktop_center/src/features/alert_center/plugin.py
 import logging
+from PySide6.QtCore import QTimer
 from src.core.plugin_interface import IFeaturePlugin
 from src.core.context import ApplicationContext
-from .controllers.alerts_page_controller import AlertsPageController
 from .services.alert_receiver import AlertReceiverThread
 from .services.alert_database_service import AlertDatabaseService
+from .services.rate_spike_detector import RateSpikeDetector
 from src.services.generic_data_service import DataType
-from .constants import DEFAULT_HOST, DEFAULT_PORT
+from .constants import (DEFAULT_HOST, DEFAULT_PORT, DEFAULT_SPIKE_DETECTION_ENABLED,
+                        DEFAULT_SPIKE_WINDOW_SECONDS, DEFAULT_SPIKE_SIGMA, DEFAULT_SPIKE_MIN_COUNT,
+                        DEFAULT_SPIKE_MAX_KEYS, DEFAULT_SPIKE_IDLE_TIMEOUT,
+                        DEFAULT_MAX_BODY_BYTES, DEFAULT_MAX_MESSAGE_LENGTH)
  
 class AlertCenterPlugin(IFeaturePlugin):
     """
@@ -24,6 +28,24 @@ class AlertCenterPlugin(IFeaturePlugin):
         # 普通功能插件，使用标准优先级
         return 100
 
+    def prepare(self, context: ApplicationContext):
+        """
+        准备阶段（后台线程）：打开并验证告警历史数据库。
+        """
+        self.db_service = None
+        generic_service = context.initializer.initialize(
+            context=context,
+            plugin_name=self.name(),
+            config_section=self.name(),
+            config_key="db_path",
+            default_relative_path="plugins/alert_center/history.db",
+            data_type=DataType.SQLITE,
+            db_service_class=AlertDatabaseService
+        )
+        if generic_service:
+            self.db_service = generic_service.load_data()
+            logging.info(f"[{self.display_name()}] 插件专属数据库服务已初始化。")
+
     def initialize(self, context: ApplicationContext):
         """
         初始化告警中心插件。
@@ -35,56 +57,125 @@ class AlertCenterPlugin(IFeaturePlugin):
         super().initialize(context)
         logging.info(f"[{self.display_name()}] 插件开始初始化...")
 
-        # 1. 初始化数据库服务 (使用共享服务)
-        generic_service = self.context.initializer.initialize(
-            context=self.context,
-            plugin_name=self.name(),
-            config_section=self.name(),
-            config_key="db_path",
-            default_relative_path="plugins/alert_center/history.db",
-            data_type=DataType.SQLITE,
-            db_service_class=AlertDatabaseService
-        )
-
-        if not generic_service:
-            logging.error(f"[{self.display_name()}] 插件因数据源错误无法加载。")
+        # 1. 数据库服务已在准备阶段初始化 (使用共享服务)
+        # 2. 初始化后台服务
+        if not self._create_alert_receiver():
             return
+
+        # 3. 初始化主控制器（页面相关模块在此处才导入，无界面模式不会加载它们）
+        from .controllers.alerts_page_controller import AlertsPageController
+        # 控制器将负责创建和管理视图(View)和模型(Model)
+        self.alerts_page_controller = AlertsPageController(self.context, self.db_service, self.name())
+        
+        # 4. 将新告警信号连接到主控制器的槽
+        self.alert_receiver.new_alert_received.connect(self.alerts_page_controller.on_new_alert)
+        logging.info(f"[{self.display_name()}] 新告警信号已连接到主页面控制器。")
         
-        self.db_service = generic_service.load_data()
-        logging.info(f"[{self.display_name()}] 插件专属数据库服务已初始化。")
+        # 5. 设置插件的主UI页面
+        self.page_widget = self.alerts_page_controller.get_view()
+
+        # 6. 【新增】监听地址变更时（设置对话框或外部修改 config.ini）立即重新绑定，无需重启
+        self._subscribe_config()
+        logging.info(f"[{self.display_name()}] 插件初始化完成。")
+
+    def initialize_headless(self, context: ApplicationContext):
+        """
+        【新增】无界面模式：只创建后台告警接收服务，不创建页面控制器。
+        """
+        super().initialize_headless(context)
+        logging.info(f"[{self.display_name()}] 插件开始以无界面模式初始化...")
+        if not self._create_alert_receiver():
+            return
+        self._subscribe_config()
+        logging.info(f"[{self.display_name()}] 插件初始化完成（无界面模式）。")
+
+    def _create_alert_receiver(self) -> bool:
+        """创建后台告警接收服务并登记为插件的后台服务。数据库不可用时返回 False。"""
+        if not self.db_service:
+            logging.error(f"[{self.display_name()}] 插件因数据源错误无法加载。")
+            return False
 
-        # 2. 初始化后台服务
         # 从配置中读取监听地址和端口，如果未配置，则使用默认值
-        host = self.context.config_service.get_value(self.name(), "host", DEFAULT_HOST)
-        port_str = self.context.config_service.get_value(self.name(), "port", str(DEFAULT_PORT))
-        try:
-            port = int(port_str)
-        except (ValueError, TypeError):
-            logging.warning(f"[{self.display_name()}] 无效的端口配置 '{port_str}'，将使用默认端口 {DEFAULT_PORT}。")
-            port = DEFAULT_PORT
-            
+        host, port = self._read_bind_address()
+
+        max_body_bytes = self._get_int_option("max_body_bytes", DEFAULT_MAX_BODY_BYTES)
+        max_message_length = self._get_int_option("max_message_length", DEFAULT_MAX_MESSAGE_LENGTH)
+
         self.alert_receiver = AlertReceiverThread(
             config_service=self.context.config_service,
             db_service=self.db_service,
             notification_service=self.context.notification_service,
             host=host,
             port=port,
-            plugin_name=self.name()
+            plugin_name=self.name(),
+            spike_detector=self._create_spike_detector(),
+            max_body_bytes=max_body_bytes,
+            max_message_length=max_message_length
         )
         self.background_services.append(self.alert_receiver)
         logging.info(f"[{self.display_name()}] 后台告警接收服务准备就绪，监听地址：{host}:{port}。")
+        return True
 
-        # 3. 初始化主控制器
-        # 控制器将负责创建和管理视图(View)和模型(Model)
-        self.alerts_page_controller = AlertsPageController(self.context, self.db_service, self.name())
-        
-        # 4. 将新告警信号连接到主控制器的槽
-        self.alert_receiver.new_alert_received.connect(self.alerts_page_controller.on_new_alert)
-        logging.info(f"[{self.display_name()}] 新告警信号已连接到主页面控制器。")
-        
-        # 5. 设置插件的主UI页面
-        self.page_widget = self.alerts_page_controller.get_view()
-        logging.info(f"[{self.display_name()}] 插件初始化完成。")
+    def _subscribe_config(self):
+        self._rebind_pending = False
+        self._unsubscribe_config = self.context.config_service.subscribe(self._on_config_changed, section=self.name())
+
+    def _read_bind_address(self) -> tuple[str, int]:
+        """从插件配置中读取监听地址和端口，无效时回退到默认值。"""
+        config = self.context.config_service
+        host = config.get_value(self.name(), "host", DEFAULT_HOST)
+        port = config.get_int(self.name(), "port", DEFAULT_PORT)
+        if not 0 < port < 65536:
+            logging.warning(f"[{self.display_name()}] 无效的端口配置 '{port}'，将使用默认端口 {DEFAULT_PORT}。")
+            port = DEFAULT_PORT
+        return host, port
+
+    def _on_config_changed(self, section: str, option: str, old_value, new_value):
+        if option in ("host", "port") and not self._rebind_pending:
+            # host 与 port 往往一起变化，合并为一次重新绑定
+            self._rebind_pending = True
+            QTimer.singleShot(0, self._apply_bind_address)
+
+    def _apply_bind_address(self):
+        self._rebind_pending = False
+        self.alert_receiver.rebind(*self._read_bind_address())
+
+    def _get_int_option(self, key: str, default: int) -> int:
+        """从插件配置中读取一个整数配置项，无效时回退到默认值。"""
+        value_str = self.context.config_service.get_value(self.name(), key, str(default))
+        try:
+            return int(value_str)
+        except (ValueError, TypeError):
+            logging.warning(f"[{self.display_name()}] 无效的 '{key}' 配置 '{value_str}'，将使用默认值 {default}。")
+            return default
+
+    def _create_spike_detector(self) -> RateSpikeDetector | None:
+        """根据插件配置创建告警速率突增检测器。如果配置中禁用了该功能，则返回None。"""
+        config = self.context.config_service
+        plugin = self.name()
+        enabled = config.get_value(plugin, "spike_detection_enabled", str(DEFAULT_SPIKE_DETECTION_ENABLED).lower()).lower() == 'true'
+        if not enabled:
+            logging.info(f"[{self.display_name()}] 告警速率突增检测已禁用。")
+            return None
+        try:
+            detector = RateSpikeDetector(
+                window_seconds=float(config.get_value(plugin, "spike_window_seconds", str(DEFAULT_SPIKE_WINDOW_SECONDS))),
+                sigma=float(config.get_value(plugin, "spike_sigma", str(DEFAULT_SPIKE_SIGMA))),
+                min_count=int(config.get_value(plugin, "spike_min_count", str(DEFAULT_SPIKE_MIN_COUNT))),
+                max_keys=int(config.get_value(plugin, "spike_max_keys", str(DEFAULT_SPIKE_MAX_KEYS))),
+                idle_timeout=float(config.get_value(plugin, "spike_idle_timeout", str(DEFAULT_SPIKE_IDLE_TIMEOUT)))
+            )
+        except (ValueError, TypeError) as e:
+            logging.warning(f"[{self.display_name()}] 突增检测配置无效 ({e})，将使用默认参数。")
+            detector = RateSpikeDetector(
+                window_seconds=DEFAULT_SPIKE_WINDOW_SECONDS,
+                sigma=DEFAULT_SPIKE_SIGMA,
+                min_count=DEFAULT_SPIKE_MIN_COUNT,
+                max_keys=DEFAULT_SPIKE_MAX_KEYS,
+                idle_timeout=DEFAULT_SPIKE_IDLE_TIMEOUT
+            )
+        logging.info(f"[{self.display_name()}] 告警速率突增检测已启用，窗口: {detector.window_seconds:g}秒，阈值: {detector.sigma:g}σ。")
+        return detector
 
     def shutdown(self):
         """
@@ -92,7 +183,13 @@ class AlertCenterPlugin(IFeaturePlugin):
         父类的shutdown方法会处理后台服务的停止。
         """
         logging.info(f"[{self.display_name()}] 插件开始关闭...")
-        if hasattr(self, 'db_service'):
+        if hasattr(self, '_unsubscribe_config'):
+            self._unsubscribe_config()
+        if hasattr(self, 'alert_receiver'):
+            # 先停止接收服务，避免关闭数据库后仍有告警写入；serve_forever 会在一个轮询周期内退出
+            self.alert_receiver.stop()
+            self.alert_receiver.wait(5000)
+        if getattr(self, 'db_service', None):
             self.db_service.close()
             logging.info(f"[{self.display_name()}] 数据库服务已关闭。")
         super().shutdown()
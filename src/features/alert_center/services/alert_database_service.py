@@ -47,6 +47,13 @@ class AlertDatabaseService(AlertCenterDatabaseExtensions, SqlDataService):
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_alerts_severity ON alerts (severity)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_alerts_type ON alerts (type)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_alerts_source_ip ON alerts (source_ip)")
+            # 超长消息的完整内容单独存放，避免膨胀 alerts 主表
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS alert_payloads (
+                    alert_id INTEGER PRIMARY KEY,
+                    full_message TEXT NOT NULL
+                )
+            """)
             self.conn.commit()
             logging.info("数据库表 'alerts' 初始化完成，并创建了索引。")
         except sqlite3.Error as e:
@@ -55,6 +62,7 @@ class AlertDatabaseService(AlertCenterDatabaseExtensions, SqlDataService):
     def add_alert(self, alert_data: Dict[str, Any]) -> None:
         """
         将一条新的告警记录插入到数据库。
+        如果 alert_data 中带有 'full_message'（消息已被截断），完整内容会在同一事务中写入 alert_payloads 表。
         """
         sql = ''' INSERT INTO alerts(timestamp, severity, type, source_ip, message)
                   VALUES(datetime('now', 'localtime'),?,?,?,?) '''
@@ -66,10 +74,32 @@ class AlertDatabaseService(AlertCenterDatabaseExtensions, SqlDataService):
                 alert_data.get('source_ip', 'N/A'),
                 alert_data.get('message', 'N/A')
             ))
+            full_message = alert_data.get('full_message')
+            if full_message is not None:
+                cursor.execute("INSERT OR REPLACE INTO alert_payloads(alert_id, full_message) VALUES(?, ?)",
+                               (cursor.lastrowid, full_message))
             self.conn.commit()
         except sqlite3.Error as e:
             logging.error(f"向数据库插入告警失败: {e}", exc_info=True)
 
+    def get_full_message(self, alert_id: int) -> str | None:
+        """
+        获取告警的完整消息内容。
+        对于被截断的告警返回转存的完整内容，否则返回主表中的 message。
+        """
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute("SELECT full_message FROM alert_payloads WHERE alert_id = ?", (alert_id,))
+            row = cursor.fetchone()
+            if row:
+                return row['full_message']
+            cursor.execute("SELECT message FROM alerts WHERE id = ?", (alert_id,))
+            row = cursor.fetchone()
+            return row['message'] if row else None
+        except sqlite3.Error as e:
+            logging.error(f"查询告警完整消息失败: {e}", exc_info=True)
+            return None
+
     def get_recent_alerts(self, limit: int = 100) -> List[Dict[str, Any]]:
         """
         获取最近的N条告警记录。
@@ -92,6 +122,7 @@ class AlertDatabaseService(AlertCenterDatabaseExtensions, SqlDataService):
         try:
             cursor = self.conn.cursor()
             cursor.execute("DELETE FROM alerts")
+            cursor.execute("DELETE FROM alert_payloads")
             cursor.execute("DELETE FROM sqlite_sequence WHERE name='alerts'")
             self.conn.commit()
             logging.info("数据库'alerts'表中的所有记录已被清除。")
@@ -112,8 +143,10 @@ class AlertDatabaseService(AlertCenterDatabaseExtensions, SqlDataService):
         try:
             cursor = self.conn.cursor()
             cursor.execute(sql, alert_ids)
+            deleted_count = cursor.rowcount
+            cursor.execute(f"DELETE FROM alert_payloads WHERE alert_id IN ({placeholders})", alert_ids)
             self.conn.commit()
-            logging.info(f"成功删除 {cursor.rowcount} 条告警记录。IDs: {alert_ids}")
+            logging.info(f"成功删除 {deleted_count} 条告警记录。IDs: {alert_ids}")
             return True
         except sqlite3.Error as e:
             logging.error(f"删除告警记录失败: {e}", exc_info=True)
@@ -1,12 +1,23 @@
 # desktop_center/src/features/alert_center/services/alert_receiver.py
+import json
+import zlib
 import logging
 import threading
 from PySide6.QtCore import QThread, Signal
-from flask import Flask, request, jsonify
 
 from src.services.config_service import ConfigService
 from src.services.notification_service import NotificationService
 from .alert_database_service import AlertDatabaseService
+from .rate_spike_detector import RateSpikeDetector
+from .request_payload import read_request_body, PayloadTooLargeError, UnsupportedEncodingError
+from ..constants import RATE_SPIKE_ALERT_TYPE, DEFAULT_MAX_BODY_BYTES, DEFAULT_MAX_MESSAGE_LENGTH
+from src.utils.lazy_import import lazy_import
+from src.utils.metrics import metrics
+
+# Flask/werkzeug 在接收线程启动时才导入，不占用界面启动时间
+flask = lazy_import("flask")
+werkzeug_exceptions = lazy_import("werkzeug.exceptions")
+werkzeug_serving = lazy_import("werkzeug.serving")
 
 # 抑制Flask的常规日志输出，只保留错误信息
 log = logging.getLogger('werkzeug')
@@ -18,6 +29,9 @@ SEVERITY_LEVELS = {
     "CRITICAL": 3
 }
 
+_alerts_ingested = metrics.counter("alert_center.alerts_ingested", "已接收并入库的告警数（含突增元告警）")
+_insert_ms = metrics.histogram("alert_center.insert_ms", "单条告警写入数据库的耗时")
+
 class AlertReceiverThread(QThread):
     """
     将Flask Web服务封装在Qt线程中，作为告警中心插件的私有服务。
@@ -25,7 +39,8 @@ class AlertReceiverThread(QThread):
     """
     new_alert_received = Signal(dict)
 
-    def __init__(self, config_service: ConfigService, db_service: AlertDatabaseService, notification_service: NotificationService, host: str, port: int, plugin_name: str, parent=None):
+    def __init__(self, config_service: ConfigService, db_service: AlertDatabaseService, notification_service: NotificationService, host: str, port: int, plugin_name: str, spike_detector: RateSpikeDetector = None,
+                 max_body_bytes: int = DEFAULT_MAX_BODY_BYTES, max_message_length: int = DEFAULT_MAX_MESSAGE_LENGTH, parent=None):
         """
         初始化告警接收器。
 
@@ -36,6 +51,9 @@ class AlertReceiverThread(QThread):
             host (str): Flask服务监听的主机地址。
             port (int): Flask服务监听的端口。
             plugin_name (str): 插件的内部名称，用于访问配置。
+            spike_detector (RateSpikeDetector, optional): 告警速率突增检测器。为None时不做突增检测。
+            max_body_bytes (int, optional): 请求体（压缩前与解压后）允许的最大字节数。
+            max_message_length (int, optional): 存入主表的 message 最大字符数，超出部分转存到独立的负载表。
             parent (QObject, optional): 父对象。
         """
         super().__init__(parent)
@@ -45,49 +63,120 @@ class AlertReceiverThread(QThread):
         self.notification_service = notification_service
         self.host = host
         self.port = port
+        self.spike_detector = spike_detector
+        self.max_body_bytes = max_body_bytes
+        self.max_message_length = max_message_length
         self.running = False
         
-        self.flask_app = Flask(__name__)
-        self.flask_app.route('/alert', methods=['POST'])(self.receive_alert)
+        # Flask 应用在 run() 中（即接收线程内）创建
+        self.flask_app = None
+        # 【新增】当前的 WSGI 服务器。更换监听地址时关闭它，由 run() 以新地址重新创建
+        self._server = None
+        self._server_lock = threading.Lock()
+
+    def _create_flask_app(self):
+        """创建 Flask 应用并注册路由。"""
+        flask_app = flask.Flask(__name__)
+        # 限制线路上（压缩状态下）的请求体大小，解压后的大小由 read_request_body 单独限制
+        flask_app.config['MAX_CONTENT_LENGTH'] = self.max_body_bytes
+        flask_app.route('/alert', methods=['POST'])(self.receive_alert)
+        return flask_app
 
     def receive_alert(self):
         """处理/alert端点的核心逻辑。"""
+        request, jsonify = flask.request, flask.jsonify
         try:
             client_ip = request.remote_addr
-            data = request.get_json()
-            if not data:
+            try:
+                body = read_request_body(request.stream, request.headers.get('Content-Encoding'), self.max_body_bytes)
+                data = json.loads(body) if body else None
+            except (PayloadTooLargeError, werkzeug_exceptions.RequestEntityTooLarge):
+                logging.warning(f"Rejected oversized payload from {client_ip} (limit: {self.max_body_bytes} bytes)")
+                return jsonify({"status": "error", "message": "Payload too large"}), 413
+            except UnsupportedEncodingError as e:
+                logging.warning(f"Rejected payload from {client_ip}: {e}")
+                return jsonify({"status": "error", "message": "Unsupported Content-Encoding"}), 415
+            except (zlib.error, UnicodeDecodeError, ValueError) as e:
+                logging.warning(f"Received undecodable payload from {client_ip}: {e}")
+                data = None
+            # 【新增】支持批量推送：请求体可以是单个告警对象，也可以是告警对象数组
+            items = data if isinstance(data, list) else [data]
+            if not data or not all(item and isinstance(item, dict) for item in items):
                 logging.warning(f"Received invalid or empty JSON from {client_ip}")
                 return jsonify({"status": "error", "message": "Invalid JSON"}), 400
 
-            raw_severity = data.get('severity', 'INFO').upper()
-            severity = raw_severity if raw_severity in SEVERITY_LEVELS else 'INFO'
-            
-            alert_data = {
-                'source_ip': client_ip,
-                'type': data.get('type', 'Generic Alert'),
-                'message': data.get('message', 'No message provided.'),
-                'severity': severity
-            }
-
-            log_message = f"ALERT from {alert_data['source_ip']} | Severity: {alert_data['severity']} | Type: {alert_data['type']}"
-            logging.info(log_message)
-
-            # 1. 将告警写入共享的数据库服务
-            self.db_service.add_alert(alert_data)
-            logging.info(f"告警已存入数据库。")
-            
-            # 2. 发射信号通知插件内部的控制器
-            self.new_alert_received.emit(alert_data)
-            
-            # 3. 通过共享的通知服务触发桌面通知
-            self.trigger_desktop_notification(alert_data)
+            for item in items:
+                self._handle_alert(item, client_ip)
 
-            return jsonify({"status": "success", "message": "Alert received"}), 200
+            message = "Alert received" if len(items) == 1 else f"{len(items)} alerts received"
+            return jsonify({"status": "success", "message": message}), 200
 
         except Exception as e:
             logging.error(f"处理告警请求时出错: {e}", exc_info=True)
             return jsonify({"status": "error", "message": "Internal server error"}), 500
 
+    def _handle_alert(self, data: dict, client_ip: str):
+        """规范化单条告警并送入处理链路。"""
+        raw_severity = str(data.get('severity', 'INFO')).upper()
+        severity = raw_severity if raw_severity in SEVERITY_LEVELS else 'INFO'
+
+        alert_data = {
+            'source_ip': client_ip,
+            'type': data.get('type', 'Generic Alert'),
+            'message': data.get('message', 'No message provided.'),
+            'severity': severity
+        }
+        self._truncate_message(alert_data)
+
+        self._ingest_alert(alert_data)
+
+        # 在线突增检测，若命中则通过同一条处理链路发出一条合成的 CRITICAL 元告警
+        if self.spike_detector:
+            spike = self.spike_detector.observe(alert_data['type'], alert_data['source_ip'])
+            if spike:
+                self._ingest_alert(self._build_spike_alert(spike))
+
+    def _truncate_message(self, alert_data: dict):
+        """
+        将超长的 message 截断后存入主表，完整内容通过 'full_message' 键交给数据库服务转存，
+        避免单条巨大告警膨胀 alerts 表和UI表格。
+        """
+        message = str(alert_data['message'])
+        if self.max_message_length <= 0 or len(message) <= self.max_message_length:
+            return
+        alert_data['full_message'] = message
+        alert_data['message'] = f"{message[:self.max_message_length]}…[已截断，完整内容共 {len(message)} 字符]"
+        logging.info(f"告警消息长度 {len(message)} 超过上限 {self.max_message_length}，已截断，完整内容将单独存储。")
+
+    def _ingest_alert(self, alert_data: dict):
+        """告警的标准处理链路：入库、通知控制器、触发桌面通知。"""
+        # 告警接收是热点路径：使用 % 占位参数，级别未启用时不做字符串拼接
+        logging.info("ALERT from %s | Severity: %s | Type: %s", alert_data['source_ip'], alert_data['severity'], alert_data['type'])
+
+        # 1. 将告警写入共享的数据库服务
+        _alerts_ingested.inc()
+        with _insert_ms.time():
+            self.db_service.add_alert(alert_data)
+        logging.debug("告警已存入数据库。")
+        
+        # 2. 发射信号通知插件内部的控制器
+        self.new_alert_received.emit(alert_data)
+        
+        # 3. 通过共享的通知服务触发桌面通知
+        self.trigger_desktop_notification(alert_data)
+
+    def _build_spike_alert(self, spike: dict) -> dict:
+        """根据突增检测结果构造一条合成的 CRITICAL 元告警。"""
+        logging.warning(f"检测到告警速率突增: type='{spike['type']}', source_ip={spike['source_ip']}, "
+                        f"{spike['window_seconds']:g}秒内 {spike['count']} 条 (基线 {spike['baseline']}, 阈值 {spike['threshold']})")
+        return {
+            'source_ip': spike['source_ip'],
+            'type': RATE_SPIKE_ALERT_TYPE,
+            'message': (f"告警类型 '{spike['type']}' 速率突增: {spike['window_seconds']:g} 秒内收到 {spike['count']} 条，"
+                        f"基线 {spike['baseline']} 条/窗口，阈值 {spike['threshold']}。"),
+            'severity': 'CRITICAL'
+        }
+
     def trigger_desktop_notification(self, alert_data: dict):
         """
         【核心重构点】
@@ -106,13 +195,12 @@ class AlertReceiverThread(QThread):
             current_level = SEVERITY_LEVELS.get(alert_data['severity'], SEVERITY_LEVELS["INFO"])
             
             if current_level < threshold_level:
-                logging.info(f"信息等级 '{alert_data['severity']}' 低于阈值 '{threshold_str}'，已跳过弹窗通知。")
+                logging.debug("信息等级 '%s' 低于阈值 '%s'，已跳过弹窗通知。", alert_data['severity'], threshold_str)
                 return
 
             # 2. 读取本插件的弹窗开关和超时设置，用于覆盖全局设置
-            enable_popup_override = config.get_value(plugin, "enable_desktop_popup", "true").lower() == 'true'
-            timeout_override_str = config.get_value(plugin, "popup_timeout", "10")
-            timeout_override = int(timeout_override_str) if timeout_override_str.isdigit() else 10
+            enable_popup_override = config.get_bool(plugin, "enable_desktop_popup", True)
+            timeout_override = config.get_int(plugin, "popup_timeout", 10)
 
             notification_title = f"[{alert_data['severity']}] 监控告警: {alert_data['source_ip']}"
             notification_message = f"类型: {alert_data['type']}\n详情: {alert_data['message']}"
@@ -129,17 +217,67 @@ class AlertReceiverThread(QThread):
             # 错误日志已在 NotificationService 内部记录，此处仅记录上下文
             logging.error(f"调用共享通知服务时发生错误: {e}")
 
-    def run(self):
-        """线程启动时执行的函数。"""
+    def start(self, *args):
+        # 在线程真正运行前置位，确保紧随 start() 之后的 stop() 不会被 run() 覆盖
         self.running = True
+        super().start(*args)
+
+    def run(self):
+        """
+        线程启动时执行的函数。
+        服务器被 rebind() 关闭后会以新的监听地址重新创建，直到 stop() 被调用。
+        """
         try:
             thread_id = threading.get_ident()
-            logging.info(f"Flask Web服务正在线程 {thread_id} 中启动，监听 {self.host}:{self.port}...")
-            # 在生产环境中，建议使用 waitress 或 gunicorn 等WSGI服务器
-            self.flask_app.run(host=self.host, port=self.port, debug=False)
+            self.flask_app = self._create_flask_app()
+            while self.running:
+                host, port = self.host, self.port
+                logging.info(f"Flask Web服务正在线程 {thread_id} 中启动，监听 {host}:{port}...")
+                # 在生产环境中，建议使用 waitress 或 gunicorn 等WSGI服务器
+                server = werkzeug_serving.make_server(host, port, self.flask_app, threaded=True)
+                with self._server_lock:
+                    self._server = server
+                if not self.running:
+                    # stop() 发生在服务器创建期间，此时它还看不到服务器，由这里负责关闭
+                    with self._server_lock:
+                        self._server = None
+                    server.server_close()
+                    break
+                try:
+                    server.serve_forever()
+                finally:
+                    with self._server_lock:
+                        self._server = None
+                    server.server_close()
         except Exception as e:
             # 捕获端口占用等启动错误
             logging.critical(f"Flask Web服务线程发生严重错误，可能无法启动: {e}", exc_info=True)
         finally:
             self.running = False
-            logging.info("Flask Web服务线程已停止。")
\ No newline at end of file
+            logging.info("Flask Web服务线程已停止。")
+
+    def rebind(self, host: str, port: int):
+        """
+        【新增】在不重启应用的情况下更换监听地址。
+        关闭当前服务器，接收线程随后以新地址重新监听；线程未运行（例如之前端口被占用）时重新启动线程。
+        """
+        if (host, port) == (self.host, self.port) and self.isRunning():
+            return
+        logging.info(f"告警接收服务的监听地址变更: {self.host}:{self.port} -> {host}:{port}")
+        self.host, self.port = host, port
+        if not self.isRunning():
+            self.start()
+            return
+        self._shutdown_server()
+
+    def stop(self):
+        """【新增】停止接收服务（不等待线程结束）。"""
+        self.running = False
+        self._shutdown_server()
+
+    def _shutdown_server(self):
+        with self._server_lock:
+            server = self._server
+        if server is not None:
+            # shutdown() 会阻塞到 serve_forever() 退出（最长一个轮询周期），放到后台线程中执行，避免卡住GUI
+            threading.Thread(target=server.shutdown, name="AlertServerShutdown", daemon=True).start()
\ No newline at end of file
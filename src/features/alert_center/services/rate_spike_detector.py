@@ -0,0 +1,148 @@
+# desktop_center/src/features/alert_center/services/rate_spike_detector.py
+import math
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+# 对连续空窗口做衰减时的最大折叠次数。
+# 超过这个次数后 EWMA 已基本衰减到 0，继续循环没有意义，同时保证单次调用的开销有上界。
+_MAX_IDLE_FOLDS = 32
+
+
+class _KeyState:
+    """单个 (type, source_ip) 键的在线统计状态。"""
+    __slots__ = ("bucket", "count", "mean", "var", "samples", "last_seen", "fired_bucket")
+
+    def __init__(self, bucket: int, now: float):
+        self.bucket = bucket          # 当前时间窗口的序号
+        self.count = 0                # 当前窗口内已观测到的告警数
+        self.mean = 0.0               # 历史窗口计数的 EWMA 均值
+        self.var = 0.0                # 历史窗口计数的 EWMA 方差
+        self.samples = 0              # 已折叠进 EWMA 的窗口数量（用于预热判断）
+        self.last_seen = now          # 最近一次观测的时间，用于空闲淘汰
+        self.fired_bucket = -1        # 最近一次触发突增的窗口序号，防止同一窗口重复告警
+
+
+class RateSpikeDetector:
+    """
+    在线告警速率突增检测器。
+
+    按 (type, source_ip) 将告警划分到固定长度的时间窗口中计数，
+    每当窗口滚动时，把已结束窗口的计数折叠进 EWMA 均值/方差；
+    当前窗口计数超过 `均值 + sigma * 标准差` 时判定为突增。
+
+    - 每条告警的处理开销为 O(1)（空窗口衰减的折叠次数有固定上限）。
+    - 状态数量受 `max_keys` 约束，超出时淘汰最久未出现的键；
+      空闲超过 `idle_timeout` 秒的键会在后续观测中被顺带淘汰。
+    - 线程安全：Flask 开发服务器会在多个线程中并发处理请求。
+    """
+    def __init__(self, window_seconds: float = 10.0, alpha: float = 0.3, sigma: float = 3.0,
+                 min_count: int = 10, warmup_windows: int = 3, max_keys: int = 1000,
+                 idle_timeout: float = 600.0, clock=time.monotonic):
+        """
+        Args:
+            window_seconds (float): 计数窗口长度（秒）。
+            alpha (float): EWMA 平滑系数，取值 (0, 1]，越大越关注近期窗口。
+            sigma (float): 判定突增所需超出均值的标准差倍数。
+            min_count (int): 触发突增所需的窗口内最小告警数，避免低流量下的误报。
+            warmup_windows (int): 键至少经历多少个完整窗口后才开始检测。
+            max_keys (int): 同时跟踪的最大键数量。
+            idle_timeout (float): 键空闲多少秒后被淘汰。
+            clock (callable): 单调时钟函数，便于测试时注入。
+        """
+        self.window_seconds = max(float(window_seconds), 0.001)
+        self.alpha = min(max(float(alpha), 0.01), 1.0)
+        self.sigma = max(float(sigma), 0.0)
+        self.min_count = max(int(min_count), 1)
+        self.warmup_windows = max(int(warmup_windows), 0)
+        self.max_keys = max(int(max_keys), 1)
+        self.idle_timeout = max(float(idle_timeout), self.window_seconds)
+        self._clock = clock
+        self._states: "OrderedDict[Tuple[str, str], _KeyState]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def observe(self, alert_type: str, source_ip: str) -> Optional[Dict[str, Any]]:
+        """
+        记录一条告警，并判断其所属键是否出现速率突增。
+
+        Args:
+            alert_type (str): 告警类型。
+            source_ip (str): 告警来源IP。
+
+        Returns:
+            Optional[Dict[str, Any]]: 检测到突增时返回描述信息
+                (type, source_ip, count, baseline, threshold, window_seconds)，否则返回 None。
+        """
+        now = self._clock()
+        bucket = int(now // self.window_seconds)
+        key = (alert_type, source_ip)
+
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                if len(self._states) >= self.max_keys:
+                    evicted_key, _ = self._states.popitem(last=False)
+                    logging.debug("[RateSpikeDetector] 跟踪键数量达到上限 %s，已淘汰最久未活动的键: %s", self.max_keys, evicted_key)
+                state = _KeyState(bucket, now)
+                self._states[key] = state
+            else:
+                self._states.move_to_end(key)
+                if bucket != state.bucket:
+                    self._roll(state, bucket)
+
+            state.count += 1
+            state.last_seen = now
+            self._evict_idle(now)
+
+            if state.samples < self.warmup_windows or state.fired_bucket == bucket:
+                return None
+
+            std = math.sqrt(state.var) if state.var > 0 else 0.0
+            threshold = max(state.mean + self.sigma * std, float(self.min_count))
+            if state.count <= threshold:
+                return None
+
+            state.fired_bucket = bucket
+            return {
+                "type": alert_type,
+                "source_ip": source_ip,
+                "count": state.count,
+                "baseline": round(state.mean, 2),
+                "threshold": round(threshold, 2),
+                "window_seconds": self.window_seconds,
+            }
+
+    def _roll(self, state: _KeyState, bucket: int) -> None:
+        """把已结束窗口（以及其后的空窗口）折叠进 EWMA，并切换到新窗口。"""
+        self._fold(state, state.count)
+        idle_windows = min(bucket - state.bucket - 1, _MAX_IDLE_FOLDS)
+        for _ in range(max(idle_windows, 0)):
+            self._fold(state, 0)
+        state.bucket = bucket
+        state.count = 0
+
+    def _fold(self, state: _KeyState, value: int) -> None:
+        """增量更新 EWMA 均值与方差。"""
+        if state.samples == 0:
+            state.mean = float(value)
+            state.var = 0.0
+        else:
+            diff = value - state.mean
+            increment = self.alpha * diff
+            state.mean += increment
+            state.var = (1 - self.alpha) * (state.var + diff * increment)
+        state.samples += 1
+
+    def _evict_idle(self, now: float) -> None:
+        """从最久未活动的一端淘汰空闲键。摊还开销为 O(1)。"""
+        deadline = now - self.idle_timeout
+        while self._states:
+            oldest_key, oldest_state = next(iter(self._states.items()))
+            if oldest_state.last_seen >= deadline:
+                break
+            del self._states[oldest_key]
@@ -0,0 +1,81 @@
+# desktop_center/src/features/alert_center/services/request_payload.py
+"""
+告警请求体的解码工具。
+
+支持 `Content-Encoding: gzip / deflate / identity`，以流式方式分块读取和解压，
+并在解压过程中强制执行最大字节数限制，避免“压缩炸弹”一次性占满内存。
+"""
+import zlib
+from typing import BinaryIO
+
+# 每次从请求流读取的块大小
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class PayloadTooLargeError(ValueError):
+    """请求体（解压后）超过了允许的最大字节数。"""
+    pass
+
+
+class UnsupportedEncodingError(ValueError):
+    """请求使用了不支持的 Content-Encoding。"""
+    pass
+
+
+def _create_decompressor(encoding: str, first_chunk: bytes):
+    """根据编码类型创建 zlib 解压器。"""
+    if encoding in ("gzip", "x-gzip"):
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    # deflate: 标准要求带 zlib 头，但不少客户端发送的是裸 deflate 流，这里根据头部自动识别
+    if len(first_chunk) >= 2 and (first_chunk[0] & 0x0F) == 8 and ((first_chunk[0] << 8) | first_chunk[1]) % 31 == 0:
+        return zlib.decompressobj(zlib.MAX_WBITS)
+    return zlib.decompressobj(-zlib.MAX_WBITS)
+
+
+def read_request_body(stream: BinaryIO, content_encoding: str, max_bytes: int) -> bytes:
+    """
+    从请求流中读取并（按需）解压请求体。
+
+    Args:
+        stream (BinaryIO): 请求的原始输入流（如 Flask 的 `request.stream`）。
+        content_encoding (str): 请求头中的 Content-Encoding，可为空。
+        max_bytes (int): 解压后允许的最大字节数。
+
+    Returns:
+        bytes: 解压后的请求体。
+
+    Raises:
+        PayloadTooLargeError: 解压后的内容超过 `max_bytes`。
+        UnsupportedEncodingError: Content-Encoding 不受支持。
+        zlib.error: 压缩数据损坏。
+    """
+    encoding = (content_encoding or "identity").strip().lower()
+    if encoding not in ("identity", "gzip", "x-gzip", "deflate"):
+        raise UnsupportedEncodingError(f"不支持的 Content-Encoding: {content_encoding}")
+
+    output = bytearray()
+    decompressor = None
+    while True:
+        chunk = stream.read(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        if encoding == "identity":
+            output += chunk
+        else:
+            if decompressor is None:
+                decompressor = _create_decompressor(encoding, chunk)
+            # 通过 max_length 限制每次解压的输出量，剩余的输入留在 unconsumed_tail 中继续处理
+            data = chunk
+            while data:
+                output += decompressor.decompress(data, max_bytes - len(output) + 1)
+                if len(output) > max_bytes:
+                    break
+                data = decompressor.unconsumed_tail
+        if len(output) > max_bytes:
+            raise PayloadTooLargeError(f"请求体超过了最大允许的 {max_bytes} 字节。")
+
+    if decompressor is not None:
+        output += decompressor.flush()
+        if len(output) > max_bytes:
+            raise PayloadTooLargeError(f"请求体超过了最大允许的 {max_bytes} 字节。")
+    return bytes(output)
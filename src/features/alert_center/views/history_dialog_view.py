@@ -16,6 +16,7 @@ class HistoryDialogView(QDialog):
     sort_requested = Signal(int)
     delete_alerts_requested = Signal(list)
     export_requested = Signal()
+    full_message_requested = Signal(int)
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -161,9 +162,18 @@ class HistoryDialogView(QDialog):
     def _show_full_message(self):
         row = self.table.currentRow()
         if row >= 0:
-            item = self.table.item(row, 5)
-            if item:
-                QMessageBox.information(self, "详细内容", item.text())
+            id_item = self.table.item(row, 0)
+            try:
+                # 由控制器从数据库获取完整内容（超长消息在表格中只保存了截断后的版本）
+                self.full_message_requested.emit(int(id_item.text()))
+            except (AttributeError, ValueError):
+                item = self.table.item(row, 5)
+                if item:
+                    self.show_full_message(item.text())
+
+    def show_full_message(self, message: str):
+        """[SLOT] 以对话框形式显示完整的消息内容。"""
+        QMessageBox.information(self, "详细内容", message)
 
     def _show_context_menu(self, pos: QPoint):
         index = self.table.indexAt(pos)
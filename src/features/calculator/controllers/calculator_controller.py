@@ -23,7 +23,7 @@ class CalculatorController(QObject):
 
     def _handle_button_click(self, button_text: str):
         """处理计算器按钮点击事件。"""
-        logging.debug(f"CalculatorController: 按钮 '{button_text}' 被点击。")
+        logging.debug("CalculatorController: 按钮 '%s' 被点击。", button_text)
         if button_text == "=":
             self.model.calculate_result()
         elif button_text == "C":
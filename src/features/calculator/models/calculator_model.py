@@ -41,7 +41,7 @@ class CalculatorModel(QObject):
             self.delete_last_char()
         else:
             self._current_expression += value
-        logging.debug(f"CalculatorModel: 追加输入 '{value}', 当前表达式: '{self._current_expression}'")
+        logging.debug("CalculatorModel: 追加输入 '%s', 当前表达式: '%s'", value, self._current_expression)
 
     def calculate_result(self):
         """计算当前表达式的结果并更新历史记录。"""
@@ -90,7 +90,7 @@ class CalculatorModel(QObject):
         self._current_expression = self._current_expression[:-1]
         if not self._current_expression:
             self._current_result = "0" # 如果表达式为空，结果显示0
-        logging.debug(f"CalculatorModel: 删除最后一个字符，当前表达式: '{self._current_expression}'")
+        logging.debug("CalculatorModel: 删除最后一个字符，当前表达式: '%s'", self._current_expression)
 
     def clear_history(self):
         """清空历史记录。"""
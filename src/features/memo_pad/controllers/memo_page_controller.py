@@ -20,6 +20,8 @@ class MemoPageController:
         self.plugin_name = plugin_name
         self._current_memo_id = None
         self.current_view_mode = 1 # 0: list, 1: split, 2: editor
+        self.memos = []
+        self._load_future = None
         
         # 设置自动保存计时器
         self.auto_save_timer = QTimer()
@@ -53,9 +55,41 @@ class MemoPageController:
         self.view.content_text_edit.textChanged.connect(self.on_text_changed)
 
     def load_memos(self):
-        """从数据库加载所有备忘录并更新列表。"""
-        self.memos = self.db_service.get_all_memos()
+        """
+        从数据库加载所有备忘录并更新列表。
+        优先通过平台的异步数据库执行器在后台线程读取，避免慢磁盘阻塞界面。
+        """
+        executor = getattr(self.context, 'db_executor', None)
+        if executor is None:
+            self.memos = self.db_service.get_all_memos()
+            self.filter_memos()
+            return
+
+        # 取消上一次尚未开始的加载，例如快速切换数据库时
+        if self._load_future is not None:
+            self._load_future.cancel()
+        future = executor.submit(self.db_service.db_path, MemoDatabaseService.fetch_all_memos)
+        self._load_future = future
+        future.add_done_callback(self._on_memos_loaded)
+
+    def _on_memos_loaded(self, future):
+        """异步加载完成的回调（在GUI线程中执行）。"""
+        if future is not self._load_future or future.cancelled():
+            return  # 已被更新的加载请求取代
+        self._load_future = None
+        if future.exception() is not None:
+            logging.error(f"Failed to load memos: {future.exception()}")
+            self.view.status_label.setText("加载备忘录失败")
+            return
+
+        loaded = future.result()
+        # 保留加载期间在界面上新建/修改、但未包含在查询结果中的备忘录
+        loaded_ids = {memo.id for memo in loaded}
+        pending = [memo for memo in self.memos if memo.id not in loaded_ids]
+        self.memos = sorted(pending + loaded, key=lambda m: m.updated_at, reverse=True)
         self.filter_memos()
+        if self._current_memo_id is not None:
+            self.view.select_item_by_id(self._current_memo_id)
 
     def new_memo(self):
         """立即创建一个新的空备忘录并选中它。"""
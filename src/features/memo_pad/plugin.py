@@ -25,16 +25,13 @@ class MemoPadPlugin(IFeaturePlugin):
         """返回插件的加载优先级。"""
         return 100
 
-    def initialize(self, context: ApplicationContext):
-        """初始化插件，连接MVC组件。"""
-        super().initialize(context)
-        
-        logging.info(f"Plugin '{self.name()}' is initializing...")
-
+    def prepare(self, context: ApplicationContext):
+        """准备阶段（后台线程）：打开并验证备忘录数据库。"""
+        self.db_service = None
         # 使用重构后的通用数据源初始化服务
-        # 注意：返回的是一个包装过的服务实例，需要通过 .db_service 访问原始的 MemoDatabaseService
-        generic_service = self.context.initializer.initialize(
-            context=self.context,
+        # 注意：返回的是一个包装过的服务实例，需要通过 .load_data() 获取原始的 MemoDatabaseService
+        generic_service = context.initializer.initialize(
+            context=context,
             plugin_name=self.name(),
             config_section=self.name(),
             config_key="db_path",
@@ -42,18 +39,23 @@ class MemoPadPlugin(IFeaturePlugin):
             data_type=DataType.SQLITE,  # 明确指定数据类型
             db_service_class=MemoDatabaseService  # 传入特定的数据库服务类
         )
+        if generic_service:
+            self.db_service = generic_service.load_data()
 
-        # 如果初始化失败，则插件不加载
-        if not generic_service:
-            logging.error(f"Plugin '{self.name()}' could not be initialized due to a data source error.")
-            return
+    def initialize(self, context: ApplicationContext):
+        """初始化插件，连接MVC组件。"""
+        super().initialize(context)
         
-        db_service = generic_service.load_data()
+        logging.info(f"Plugin '{self.name()}' is initializing...")
 
+        # 如果数据源初始化失败，则插件不加载
+        if not self.db_service:
+            logging.error(f"Plugin '{self.name()}' could not be initialized due to a data source error.")
+            return
 
         # 初始化视图和控制器
         self.page_widget = MemoPageView()
-        self.controller = MemoPageController(self.page_widget, db_service, self.context, self.name())
+        self.controller = MemoPageController(self.page_widget, self.db_service, self.context, self.name())
         logging.info(f"Plugin '{self.name()}' initialized successfully.")
 
     def get_page_widget(self):
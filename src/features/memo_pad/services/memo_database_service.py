@@ -54,16 +54,23 @@ class MemoDatabaseService(SqlDataService):
         """获取所有的备忘录。"""
         if not self.conn: return []
         with self.conn as conn:
-            cursor = conn.cursor()
-            cursor.execute(f"SELECT * FROM {self.TABLE_NAME} ORDER BY updated_at DESC")
-            rows = cursor.fetchall()
-            memos = []
-            for row in rows:
-                row_dict = dict(row)
-                row_dict['created_at'] = datetime.fromisoformat(row_dict['created_at'])
-                row_dict['updated_at'] = datetime.fromisoformat(row_dict['updated_at'])
-                memos.append(Memo(**row_dict))
-            return memos
+            return self.fetch_all_memos(conn)
+
+    @classmethod
+    def fetch_all_memos(cls, conn: sqlite3.Connection) -> List[Memo]:
+        """
+        使用给定的连接读取所有备忘录。
+        不依赖实例状态，可直接提交给异步数据库执行器，在其工作线程的专属连接上运行。
+        """
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT * FROM {cls.TABLE_NAME} ORDER BY updated_at DESC")
+        memos = []
+        for row in cursor.fetchall():
+            row_dict = dict(row)
+            row_dict['created_at'] = datetime.fromisoformat(row_dict['created_at'])
+            row_dict['updated_at'] = datetime.fromisoformat(row_dict['updated_at'])
+            memos.append(Memo(**row_dict))
+        return memos
 
     def update_memo(self, memo_id: int, title: str, content: str) -> Optional[Memo]:
         """更新一条备忘录。"""
@@ -1,12 +1,13 @@
 # src/features/multidim_table/controllers/multidim_table_controller.py
+from __future__ import annotations
 import os
-import pandas as pd
 import sys
 import logging
 import shutil # 新增导入
 from PySide6.QtCore import QObject, QTimer
 from PySide6.QtWidgets import QFileDialog
 from src.core.context import ApplicationContext
+from src.utils.lazy_import import lazy_import
 from src.services.sqlite_base_service import SqlDataService, SchemaType
 from src.services.data_source_switch_service import DataSourceSwitchService
 from src.services.data_source_initializer import DataSourceInitializerService
@@ -17,6 +18,8 @@ from src.features.multidim_table.views.table_designer_view import TableDesignerV
 from src.features.multidim_table.views.add_data_dialog import AddDataDialog
 from src.features.multidim_table.views.statistics_tab_view import StatisticsTabView # 导入新的统计标签页视图
 
+pd = lazy_import("pandas")
+
 class MultidimTableController(QObject):
     """
     多维表格的控制器，负责协调模型和所有视图。![1752058308567](images/multidim_table_controller/1752058308567.png)![1752058310795](images/multidim_table_controller/1752058310795.png)![1752058326203](images/multidim_table_controller/1752058326203.png)![1752058332085](images/multidim_table_controller/1752058332085.png)
@@ -117,7 +120,7 @@ class MultidimTableController(QObject):
         else:
             # 保存成功连接的路径到 config.ini
             self.context.config_service.set_option(self.plugin_name, "last_db_path", db_path)
-            self.context.config_service.save_config()
+            self.context.config_service.schedule_save()
 
     def _on_open_db(self):
         """处理打开数据库的请求，使用 DataSourceSwitchService。"""
@@ -1,7 +1,10 @@
 # src/features/multidim_table/models/multidim_table_model.py
-import pandas as pd
-import sqlite3
+from __future__ import annotations
 from PySide6.QtCore import QObject, Signal
+from src.services.sqlite_base_service import connect_database
+from src.utils.lazy_import import lazy_import
+
+pd = lazy_import("pandas")
 
 class MultidimTableModel(QObject):
     """
@@ -29,7 +32,7 @@ class MultidimTableModel(QObject):
             if self.conn:
                 self.conn.close()
             
-            self.conn = sqlite3.connect(db_path, check_same_thread=False)
+            self.conn = connect_database(db_path, check_same_thread=False)
             self.db_path = db_path
             self.db_connection_changed.emit(db_path)
             self.tables_changed.emit() # 触发刷新表列表
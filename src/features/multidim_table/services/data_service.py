@@ -1,9 +1,12 @@
 # src/features/multidim_table/services/data_service.py
-import pandas as pd
+from __future__ import annotations
 import json
 import os
+from src.utils.lazy_import import lazy_import
 from src.features.multidim_table.models.multidim_table_model import MultidimTableModel
 
+pd = lazy_import("pandas")
+
 class DataService:
     """
     服务层，封装了多维表格的核心业务逻辑。
@@ -5,8 +5,10 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtGui import QStandardItemModel, QStandardItem, QAction, QGuiApplication
 from PySide6.QtCore import Signal, Qt, QSortFilterProxyModel
-import pandas as pd
 import re
+from src.utils.lazy_import import lazy_import
+
+pd = lazy_import("pandas")
 
 class RowNumberProxyModel(QSortFilterProxyModel):
     """一个自定义的代理模型，以确保垂直表头始终显示正确的行号。"""
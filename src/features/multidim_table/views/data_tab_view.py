@@ -6,9 +6,11 @@ from PySide6.QtWidgets import (
 from PySide6.QtGui import QStandardItemModel, QStandardItem, QAction, QGuiApplication
 from PySide6.QtCore import Signal, Qt, QSortFilterProxyModel
 import os
-import pandas as pd
+from src.utils.lazy_import import lazy_import
 from src.features.multidim_table.widgets.custom_delegate import CustomItemDelegate
 
+pd = lazy_import("pandas")
+
 class RowNumberProxyModel(QSortFilterProxyModel):
     """一个自定义的代理模型，以确保垂直表头始终显示正确的行号。"""
     def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole):
@@ -1,15 +1,19 @@
 # src/features/multidim_table/views/statistics_tab_view.py
+from __future__ import annotations
 from PySide6.QtWidgets import QVBoxLayout, QWidget, QTableView, QHeaderView, QPushButton, QHBoxLayout, QLabel, QSizePolicy
 from PySide6.QtCore import QAbstractTableModel, Qt, QModelIndex
-import pandas as pd
+from src.utils.lazy_import import lazy_import
+
+pd = lazy_import("pandas")
 
 class PandasTableModel(QAbstractTableModel):
     """
     一个用于将 Pandas DataFrame 显示在 QTableView 中的模型。
     """
-    def __init__(self, dataframe: pd.DataFrame = pd.DataFrame(), parent=None):
+    def __init__(self, dataframe: pd.DataFrame = None, parent=None):
         super().__init__(parent)
-        self._dataframe = dataframe
+        # 默认值不能写成 pd.DataFrame()，否则定义类时就会触发 pandas 导入
+        self._dataframe = dataframe if dataframe is not None else pd.DataFrame()
 
     def rowCount(self, parent=QModelIndex()):
         return self._dataframe.shape[0]
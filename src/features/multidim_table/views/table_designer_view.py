@@ -1,9 +1,10 @@
+from __future__ import annotations
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QTabWidget, QWidget,
     QMessageBox, QStatusBar, QComboBox, QHBoxLayout, QLabel
 )
 from PySide6.QtCore import Signal, Qt, QSettings
-import pandas as pd # 导入 pandas
+from src.utils.lazy_import import lazy_import
 
 # 导入新的标签视图
 from .data_tab_view import DataTabView
@@ -11,6 +12,8 @@ from .structure_tab_view import StructureTabView
 from .analysis_tab_view import AnalysisTabView
 from .statistics_tab_view import StatisticsTabView
 
+pd = lazy_import("pandas")
+
 class TableDesignerView(QDialog):
     """
     一个用于设计表结构和编辑表数据的对话框。
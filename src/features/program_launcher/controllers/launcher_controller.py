@@ -103,6 +103,7 @@ class LauncherController(QObject):
             QMessageBox.warning(self.view, "启动失败", "程序路径不存在或已被移动，请编辑或删除此条目。")
             return
 
+        launches = self.context.metrics.counter("program_launcher.launches", "程序启动次数")
         try:
             run_as_admin = program.get('run_as_admin', False)
             
@@ -115,6 +116,7 @@ class LauncherController(QObject):
                         None, "runas", program_path, None, None, 1
                     )
                     if result > 32:
+                        launches.inc()
                         self.context.notification_service.show(
                             title="程序已启动", message=f"'{program_name}' 正在以管理员权限启动。"
                         )
@@ -127,6 +129,7 @@ class LauncherController(QObject):
                 else:
                     logging.info(f"Attempting to launch '{program_name}' with normal rights.")
                     os.startfile(program_path)
+                    launches.inc()
                     self.context.notification_service.show(
                         title="程序已启动", message=f"'{program_name}' 正在启动。"
                     )
@@ -136,11 +139,13 @@ class LauncherController(QObject):
                 if run_as_admin:
                     logging.warning("在非 Windows 平台上请求管理员权限，尝试直接启动。")
                 subprocess.Popen([program_path])
+                launches.inc()
                 self.context.notification_service.show(
                     title="程序已启动", message=f"'{program_name}' 正在启动。"
                 )
         except Exception as e:
             logging.error(f"启动程序失败 {program_name} ({program_path}): {e}")
+            self.context.metrics.counter("program_launcher.launch_failures", "程序启动失败次数").inc()
             QMessageBox.critical(self.view, "启动失败", f"无法启动程序：\n{program_path}\n\n错误: {e}")
     @Slot(str, str)
     def edit_item(self, item_id: str, item_type: str):
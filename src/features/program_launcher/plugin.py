@@ -29,28 +29,36 @@ class ProgramLauncherPlugin(IFeaturePlugin):
         """返回插件的加载优先级。"""
         return 100 # 普通独立功能插件
 
-    def initialize(self, context: ApplicationContext):
+    def prepare(self, context: ApplicationContext):
         """
-        初始化插件，创建并连接MVC组件。
+        准备阶段（后台线程）：打开并验证启动器数据库。
+        LauncherModel 是 QObject，必须在GUI线程中创建，因此留到 initialize 中。
         """
-        super().initialize(context)
-        logging.info(f"[{self.name()}]-> 插件初始化开始...")
-
-        db_service = self.context.initializer.initialize(
-            context=self.context,
+        self.db_service = None
+        db_service = context.initializer.initialize(
+            context=context,
             plugin_name=self.name(),
             config_section=self.name(),
             config_key=self.CONFIG_KEY_DB_PATH,
             db_service_class=ProgramLauncherDatabaseService,
             default_relative_path=f"plugins/{self.name()}/launcher.db"
         )
+        if db_service:
+            self.db_service = db_service.load_data()
+
+    def initialize(self, context: ApplicationContext):
+        """
+        初始化插件，创建并连接MVC组件。
+        """
+        super().initialize(context)
+        logging.info(f"[{self.name()}]-> 插件初始化开始...")
 
-        if not db_service:
+        if not self.db_service:
             logging.error(f"插件 '{self.name()}' 因数据库错误无法初始化。")
             return
 
         # 1. 创建模型
-        self.model = LauncherModel(db_service.load_data())
+        self.model = LauncherModel(self.db_service)
 
         # 2. 创建视图
         self.view = LauncherPageView()
@@ -24,16 +24,13 @@ class RemoteTerminalPlugin(IFeaturePlugin):
     def load_priority(self) -> int:
         return 100
 
-    def initialize(self, context: ApplicationContext):
+    def prepare(self, context: ApplicationContext):
         """
-        Initializes the plugin by creating the controller.
+        Prepare phase (worker thread): opens and validates the connections database.
         """
-        super().initialize(context)
-        logging.info(f"[{self.display_name()}] 插件开始初始化...")
-
         # 1. Initialize the database service using the global initializer
-        generic_service = self.context.initializer.initialize(
-            context=self.context,
+        generic_service = context.initializer.initialize(
+            context=context,
             plugin_name=self.name(),
             config_section=self.name(),
             config_key="db_path",
@@ -41,13 +38,20 @@ class RemoteTerminalPlugin(IFeaturePlugin):
             data_type=DataType.SQLITE,
             db_service_class=ConnectionDBService
         )
+        if generic_service:
+            self.db_service = generic_service.load_data()
+            logging.info(f"[{self.display_name()}] 插件专属数据库服务已初始化。")
+
+    def initialize(self, context: ApplicationContext):
+        """
+        Initializes the plugin by creating the controller.
+        """
+        super().initialize(context)
+        logging.info(f"[{self.display_name()}] 插件开始初始化...")
 
-        if not generic_service:
+        if not self.db_service:
             logging.error(f"[{self.display_name()}] 插件因数据源错误无法加载。")
             return
-        # self.db_service = generic_service.db_service
-        self.db_service = generic_service.load_data()
-        logging.info(f"[{self.display_name()}] 插件专属数据库服务已初始化。")
 
         # 2. Initialize the main controller
         self.controller = TerminalController(self.context, self.db_service, self.name())
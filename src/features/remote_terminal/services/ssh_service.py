@@ -1,6 +1,13 @@
-import paramiko
 from PySide6.QtCore import QObject, Signal, QThread, Slot, QTimer
 from enum import Enum, auto
+from src.utils.lazy_import import lazy_import
+from src.utils.metrics import metrics
+
+# paramiko（及其依赖的 cryptography）导入较慢，首次建立连接时才加载
+paramiko = lazy_import("paramiko")
+
+_bytes_received = metrics.counter("remote_terminal.bytes_received", "SSH 会话收到的字节数", unit="bytes")
+_bytes_sent = metrics.counter("remote_terminal.bytes_sent", "SSH 会话发送的字节数", unit="bytes")
 
 class ConnectionStatus(Enum):
     DISCONNECTED = auto()
@@ -78,7 +85,9 @@ class SSHWorker(QObject):
 
         try:
             if self.shell.recv_ready():
-                data = self.shell.recv(4096).decode('utf-8', errors='replace')
+                raw = self.shell.recv(4096)
+                _bytes_received.inc(len(raw))
+                data = raw.decode('utf-8', errors='replace')
                 if data:
                     self.data_received.emit(data)
         except Exception as e:
@@ -92,7 +101,7 @@ class SSHWorker(QObject):
         """Sends a command to the shell."""
         if self.shell and not self.shell.closed:
             try:
-                self.shell.send(command)
+                _bytes_sent.inc(self.shell.send(command) or 0)
             except Exception as e:
                 self.status_changed.emit(ConnectionStatus.FAILED, f"Error sending command: {e}")
 
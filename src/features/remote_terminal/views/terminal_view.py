@@ -4,7 +4,9 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                                QSplitter, QAbstractItemView, QMenu, QGroupBox)
 from PySide6.QtCore import Signal, Qt, QEvent, QModelIndex
 from PySide6.QtGui import QFont, QStandardItemModel, QStandardItem, QTextCursor, QAction, QIcon
-from ansi2html import Ansi2HTMLConverter
+from src.utils.lazy_import import lazy_import
+
+ansi2html = lazy_import("ansi2html")
 
 class TerminalView(QWidget):
     """
@@ -22,7 +24,7 @@ class TerminalView(QWidget):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("远程终端")
-        self.ansi_converter = Ansi2HTMLConverter(dark_bg=True, scheme='xterm')
+        self.ansi_converter = None  # 首次输出终端内容时创建，见 append_data()
         self.command_history = []
         self.history_index = -1
         self._init_ui()
@@ -312,6 +314,8 @@ class TerminalView(QWidget):
         self.tree_view.expandAll()
 
     def append_data(self, raw_data):
+        if self.ansi_converter is None:
+            self.ansi_converter = ansi2html.Ansi2HTMLConverter(dark_bg=True, scheme='xterm')
         html = self.ansi_converter.convert(raw_data, full=False).replace('\n', '<br>')
         self.terminal_output.moveCursor(QTextCursor.End)
         self.terminal_output.insertHtml(html)
@@ -50,7 +50,7 @@ class ArrangerController(QObject):
     def toggle_monitoring(self, checked: bool):
         """【修复】启动或停止后台监控服务，并为其准备初始数据和依赖。"""
         self.context.config_service.set_option("WindowArranger", "auto_monitor_enabled", str(checked).lower())
-        self.context.config_service.save_config()
+        self.context.config_service.schedule_save()
         
         if checked:
             # 【修复】每次启动监控时，都重新获取最新的窗口列表，而不是使用 self.detected_windows
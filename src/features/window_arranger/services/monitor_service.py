@@ -1,6 +1,6 @@
 # desktop_center/src/features/window_arranger/services/monitor_service.py
 import logging
-import time
+import threading
 from datetime import datetime
 from typing import Dict, Tuple, Set, Callable, List
 import pygetwindow as gw
@@ -19,6 +19,8 @@ class MonitorService(QThread):
         super().__init__(parent)
         self.context = context
         self.running = False
+        # 【新增】用于打断两轮监测之间的等待（停止或监测间隔被修改时）
+        self._wake = threading.Event()
         self.position_map: Dict[int, Tuple[QRect, int, str]] = {} # {HWND: (QRect, PID, Title)} 【修改】包含标题
         self.baseline_hwnds: Set[int] = set() # 用于模板模式判断窗口集变化
         
@@ -56,24 +58,32 @@ class MonitorService(QThread):
     def run(self):
         """线程主循环。"""
         self.running = True
+        self._wake.clear()
         logging.info(f"[MonitorService] 自动监测服务已启动 (模式: {self.mode})。")
         self.status_updated.emit(f"监控中 (模式: {self.mode.capitalize()})")
 
+        # 【新增】监测间隔被修改（设置对话框或外部修改 config.ini）时立即按新间隔重新计时
+        unsubscribe = self.context.config_service.subscribe(self._on_interval_changed, section="WindowArranger", option="monitor_interval")
+        cycle_ms = self.context.metrics.histogram("window_arranger.monitor_cycle_ms", "每轮窗口监测耗时")
         while self.running:
-            interval = int(self.context.config_service.get_value("WindowArranger", "monitor_interval", "5"))
-            time.sleep(interval)
+            interval = self.context.config_service.get_int("WindowArranger", "monitor_interval", 5)
+            if self._wake.wait(interval):
+                self._wake.clear()
+                continue
 
             if not self.running: 
                 break
 
             logging.debug("[MonitorService] 开始新一轮监测...")
             try:
-                self._check_and_correct_windows()
+                with cycle_ms.time():
+                    self._check_and_correct_windows()
             except Exception as e:
                 # 捕获线程内所有未处理异常，防止线程崩溃
                 logging.critical(f"[MonitorService] 线程主循环发生未捕获异常: {e}", exc_info=True)
 
 
+        unsubscribe()
         logging.info("[MonitorService] 自动监测服务已停止。")
         self.status_updated.emit("监控已停止")
         self._dispatch_event(
@@ -87,10 +97,15 @@ class MonitorService(QThread):
     def stop(self):
         """停止线程循环。"""
         self.running = False
+        self._wake.set()
         logging.info("[MonitorService] 正在请求停止监测服务...")
         self.quit()
         self.wait(2000)
 
+    def _on_interval_changed(self, section: str, option: str, old_value, new_value):
+        logging.info(f"[MonitorService] 监测间隔已变更为 {new_value} 秒。")
+        self._wake.set()
+
     def _dispatch_event(self, type: str, title: str, message: str, severity: str, details: dict = None):
         """【新增】统一处理日志、桌面通知和 Webhook 推送。"""
         # 1. 构造完整的事件数据包
@@ -109,14 +124,14 @@ class MonitorService(QThread):
         logging.log(log_level, f"[{self.mode.capitalize()} - {type}] {title}: {message}")
 
         # 3. 桌面通知 (如果启用)
-        if self.context.config_service.get_value("WindowArranger", "enable_notifications", "true").lower() == 'true':
+        if self.context.config_service.get_bool("WindowArranger", "enable_notifications", True):
             self.context.notification_service.show(
                 title=f"桌面窗口 ({title})", 
                 message=message
             )
 
         # 4. Webhook 推送 (如果启用)
-        if self.context.config_service.get_value("WindowArranger", "enable_push", "false").lower() == 'true':
+        if self.context.config_service.get_bool("WindowArranger", "enable_push", False):
             host = self.context.config_service.get_value("WindowArranger", "push_host", "").strip() # 使用空字符串作为fallback，而不是None
             port_str = self.context.config_service.get_value("WindowArranger", "push_port", "").strip()
             path = self.context.config_service.get_value("WindowArranger", "push_path", "/alert").strip()
@@ -130,7 +145,9 @@ class MonitorService(QThread):
             port = int(port_str) if port_str.isdigit() else 5000
             url = f"http://{host}:{port}{path if path.startswith('/') else '/' + path}"
             
-            self.context.webhook_service.push(url, event_data) # 推送完整的事件数据
+            # 推送完整的事件数据；写入发件箱，目标不可用或程序重启后仍会送达
+            batch = self.context.config_service.get_bool("WindowArranger", "push_batch", False)
+            self.context.webhook_service.push(url, event_data, durable=True, batch=batch)
 
     def _check_and_correct_windows(self):
         """核心监测与校正逻辑。"""
@@ -326,6 +343,7 @@ class MonitorService(QThread):
                 win_obj.restore()
                 win_obj.moveTo(expected_rect.left(), expected_rect.top())
                 win_obj.resizeTo(expected_rect.width(), expected_rect.height())
+                self.context.metrics.counter("window_arranger.windows_corrected", "已自动归位的窗口数").inc()
                 self.status_updated.emit(f"已校正: {window_info.title[:30]}...")
             except Exception as e:
                 self._dispatch_event(
@@ -0,0 +1,249 @@
+# desktop_center/src/services/async_db_executor.py
+"""
+平台级异步数据库执行器。
+
+每个数据库文件拥有一个独立的工作线程和该线程专属的 sqlite3 连接，
+提交给同一数据库的任务按优先级（交互优先于后台）和提交顺序串行执行，
+不同数据库之间互不阻塞。任务结果通过 `DbFuture` 返回，
+完成回调经由 `dispatcher` 投递到 GUI 线程执行（见 `src.utils.gui_dispatcher`）。
+"""
+import os
+import queue
+import sqlite3
+import logging
+import itertools
+import threading
+from enum import IntEnum
+from typing import Any, Callable, Dict, List, Optional
+
+from src.services.sqlite_base_service import connect_database
+from src.utils.metrics import metrics
+
+_tasks_run = metrics.counter("db.tasks", "异步数据库执行器已执行的任务数")
+_task_ms = metrics.histogram("db.task_ms", "异步数据库任务的执行耗时")
+
+
+class DbTaskPriority(IntEnum):
+    """任务优先级，数值越小越先执行。"""
+    INTERACTIVE = 0   # 用户正在等待结果的操作，例如页面加载、点击刷新
+    BACKGROUND = 10   # 可以延后执行的操作，例如统计、清理
+
+
+class DbTaskCancelledError(Exception):
+    """在已取消的任务上获取结果时抛出。"""
+    pass
+
+
+class DbFuture:
+    """
+    异步数据库任务的结果占位对象。
+
+    完成回调通过执行器的 dispatcher 调度；在 GUI 中使用时，回调总是在 GUI 线程上运行，
+    可以直接更新界面控件。
+    """
+    PENDING, RUNNING, FINISHED, CANCELLED = range(4)
+
+    def __init__(self, dispatcher: Optional[Callable[[Callable[[], None]], None]] = None):
+        self._dispatcher = dispatcher
+        self._state = DbFuture.PENDING
+        self._result = None
+        self._exception: Optional[BaseException] = None
+        self._callbacks: List[Callable[['DbFuture'], None]] = []
+        self._condition = threading.Condition()
+
+    def cancel(self) -> bool:
+        """取消尚未开始执行的任务。已开始或已完成的任务无法取消，返回 False。"""
+        with self._condition:
+            if self._state != DbFuture.PENDING:
+                return self._state == DbFuture.CANCELLED
+            self._state = DbFuture.CANCELLED
+            self._condition.notify_all()
+        self._schedule_callbacks()
+        return True
+
+    def cancelled(self) -> bool:
+        return self._state == DbFuture.CANCELLED
+
+    def done(self) -> bool:
+        return self._state in (DbFuture.FINISHED, DbFuture.CANCELLED)
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        """阻塞等待任务完成并返回结果。GUI 线程中应使用 `add_done_callback` 而不是此方法。"""
+        with self._condition:
+            if not self._condition.wait_for(self.done, timeout):
+                raise TimeoutError("等待数据库任务超时。")
+            if self._state == DbFuture.CANCELLED:
+                raise DbTaskCancelledError("数据库任务已被取消。")
+            if self._exception is not None:
+                raise self._exception
+            return self._result
+
+    def exception(self) -> Optional[BaseException]:
+        """返回任务抛出的异常（若有），不阻塞。"""
+        return self._exception
+
+    def add_done_callback(self, callback: Callable[['DbFuture'], None]) -> None:
+        """注册完成回调（包括成功、失败和取消）。任务已完成时回调会被立即调度。"""
+        with self._condition:
+            if not self.done():
+                self._callbacks.append(callback)
+                return
+        self._dispatch(callback)
+
+    # --- 执行器内部使用 ---
+
+    def _set_running(self) -> bool:
+        with self._condition:
+            if self._state != DbFuture.PENDING:
+                return False
+            self._state = DbFuture.RUNNING
+            return True
+
+    def _set_result(self, result: Any) -> None:
+        with self._condition:
+            self._result = result
+            self._state = DbFuture.FINISHED
+            self._condition.notify_all()
+        self._schedule_callbacks()
+
+    def _set_exception(self, exc: BaseException) -> None:
+        with self._condition:
+            self._exception = exc
+            self._state = DbFuture.FINISHED
+            self._condition.notify_all()
+        self._schedule_callbacks()
+
+    def _schedule_callbacks(self) -> None:
+        with self._condition:
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            self._dispatch(callback)
+
+    def _dispatch(self, callback: Callable[['DbFuture'], None]) -> None:
+        def invoke():
+            try:
+                callback(self)
+            except Exception as e:
+                logging.error(f"[src.services.async_db_executor.DbFuture._dispatch] 数据库任务回调执行失败: {e}", exc_info=True)
+
+        if self._dispatcher is None:
+            invoke()
+        else:
+            self._dispatcher(invoke)
+
+
+class _DbWorker(threading.Thread):
+    """单个数据库的工作线程，持有该线程专属的连接。"""
+    _STOP = object()
+
+    def __init__(self, db_path: str):
+        super().__init__(name=f"DbWorker-{os.path.basename(db_path)}", daemon=True)
+        self.db_path = db_path
+        self.tasks: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def run(self) -> None:
+        while True:
+            _, _, future, fn, args, kwargs = self.tasks.get()
+            if future is self._STOP:
+                break
+            if not future._set_running():
+                continue  # 已取消
+            _tasks_run.inc()
+            try:
+                with _task_ms.time():
+                    result = fn(self._get_connection(), *args, **kwargs)
+                future._set_result(result)
+            except BaseException as e:
+                logging.error(f"[src.services.async_db_executor._DbWorker.run] 数据库 '{self.db_path}' 上的任务执行失败: {e}")
+                future._set_exception(e)
+
+        # 退出前取消所有未执行的任务
+        while not self.tasks.empty():
+            future = self.tasks.get_nowait()[2]
+            if future is not self._STOP:
+                future.cancel()
+        if self._conn is not None:
+            self._conn.close()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = connect_database(self.db_path)
+            self._conn.row_factory = sqlite3.Row
+        return self._conn
+
+
+class AsyncDbExecutor:
+    """
+    按数据库文件分配工作线程的异步执行器，挂载在 `ApplicationContext.db_executor` 上。
+
+    用法:
+        future = context.db_executor.submit(db_service.db_path, MemoDatabaseService.fetch_all_memos)
+        future.add_done_callback(lambda f: self.on_memos_loaded(f))
+    """
+    def __init__(self, dispatcher: Optional[Callable[[Callable[[], None]], None]] = None):
+        """
+        Args:
+            dispatcher (callable): 接收一个无参可调用对象，并将其投递到 GUI 线程执行。
+                为 None 时回调直接在工作线程中执行。
+        """
+        self._dispatcher = dispatcher
+        self._workers: Dict[str, _DbWorker] = {}
+        self._lock = threading.Lock()
+        self._sequence = itertools.count()
+        self._shutdown = False
+        metrics.gauge("db.queued_tasks", "排队等待执行的数据库任务数", func=self.pending_count)
+
+    def pending_count(self) -> int:
+        """所有工作线程中排队等待执行的任务数。"""
+        with self._lock:
+            workers = list(self._workers.values())
+        return sum(worker.tasks.qsize() for worker in workers)
+
+    def submit(self, db_path: str, fn: Callable[..., Any], *args,
+               priority: DbTaskPriority = DbTaskPriority.INTERACTIVE, **kwargs) -> DbFuture:
+        """
+        提交一个任务到指定数据库的工作线程。
+
+        Args:
+            db_path (str): 数据库文件路径，决定任务在哪个工作线程上执行。
+            fn (callable): 任务函数，签名为 `fn(conn, *args, **kwargs)`，
+                其中 `conn` 是工作线程专属的 sqlite3 连接（row_factory 为 sqlite3.Row）。
+            priority (DbTaskPriority): 任务优先级。
+
+        Returns:
+            DbFuture: 任务的结果占位对象。
+
+        Raises:
+            RuntimeError: 执行器已关闭。
+        """
+        future = DbFuture(self._dispatcher)
+        worker = self._get_worker(db_path)
+        worker.tasks.put((int(priority), next(self._sequence), future, fn, args, kwargs))
+        return future
+
+    def _get_worker(self, db_path: str) -> _DbWorker:
+        key = os.path.normcase(os.path.abspath(db_path))
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("异步数据库执行器已关闭。")
+            worker = self._workers.get(key)
+            if worker is None:
+                worker = _DbWorker(db_path)
+                worker.start()
+                self._workers[key] = worker
+                logging.info(f"[src.services.async_db_executor.AsyncDbExecutor._get_worker] 已为数据库创建工作线程: {db_path}")
+            return worker
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """停止所有工作线程。正在执行的任务会执行完毕，排队中的任务会被取消。"""
+        with self._lock:
+            self._shutdown = True
+            workers = list(self._workers.values())
+            self._workers.clear()
+        for worker in workers:
+            # 停止标记使用最高优先级，保证排在所有未执行任务之前
+            worker.tasks.put((-1, next(self._sequence), _DbWorker._STOP, None, (), {}))
+        for worker in workers:
+            worker.join(timeout)
+        logging.info("[src.services.async_db_executor.AsyncDbExecutor.shutdown] 异步数据库执行器已关闭。")
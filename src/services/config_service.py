@@ -1,22 +1,155 @@
 # desktop_center/src/services/config_service.py
+import io
+import time
 import configparser
 import logging
-from typing import List, Tuple
+import threading
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from src.services.file_journal import atomic_write_text, file_signature
+
+# 【新增】延迟保存的防抖时间（秒）与最长延迟（持续修改时也保证在该时间内落盘）
+SAVE_DEBOUNCE_SECONDS = 1.0
+SAVE_MAX_DELAY_SECONDS = 5.0
+# 【新增】外部修改检测的轮询间隔（秒）
+WATCH_INTERVAL_SECONDS = 2.0
+
+_TRUE_VALUES = frozenset(("true", "1", "yes", "on"))
+_FALSE_VALUES = frozenset(("false", "0", "no", "off"))
+_INVALID = object()
+
+# 配置变更回调: callback(section, option, old_value, new_value)，新增时 old_value 为 None，删除时 new_value 为 None
+ConfigChangeCallback = Callable[[str, str, Optional[str], Optional[str]], None]
+ConfigChange = Tuple[str, str, Optional[str], Optional[str]]
+
+
+def diff_config(old: Dict[str, Dict[str, str]], new: Dict[str, Dict[str, str]]) -> List[ConfigChange]:
+    """比较两份配置，返回逐键的变更列表 (section, option, old_value, new_value)。"""
+    changes = []
+    for section in list(old) + [s for s in new if s not in old]:
+        old_options, new_options = old.get(section, {}), new.get(section, {})
+        for option in list(old_options) + [o for o in new_options if o not in old_options]:
+            old_value, new_value = old_options.get(option), new_options.get(option)
+            if old_value != new_value:
+                changes.append((section, option, old_value, new_value))
+    return changes
+
+
+class ConfigSnapshot:
+    """
+    配置的不可变快照。
+
+    读取只是字典查找，不经过 ConfigParser 的插值逻辑；类型化读取的解析结果缓存在快照内，
+    快照在配置发生变化时整体替换，因此缓存永远不会过期。
+    """
+    def __init__(self, data: Dict[str, Dict[str, str]], version: int):
+        self._data: Mapping[str, Mapping[str, str]] = MappingProxyType(
+            {section: MappingProxyType(dict(options)) for section, options in data.items()})
+        self.version = version
+        self._parsed: Dict[tuple, Any] = {}
+
+    def sections(self) -> List[str]:
+        return list(self._data)
+
+    def has_section(self, section: str) -> bool:
+        return section in self._data
+
+    def items(self, section: str) -> List[Tuple[str, str]]:
+        return list(self._data.get(section, {}).items())
+
+    def as_dict(self) -> Dict[str, Dict[str, str]]:
+        return {section: dict(options) for section, options in self._data.items()}
+
+    def get(self, section: str, option: str, fallback: Optional[str] = None) -> Optional[str]:
+        options = self._data.get(section)
+        if options is None:
+            return fallback
+        return options.get(option.lower(), fallback)
+
+    def _get_parsed(self, kind: str, section: str, option: str, parser: Callable[[str], Any]):
+        key = (kind, section, option)
+        try:
+            return self._parsed[key]
+        except KeyError:
+            pass
+        raw = self.get(section, option)
+        if raw is None:
+            value = _INVALID
+        else:
+            try:
+                value = parser(raw)
+            except (ValueError, TypeError):
+                logging.debug(f"[src.services.config_service.ConfigSnapshot._get_parsed] 配置项 [{section}] {option} = '{raw}' 不是有效的 {kind}，将使用默认值。")
+                value = _INVALID
+        self._parsed[key] = value
+        return value
+
+    def get_bool(self, section: str, option: str, fallback: bool = False) -> bool:
+        value = self._get_parsed("bool", section, option, _parse_bool)
+        return fallback if value is _INVALID else value
+
+    def get_int(self, section: str, option: str, fallback: int = 0) -> int:
+        value = self._get_parsed("int", section, option, lambda raw: int(raw.strip()))
+        return fallback if value is _INVALID else value
+
+    def get_float(self, section: str, option: str, fallback: float = 0.0) -> float:
+        value = self._get_parsed("float", section, option, lambda raw: float(raw.strip()))
+        return fallback if value is _INVALID else value
+
+    def get_list(self, section: str, option: str, fallback: Optional[List[str]] = None, separator: str = ",") -> List[str]:
+        value = self._get_parsed(f"list{separator}", section, option,
+                                 lambda raw: tuple(item.strip() for item in raw.split(separator) if item.strip()))
+        if value is _INVALID:
+            return list(fallback) if fallback is not None else []
+        return list(value)
+
+
+def _parse_bool(raw: str) -> bool:
+    text = raw.strip().lower()
+    if text in _TRUE_VALUES:
+        return True
+    if text in _FALSE_VALUES:
+        return False
+    raise ValueError(raw)
+
 
 class ConfigService:
     """
     健壮的配置服务，负责所有 config.ini 文件的读写逻辑。
     设计目标是即使在配置文件损坏或丢失的情况下也能让主程序安全启动。
+
+    【新增】读取走不可变快照（见 ConfigSnapshot），只在配置变化后重建一次；
+    `get_bool` / `get_int` 等类型化读取的解析结果会被缓存，适合在热路径上调用。
+    通过 `subscribe` 可以订阅某个区段或某个键的变更。
+    `schedule_save` 把频繁的写入合并为一次延迟的后台保存，`flush` 立即写出未保存的修改。
+    `start_watching` 启动外部修改检测：config.ini 在磁盘上被修改后自动重新加载，并逐键发出变更通知。
     """
-    def __init__(self, filepath: str):
+    def __init__(self, filepath: str, save_delay: float = SAVE_DEBOUNCE_SECONDS):
         """
         初始化配置服务。
 
         Args:
             filepath (str): config.ini 文件的路径。
+            save_delay (float): `schedule_save` 的防抖时间（秒）。
         """
         self.filepath = filepath
+        self.save_delay = save_delay
         self.config = configparser.ConfigParser()
+        # 【新增】插件准备阶段会在线程池中并发读写配置，写操作需要串行化
+        self._lock = threading.RLock()
+        # 保证写文件的顺序与生成内容的顺序一致
+        self._save_lock = threading.Lock()
+        self._snapshot: Optional[ConfigSnapshot] = None
+        self._version = 0
+        self._subscribers: List[Tuple[Optional[str], Optional[str], ConfigChangeCallback]] = []
+        self._save_timer: Optional[threading.Timer] = None
+        self._dirty_since: Optional[float] = None
+        # 最近一次由本服务读取或写入时配置文件的签名，用于区分外部修改与自身的保存
+        self._known_signature: Optional[List[int]] = None
+        self._watch_thread: Optional[threading.Thread] = None
+        self._watch_stop = threading.Event()
+        self._dispatcher: Optional[Callable[[Callable[[], None]], None]] = None
         self.load_config()
 
     def load_config(self) -> None:
@@ -25,9 +158,11 @@ class ConfigService:
         如果文件不存在或无法解析，将记录一个错误并使用一个空的配置对象，
         这可以防止应用程序在启动时崩溃。
         """
+        signature = file_signature(self.filepath)
+        parser = configparser.ConfigParser()
         try:
             # 使用utf-8-sig可以处理带有BOM头的UTF-8文件
-            read_files = self.config.read(self.filepath, encoding='utf-8-sig')
+            read_files = parser.read(self.filepath, encoding='utf-8-sig')
             if not read_files:
                 logging.warning(f"配置文件 '{self.filepath}' 未找到。将使用空配置。")
             else:
@@ -35,40 +170,277 @@ class ConfigService:
         except configparser.Error as e:
             logging.error(f"解析配置文件 '{self.filepath}' 失败: {e}")
             # 解析失败时重置为一个空对象，保证程序健壮性
-            self.config = configparser.ConfigParser()
+            parser = configparser.ConfigParser()
+        with self._lock:
+            self.config = parser
+            self._known_signature = signature
+            self._invalidate()
+
+    def reload(self) -> List[ConfigChange]:
+        """
+        【新增】从磁盘重新加载配置，并对发生变化的键发出变更通知。
+
+        文件无法解析时保留当前配置。尚未写出的延迟保存会被放弃（以磁盘上的外部修改为准）。
+
+        Returns:
+            变更列表 (section, option, old_value, new_value)。
+        """
+        signature = file_signature(self.filepath)
+        if signature is None:
+            logging.warning(f"[src.services.config_service.ConfigService.reload] 配置文件 '{self.filepath}' 不存在，保留当前配置。")
+            return []
+        parser = configparser.ConfigParser()
+        try:
+            parser.read(self.filepath, encoding='utf-8-sig')
+        except configparser.Error as e:
+            logging.error(f"[src.services.config_service.ConfigService.reload] 重新加载配置文件失败，保留当前配置: {e}")
+            with self._lock:
+                self._known_signature = signature
+            return []
+
+        new_data = self._parser_to_dict(parser)
+        with self._lock:
+            old_data = self._parser_to_dict(self.config)
+            if self._dirty_since is not None:
+                logging.warning("[src.services.config_service.ConfigService.reload] 配置文件被外部修改，尚未保存的内存修改已被放弃。")
+                self._cancel_save_timer()
+                self._dirty_since = None
+            self.config = parser
+            self._known_signature = signature
+            changes = diff_config(old_data, new_data)
+            if changes:
+                self._invalidate()
+        if changes:
+            logging.info(f"[src.services.config_service.ConfigService.reload] 配置文件已重新加载，{len(changes)} 个配置项发生变化: "
+                         + ", ".join(f"[{section}] {option}" for section, option, _, _ in changes[:10]))
+            self._notify(changes)
+        return changes
+
+    # ------------------------------------------------------------------
+    # 读取
+    # ------------------------------------------------------------------
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        """当前配置的不可变快照。配置变化后会返回新的快照对象。"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                snapshot = self._snapshot
+                if snapshot is None:
+                    snapshot = self._snapshot = ConfigSnapshot(self._parser_to_dict(self.config), self._version)
+        return snapshot
+
+    @staticmethod
+    def _parser_to_dict(parser: configparser.ConfigParser) -> Dict[str, Dict[str, str]]:
+        data = {}
+        for section in parser.sections():
+            options = {}
+            for option in parser.options(section):
+                try:
+                    options[option] = parser.get(section, option)
+                except configparser.InterpolationError:
+                    # 含有 '%' 等无法插值的值时按原样返回
+                    options[option] = parser.get(section, option, raw=True)
+            data[section] = options
+        return data
 
     def get_sections(self) -> List[str]:
         """获取所有配置区段的名称列表。"""
-        return self.config.sections()
+        return self.snapshot.sections()
 
     def get_options(self, section: str) -> List[Tuple[str, str]]:
         """获取指定区段下的所有键值对。"""
-        if self.config.has_section(section):
-            return self.config.items(section)
-        return []
+        return self.snapshot.items(section)
 
     def get_value(self, section: str, option: str, fallback: str = None) -> str:
         """安全地获取一个配置值，可提供默认值。"""
-        return self.config.get(section, option, fallback=fallback)
+        return self.snapshot.get(section, option, fallback)
+
+    def get_bool(self, section: str, option: str, fallback: bool = False) -> bool:
+        """【新增】读取布尔值（true/false、1/0、yes/no、on/off），无效或缺失时返回 fallback。"""
+        return self.snapshot.get_bool(section, option, fallback)
+
+    def get_int(self, section: str, option: str, fallback: int = 0) -> int:
+        """【新增】读取整数，无效或缺失时返回 fallback。"""
+        return self.snapshot.get_int(section, option, fallback)
 
+    def get_float(self, section: str, option: str, fallback: float = 0.0) -> float:
+        """【新增】读取浮点数，无效或缺失时返回 fallback。"""
+        return self.snapshot.get_float(section, option, fallback)
+
+    def get_list(self, section: str, option: str, fallback: Optional[List[str]] = None, separator: str = ",") -> List[str]:
+        """【新增】读取以分隔符分隔的列表（去除空白与空项），缺失时返回 fallback。"""
+        return self.snapshot.get_list(section, option, fallback, separator)
+
+    # ------------------------------------------------------------------
+    # 修改与变更通知
+    # ------------------------------------------------------------------
     def set_option(self, section: str, option: str, value: str) -> None:
-        """设置一个配置值。如果区段不存在，则自动创建。"""
-        if not self.config.has_section(section):
-            self.config.add_section(section)
-        self.config.set(section, option, str(value))
+        """设置一个配置值。如果区段不存在，则自动创建。值未变化时不会触发变更通知。"""
+        value = str(value)
+        with self._lock:
+            if not self.config.has_section(section):
+                self.config.add_section(section)
+            old_value = self.config.get(section, option, raw=True, fallback=None)
+            if old_value == value:
+                return
+            self.config.set(section, option, value)
+            self._invalidate()
+        self._notify([(section, option.lower(), old_value, value)])
+
+    def subscribe(self, callback: ConfigChangeCallback, section: Optional[str] = None, option: Optional[str] = None) -> Callable[[], None]:
+        """
+        【新增】订阅配置变更。
+
+        Args:
+            callback: 变更回调，参数为 (section, option, old_value, new_value)。
+                回调在修改配置的线程中同步调用。
+            section: 只关心该区段的变更；为 None 时接收所有变更。
+            option: 只关心该键的变更（需同时指定 section）。
+
+        Returns:
+            取消订阅的函数。
+        """
+        entry = (section, option.lower() if option else None, callback)
+        with self._lock:
+            self._subscribers.append(entry)
+
+        def unsubscribe():
+            with self._lock:
+                if entry in self._subscribers:
+                    self._subscribers.remove(entry)
+        return unsubscribe
+
+    def _invalidate(self) -> None:
+        """配置已变化：丢弃当前快照，下次读取时重建。调用方需持有 _lock。"""
+        self._version += 1
+        self._snapshot = None
+
+    def _notify(self, changes: List[ConfigChange]) -> None:
+        dispatcher = self._dispatcher
+        if dispatcher is not None and threading.current_thread() is self._watch_thread:
+            # 外部修改引起的通知投递到订阅者所在的线程（通常是GUI线程）
+            dispatcher(lambda: self._deliver(changes))
+        else:
+            self._deliver(changes)
 
+    def _deliver(self, changes: List[ConfigChange]) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for section, option, old_value, new_value in changes:
+            for sub_section, sub_option, callback in subscribers:
+                if sub_section is not None and sub_section != section:
+                    continue
+                if sub_option is not None and sub_option != option:
+                    continue
+                try:
+                    callback(section, option, old_value, new_value)
+                except Exception as e:
+                    logging.error(f"[src.services.config_service.ConfigService._notify] 配置变更回调执行失败 [{section}] {option}: {e}", exc_info=True)
+
+    # ------------------------------------------------------------------
+    # 保存
+    # ------------------------------------------------------------------
     def save_config(self) -> bool:
         """
-        将当前配置状态写回文件。
+        将当前配置状态立即写回文件（原子写入）。会取消尚未执行的延迟保存。
 
         Returns:
             bool: 如果保存成功则返回 True，否则返回 False。
         """
-        try:
-            with open(self.filepath, 'w', encoding='utf-8') as configfile:
-                self.config.write(configfile)
-            logging.info(f"配置文件已成功保存到: {self.filepath}")
+        with self._save_lock:
+            with self._lock:
+                self._cancel_save_timer()
+                self._dirty_since = None
+                buffer = io.StringIO()
+                self.config.write(buffer)
+            try:
+                atomic_write_text(self.filepath, buffer.getvalue())
+                with self._lock:
+                    self._known_signature = file_signature(self.filepath)
+                logging.info(f"配置文件已成功保存到: {self.filepath}")
+                return True
+            except OSError as e:
+                logging.error(f"保存配置文件到 '{self.filepath}' 失败: {e}")
+                return False
+
+    def schedule_save(self) -> None:
+        """
+        【新增】请求一次延迟保存。短时间内的多次请求会被合并为一次后台写入；
+        即使修改持续不断，也会在 SAVE_MAX_DELAY_SECONDS 内写出。
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._dirty_since is None:
+                self._dirty_since = now
+            delay = min(self.save_delay, max(0.0, self._dirty_since + SAVE_MAX_DELAY_SECONDS - now))
+            self._cancel_save_timer()
+            self._save_timer = threading.Timer(delay, self._run_scheduled_save)
+            self._save_timer.daemon = True
+            self._save_timer.name = "ConfigSaveTimer"
+            self._save_timer.start()
+
+    def _run_scheduled_save(self) -> None:
+        with self._lock:
+            if self._dirty_since is None:
+                return  # 已被 save_config / flush 写出
+        self.save_config()
+
+    def _cancel_save_timer(self) -> None:
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+            self._save_timer = None
+
+    def has_pending_save(self) -> bool:
+        """是否存在尚未写出的延迟保存。"""
+        return self._dirty_since is not None
+
+    def flush(self) -> bool:
+        """【新增】立即写出尚未执行的延迟保存（应用退出前调用）。没有待保存内容时直接返回 True。"""
+        if not self.has_pending_save():
             return True
-        except IOError as e:
-            logging.error(f"保存配置文件到 '{self.filepath}' 失败: {e}")
-            return False
\ No newline at end of file
+        return self.save_config()
+
+    # ------------------------------------------------------------------
+    # 外部修改检测（热重载）
+    # ------------------------------------------------------------------
+    def start_watching(self, interval: float = WATCH_INTERVAL_SECONDS,
+                       dispatcher: Optional[Callable[[Callable[[], None]], None]] = None) -> None:
+        """
+        【新增】启动后台线程，轮询配置文件的大小与修改时间，发现外部修改后自动 `reload`。
+
+        Args:
+            interval: 轮询间隔（秒）。
+            dispatcher: 用于投递变更通知的函数（例如 GuiDispatcher.post），
+                使订阅者的回调在GUI线程中执行。为 None 时在监视线程中直接调用。
+        """
+        if self._watch_thread is not None and self._watch_thread.is_alive():
+            return
+        self._dispatcher = dispatcher
+        self._watch_stop.clear()
+        self._watch_thread = threading.Thread(target=self._watch_loop, args=(interval,), name="ConfigWatcher", daemon=True)
+        self._watch_thread.start()
+        logging.info(f"[src.services.config_service.ConfigService.start_watching] 已开始监视配置文件的外部修改: {self.filepath}")
+
+    def stop_watching(self) -> None:
+        """【新增】停止外部修改检测。"""
+        self._watch_stop.set()
+        if self._watch_thread is not None:
+            self._watch_thread.join(timeout=5)
+            self._watch_thread = None
+
+    def check_for_changes(self) -> List[ConfigChange]:
+        """检查一次配置文件是否被外部修改，是则重新加载。"""
+        signature = file_signature(self.filepath)
+        with self._lock:
+            known = self._known_signature
+        if signature is None or signature == known:
+            return []
+        return self.reload()
+
+    def _watch_loop(self, interval: float) -> None:
+        while not self._watch_stop.wait(interval):
+            try:
+                self.check_for_changes()
+            except Exception as e:
+                logging.error(f"[src.services.config_service.ConfigService._watch_loop] 检查配置文件修改时出错: {e}", exc_info=True)
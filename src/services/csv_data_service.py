@@ -1,12 +1,20 @@
 # src/services/csv_data_service.py
+from __future__ import annotations
+
 import os
+import csv
 import logging
-try:
-    import pandas as pd
-except ImportError:
-    pd = None
+from typing import Dict, Iterator, List, Optional
 
 from src.services.generic_data_service import GenericDataService, DataType, DataValidationError
+from src.services.frame_cache import frame_cache
+from src.utils.lazy_import import lazy_import, module_available
+
+# pandas 导入开销较大，延迟到首次使用时再加载
+pd = lazy_import("pandas")
+
+# 流式读取时每个分块的默认行数
+DEFAULT_CHUNK_SIZE = 10000
 
 class CSVDataService(GenericDataService):
     """
@@ -15,19 +23,59 @@ class CSVDataService(GenericDataService):
     
     def __init__(self, file_path: str):
         super().__init__(file_path, DataType.CSV)
-        if pd is None:
+        if not module_available("pandas"):
             raise ImportError("pandas库未安装，无法处理CSV文件")
             
-    def load_data(self) -> pd.DataFrame:
-        """加载CSV数据"""
+    def load_data(self, columns: Optional[List[str]] = None, dtype: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+        """
+        加载CSV数据
+
+        Args:
+            columns: 只读取指定的列，为 None 时读取全部列。
+            dtype: 列类型提示，例如 {'账号': 'string', '等级': 'Int64'}。
+        """
         try:
-            df = pd.read_csv(self.file_path)
+            # 通过解析缓存读取，源文件未变化时跳过重新解析
+            variant = repr((columns, dtype)) if columns or dtype else ""
+            df = frame_cache.load(
+                self.file_path,
+                lambda: pd.read_csv(self.file_path, usecols=columns, dtype=dtype),
+                variant=variant
+            )
             logging.info(f"[{self.service_name}] 成功加载CSV数据: {self.file_path}")
             return df
         except Exception as e:
             logging.error(f"[{self.service_name}] 加载CSV数据失败: {e}")
             raise DataValidationError(f"无法加载CSV文件: {e}")
             
+    def iter_chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE, columns: Optional[List[str]] = None,
+                    dtype: Optional[Dict[str, str]] = None) -> Iterator[pd.DataFrame]:
+        """
+        以分块方式流式读取CSV数据，每次产出最多 `chunk_size` 行的 DataFrame。
+        内存占用只与分块大小有关，适合处理超过内存容量的大文件。
+
+        Args:
+            chunk_size: 每个分块的行数。
+            columns: 只读取指定的列，为 None 时读取全部列。
+            dtype: 列类型提示。
+
+        Raises:
+            DataValidationError: 文件无法打开或解析。
+        """
+        try:
+            reader = pd.read_csv(self.file_path, chunksize=max(int(chunk_size), 1), usecols=columns, dtype=dtype)
+        except Exception as e:
+            logging.error(f"[{self.service_name}] 打开CSV数据流失败: {e}")
+            raise DataValidationError(f"无法读取CSV文件: {e}")
+
+        with reader:
+            try:
+                for chunk in reader:
+                    yield chunk
+            except Exception as e:
+                logging.error(f"[{self.service_name}] 流式读取CSV数据失败: {e}")
+                raise DataValidationError(f"无法读取CSV文件: {e}")
+
     def save_data(self, data: pd.DataFrame) -> bool:
         """保存CSV数据"""
         try:
@@ -43,13 +91,14 @@ class CSVDataService(GenericDataService):
         try:
             # 如果文件不存在，则创建一个空的DataFrame并保存
             if not os.path.exists(self.file_path):
-                if pd is None:
+                if not module_available("pandas"):
                     raise ImportError("pandas库未安装，无法创建CSV文件")
                 pd.DataFrame().to_csv(self.file_path, index=False)
                 return True
 
-            # 尝试读取CSV文件头来验证结构
-            pd.read_csv(self.file_path, nrows=1)
+            # 只读取表头行来验证结构，无需让 pandas 解析整个文件
+            with open(self.file_path, newline='', encoding='utf-8-sig') as f:
+                next(csv.reader(f), None)
             return True
         except Exception as e:
             logging.warning(f"[{self.service_name}] CSV文件结构验证失败: {e}")
@@ -1,18 +1,94 @@
 # src/services/data_source_initializer.py
 import os
+import json
+import zlib
 import logging
+import threading
 from datetime import datetime
 from typing import Optional
 
 from src.services.sqlite_base_service import SchemaType
 from src.services.generic_data_service import GenericDataService, create_data_service, DataType
 
+# 验证结果缓存文件，位于应用数据目录下
+VALIDATION_CACHE_RELATIVE_PATH = "cache/validation_cache.json"
+
+class ValidationCache:
+    """
+    数据源验证结果的持久化缓存。
+
+    以“文件路径 + 验证器标识”为键，记录上次验证成功时文件的大小和修改时间 (mtime)。
+    只要文件未发生变化，下次启动时即可跳过验证。只缓存成功的结果，失败的数据源每次都会重新验证。
+    """
+    def __init__(self, cache_path: str):
+        self.cache_path = cache_path
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            return entries if isinstance(entries, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logging.warning(f"[src.services.data_source_initializer.ValidationCache._load] 读取验证缓存失败，将忽略缓存: {e}")
+            return {}
+
+    @staticmethod
+    def _make_key(data_path: str, validator: str) -> str:
+        return f"{os.path.normcase(os.path.abspath(data_path))}|{validator}"
+
+    @staticmethod
+    def _file_signature(data_path: str) -> Optional[list]:
+        try:
+            stat = os.stat(data_path)
+            return [stat.st_size, stat.st_mtime_ns]
+        except OSError:
+            return None
+
+    def is_valid(self, data_path: str, validator: str) -> bool:
+        """如果该文件自上次验证成功后未发生变化，则返回 True。"""
+        signature = self._file_signature(data_path)
+        if signature is None:
+            return False
+        with self._lock:
+            return self._entries.get(self._make_key(data_path, validator)) == signature
+
+    def mark_valid(self, data_path: str, validator: str) -> None:
+        """记录一次成功的验证，并立即写回缓存文件。"""
+        signature = self._file_signature(data_path)
+        if signature is None:
+            return
+        with self._lock:
+            self._entries[self._make_key(data_path, validator)] = signature
+            try:
+                os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+                tmp_path = self.cache_path + ".tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self._entries, f, ensure_ascii=False)
+                os.replace(tmp_path, self.cache_path)
+            except OSError as e:
+                logging.warning(f"[src.services.data_source_initializer.ValidationCache.mark_valid] 写入验证缓存失败: {e}")
+
 class DataSourceInitializerService:
     """
     数据源初始化服务。
     该服务提供可重用的逻辑，用于处理插件所需数据源的初始化、路径解析、有效性验证以及在遇到问题时的回退机制。
     它确保了即使在配置缺失或数据源损坏的情况下，插件也能尝试以可靠的方式启动。
+    验证成功的结果会按“路径 + 大小 + mtime”缓存在应用数据目录中，文件未变化时下次启动将跳过验证。
     """
+    def __init__(self):
+        self._validation_cache: Optional[ValidationCache] = None
+        self._cache_lock = threading.Lock()
+
+    def _get_validation_cache(self, context: 'ApplicationContext') -> ValidationCache:
+        """延迟创建验证缓存，缓存文件位于应用数据目录下。"""
+        with self._cache_lock:
+            if self._validation_cache is None:
+                self._validation_cache = ValidationCache(context.get_data_path(VALIDATION_CACHE_RELATIVE_PATH))
+            return self._validation_cache
     def initialize(
         self,
         context: 'ApplicationContext',
@@ -72,7 +148,7 @@ class DataSourceInitializerService:
             logging.info(f"[src.services.data_source_initializer.DataSourceInitializerService.initialize] [{plugin_name}] [步骤 1.2/3] 配置中未找到数据源路径，将使用并保存默认相对路径: '{default_relative_path}'")
             path_from_config = default_relative_path
             config_service.set_option(config_section, config_key, path_from_config)
-            config_service.save_config()
+            config_service.schedule_save()
         else:
             logging.debug(f"[src.services.data_source_initializer.DataSourceInitializerService.initialize] [{plugin_name}] [步骤 1.2/3] 从配置中成功读取到数据源路径: '{path_from_config}'")
 
@@ -86,7 +162,8 @@ class DataSourceInitializerService:
             logging.debug(f"[src.services.data_source_initializer.DataSourceInitializerService.initialize] [{plugin_name}] 检测到数据源路径为相对路径，已解析为绝对路径: '{data_path}'")
 
         logging.info(f"[src.services.data_source_initializer.DataSourceInitializerService.initialize] [{plugin_name}] [步骤 2/3] 尝试创建并验证数据服务实例。")
-        data_service = self._validate_and_create_service(data_path, data_type, schema_type, plugin_name, db_service_class)
+        validation_cache = self._get_validation_cache(context)
+        data_service = self._validate_and_create_service(data_path, data_type, schema_type, plugin_name, db_service_class, validation_cache)
 
         if data_service:
             logging.info(f"[src.services.data_source_initializer.DataSourceInitializerService.initialize] [{plugin_name}] [步骤 3/3] 数据源初始化流程成功完成。")
@@ -123,14 +200,20 @@ class DataSourceInitializerService:
         )
         return None
 
-    def _validate_and_create_service(self, data_path: str, data_type: Optional[DataType], schema_type: SchemaType, plugin_name: str, db_service_class: Optional[type] = None) -> Optional[GenericDataService]:
+    def _validate_and_create_service(self, data_path: str, data_type: Optional[DataType], schema_type: SchemaType, plugin_name: str, db_service_class: Optional[type] = None, validation_cache: Optional[ValidationCache] = None) -> Optional[GenericDataService]:
         logging.info(f"[src.services.data_source_initializer.DataSourceInitializerService._validate_and_create_service] [{plugin_name}] [步骤 2.1/3] 开始验证数据源文件: {data_path}")
         try:
             logging.debug(f"[src.services.data_source_initializer.DataSourceInitializerService._validate_and_create_service] [{plugin_name}] [步骤 2.2/3] 尝试创建数据服务实例。")
             temp_service = create_data_service(data_path, data_type, db_service_class=db_service_class)
+            validator = self._validator_signature(temp_service, db_service_class, schema_type)
+            if validation_cache and validation_cache.is_valid(data_path, validator):
+                logging.info(f"[src.services.data_source_initializer.DataSourceInitializerService._validate_and_create_service] [{plugin_name}] [步骤 2.3/3] 数据源 '{data_path}' 自上次验证后未变化，命中验证缓存，跳过验证。")
+                return temp_service
             logging.debug(f"[src.services.data_source_initializer.DataSourceInitializerService._validate_and_create_service] [{plugin_name}] [步骤 2.3/3] 调用服务实例的 validate_data_source 方法进行模式验证。")
             if temp_service.validate_data_source(schema_type):
                 logging.info(f"[src.services.data_source_initializer.DataSourceInitializerService._validate_and_create_service] [{plugin_name}] [步骤 2.4/3] 数据源 '{data_path}' 验证成功。")
+                if validation_cache:
+                    validation_cache.mark_valid(data_path, validator)
                 return temp_service
             else:
                 logging.warning(f"[src.services.data_source_initializer.DataSourceInitializerService._validate_and_create_service] [{plugin_name}] [步骤 2.4/3] 数据源 '{data_path}' 存在，但其内部结构验证失败。")
@@ -139,6 +222,16 @@ class DataSourceInitializerService:
             logging.warning(f"[src.services.data_source_initializer.DataSourceInitializerService._validate_and_create_service] [{plugin_name}] [步骤 2.4/3] 验证数据源 '{data_path}' 时发生错误: {e}", exc_info=True)
             return None
 
+    @staticmethod
+    def _validator_signature(service: GenericDataService, db_service_class: Optional[type], schema_type: SchemaType) -> str:
+        """生成验证器标识。数据库服务类的表结构定义变化时，标识随之变化，旧的缓存自动失效。"""
+        schemas = getattr(db_service_class, "TABLE_SCHEMAS", None) or {
+            getattr(db_service_class, "TABLE_NAME", ""): getattr(db_service_class, "EXPECTED_COLUMNS", set())
+        }
+        schema_text = ";".join(f"{table}:{','.join(sorted(columns))}" for table, columns in sorted(schemas.items()))
+        class_name = db_service_class.__name__ if db_service_class else ""
+        return f"{service.service_name}:{class_name}:{schema_type.name}:{zlib.crc32(schema_text.encode('utf-8')):08x}"
+
     def _try_fallback_default(self, context, plugin_name, config_section, config_key, default_relative_path, data_type, schema_type, original_failed_path, db_service_class) -> Optional[GenericDataService]:
         logging.debug(f"[src.services.data_source_initializer.DataSourceInitializerService._try_fallback_default] [{plugin_name}] [回退 1/2] 尝试使用标准默认数据源文件。")
         default_absolute_path = context.get_data_path(default_relative_path)
@@ -148,11 +241,11 @@ class DataSourceInitializerService:
             return None
 
         logging.debug(f"[src.services.data_source_initializer.DataSourceInitializerService._try_fallback_default] [{plugin_name}] 尝试验证并创建默认数据源的服务实例: '{default_absolute_path}'。")
-        service = self._validate_and_create_service(default_absolute_path, data_type, schema_type, plugin_name, db_service_class)
+        service = self._validate_and_create_service(default_absolute_path, data_type, schema_type, plugin_name, db_service_class, self._get_validation_cache(context))
         if service:
             logging.info(f"[src.services.data_source_initializer.DataSourceInitializerService._try_fallback_default] [{plugin_name}] 成功回退到默认数据源 '{default_absolute_path}'。配置已更新。")
             context.config_service.set_option(config_section, config_key, default_relative_path)
-            context.config_service.save_config()
+            context.config_service.schedule_save()
             context.notification_service.show(
                 f"{plugin_name} 插件提示",
                 f"由于无法访问原始数据源 '{os.path.basename(original_failed_path)}'，已自动切换到默认数据源。",
@@ -169,12 +262,12 @@ class DataSourceInitializerService:
         
         new_absolute_path = context.get_data_path(new_relative_path)
         logging.debug(f"[src.services.data_source_initializer.DataSourceInitializerService._try_fallback_timestamped] [{plugin_name}] 尝试验证并创建新的带时间戳数据源的服务实例: '{new_absolute_path}'。")
-        service = self._validate_and_create_service(new_absolute_path, data_type, schema_type, plugin_name, db_service_class)
+        service = self._validate_and_create_service(new_absolute_path, data_type, schema_type, plugin_name, db_service_class, self._get_validation_cache(context))
         
         if service:
             logging.info(f"[src.services.data_source_initializer.DataSourceInitializerService._try_fallback_timestamped] [{plugin_name}] 成功创建并切换到新的带时间戳数据源 '{new_absolute_path}'。配置已更新。")
             context.config_service.set_option(config_section, config_key, new_relative_path)
-            context.config_service.save_config()
+            context.config_service.schedule_save()
             context.notification_service.show(
                 f"{plugin_name} 插件恢复通知",
                 f"默认数据源已损坏或无法访问。已自动创建新的备用数据源 '{os.path.basename(new_absolute_path)}'。",
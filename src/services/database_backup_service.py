@@ -0,0 +1,252 @@
+# desktop_center/src/services/database_backup_service.py
+"""
+SQLite 在线备份（快照）服务。
+
+基于 sqlite3 的在线备份 API，按页分批地把所有已注册的插件数据库复制到备份目录，
+每一批之间都会释放源库上的读锁，应用在备份期间仍可正常写入。
+所有 `SqlDataService` 子类在建立连接后会自动注册到 `database_registry`。
+"""
+import os
+import time
+import zlib
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# 快照文件名中的时间戳格式
+SNAPSHOT_TIME_FORMAT = "%Y%m%d_%H%M%S"
+SNAPSHOT_SUFFIX = ".db"
+
+
+class DatabaseRegistry:
+    """
+    线程安全的数据库注册表，记录需要被备份的数据库文件。
+    键为规范化后的绝对路径，值为按注册顺序排列的注册者名称（通常是服务类名）。
+    同一个文件可能被多个服务实例同时打开，每次注册都计一次引用，最后一个使用者取消注册后才移除该路径。
+    """
+    def __init__(self):
+        self._databases: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(db_path: str) -> str:
+        return os.path.normcase(os.path.abspath(db_path))
+
+    def register(self, db_path: str, owner: str = "") -> None:
+        """注册一个数据库文件。内存数据库或空路径会被忽略。"""
+        if not db_path or db_path == ":memory:":
+            return
+        with self._lock:
+            self._databases.setdefault(self._normalize(db_path), []).append(owner)
+
+    def unregister(self, db_path: str, owner: str = "") -> None:
+        """释放一次注册（优先释放 `owner` 的那一次）；没有剩余使用者时移除该数据库文件。"""
+        if not db_path:
+            return
+        key = self._normalize(db_path)
+        with self._lock:
+            owners = self._databases.get(key)
+            if not owners:
+                return
+            owners.remove(owner) if owner in owners else owners.pop()
+            if not owners:
+                del self._databases[key]
+
+    def databases(self) -> Dict[str, str]:
+        """返回当前已注册数据库的副本 {路径: 最先注册的注册者}。"""
+        with self._lock:
+            return {path: owners[0] for path, owners in self._databases.items()}
+
+
+# 全局注册表，SqlDataService 会自动向其中注册
+database_registry = DatabaseRegistry()
+
+
+class DatabaseBackupService:
+    """
+    定时执行 SQLite 在线备份，并按数量保留最近的快照。
+
+    备份在独立的守护线程中进行，使用自己的只读连接，不会占用插件的数据库连接。
+    调度方式：工作线程周期性醒来，对最新快照已超过 `interval_hours` 的数据库执行备份；
+    `snapshot_now()` 会立即唤醒工作线程并对所有数据库强制备份一次。
+    """
+    def __init__(self, backup_dir: str, interval_hours: float = 24.0, keep_count: int = 7,
+                 pages_per_step: int = 64, step_sleep: float = 0.005,
+                 registry: DatabaseRegistry = database_registry, check_interval: float = 60.0):
+        """
+        Args:
+            backup_dir (str): 快照根目录，每个数据库在其中拥有独立的子目录。
+            interval_hours (float): 两次定时备份之间的最小间隔（小时），<= 0 表示不做定时备份。
+            keep_count (int): 每个数据库保留的快照数量。
+            pages_per_step (int): 每一步复制的页数，越小持锁时间越短。
+            step_sleep (float): 每一步之间的休眠秒数，给写入方让出机会。
+            registry (DatabaseRegistry): 数据库注册表。
+            check_interval (float): 工作线程检查是否到期的周期（秒）。
+        """
+        self.backup_dir = backup_dir
+        self.interval_seconds = max(float(interval_hours), 0.0) * 3600
+        self.keep_count = max(int(keep_count), 1)
+        self.pages_per_step = max(int(pages_per_step), 1)
+        self.step_sleep = max(float(step_sleep), 0.0)
+        self.registry = registry
+        self.check_interval = max(float(check_interval), 0.1)
+
+        self._wake_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._force_requested = False
+        self._backup_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    # --- 生命周期 ---
+
+    def start(self) -> None:
+        """启动后台备份线程。"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="DatabaseBackup", daemon=True)
+        self._thread.start()
+        logging.info(f"[src.services.database_backup_service.DatabaseBackupService.start] 数据库备份服务已启动，备份目录: {self.backup_dir}")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """停止后台备份线程。正在进行的备份会在当前步骤结束后中止。"""
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        logging.info("[src.services.database_backup_service.DatabaseBackupService.stop] 数据库备份服务已停止。")
+
+    def snapshot_now(self) -> None:
+        """请求立即对所有已注册数据库执行一次快照（异步）。"""
+        logging.info("[src.services.database_backup_service.DatabaseBackupService.snapshot_now] 收到立即快照请求。")
+        self._force_requested = True
+        self._wake_event.set()
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            force = self._force_requested
+            self._force_requested = False
+            if force or self.interval_seconds > 0:
+                try:
+                    self.backup_all(force=force)
+                except Exception as e:
+                    logging.error(f"[src.services.database_backup_service.DatabaseBackupService._run] 备份过程中发生意外错误: {e}", exc_info=True)
+            self._wake_event.wait(self.check_interval)
+            self._wake_event.clear()
+
+    # --- 备份逻辑 ---
+
+    def backup_all(self, force: bool = False) -> List[str]:
+        """
+        对所有已注册数据库执行备份。
+
+        Args:
+            force (bool): 为 True 时忽略调度间隔，对所有数据库都执行备份。
+
+        Returns:
+            List[str]: 本次成功生成的快照文件路径。
+        """
+        created = []
+        with self._backup_lock:
+            for db_path in self.registry.databases():
+                if self._stop_event.is_set():
+                    break
+                if not os.path.isfile(db_path):
+                    continue
+                if not force and not self._is_due(db_path):
+                    continue
+                try:
+                    created.append(self.backup_database(db_path))
+                    self.apply_retention(db_path)
+                except (sqlite3.Error, OSError) as e:
+                    logging.error(f"[src.services.database_backup_service.DatabaseBackupService.backup_all] 备份数据库 '{db_path}' 失败: {e}")
+        return created
+
+    def backup_database(self, db_path: str) -> str:
+        """
+        使用在线备份 API 为单个数据库生成快照。
+
+        先写入临时文件，完成后再原子地重命名，保证备份目录中不会出现不完整的快照。
+
+        Returns:
+            str: 快照文件路径。
+        """
+        snapshot_dir = self.snapshot_dir_for(db_path)
+        os.makedirs(snapshot_dir, exist_ok=True)
+        stem = os.path.splitext(os.path.basename(db_path))[0]
+        timestamp = datetime.now().strftime(SNAPSHOT_TIME_FORMAT)
+        snapshot_path = os.path.join(snapshot_dir, f"{stem}_{timestamp}{SNAPSHOT_SUFFIX}")
+        counter = 1
+        while os.path.exists(snapshot_path):
+            snapshot_path = os.path.join(snapshot_dir, f"{stem}_{timestamp}_{counter}{SNAPSHOT_SUFFIX}")
+            counter += 1
+        tmp_path = snapshot_path + ".tmp"
+
+        start = time.perf_counter()
+        # 以只读 URI 方式打开源库，避免备份线程意外修改数据
+        source = sqlite3.connect(Path(db_path).resolve().as_uri() + "?mode=ro", uri=True)
+        try:
+            target = sqlite3.connect(tmp_path)
+            try:
+                source.backup(target, pages=self.pages_per_step, progress=self._check_cancelled, sleep=self.step_sleep)
+            finally:
+                target.close()
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        finally:
+            source.close()
+        os.replace(tmp_path, snapshot_path)
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        logging.info(f"[src.services.database_backup_service.DatabaseBackupService.backup_database] 已生成快照: {snapshot_path} (耗时 {elapsed_ms:.1f} ms)")
+        return snapshot_path
+
+    def _check_cancelled(self, status, remaining, total) -> None:
+        """备份进度回调：服务停止时抛出异常以中止备份。"""
+        if self._stop_event.is_set():
+            raise sqlite3.OperationalError("备份已因服务停止而中止。")
+
+    def apply_retention(self, db_path: str) -> List[str]:
+        """删除超出保留数量的旧快照，返回被删除的文件路径。"""
+        removed = []
+        for path in self.list_snapshots(db_path)[self.keep_count:]:
+            try:
+                os.remove(path)
+                removed.append(path)
+            except OSError as e:
+                logging.warning(f"[src.services.database_backup_service.DatabaseBackupService.apply_retention] 删除旧快照 '{path}' 失败: {e}")
+        return removed
+
+    def list_snapshots(self, db_path: str) -> List[str]:
+        """返回某个数据库的全部快照路径，按时间从新到旧排序。"""
+        snapshot_dir = self.snapshot_dir_for(db_path)
+        if not os.path.isdir(snapshot_dir):
+            return []
+        paths = [os.path.join(snapshot_dir, name) for name in os.listdir(snapshot_dir)
+                 if name.endswith(SNAPSHOT_SUFFIX)]
+        return sorted(paths, key=lambda p: (os.path.getmtime(p), p), reverse=True)
+
+    def snapshot_dir_for(self, db_path: str) -> str:
+        """
+        返回某个数据库的快照子目录。
+        目录名由文件名和路径校验值组成，避免不同插件中同名数据库的快照互相覆盖。
+        """
+        normalized = os.path.normcase(os.path.abspath(db_path))
+        stem = os.path.splitext(os.path.basename(normalized))[0]
+        digest = zlib.crc32(normalized.encode("utf-8")) & 0xFFFFFFFF
+        return os.path.join(self.backup_dir, f"{stem}-{digest:08x}")
+
+    def _is_due(self, db_path: str) -> bool:
+        """判断数据库距离上次快照是否已超过调度间隔。"""
+        if self.interval_seconds <= 0:
+            return False
+        snapshots = self.list_snapshots(db_path)
+        if not snapshots:
+            return True
+        return time.time() - os.path.getmtime(snapshots[0]) >= self.interval_seconds
@@ -1,12 +1,20 @@
 # src/services/excel_data_service.py
+from __future__ import annotations
+
 import os
 import logging
-try:
-    import pandas as pd
-except ImportError:
-    pd = None
+from typing import Dict, Iterator, List, Optional
 
 from src.services.generic_data_service import GenericDataService, DataType, DataValidationError
+from src.services.frame_cache import frame_cache
+from src.utils.lazy_import import lazy_import, module_available
+
+# pandas / openpyxl 导入开销较大，延迟到首次使用时再加载
+pd = lazy_import("pandas")
+openpyxl = lazy_import("openpyxl")
+
+# 流式读取时每个分块的默认行数
+DEFAULT_CHUNK_SIZE = 10000
 
 class ExcelDataService(GenericDataService):
     """
@@ -15,19 +23,129 @@ class ExcelDataService(GenericDataService):
     
     def __init__(self, file_path: str):
         super().__init__(file_path, DataType.EXCEL)
-        if pd is None:
+        if not module_available("pandas"):
             raise ImportError("pandas库未安装，无法处理Excel文件")
             
-    def load_data(self) -> pd.DataFrame:
-        """加载Excel数据"""
+    def load_data(self, columns: Optional[List[str]] = None, dtype: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+        """
+        加载Excel数据
+
+        Args:
+            columns: 只读取指定列名（表头标签，数字表头用数字）的列，为 None 时读取全部列。
+            dtype: 列类型提示，例如 {'账号': 'string', '等级': 'Int64'}。
+        """
         try:
-            df = pd.read_excel(self.file_path)
+            # 通过解析缓存读取，源文件未变化时跳过重新解析
+            variant = repr((columns, dtype)) if columns or dtype else ""
+            df = frame_cache.load(
+                self.file_path,
+                lambda: self._read_excel(columns=columns, dtype=dtype),
+                variant=variant
+            )
             logging.info(f"[{self.service_name}] 成功加载Excel数据: {self.file_path}")
             return df
         except Exception as e:
             logging.error(f"[{self.service_name}] 加载Excel数据失败: {e}")
             raise DataValidationError(f"无法加载Excel文件: {e}")
             
+    def iter_chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE, columns: Optional[List[str]] = None,
+                    dtype: Optional[Dict[str, str]] = None, sheet_name: Optional[str] = None) -> Iterator[pd.DataFrame]:
+        """
+        使用 openpyxl 只读模式流式读取工作表，每次产出最多 `chunk_size` 行的 DataFrame。
+        第一行视为表头。只读模式按需解析 XML，内存占用只与分块大小有关。
+
+        Args:
+            chunk_size: 每个分块的行数。
+            columns: 只读取指定列名的列（规则同 `load_data`，按表格中的列顺序返回），为 None 时读取全部列。
+            dtype: 列类型提示。
+            sheet_name: 工作表名称，为 None 时读取第一个工作表（与 `pd.read_excel` 默认行为一致）。
+
+        Raises:
+            DataValidationError: 文件无法打开、工作表或列不存在。
+        """
+        chunk_size = max(int(chunk_size), 1)
+        if not self._supports_streaming():
+            # 旧版 .xls 或缺少 openpyxl 时无法流式解析，退回到一次性读取后再分块产出
+            df = self._read_excel(sheet_name=sheet_name or 0, columns=columns, dtype=dtype)
+            for start in range(0, len(df), chunk_size):
+                yield df.iloc[start:start + chunk_size]
+            return
+
+        try:
+            workbook = openpyxl.load_workbook(self.file_path, read_only=True, data_only=True)
+        except Exception as e:
+            logging.error(f"[{self.service_name}] 打开Excel数据流失败: {e}")
+            raise DataValidationError(f"无法读取Excel文件: {e}")
+
+        try:
+            try:
+                sheet = workbook[sheet_name] if sheet_name else workbook.worksheets[0]
+            except (KeyError, IndexError):
+                raise DataValidationError(f"Excel文件中不存在工作表: {sheet_name}")
+
+            rows = sheet.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return
+            header = self._column_labels(header)
+
+            if columns is None:
+                indexes = list(range(len(header)))
+            else:
+                missing = [name for name in columns if name not in header]
+                if missing:
+                    raise DataValidationError(f"Excel文件中不存在列: {missing}")
+                # 与 pd.read_excel 的 usecols 一样按表格中的列顺序返回
+                indexes = sorted(header.index(name) for name in columns)
+            names = [header[i] for i in indexes]
+            type_hints = {name: t for name, t in (dtype or {}).items() if name in names}
+
+            buffer = []
+            for row in rows:
+                buffer.append([row[i] if i < len(row) else None for i in indexes])
+                if len(buffer) >= chunk_size:
+                    yield self._build_frame(buffer, names, type_hints)
+                    buffer = []
+            if buffer:
+                yield self._build_frame(buffer, names, type_hints)
+        finally:
+            # 只读模式会保持文件句柄，必须显式关闭
+            workbook.close()
+
+    def _read_excel(self, columns: Optional[List[str]] = None, **kwargs) -> pd.DataFrame:
+        """
+        `pd.read_excel` 的包装：`columns` 始终按列名匹配。
+        直接把列表传给 usecols 时，整数会被当作列号，数字表头（如 2023）将无法选中。
+        """
+        if columns is None:
+            return pd.read_excel(self.file_path, **kwargs)
+        wanted = list(columns)
+        df = pd.read_excel(self.file_path, usecols=lambda name: name in wanted, **kwargs)
+        missing = [name for name in wanted if name not in df.columns]
+        if missing:
+            raise DataValidationError(f"Excel文件中不存在列: {missing}")
+        return df
+
+    @staticmethod
+    def _column_labels(header: tuple) -> list:
+        """
+        用 `pd.read_excel` 自身的表头解析（TextParser）生成列名，使流式读取与 `load_data` 的列标签一致：
+        数字表头仍为数字，空表头为 `Unnamed: {列号}`，重复列名按 pandas 的规则加后缀。
+        """
+        # 与 pandas 的 openpyxl 读取器相同的单元格转换：空单元格为空串，整数值的浮点数转为 int
+        cells = ["" if value is None else int(value) if isinstance(value, float) and value.is_integer() else value
+                 for value in header]
+        return list(pd.io.parsers.TextParser([cells], header=0).read().columns)
+
+    def _supports_streaming(self) -> bool:
+        """openpyxl 只支持 .xlsx/.xlsm 等 OOXML 格式。"""
+        return module_available("openpyxl") and not self.file_path.lower().endswith('.xls')
+
+    @staticmethod
+    def _build_frame(rows: list, names: List[str], type_hints: Dict[str, str]) -> pd.DataFrame:
+        df = pd.DataFrame(rows, columns=names)
+        return df.astype(type_hints) if type_hints else df
+
     def save_data(self, data: pd.DataFrame) -> bool:
         """保存Excel数据"""
         try:
@@ -43,13 +161,23 @@ class ExcelDataService(GenericDataService):
         try:
             # 如果文件不存在，则创建一个空的DataFrame并保存
             if not os.path.exists(self.file_path):
-                if pd is None:
+                if not module_available("pandas"):
                     raise ImportError("pandas库未安装，无法创建Excel文件")
                 pd.DataFrame().to_excel(self.file_path, index=False)
                 return True
 
-            # 尝试读取Excel文件头来验证结构
-            pd.read_excel(self.file_path, nrows=1)
+            if not self._supports_streaming():
+                # 无法使用 openpyxl 时退回到 pandas 读取文件头
+                pd.read_excel(self.file_path, nrows=1)
+                return True
+
+            # 以只读模式打开，只读取第一个工作表的表头行，不会解析整个工作簿
+            workbook = openpyxl.load_workbook(self.file_path, read_only=True)
+            try:
+                if workbook.worksheets:
+                    next(workbook.worksheets[0].iter_rows(max_row=1, values_only=True), None)
+            finally:
+                workbook.close()
             return True
         except Exception as e:
             logging.warning(f"[{self.service_name}] Excel文件结构验证失败: {e}")
@@ -0,0 +1,188 @@
+# src/services/file_journal.py
+"""
+文件数据服务共用的安全写入工具。
+
+- `atomic_write_text`: 写临时文件 + fsync + rename，保证目标文件要么是旧内容，要么是完整的新内容。
+- `PatchJournal`: 追加式补丁日志（每行一条 JSON 记录），用于把小改动以 O(改动大小) 的代价持久化，
+  之后再定期合并（compaction）进基础文件。
+- `apply_json_patch`: JSON Patch (RFC 6902) 的 add / replace / remove 子集。
+"""
+import os
+import json
+import stat
+import logging
+import tempfile
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def atomic_write_text(path: str, text: str, encoding: str = 'utf-8') -> None:
+    """
+    原子地写入文本文件：在同一目录写入临时文件并 fsync，再用 os.replace 替换目标文件。
+    进程在任何时刻崩溃，目标文件都不会处于被截断的中间状态。
+    """
+    dir_name = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + '.', suffix='.tmp', dir=dir_name)
+    try:
+        # mkstemp 创建的文件权限为 0600，沿用原文件的权限
+        if os.path.exists(path):
+            os.chmod(tmp_path, stat.S_IMODE(os.stat(path).st_mode))
+        with os.fdopen(fd, 'w', encoding=encoding) as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    _fsync_directory(dir_name)
+
+
+def _fsync_directory(dir_name: str) -> None:
+    """尽力把目录项（rename 结果）刷到磁盘。Windows 不支持对目录 fsync，忽略即可。"""
+    if os.name == 'nt':
+        return
+    try:
+        fd = os.open(dir_name, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def file_signature(path: str) -> Optional[List[int]]:
+    """返回文件的 [大小, mtime_ns] 签名，文件不存在时返回 None。"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+class PatchJournal:
+    """
+    与某个基础文件配对的追加式补丁日志。
+
+    日志第一行是头部记录 {"base": 基础文件签名}，只有当基础文件的签名与之一致时，
+    日志中的补丁才会被重放。合并时先原子地替换基础文件、再清空日志：
+    若两步之间发生崩溃，基础文件签名已经改变，残留的日志会被识别为过期而丢弃，补丁不会被重复应用。
+    """
+    def __init__(self, base_path: str, journal_path: Optional[str] = None):
+        self.base_path = base_path
+        self.journal_path = journal_path or base_path + '.journal'
+
+    def size(self) -> int:
+        """日志文件的字节数。"""
+        try:
+            return os.path.getsize(self.journal_path)
+        except OSError:
+            return 0
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """追加一条记录并 fsync。日志为空时先写入基础文件签名头部。"""
+        lines = []
+        if self.size() == 0:
+            lines.append(json.dumps({"base": file_signature(self.base_path)}))
+        lines.append(json.dumps(record, ensure_ascii=False))
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def read(self) -> List[Dict[str, Any]]:
+        """
+        读取与当前基础文件匹配的所有记录。
+        末尾不完整的行（追加时崩溃）会被忽略；日志过期时返回空列表。
+        """
+        if self.size() == 0:
+            return []
+        records = []
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            lines = f.read().split('\n')
+        try:
+            header = json.loads(lines[0])
+        except ValueError:
+            logging.warning(f"[src.services.file_journal.PatchJournal.read] 补丁日志头部损坏，已忽略: {self.journal_path}")
+            return []
+        if header.get("base") != file_signature(self.base_path):
+            logging.warning(f"[src.services.file_journal.PatchJournal.read] 补丁日志与基础文件不匹配（已合并或文件被外部修改），已忽略: {self.journal_path}")
+            return []
+        for line in lines[1:]:
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                logging.warning(f"[src.services.file_journal.PatchJournal.read] 补丁日志末尾存在不完整的记录，已忽略: {self.journal_path}")
+                break
+        return records
+
+    def clear(self) -> None:
+        """删除日志文件。"""
+        try:
+            os.remove(self.journal_path)
+        except FileNotFoundError:
+            pass
+
+
+def _parse_pointer(pointer: str) -> List[str]:
+    """把 JSON Pointer（如 '/groups/0/name'）拆分为路径片段。"""
+    if pointer == '':
+        return []
+    if not pointer.startswith('/'):
+        raise ValueError(f"无效的 JSON Pointer: {pointer}")
+    return [part.replace('~1', '/').replace('~0', '~') for part in pointer[1:].split('/')]
+
+
+def _resolve_parent(document: Any, parts: List[str]) -> Tuple[Any, str]:
+    target = document
+    for part in parts[:-1]:
+        target = target[int(part)] if isinstance(target, list) else target[part]
+    return target, parts[-1]
+
+
+def apply_json_patch(document: Any, operations: List[Dict[str, Any]]) -> Any:
+    """
+    在原地对文档应用补丁操作，返回应用后的文档（替换根节点时为新对象）。
+
+    Raises:
+        ValueError: 操作类型不受支持或路径无效。
+    """
+    for op in operations:
+        kind = op.get('op')
+        parts = _parse_pointer(op.get('path', ''))
+        if not parts:
+            if kind in ('add', 'replace'):
+                document = op['value']
+                continue
+            raise ValueError("不能删除文档根节点")
+        try:
+            parent, key = _resolve_parent(document, parts)
+            if kind == 'add':
+                if isinstance(parent, list):
+                    if key == '-':
+                        parent.append(op['value'])
+                    else:
+                        parent.insert(int(key), op['value'])
+                else:
+                    parent[key] = op['value']
+            elif kind == 'replace':
+                if isinstance(parent, list):
+                    parent[int(key)] = op['value']
+                else:
+                    if key not in parent:
+                        raise KeyError(key)
+                    parent[key] = op['value']
+            elif kind == 'remove':
+                del parent[int(key) if isinstance(parent, list) else key]
+            else:
+                raise ValueError(f"不支持的补丁操作: {kind}")
+        except (KeyError, IndexError, TypeError) as e:
+            raise ValueError(f"补丁路径无效 '{op.get('path')}': {e}")
+    return document
@@ -0,0 +1,167 @@
+# desktop_center/src/services/frame_cache.py
+"""
+解析结果的磁盘缓存（主要用于 Excel / CSV 数据源）。
+
+openpyxl 解析大型工作簿往往需要数秒，而同一个文件会被反复打开。
+此模块把解析得到的 DataFrame 以 pickle 二进制格式保存在应用数据目录下，
+缓存键由 文件路径 + 工作表 + 读取参数 组成，并附带源文件的 大小 + mtime 签名：
+源文件一旦变化，签名不再匹配，旧条目即失效并在下一次写入时被清理。
+总占用超过磁盘预算时，按最近使用时间（LRU）淘汰。
+"""
+import os
+import time
+import pickle
+import hashlib
+import logging
+import threading
+from typing import Any, Callable, Optional
+
+CACHE_SUFFIX = ".pkl"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+class FrameCache:
+    """基于源文件签名的 LRU 磁盘缓存。未配置缓存目录时所有操作都是空操作。"""
+
+    def __init__(self):
+        self.cache_dir: Optional[str] = None
+        self.max_bytes = DEFAULT_MAX_BYTES
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.cache_dir is not None
+
+    def configure(self, cache_dir: Optional[str], max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        """
+        Args:
+            cache_dir (str): 缓存目录，传入 None 表示禁用缓存。
+            max_bytes (int): 缓存目录允许占用的最大字节数。
+        """
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        self.cache_dir = cache_dir or None
+        self.max_bytes = max(int(max_bytes), 0)
+        logging.info(f"[src.services.frame_cache.FrameCache.configure] 解析缓存 {'已启用: ' + cache_dir if cache_dir else '已禁用'}")
+
+    def load(self, source_path: str, loader: Callable[[], Any], sheet: Optional[str] = None, variant: str = "") -> Any:
+        """
+        读取缓存，未命中时调用 `loader()` 解析源文件并写入缓存。
+
+        Args:
+            source_path (str): 源文件路径。
+            loader (callable): 无参函数，返回解析后的对象（通常是 DataFrame）。
+            sheet (str): 工作表名称，用于区分同一工作簿的不同工作表。
+            variant (str): 其他影响解析结果的参数（如列选择、类型提示）的描述。
+        """
+        if not self.enabled:
+            return loader()
+        # 签名必须在解析之前获取：解析期间源文件被修改时，缓存条目会以旧签名保存并在下次自然失效
+        signature = self._signature(source_path)
+        if signature is None:
+            return loader()
+        cached = self._read(source_path, sheet, variant, signature)
+        if cached is not None:
+            return cached
+        data = loader()
+        self._write(source_path, sheet, variant, signature, data)
+        return data
+
+    def invalidate(self, source_path: str, sheet: Optional[str] = None, variant: str = "") -> None:
+        """删除某个源文件（指定工作表/参数）的全部缓存条目。"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._remove_entries(self._entry_prefix(source_path, sheet, variant))
+
+    # --- 内部实现 ---
+
+    @staticmethod
+    def _signature(source_path: str) -> Optional[str]:
+        try:
+            stat = os.stat(source_path)
+        except OSError:
+            return None
+        return f"{stat.st_size}_{stat.st_mtime_ns}"
+
+    @staticmethod
+    def _entry_prefix(source_path: str, sheet: Optional[str], variant: str) -> str:
+        key = f"{os.path.normcase(os.path.abspath(source_path))}|{sheet or ''}|{variant}"
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()[:20]
+
+    def _entry_path(self, prefix: str, signature: str) -> str:
+        return os.path.join(self.cache_dir, f"{prefix}_{signature}{CACHE_SUFFIX}")
+
+    def _read(self, source_path: str, sheet: Optional[str], variant: str, signature: str) -> Any:
+        entry_path = self._entry_path(self._entry_prefix(source_path, sheet, variant), signature)
+        try:
+            start = time.perf_counter()
+            with open(entry_path, "rb") as f:
+                data = pickle.load(f)
+            # 更新 mtime 作为最近使用时间，供 LRU 淘汰使用
+            os.utime(entry_path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as e:
+            logging.warning(f"[src.services.frame_cache.FrameCache._read] 缓存条目损坏，已丢弃: {entry_path} ({e})")
+            self._safe_remove(entry_path)
+            self.misses += 1
+            return None
+        self.hits += 1
+        logging.debug("[src.services.frame_cache.FrameCache._read] 命中解析缓存: %s (%.1f ms)", source_path, (time.perf_counter() - start) * 1000)
+        return data
+
+    def _write(self, source_path: str, sheet: Optional[str], variant: str, signature: str, data: Any) -> None:
+        prefix = self._entry_prefix(source_path, sheet, variant)
+        entry_path = self._entry_path(prefix, signature)
+        tmp_path = f"{entry_path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            if os.path.getsize(tmp_path) > self.max_bytes:
+                self._safe_remove(tmp_path)
+                return
+            with self._lock:
+                # 同一源文件的旧签名条目已经失效，写入新条目前一并清理
+                self._remove_entries(prefix)
+                os.replace(tmp_path, entry_path)
+                self._evict()
+        except Exception as e:
+            logging.warning(f"[src.services.frame_cache.FrameCache._write] 写入解析缓存失败: {e}")
+            self._safe_remove(tmp_path)
+
+    def _remove_entries(self, prefix: str) -> None:
+        for name in os.listdir(self.cache_dir):
+            if name.startswith(prefix + "_") and name.endswith(CACHE_SUFFIX):
+                self._safe_remove(os.path.join(self.cache_dir, name))
+
+    def _evict(self) -> None:
+        """按最近使用时间从旧到新删除条目，直到总大小不超过预算。"""
+        entries = []
+        total = 0
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith(CACHE_SUFFIX):
+                stat = entry.stat()
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                total += stat.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self._safe_remove(path)
+            total -= size
+            logging.debug(f"[src.services.frame_cache.FrameCache._evict] 超出磁盘预算，已淘汰缓存条目: {path}")
+
+    @staticmethod
+    def _safe_remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+# 全局缓存实例，由应用启动时根据配置调用 configure()
+frame_cache = FrameCache()
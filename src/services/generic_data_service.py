@@ -240,15 +240,14 @@ class SQLiteDataService(GenericDataService):
     def check_write_access(self) -> bool:
         """
         检查 SQLite 数据库文件的写入权限。
-        此方法委托给 `SqlDataService.check_db_writability()` 静态方法，
-        该方法能更准确地判断数据库文件的可写性。
+        此方法委托给内部数据库服务的 `_check_write_access()`，复用其已建立的连接，
+        不再额外打开第二个连接，且检查结果会在该连接上缓存，后续的模式验证不会重复检查。
         Returns:
             bool: 如果数据库文件可写则返回 True，否则返回 False。
         """
-        from src.services.sqlite_base_service import SqlDataService
-        is_writable, msg = SqlDataService.check_db_writability(self.file_path)
+        is_writable = self.db_service._check_write_access()
         if not is_writable:
-            logging.warning(f"[src.services.generic_data_service.{self.service_name}.check_write_access] [SQLiteDataService] [检查失败] SQLite 文件写入权限检查失败: {msg}")
+            logging.warning(f"[src.services.generic_data_service.{self.service_name}.check_write_access] [SQLiteDataService] [检查失败] SQLite 文件写入权限检查失败。")
         else:
             logging.debug(f"[src.services.generic_data_service.{self.service_name}.check_write_access] [SQLiteDataService] [检查通过] SQLite 文件写入权限检查通过。")
         return is_writable
@@ -1,9 +1,11 @@
 # src/services/ini_data_service.py
+import io
 import os
 import logging
 import configparser
 
 from src.services.generic_data_service import GenericDataService, DataType, DataValidationError
+from src.services.file_journal import atomic_write_text
 
 class INIDataService(GenericDataService):
     """
@@ -25,10 +27,11 @@ class INIDataService(GenericDataService):
             raise DataValidationError(f"无法加载INI文件: {e}")
             
     def save_data(self, data: configparser.ConfigParser) -> bool:
-        """保存INI配置数据"""
+        """保存INI配置数据（原子写入，崩溃时不会留下被截断的文件）"""
         try:
-            with open(self.file_path, 'w', encoding='utf-8') as f:
-                data.write(f)
+            buffer = io.StringIO()
+            data.write(buffer)
+            atomic_write_text(self.file_path, buffer.getvalue())
             logging.info(f"[{self.service_name}] 成功保存INI配置: {self.file_path}")
             return True
         except Exception as e:
@@ -2,52 +2,124 @@
 import os
 import json
 import logging
-from typing import Union, Dict, List
+from typing import Any, Dict, List, Optional, Union
 
 from src.services.generic_data_service import GenericDataService, DataType, DataValidationError
+from src.services.file_journal import PatchJournal, apply_json_patch, atomic_write_text
+
+# 补丁日志超过该大小（且超过基础文件大小）时自动合并
+COMPACT_MIN_BYTES = 64 * 1024
 
 class JSONDataService(GenericDataService):
     """
     JSON文件数据服务。
+
+    支持两种写入方式：
+    - `save_data`: 整体原子写入（临时文件 + fsync + rename），并清空补丁日志。
+    - `apply_patch`: 把小改动以 JSON Patch 的形式追加到 `<文件>.journal`，
+      日志增长到一定规模后自动合并进基础文件。`load_data` 会重放日志。
     """
-    
-    def __init__(self, file_path: str):
+
+    def __init__(self, file_path: str, compact_min_bytes: int = COMPACT_MIN_BYTES):
         super().__init__(file_path, DataType.JSON)
-            
+        self.journal = PatchJournal(file_path)
+        self.compact_min_bytes = compact_min_bytes
+        # 打补丁时使用的内存文档，避免每次打补丁都重新解析基础文件
+        self._document: Optional[Union[Dict, List]] = None
+
     def load_data(self) -> Union[Dict, List]:
-        """加载JSON数据"""
+        """加载JSON数据（基础文件 + 补丁日志重放）"""
         try:
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = self._read_document()
             logging.info(f"[{self.service_name}] 成功加载JSON数据: {self.file_path}")
             return data
         except Exception as e:
             logging.error(f"[{self.service_name}] 加载JSON数据失败: {e}")
             raise DataValidationError(f"无法加载JSON文件: {e}")
-            
+
     def save_data(self, data: Union[Dict, List]) -> bool:
-        """保存JSON数据"""
+        """保存JSON数据（整体原子写入）"""
         try:
-            with open(self.file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            self._write_base(data)
+            # 调用方仍持有 data 的引用，不把它作为内存文档缓存
+            self._document = None
             logging.info(f"[{self.service_name}] 成功保存JSON数据: {self.file_path}")
             return True
         except Exception as e:
             logging.error(f"[{self.service_name}] 保存JSON数据失败: {e}")
             return False
-            
+
+    def apply_patch(self, operations: List[Dict[str, Any]]) -> bool:
+        """
+        以补丁日志的方式持久化一组小改动。
+
+        Args:
+            operations: JSON Patch 操作列表，支持 add / replace / remove，
+                例如 [{"op": "replace", "path": "/settings/theme", "value": "dark"}]。
+
+        Returns:
+            bool: 成功返回 True。补丁无效或写入失败时返回 False，磁盘上的数据保持不变。
+        """
+        try:
+            if not os.path.exists(self.file_path):
+                self._write_base({})
+                self._document = {}
+            if self._document is None:
+                self._document = self._read_document()
+            # 先在内存中应用以校验补丁，校验通过后才写入日志
+            self._document = apply_json_patch(self._document, operations)
+            self.journal.append({"ops": operations})
+        except Exception as e:
+            # 内存文档可能只应用了部分操作，丢弃它，下次从磁盘重新加载
+            self._document = None
+            logging.error(f"[{self.service_name}] 追加JSON补丁失败: {e}")
+            return False
+
+        if self.journal.size() > max(self.compact_min_bytes, os.path.getsize(self.file_path)):
+            self.compact()
+        return True
+
+    def compact(self) -> bool:
+        """把补丁日志合并进基础文件。"""
+        try:
+            if self.journal.size() == 0:
+                return True
+            if self._document is None:
+                self._document = self._read_document()
+            self._write_base(self._document)
+            logging.info(f"[{self.service_name}] 已将补丁日志合并进JSON文件: {self.file_path}")
+            return True
+        except Exception as e:
+            logging.error(f"[{self.service_name}] 合并JSON补丁日志失败: {e}")
+            return False
+
+    def _read_document(self) -> Union[Dict, List]:
+        """读取基础文件并重放补丁日志。"""
+        with open(self.file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        records = self.journal.read()
+        for record in records:
+            data = apply_json_patch(data, record['ops'])
+        if records:
+            logging.debug(f"[{self.service_name}] 已重放 {len(records)} 条JSON补丁: {self.journal.journal_path}")
+        return data
+
+    def _write_base(self, data: Union[Dict, List]) -> None:
+        """原子地写入基础文件，然后删除（已被包含的）补丁日志。"""
+        atomic_write_text(self.file_path, json.dumps(data, ensure_ascii=False, indent=2))
+        self.journal.clear()
+
     def validate_data_structure(self) -> bool:
         """验证JSON文件结构"""
         try:
             # 如果文件不存在，则创建一个空的JSON对象或数组
             if not os.path.exists(self.file_path):
-                with open(self.file_path, 'w', encoding='utf-8') as f:
-                    json.dump({}, f) # 默认创建一个空对象
+                atomic_write_text(self.file_path, json.dumps({})) # 默认创建一个空对象
                 return True
-            
+
             with open(self.file_path, 'r', encoding='utf-8') as f:
                 json.load(f)
             return True
         except Exception as e:
             logging.warning(f"[{self.service_name}] JSON文件结构验证失败: {e}")
-            return False
\ No newline at end of file
+            return False
@@ -1,15 +1,53 @@
 # desktop_center/src/services/notification_service.py
-import logging
+"""
+平台共享的桌面通知服务。
+
+`show()` 可以在任意线程中调用且不会阻塞：通知被放入队列，由唯一的分发线程调用 plyer 弹出。
+分发前会做两层限流：
+
+- 合并：同一 (标题, 内容) 的通知若仍在队列中，或在合并窗口内刚刚弹出过，则合并为一次，
+  仍在队列中的通知会在标题后附加合并次数。
+- 全局速率上限：任意 60 秒内最多弹出 `max_per_minute` 条，超出的通知被丢弃。
+
+`stats()` 返回已弹出 / 已合并 / 已丢弃等计数，供日志和性能页面使用。
+"""
 import os
-from plyer import notification
+import time
+import logging
+import threading
+from collections import OrderedDict, deque
+from typing import Callable, Dict, Optional, Tuple
+
 from src.services.config_service import ConfigService
+from src.utils.lazy_import import lazy_import
+
+# plyer 会按平台加载通知后端，延迟到第一次弹出通知时再导入
+plyer = lazy_import("plyer")
+
+DEFAULT_MERGE_WINDOW_SECONDS = 10.0
+DEFAULT_MAX_PER_MINUTE = 20
+# 等待分发的通知数量上限，超出时丢弃最早的通知
+MAX_PENDING = 50
+RATE_WINDOW_SECONDS = 60.0
+
+
+class _PendingNotification:
+    __slots__ = ("title", "message", "timeout", "count")
+
+    def __init__(self, title: str, message: str, timeout: int):
+        self.title = title
+        self.message = message
+        self.timeout = timeout
+        self.count = 1
+
 
 class NotificationService:
     """
     负责管理和显示桌面弹窗通知的核心服务。
-    此版本使用系统的原生通知功能，通过 'plyer' 库实现。
+    此版本使用系统的原生通知功能，通过 'plyer' 库实现，弹窗在独立的分发线程中执行。
     """
-    def __init__(self, app_name: str, app_icon: str, config_service: ConfigService, app_id: str = None):
+    def __init__(self, app_name: str, app_icon: str, config_service: ConfigService, app_id: str = None,
+                 notifier: Optional[Callable[..., None]] = None, clock: Callable[[], float] = time.monotonic):
         """
         初始化通知服务。
 
@@ -18,16 +56,46 @@ class NotificationService:
             app_icon (str): 指向应用程序图标文件的路径 (.ico for Windows)。
             config_service (ConfigService): 配置服务实例。
             app_id (str, optional): 应用程序的唯一ID (AUMID)，用于Windows通知。
+            notifier (callable, optional): 实际弹出通知的函数，签名同 `plyer.notification.notify`。
+                为 None 时使用 plyer。
+            clock (callable, optional): 单调时钟，用于合并窗口和速率上限的计时。
         """
         self.app_name = app_name
         self.app_icon = app_icon
         self.config_service = config_service
         self.app_id = app_id
+        self._notifier = notifier or self._notify_with_plyer
+        self._clock = clock
+
+        self._condition = threading.Condition()
+        self._pending: "OrderedDict[Tuple[str, str], _PendingNotification]" = OrderedDict()
+        self._last_shown: Dict[Tuple[str, str], float] = {}
+        self._shown_times: deque = deque()
+        self._counters = {"shown": 0, "merged": 0, "dropped": 0, "disabled": 0, "failed": 0}
+        self._worker: Optional[threading.Thread] = None
+        self._stopping = False
+
+        # 全局设置缓存在实例上，配置变化时由订阅回调更新
+        self._load_settings()
+        self._unsubscribers = [
+            config_service.subscribe(self._on_config_changed, section="General"),
+            config_service.subscribe(self._on_config_changed, section="Notification"),
+        ]
         logging.info(f"通知服务 (NotificationService) 初始化完成。App ID: {self.app_id}")
 
-    def show(self, title: str, message: str, level: str = 'INFO', enable_popup: bool = None, timeout: int = None):
+    def _load_settings(self):
+        config = self.config_service
+        self._popup_enabled = config.get_bool("General", "enable_desktop_popup", True)
+        self._popup_timeout = config.get_int("General", "popup_timeout", 10)
+        self._merge_window = max(0.0, config.get_float("Notification", "merge_window_seconds", DEFAULT_MERGE_WINDOW_SECONDS))
+        self._max_per_minute = max(1, config.get_int("Notification", "max_per_minute", DEFAULT_MAX_PER_MINUTE))
+
+    def _on_config_changed(self, section, option, old, new):
+        self._load_settings()
+
+    def show(self, title: str, message: str, level: str = 'INFO', enable_popup: bool = None, timeout: int = None) -> bool:
         """
-        供所有插件调用的公共接口，用于显示一个系统原生通知。
+        供所有插件调用的公共接口，用于显示一个系统原生通知。可在任意线程调用，不会阻塞。
 
         Args:
             title (str): 通知的标题。
@@ -35,40 +103,136 @@ class NotificationService:
             level (str, optional): 通知的级别（暂未使用，为未来扩展保留）。
             enable_popup (bool, optional): 是否弹出。如果为None，则使用全局配置。
             timeout (int, optional): 弹窗超时时间。如果为None，则使用全局配置。
+
+        Returns:
+            bool: 通知是否进入了队列（被合并到已有通知时返回 False）。
         """
-        # 1. 检查是否允许弹窗
-        # 优先使用调用者传入的覆盖值，否则使用全局配置
-        popup_is_enabled = enable_popup
-        if popup_is_enabled is None:
-            popup_is_enabled = self.config_service.get_value("General", "enable_desktop_popup", "true").lower() == 'true'
-        
+        # 1. 检查是否允许弹窗，优先使用调用者传入的覆盖值，否则使用全局配置
+        popup_is_enabled = self._popup_enabled if enable_popup is None else enable_popup
         if not popup_is_enabled:
-            logging.info(f"通知 '{title}' 已被插件或全局设置禁用，本次通知已忽略。")
-            return
-
-        # 2. 检查通知级别是否满足阈值 (未来可扩展)
-        # ...
-
-        # 3. 调用plyer发送通知
-        try:
-            # 确保图标文件存在
-            icon_path = self.app_icon if os.path.exists(self.app_icon) else ''
-            
-            # 优先使用调用者传入的覆盖值，否则使用全局配置
-            if timeout is None:
-                timeout_str = self.config_service.get_value("General", "popup_timeout", "10")
-                timeout = int(timeout_str) if timeout_str.isdigit() else 10
-            
-            # 【核心修复】在Windows上，plyer的 'app_name' 参数实际上被用作 AppUserModelID
-            # 因此，我们传递 self.app_id 而不是 self.app_name
-            notification.notify(
-                title=title,
-                message=message,
-                app_name=self.app_id or self.app_name, # 优先使用ID
-                app_icon=icon_path,
-                timeout=timeout
-            )
-            logging.info(f"已发送系统通知: title='{title}'")
-        except Exception as e:
-            # plyer在某些环境下（如无GUI的服务器或缺少依赖）可能会失败
-            logging.error(f"发送系统通知时发生错误: {e}", exc_info=True)
\ No newline at end of file
+            with self._condition:
+                self._counters["disabled"] += 1
+            logging.debug(f"通知 '{title}' 已被插件或全局设置禁用，本次通知已忽略。")
+            return False
+
+        if timeout is None:
+            timeout = self._popup_timeout
+
+        key = (title, message)
+        with self._condition:
+            if self._stopping:
+                return False
+            # 2. 合并：仍在队列中，或在合并窗口内刚弹出过的相同通知
+            pending = self._pending.get(key)
+            if pending is not None:
+                pending.count += 1
+                self._counters["merged"] += 1
+                return False
+            last = self._last_shown.get(key)
+            if last is not None and self._clock() - last < self._merge_window:
+                self._counters["merged"] += 1
+                return False
+
+            # 3. 入队，队列满时丢弃最早的通知
+            if len(self._pending) >= MAX_PENDING:
+                dropped_key, _ = self._pending.popitem(last=False)
+                self._counters["dropped"] += 1
+                logging.warning(f"通知队列已满，丢弃最早的通知: '{dropped_key[0]}'")
+            self._pending[key] = _PendingNotification(title, message, timeout)
+            self._ensure_worker()
+            self._condition.notify()
+        return True
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._dispatch_loop, name="NotificationDispatcher", daemon=True)
+            self._worker.start()
+
+    def _dispatch_loop(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._stopping:
+                    self._condition.wait()
+                if self._stopping:
+                    return
+                key, notification = self._pending.popitem(last=False)
+                if not self._acquire_rate_slot():
+                    self._counters["dropped"] += 1
+                    logging.warning(f"通知弹出速率超过上限 ({self._max_per_minute} 条/分钟)，已丢弃: '{notification.title}'")
+                    continue
+                self._record_shown(key)
+
+            title = notification.title
+            if notification.count > 1:
+                title = f"{title} (×{notification.count})"
+            try:
+                self._notifier(title=title, message=notification.message, timeout=notification.timeout)
+                logging.info(f"已发送系统通知: title='{title}'")
+            except Exception as e:
+                # plyer在某些环境下（如无GUI的服务器或缺少依赖）可能会失败
+                with self._condition:
+                    self._counters["failed"] += 1
+                logging.error(f"发送系统通知时发生错误: {e}", exc_info=True)
+
+    def _acquire_rate_slot(self) -> bool:
+        """在锁内调用：滑动窗口内弹出数量未达上限时占用一个名额。"""
+        now = self._clock()
+        while self._shown_times and now - self._shown_times[0] >= RATE_WINDOW_SECONDS:
+            self._shown_times.popleft()
+        if len(self._shown_times) >= self._max_per_minute:
+            return False
+        self._shown_times.append(now)
+        return True
+
+    def _record_shown(self, key: Tuple[str, str]):
+        """在锁内调用：记录弹出时间并清理已过合并窗口的记录。"""
+        now = self._clock()
+        self._counters["shown"] += 1
+        self._last_shown[key] = now
+        if len(self._last_shown) > 256:
+            self._last_shown = {k: t for k, t in self._last_shown.items() if now - t < self._merge_window}
+
+    def _notify_with_plyer(self, title: str, message: str, timeout: int):
+        # 确保图标文件存在
+        icon_path = self.app_icon if os.path.exists(self.app_icon) else ''
+        # 【核心修复】在Windows上，plyer的 'app_name' 参数实际上被用作 AppUserModelID
+        # 因此，我们传递 self.app_id 而不是 self.app_name
+        plyer.notification.notify(
+            title=title,
+            message=message,
+            app_name=self.app_id or self.app_name, # 优先使用ID
+            app_icon=icon_path,
+            timeout=timeout
+        )
+
+    def stats(self) -> Dict[str, int]:
+        """返回通知计数：shown / merged / dropped / disabled / failed，以及当前排队数 pending。"""
+        with self._condition:
+            stats = dict(self._counters)
+            stats["pending"] = len(self._pending)
+        return stats
+
+    def wait_idle(self, timeout: float = 5.0) -> bool:
+        """等待队列清空（主要用于测试）。注意：最后一条通知可能仍在弹出过程中。"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._condition:
+                if not self._pending:
+                    return True
+            time.sleep(0.01)
+        return False
+
+    def shutdown(self, timeout: float = 2.0):
+        """停止分发线程，丢弃尚未弹出的通知。"""
+        for unsubscribe in self._unsubscribers:
+            unsubscribe()
+        with self._condition:
+            self._stopping = True
+            discarded = len(self._pending)
+            self._counters["dropped"] += discarded
+            self._pending.clear()
+            self._condition.notify_all()
+            worker = self._worker
+        if worker is not None:
+            worker.join(timeout)
+        logging.info(f"[src.services.notification_service.NotificationService.shutdown] 通知服务已停止，统计: {self.stats()}")
@@ -1,10 +1,16 @@
 # src/services/sqlite_base_service.py
+import re
 import sqlite3
 import os
+import time
 import logging
-from typing import Set
+import threading
+from typing import Set, List, Dict, Any
 from enum import Enum, auto
 
+from src.services.database_backup_service import database_registry
+from src.utils.metrics import metrics
+
 class SchemaType(Enum):
     """定义数据库的模式类型，以控制验证级别。"""
     FIXED = auto()    # 固定的、需要严格验证的模式
@@ -21,6 +27,274 @@ class ValidationFlags:
     # 默认进行所有检查
     FULL_CHECK = CHECK_WRITE_ACCESS | CHECK_TABLE_EXISTS | CHECK_COLUMNS | CHECK_READABLE
 
+class QueryProfiler:
+    """
+    可选启用的 SQL 语句性能分析器。
+
+    启用后，通过 `connect_database()` 创建的连接会记录每条语句的执行耗时，
+    按归一化后的 SQL（字面量替换为 ?）聚合统计；对超过慢查询阈值的语句，
+    会在同一连接上补充执行一次 `EXPLAIN QUERY PLAN` 并缓存结果，
+    最终可生成包含缺失索引建议的文本报告。
+
+    未启用时 `connect_database()` 直接返回普通的 sqlite3 连接，没有任何额外开销。
+    注意：分析器只在连接创建时生效，因此需在各插件打开数据库之前调用 `configure()`。
+    """
+    _STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+    _NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+    _IN_LIST = re.compile(r"\bIN\s*\((?:\s*\?\s*,)*\s*\?\s*\)", re.IGNORECASE)
+    _WHITESPACE = re.compile(r"\s+")
+    _PLAN_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$")
+    _WHERE_COLUMN = re.compile(r'"?(\w+)"?\s*(?:=|>=|<=|>|<|\bIN\b|\bLIKE\b|\bIS\b)', re.IGNORECASE)
+    _ORDER_BY = re.compile(r"\bORDER BY\s+(.+?)(?:\bLIMIT\b|$)", re.IGNORECASE)
+    _EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")
+
+    def __init__(self):
+        self.enabled = False
+        self.slow_threshold_ms = 100.0
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, enabled: bool, slow_threshold_ms: float = 100.0) -> None:
+        """启用或禁用分析器，并设置慢查询阈值（毫秒）。"""
+        self.enabled = bool(enabled)
+        self.slow_threshold_ms = max(float(slow_threshold_ms), 0.0)
+        logging.info(f"[src.services.sqlite_base_service.QueryProfiler.configure] [QueryProfiler] SQL 性能分析: {'启用' if self.enabled else '禁用'}，慢查询阈值: {self.slow_threshold_ms:g} ms")
+
+    def reset(self) -> None:
+        """清空已收集的统计数据。"""
+        with self._lock:
+            self._stats.clear()
+
+    @classmethod
+    def normalize_sql(cls, sql: str) -> str:
+        """将 SQL 中的字面量替换为占位符并压缩空白，使同类语句聚合到一起。"""
+        normalized = cls._STRING_LITERAL.sub("?", sql)
+        normalized = cls._NUMBER_LITERAL.sub("?", normalized)
+        normalized = cls._IN_LIST.sub("IN (...)", normalized)
+        return cls._WHITESPACE.sub(" ", normalized).strip().rstrip(";")
+
+    def record(self, connection: sqlite3.Connection, sql: str, parameters, elapsed_ms: float,
+               database: str, capture_plan: bool = True) -> str:
+        """
+        记录一次语句执行（或其结果集读取）的耗时。
+
+        Returns:
+            str: 该语句的归一化键。
+        """
+        key = self.normalize_sql(sql)
+        need_plan = False
+        metrics.counter("db.profiled_queries", "SQL 性能分析器记录的语句数").inc()
+        metrics.histogram("db.query_ms", "SQL 语句执行耗时（仅在启用 SQL 性能分析时记录）").observe(elapsed_ms)
+        with self._lock:
+            stat = self._stats.get(key)
+            if stat is None:
+                stat = {"sql": key, "database": database, "count": 0, "total_ms": 0.0,
+                        "max_ms": 0.0, "slow_count": 0, "plan": None}
+                self._stats[key] = stat
+            stat["count"] += 1
+            stat["total_ms"] += elapsed_ms
+            stat["max_ms"] = max(stat["max_ms"], elapsed_ms)
+            if elapsed_ms >= self.slow_threshold_ms:
+                stat["slow_count"] += 1
+                need_plan = capture_plan and stat["plan"] is None
+        if need_plan:
+            self._capture_plan(connection, key, sql, parameters)
+        return key
+
+    def add_fetch_time(self, connection: sqlite3.Connection, key: str, sql: str, parameters, elapsed_ms: float) -> None:
+        """
+        将结果集读取的耗时累加到对应语句上。
+        SQLite 的大部分查询工作发生在逐行读取时，因此读取阶段变慢同样会触发执行计划采集。
+        """
+        need_plan = False
+        with self._lock:
+            stat = self._stats.get(key)
+            if stat is None:
+                return
+            stat["total_ms"] += elapsed_ms
+            stat["max_ms"] = max(stat["max_ms"], elapsed_ms)
+            if elapsed_ms >= self.slow_threshold_ms:
+                stat["slow_count"] += 1
+                need_plan = stat["plan"] is None
+        if need_plan:
+            self._capture_plan(connection, key, sql, parameters)
+
+    def _capture_plan(self, connection: sqlite3.Connection, key: str, sql: str, parameters) -> None:
+        """在原连接上执行 EXPLAIN QUERY PLAN，并缓存计划详情。"""
+        plan: List[str] = []
+        if sql.lstrip().upper().startswith(self._EXPLAINABLE):
+            try:
+                # 使用基础游标，避免计划查询本身再次被记录
+                cursor = sqlite3.Connection.cursor(connection, sqlite3.Cursor)
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}", parameters)
+                plan = [row[-1] for row in cursor.fetchall()]
+                cursor.close()
+            except sqlite3.Error as e:
+                plan = [f"<无法获取执行计划: {e}>"]
+        with self._lock:
+            self._stats[key]["plan"] = plan
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """返回按总耗时降序排列的统计数据副本。"""
+        with self._lock:
+            stats = [dict(stat, plan=list(stat["plan"]) if stat["plan"] is not None else None)
+                     for stat in self._stats.values()]
+        return sorted(stats, key=lambda stat: stat["total_ms"], reverse=True)
+
+    def suggest_indexes(self, stat: Dict[str, Any]) -> List[str]:
+        """
+        根据执行计划为单条语句给出索引建议。
+        这是启发式建议：对全表扫描的表，取 WHERE 子句中引用的列；对使用临时 B 树排序的语句，取 ORDER BY 列。
+        """
+        plan = stat.get("plan") or []
+        sql = stat["sql"]
+        suggestions = []
+        where_part = re.split(r"\bWHERE\b", sql, maxsplit=1, flags=re.IGNORECASE)
+        where_columns = []
+        if len(where_part) == 2:
+            body = re.split(r"\b(?:GROUP BY|ORDER BY|LIMIT)\b", where_part[1], maxsplit=1, flags=re.IGNORECASE)[0]
+            for column in self._WHERE_COLUMN.findall(body):
+                if column.upper() not in ("AND", "OR", "NOT", "NULL") and column not in where_columns:
+                    where_columns.append(column)
+
+        for detail in plan:
+            scan = self._PLAN_SCAN.match(detail.strip())
+            if scan and where_columns:
+                table = scan.group(1)
+                columns = ", ".join(where_columns[:3])
+                suggestions.append(f'CREATE INDEX IF NOT EXISTS idx_{table}_{"_".join(where_columns[:3])} ON "{table}" ({columns});')
+                if re.search(r"LIKE\s+\?", sql, re.IGNORECASE):
+                    suggestions.append("若 LIKE 模式以 '%' 开头，普通索引无法生效，可考虑 FTS5 全文索引。")
+            elif "USE TEMP B-TREE FOR ORDER BY" in detail:
+                order = self._ORDER_BY.search(sql)
+                if order:
+                    suggestions.append(f"ORDER BY 使用了临时排序，可考虑为排序列建立索引: {order.group(1).strip()}")
+            elif "USE TEMP B-TREE FOR GROUP BY" in detail:
+                suggestions.append("GROUP BY 使用了临时 B 树，可考虑为分组列建立索引。")
+        return suggestions
+
+    def report(self, limit: int = 20) -> str:
+        """生成可读的文本报告，包含耗时排名、慢查询执行计划和索引建议。"""
+        stats = self.snapshot()
+        lines = [f"SQL 性能分析报告 (慢查询阈值: {self.slow_threshold_ms:g} ms, 共 {len(stats)} 类语句)", "=" * 80]
+        for index, stat in enumerate(stats[:limit], start=1):
+            average = stat["total_ms"] / stat["count"] if stat["count"] else 0.0
+            lines.append(f"#{index} [{stat['database']}] 次数: {stat['count']}, 总耗时: {stat['total_ms']:.1f} ms, "
+                         f"平均: {average:.2f} ms, 最大: {stat['max_ms']:.1f} ms, 慢查询: {stat['slow_count']}")
+            lines.append(f"    SQL: {stat['sql']}")
+            if stat["plan"]:
+                for detail in stat["plan"]:
+                    lines.append(f"    PLAN: {detail}")
+                for suggestion in self.suggest_indexes(stat):
+                    lines.append(f"    建议: {suggestion}")
+        return "\n".join(lines)
+
+
+# 全局唯一的分析器实例
+query_profiler = QueryProfiler()
+
+
+class _ProfiledCursor(sqlite3.Cursor):
+    """记录每条语句耗时的游标，仅在分析器启用时使用。"""
+    _profile_key = None
+    _profile_sql = None
+    _profile_params = ()
+
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._profile_sql, self._profile_params = sql, parameters
+            self._profile_key = query_profiler.record(self.connection, sql, parameters,
+                                                      (time.perf_counter() - start) * 1000, self.connection.database_name)
+
+    def executemany(self, sql, seq_of_parameters):
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            # 批量语句没有单一的参数组，只计时，不采集执行计划
+            self._profile_key = None
+            query_profiler.record(self.connection, sql, (), (time.perf_counter() - start) * 1000,
+                                  self.connection.database_name, capture_plan=False)
+
+    def _timed_fetch(self, fetch, *args):
+        start = time.perf_counter()
+        try:
+            return fetch(*args)
+        finally:
+            if self._profile_key:
+                query_profiler.add_fetch_time(self.connection, self._profile_key, self._profile_sql, self._profile_params,
+                                              (time.perf_counter() - start) * 1000)
+
+    def fetchone(self):
+        return self._timed_fetch(super().fetchone)
+
+    def fetchmany(self, size=None):
+        return self._timed_fetch(super().fetchmany, self.arraysize if size is None else size)
+
+    def fetchall(self):
+        return self._timed_fetch(super().fetchall)
+
+
+class _ProfiledConnection(sqlite3.Connection):
+    """默认使用 `_ProfiledCursor` 的连接，仅在分析器启用时使用。"""
+    database_name = ""
+
+    def cursor(self, factory=_ProfiledCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def connect_database(db_path: str, **kwargs) -> sqlite3.Connection:
+    """
+    创建一个 SQLite 连接。分析器启用时返回带计时的连接，否则返回普通连接。
+    所有希望被 SQL 性能分析覆盖的代码都应通过此函数建立连接。
+
+    Args:
+        db_path (str): 数据库文件路径。
+        **kwargs: 透传给 `sqlite3.connect` 的参数。
+    """
+    if not query_profiler.enabled:
+        return sqlite3.connect(db_path, **kwargs)
+    conn = sqlite3.connect(db_path, factory=_ProfiledConnection, **kwargs)
+    conn.database_name = os.path.basename(db_path)
+    return conn
+
+
+def _probe_write_access(conn: sqlite3.Connection) -> None:
+    """
+    在不修改表结构的前提下探测连接是否可写。
+
+    在 IMMEDIATE 事务中把 user_version 写回原值后立即回滚：只读数据库会在写入时抛出
+    `sqlite3.OperationalError`，可写数据库则不会产生任何实际的文件改动。
+    如果连接上已有未提交的事务，则退化为文件系统层面的权限检查。
+
+    Raises:
+        sqlite3.Error: 数据库不可写。
+    """
+    if conn.in_transaction:
+        db_file = conn.execute("PRAGMA database_list").fetchone()[2]
+        if db_file and not os.access(db_file, os.W_OK):
+            raise sqlite3.OperationalError("attempt to write a readonly database")
+        return
+    cursor = sqlite3.Connection.cursor(conn, sqlite3.Cursor)
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        user_version = cursor.execute("PRAGMA user_version").fetchone()[0]
+        cursor.execute(f"PRAGMA user_version = {int(user_version)}")
+    finally:
+        if conn.in_transaction:
+            conn.rollback()
+        cursor.close()
+
+
 class SqlDataService:
     """
     一个包含通用数据库功能（如连接、验证）的基类。
@@ -57,12 +331,17 @@ class SqlDataService:
 
         self.db_path = db_path
         self.conn = None
+        self._write_access_verified = False
+        self._registered = False
         try:
             os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self.conn = connect_database(self.db_path, check_same_thread=False)
             self.conn.row_factory = sqlite3.Row
             logging.info(f"[src.services.sqlite_base_service.{self.service_name}.__init__] [SqlDataService] 数据库连接已建立: {self.db_path}")
             self._create_tables()
+            # 自动注册到在线备份服务
+            database_registry.register(self.db_path, self.service_name)
+            self._registered = True
         except sqlite3.Error as e:
             logging.error(f"[src.services.sqlite_base_service.{self.service_name}.__init__] [SqlDataService] 数据库连接或初始化失败: {e}", exc_info=True)
             raise
@@ -84,14 +363,16 @@ class SqlDataService:
     def _check_write_access(self) -> bool:
         """
         验证数据库的写入权限。
+        使用已有连接执行一次“回滚的文件头写入”，不修改表结构，也不会真正改动文件。
+        同一连接上检查通过后会记住结果，避免在一次验证流程中重复检查。
         """
         if not self.conn:
             return False
+        if self._write_access_verified:
+            return True
         try:
-            cursor = self.conn.cursor()
-            cursor.execute("CREATE TABLE IF NOT EXISTS _temp_write_test (id INTEGER)")
-            cursor.execute("DROP TABLE IF EXISTS _temp_write_test")
-            self.conn.commit()
+            _probe_write_access(self.conn)
+            self._write_access_verified = True
             logging.debug(f"[src.services.sqlite_base_service.{self.service_name}._check_write_access] [SqlDataService] 数据库写入权限检查成功")
             return True
         except sqlite3.Error as e:
@@ -159,9 +440,10 @@ class SqlDataService:
                         logging.debug(f"[src.services.sqlite_base_service.{service_name}.validate_database_schema] [SqlDataService] [FIXED 验证 2/3] 表 '{table_name}' 列结构检查通过。")
 
                 # 3. 检查可读性
+                # 只读取表的第一行（最多一个数据页），避免在大库上执行全表 COUNT(*)
                 if self.VALIDATION_FLAGS & ValidationFlags.CHECK_READABLE:
                     logging.debug(f"[src.services.sqlite_base_service.{service_name}.validate_database_schema] [SqlDataService] [FIXED 验证 3/3] 检查表 '{table_name}' 的可读性...")
-                    cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
+                    cursor.execute(f'SELECT 1 FROM "{table_name}" LIMIT 1')
                     cursor.fetchone()
                     logging.debug(f"[src.services.sqlite_base_service.{service_name}.validate_database_schema] [SqlDataService] [FIXED 3/3] 表 '{table_name}' 可读性检查通过。")
 
@@ -175,6 +457,10 @@ class SqlDataService:
         """关闭数据库连接。"""
         if self.conn:
             self.conn.close()
+            # 每个实例只释放自己的那一次注册，重复调用 close() 不会影响共享同一文件的其他实例
+            if self._registered:
+                database_registry.unregister(self.db_path, self.service_name)
+                self._registered = False
             logging.info(f"[src.services.sqlite_base_service.{self.service_name}.close] [SqlDataService] [连接关闭] Database connection closed for {self.service_name}.")
 
     @staticmethod
@@ -198,10 +484,7 @@ class SqlDataService:
                 os.makedirs(dir_name, exist_ok=True)
             
             conn = sqlite3.connect(db_path, check_same_thread=False)
-            cursor = conn.cursor()
-            cursor.execute("CREATE TABLE IF NOT EXISTS _temp_write_test (id INTEGER)")
-            cursor.execute("DROP TABLE IF EXISTS _temp_write_test")
-            conn.commit()
+            _probe_write_access(conn)
             return True, ""
         except sqlite3.Error as e:
             error_msg = f"[src.services.sqlite_base_service.SqlDataService.check_db_writability] [SqlDataService] [检查失败] 数据库 '{db_path}' 写入权限检查失败: {e}"
@@ -0,0 +1,391 @@
+# desktop_center/src/services/task_manager.py
+"""
+平台级后台任务管理器，挂载在 `ApplicationContext.task_manager` 上。
+
+插件把耗时操作（导入导出、批量文件复制等）作为任务提交，由有界的工作线程池执行，
+GUI 线程不再被阻塞，也不需要每个插件各自管理线程。每个插件同时运行的任务数受单独的上限约束，
+某个插件提交大量任务时不会占满整个线程池。
+
+任务函数的签名为 `fn(task, *args, **kwargs)`，通过 `task.report_progress()` 报告进度，
+并在适当的位置调用 `task.check_cancelled()`（或检查 `task.is_cancel_requested()`）以响应取消请求:
+
+    def export(task, rows, path):
+        for i, row in enumerate(rows):
+            task.check_cancelled()
+            ...
+            task.report_progress(i + 1, len(rows), f"已写入 {i + 1} 行")
+
+    task = context.task_manager.submit("alert_center", "导出告警历史", export, rows, path)
+    task.add_done_callback(lambda t: self.on_export_finished(t))
+
+状态变化与进度通过 `dispatcher` 投递到 GUI 线程，监听者（例如“任务”页面）可以直接更新界面控件；
+进度通知按任务节流，避免高频进度报告刷爆 GUI 事件队列。
+"""
+import time
+import logging
+import itertools
+import threading
+from collections import deque
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from src.utils.metrics import metrics
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_PLUGIN_LIMIT = 2
+# 同一任务两次进度通知之间的最小间隔（秒），状态变化总是立即通知
+PROGRESS_NOTIFY_INTERVAL = 0.1
+# 保留在任务列表中的已结束任务数量上限，更早的会被自动清除
+MAX_FINISHED_TASKS = 200
+
+_tasks_finished = metrics.counter("tasks.finished", "已结束的后台任务数（含失败和取消）")
+_tasks_failed = metrics.counter("tasks.failed", "执行失败的后台任务数")
+_task_ms = metrics.histogram("tasks.duration_ms", "后台任务的执行耗时")
+
+
+class TaskState(Enum):
+    PENDING = "等待中"
+    RUNNING = "运行中"
+    FINISHED = "已完成"
+    FAILED = "失败"
+    CANCELLED = "已取消"
+
+
+class TaskCancelledError(Exception):
+    """任务响应取消请求时由 `Task.check_cancelled()` 抛出；在已取消的任务上获取结果时也会抛出。"""
+    pass
+
+
+class Task:
+    """
+    一个后台任务：既是任务函数报告进度、检查取消的句柄，也是调用方获取状态和结果的占位对象。
+
+    完成回调通过管理器的 dispatcher 调度，在 GUI 中使用时总是在 GUI 线程上运行。
+    """
+
+    def __init__(self, manager: 'TaskManager', task_id: int, plugin: str, title: str,
+                 fn: Callable[..., Any], args: tuple, kwargs: dict, cancellable: bool):
+        self._manager = manager
+        self.id = task_id
+        self.plugin = plugin
+        self.title = title
+        self.cancellable = cancellable
+        self._fn, self._args, self._kwargs = fn, args, kwargs
+        self.state = TaskState.PENDING
+        # 0~1 之间的完成比例；None 表示无法确定进度
+        self.progress: Optional[float] = None
+        self.message = ""
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._result = None
+        self._exception: Optional[BaseException] = None
+        self._cancel_event = threading.Event()
+        self._callbacks: List[Callable[['Task'], None]] = []
+        self._condition = threading.Condition()
+        self._last_notified = 0.0
+
+    # --- 任务函数使用 ---
+
+    def report_progress(self, current: Optional[float] = None, total: Optional[float] = None, message: str = None) -> None:
+        """
+        报告进度。`total` 为空时 `current` 视为 0~1 之间的比例；两者都为空时只更新消息。可在任意线程调用。
+        """
+        if current is not None:
+            fraction = current / total if total else current
+            self.progress = min(max(float(fraction), 0.0), 1.0)
+        if message is not None:
+            self.message = message
+        now = time.monotonic()
+        if now - self._last_notified >= PROGRESS_NOTIFY_INTERVAL:
+            self._last_notified = now
+            self._manager._notify(self)
+
+    def is_cancel_requested(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def check_cancelled(self) -> None:
+        """已请求取消时抛出 TaskCancelledError，任务随之以“已取消”状态结束。"""
+        if self._cancel_event.is_set():
+            raise TaskCancelledError(f"任务 '{self.title}' 已被取消。")
+
+    # --- 调用方使用 ---
+
+    def cancel(self) -> bool:
+        """
+        请求取消任务。尚未开始的任务立即取消；运行中的任务在下一次 `check_cancelled()` 时结束。
+
+        Returns:
+            bool: 是否成功请求了取消（已结束或不可取消的任务返回 False）。
+        """
+        with self._condition:
+            if self.done() or not self.cancellable:
+                return False
+            self._cancel_event.set()
+            pending = self.state == TaskState.PENDING
+        if pending:
+            self._manager._cancel_pending(self)
+        else:
+            self._manager._notify(self)
+        logging.info(f"[src.services.task_manager.Task.cancel] 已请求取消任务 '{self.title}' ({self.plugin})。")
+        return True
+
+    def done(self) -> bool:
+        return self.state in (TaskState.FINISHED, TaskState.FAILED, TaskState.CANCELLED)
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        """阻塞等待任务结束并返回结果。GUI 线程中应使用 `add_done_callback` 而不是此方法。"""
+        with self._condition:
+            if not self._condition.wait_for(self.done, timeout):
+                raise TimeoutError(f"等待任务 '{self.title}' 超时。")
+        if self.state == TaskState.CANCELLED:
+            raise TaskCancelledError(f"任务 '{self.title}' 已被取消。")
+        if self._exception is not None:
+            raise self._exception
+        return self._result
+
+    def exception(self) -> Optional[BaseException]:
+        """返回任务抛出的异常（若有），不阻塞。"""
+        return self._exception
+
+    def add_done_callback(self, callback: Callable[['Task'], None]) -> None:
+        """注册结束回调（包括成功、失败和取消）。任务已结束时回调会被立即调度。"""
+        with self._condition:
+            if not self.done():
+                self._callbacks.append(callback)
+                return
+        self._manager._dispatch(lambda: callback(self))
+
+    @property
+    def elapsed(self) -> Optional[float]:
+        """已运行的秒数；尚未开始时为 None。"""
+        if self.started_at is None:
+            return None
+        return (self.finished_at or time.time()) - self.started_at
+
+    # --- 管理器内部使用 ---
+
+    def _run(self) -> None:
+        with self._condition:
+            if self.state != TaskState.PENDING:
+                return
+            cancelled = self._cancel_event.is_set()
+            if not cancelled:
+                self.state = TaskState.RUNNING
+                self.started_at = time.time()
+        if cancelled:
+            # 在排队期间被取消，但已被工作线程取走
+            self._finish(TaskState.CANCELLED)
+            return
+        self._manager._notify(self)
+        start = time.perf_counter()
+        try:
+            result = self._fn(self, *self._args, **self._kwargs)
+        except TaskCancelledError:
+            self._finish(TaskState.CANCELLED)
+        except BaseException as e:
+            logging.error(f"[src.services.task_manager.Task._run] 任务 '{self.title}' ({self.plugin}) 执行失败: {e}", exc_info=True)
+            self._finish(TaskState.FAILED, exception=e)
+        else:
+            self._finish(TaskState.FINISHED, result=result)
+        finally:
+            _task_ms.observe((time.perf_counter() - start) * 1000)
+
+    def _finish(self, state: TaskState, result: Any = None, exception: BaseException = None) -> None:
+        with self._condition:
+            if self.done():
+                return
+            self._result = result
+            self._exception = exception
+            self.state = state
+            self.finished_at = time.time()
+            if state == TaskState.FINISHED:
+                self.progress = 1.0
+            self._fn = self._args = self._kwargs = None
+            callbacks, self._callbacks = self._callbacks, []
+            self._condition.notify_all()
+        _tasks_finished.inc()
+        if state == TaskState.FAILED:
+            _tasks_failed.inc()
+        self._manager._notify(self)
+        for callback in callbacks:
+            self._manager._dispatch(lambda callback=callback: callback(self))
+
+
+class TaskManager:
+    """
+    有界线程池 + 每插件并发上限的后台任务管理器。
+
+    任务按提交顺序调度：空闲的工作线程取出第一个所属插件未达到并发上限的任务执行。
+    """
+
+    def __init__(self, dispatcher: Optional[Callable[[Callable[[], None]], None]] = None,
+                 max_workers: int = DEFAULT_MAX_WORKERS, plugin_limit: int = DEFAULT_PLUGIN_LIMIT):
+        """
+        Args:
+            dispatcher (callable): 接收一个无参可调用对象，并将其投递到 GUI 线程执行。
+                为 None 时回调和通知直接在工作线程中执行。
+            max_workers (int): 工作线程数，即所有插件合计的最大并发任务数。
+            plugin_limit (int): 每个插件默认的最大并发任务数，可用 `set_plugin_limit` 单独调整。
+        """
+        self._dispatcher = dispatcher
+        self.max_workers = max(1, max_workers)
+        self.default_plugin_limit = max(1, plugin_limit)
+        self._plugin_limits: Dict[str, int] = {}
+        self._pending: Deque[Task] = deque()
+        self._running: Dict[str, int] = {}
+        self._tasks: Dict[int, Task] = {}
+        self._listeners: List[Callable[[Task], None]] = []
+        self._condition = threading.Condition()
+        self._ids = itertools.count(1)
+        self._workers: List[threading.Thread] = []
+        self._shutdown = False
+        metrics.gauge("tasks.pending", "排队等待执行的后台任务数", func=lambda: len(self._pending))
+        metrics.gauge("tasks.running", "正在执行的后台任务数", func=lambda: sum(self._running.values()))
+
+    def set_plugin_limit(self, plugin: str, limit: int) -> None:
+        """设置某个插件同时运行的任务数上限。"""
+        with self._condition:
+            self._plugin_limits[plugin] = max(1, limit)
+            self._condition.notify_all()
+
+    def add_listener(self, listener: Callable[[Task], None]) -> None:
+        """注册监听者，任务状态或进度变化时以任务为参数调用（经由 dispatcher）。"""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[Task], None]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def submit(self, plugin: str, title: str, fn: Callable[..., Any], *args,
+               cancellable: bool = True, **kwargs) -> Task:
+        """
+        提交一个后台任务。
+
+        Args:
+            plugin (str): 提交任务的插件名，用于并发限制和在任务页面中分组显示。
+            title (str): 显示在任务页面中的任务名称。
+            fn (callable): 任务函数，签名为 `fn(task, *args, **kwargs)`，在工作线程中执行，不得直接操作界面控件。
+            cancellable (bool): 是否允许用户取消。
+
+        Returns:
+            Task: 任务对象。
+
+        Raises:
+            RuntimeError: 管理器已关闭。
+        """
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("后台任务管理器已关闭。")
+            task = Task(self, next(self._ids), plugin, title, fn, args, kwargs, cancellable)
+            self._tasks[task.id] = task
+            self._pending.append(task)
+            self._ensure_workers()
+            self._condition.notify()
+        logging.info(f"[src.services.task_manager.TaskManager.submit] 已提交任务 #{task.id} '{title}' ({plugin})。")
+        self._notify(task)
+        return task
+
+    def tasks(self) -> List[Task]:
+        """按提交顺序返回所有任务（包括已结束但尚未清除的任务）。"""
+        with self._condition:
+            return list(self._tasks.values())
+
+    def active_count(self) -> int:
+        """尚未结束（等待中或运行中）的任务总数。"""
+        with self._condition:
+            return sum(1 for task in self._tasks.values() if not task.done())
+
+    def clear_finished(self) -> None:
+        """从任务列表中移除所有已结束的任务。"""
+        with self._condition:
+            self._tasks = {task_id: task for task_id, task in self._tasks.items() if not task.done()}
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """取消所有未开始的任务，请求取消运行中的任务，并等待工作线程退出。"""
+        with self._condition:
+            self._shutdown = True
+            pending = list(self._pending)
+            self._pending.clear()
+            running = [task for task in self._tasks.values() if task.state == TaskState.RUNNING]
+            workers = list(self._workers)
+            self._condition.notify_all()
+        for task in pending:
+            task._cancel_event.set()
+            task._finish(TaskState.CANCELLED)
+        for task in running:
+            task._cancel_event.set()
+        deadline = time.monotonic() + timeout
+        for worker in workers:
+            worker.join(max(0.0, deadline - time.monotonic()))
+        unfinished = [task.title for task in running if not task.done()]
+        if unfinished:
+            logging.warning(f"[src.services.task_manager.TaskManager.shutdown] 以下任务在 {timeout:g}s 内未响应取消: {unfinished}")
+        logging.info("[src.services.task_manager.TaskManager.shutdown] 后台任务管理器已关闭。")
+
+    # --- 内部实现 ---
+
+    def _ensure_workers(self) -> None:
+        """按需创建工作线程，直到达到上限。调用方需持有 _condition。"""
+        idle = len(self._workers) - sum(self._running.values())
+        if len(self._workers) < self.max_workers and len(self._pending) > idle:
+            worker = threading.Thread(target=self._worker_loop, name=f"TaskWorker-{len(self._workers)}", daemon=True)
+            self._workers.append(worker)
+            worker.start()
+
+    def _next_runnable(self) -> Optional[Task]:
+        """取出第一个所属插件未达到并发上限的任务。调用方需持有 _condition。"""
+        for task in self._pending:
+            limit = self._plugin_limits.get(task.plugin, self.default_plugin_limit)
+            if self._running.get(task.plugin, 0) < limit:
+                self._pending.remove(task)
+                self._running[task.plugin] = self._running.get(task.plugin, 0) + 1
+                return task
+        return None
+
+    def _worker_loop(self) -> None:
+        while True:
+            with self._condition:
+                task = self._next_runnable()
+                while task is None:
+                    if self._shutdown:
+                        return
+                    self._condition.wait()
+                    task = self._next_runnable()
+            try:
+                task._run()
+            finally:
+                with self._condition:
+                    self._running[task.plugin] -= 1
+                    self._trim_finished()
+                    # 插件的并发名额释放后，可能有被限制的任务可以运行了
+                    self._condition.notify_all()
+
+    def _trim_finished(self) -> None:
+        finished = [task_id for task_id, task in self._tasks.items() if task.done()]
+        for task_id in finished[:max(0, len(finished) - MAX_FINISHED_TASKS)]:
+            del self._tasks[task_id]
+
+    def _cancel_pending(self, task: Task) -> None:
+        with self._condition:
+            if task in self._pending:
+                self._pending.remove(task)
+            else:
+                return  # 已被工作线程取走，由 check_cancelled 结束
+        task._finish(TaskState.CANCELLED)
+
+    def _notify(self, task: Task) -> None:
+        for listener in list(self._listeners):
+            self._dispatch(lambda listener=listener: listener(task))
+
+    def _dispatch(self, fn: Callable[[], None]) -> None:
+        def invoke():
+            try:
+                fn()
+            except Exception as e:
+                logging.error(f"[src.services.task_manager.TaskManager._dispatch] 任务回调执行失败: {e}", exc_info=True)
+
+        if self._dispatcher is None:
+            invoke()
+        else:
+            self._dispatcher(invoke)
@@ -3,6 +3,7 @@ import os
 import logging
 
 from src.services.generic_data_service import GenericDataService, DataType, DataValidationError
+from src.services.file_journal import atomic_write_text
 
 class TextDataService(GenericDataService):
     """
@@ -24,10 +25,9 @@ class TextDataService(GenericDataService):
             raise DataValidationError(f"无法加载文本文件: {e}")
             
     def save_data(self, data: str) -> bool:
-        """保存文本数据"""
+        """保存文本数据（原子写入，崩溃时不会留下被截断的文件）"""
         try:
-            with open(self.file_path, 'w', encoding='utf-8') as f:
-                f.write(data)
+            atomic_write_text(self.file_path, data)
             logging.info(f"[{self.service_name}] 成功保存文本数据: {self.file_path}")
             return True
         except Exception as e:
@@ -1,48 +1,367 @@
 # desktop_center/src/services/webhook_service.py
+"""
+平台级 Webhook 推送服务。
+
+- 每个目标主机（scheme://host:port）拥有一个推送线程和该线程专属的 `requests.Session`，
+  同一主机的请求复用 keep-alive 连接；某个主机不可达时只会拖慢发往它的推送。
+- 推送失败（连接错误、超时、408/429/5xx）时按指数退避重试。
+- `batch=True` 的事件会在批量窗口内与发往同一 URL 的其他批量事件合并，以 JSON 数组一次发送。
+- `durable=True` 的事件先写入磁盘上的发件箱（SQLite），发送成功后才删除；
+  程序重启后调用 `replay_outbox()` 会重新投递上次未送达的事件。
+"""
+import json
+import time
+import heapq
+import random
 import logging
-import requests
-from PySide6.QtCore import QObject, QRunnable, QThreadPool
+import sqlite3
+import itertools
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from src.services.sqlite_base_service import connect_database
+from src.utils.lazy_import import lazy_import
+
+requests = lazy_import("requests", "Webhook 推送需要安装 requests")
 
-class WebhookWorker(QRunnable):
+DEFAULT_TIMEOUT_SECONDS = 5.0
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_RETRY_BASE_SECONDS = 1.0
+RETRY_MAX_SECONDS = 300.0
+DEFAULT_BATCH_WINDOW_SECONDS = 0.2
+DEFAULT_MAX_BATCH_SIZE = 20
+# 发件箱最多保留的事件数，超出时删除最早的事件
+MAX_OUTBOX_ROWS = 1000
+# 这些状态码表示暂时性故障，值得重试；其余 4xx 视为目标明确拒绝，不再重试
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+
+
+class WebhookOutbox:
     """
-    一个在独立线程中发送 Webhook 请求的工作器，以避免阻塞调用方。
+    持久化待发送事件的 SQLite 发件箱。
+
+    推送线程与调用 `push` 的线程共享一个连接，所有访问都通过锁串行化。
     """
-    def __init__(self, url: str, payload: dict):
-        super().__init__()
+    def __init__(self, db_path: str, max_rows: int = MAX_OUTBOX_ROWS):
+        self.db_path = db_path
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = connect_database(db_path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    url TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    batch INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL
+                )
+            """)
+
+    def add(self, url: str, payload: Any, batch: bool = False) -> Optional[int]:
+        """写入一条事件并返回其 ID。超出容量时删除最早的事件。"""
+        with self._lock:
+            if self._conn is None:
+                return None
+            with self._conn:
+                cursor = self._conn.execute(
+                    "INSERT INTO outbox (url, payload, batch, created_at) VALUES (?, ?, ?, ?)",
+                    (url, json.dumps(payload, ensure_ascii=False), int(batch), time.time()))
+                trimmed = self._conn.execute(
+                    "DELETE FROM outbox WHERE id <= (SELECT id FROM outbox ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                    (self.max_rows,)).rowcount
+            if trimmed > 0:
+                logging.warning(f"[src.services.webhook_service.WebhookOutbox.add] 发件箱已满，丢弃了 {trimmed} 条最早的事件。")
+            return cursor.lastrowid
+
+    def remove(self, ids: List[int]) -> None:
+        if not ids:
+            return
+        with self._lock:
+            if self._conn is None:
+                return
+            with self._conn:
+                self._conn.executemany("DELETE FROM outbox WHERE id = ?", [(i,) for i in ids])
+
+    def pending(self) -> List[Tuple[int, str, Any, bool]]:
+        """按写入顺序返回所有未送达的事件: (id, url, payload, batch)。"""
+        with self._lock:
+            if self._conn is None:
+                return []
+            rows = self._conn.execute("SELECT id, url, payload, batch FROM outbox ORDER BY id").fetchall()
+        events = []
+        for row_id, url, payload, batch in rows:
+            try:
+                events.append((row_id, url, json.loads(payload), bool(batch)))
+            except ValueError:
+                logging.warning(f"[src.services.webhook_service.WebhookOutbox.pending] 发件箱中的事件 {row_id} 已损坏，已删除。")
+                self.remove([row_id])
+        return events
+
+    def count(self) -> int:
+        with self._lock:
+            if self._conn is None:
+                return 0
+            return self._conn.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class _WebhookEvent:
+    __slots__ = ("url", "payload", "batch", "outbox_id")
+
+    def __init__(self, url: str, payload: Any, batch: bool, outbox_id: Optional[int] = None):
         self.url = url
         self.payload = payload
+        self.batch = batch
+        self.outbox_id = outbox_id
+
+
+class _Delivery:
+    """一次 HTTP 请求要发送的内容：单个事件，或发往同一 URL 的一批事件。"""
+    __slots__ = ("url", "events", "batch", "attempt")
+
+    def __init__(self, url: str, events: List[_WebhookEvent], batch: bool, attempt: int = 0):
+        self.url = url
+        self.events = events
+        self.batch = batch
+        self.attempt = attempt
+
+    def body(self) -> Any:
+        return [event.payload for event in self.events] if self.batch else self.events[0].payload
+
+
+class _HostSender(threading.Thread):
+    """单个目标主机的推送线程，按到期时间依次发送，持有该线程专属的 HTTP 会话。"""
+
+    def __init__(self, service: 'WebhookService', host_key: str):
+        super().__init__(name=f"WebhookSender-{host_key}", daemon=True)
+        self.service = service
+        self._heap: List[Tuple[float, int, _Delivery]] = []
+        self._open_batches: Dict[str, _Delivery] = {}
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._stopping = False
+        self._session = None
 
-    def run(self):
-        """执行 HTTP POST 请求。"""
+    def add_event(self, event: _WebhookEvent) -> None:
+        now = time.monotonic()
+        with self._condition:
+            if event.batch:
+                # 合并到同一 URL 尚未发出的批次中
+                open_batch = self._open_batches.get(event.url)
+                if open_batch is not None and len(open_batch.events) < self.service.max_batch_size:
+                    open_batch.events.append(event)
+                    return
+                delivery = _Delivery(event.url, [event], batch=True)
+                self._open_batches[event.url] = delivery
+                due = now + self.service.batch_window
+            else:
+                delivery = _Delivery(event.url, [event], batch=False)
+                due = now
+            heapq.heappush(self._heap, (due, next(self._sequence), delivery))
+            self._condition.notify()
+
+    def retry_later(self, delivery: _Delivery, delay: float) -> None:
+        with self._condition:
+            heapq.heappush(self._heap, (time.monotonic() + delay, next(self._sequence), delivery))
+            self._condition.notify()
+
+    def pending_count(self) -> int:
+        with self._condition:
+            return sum(len(item[2].events) for item in self._heap)
+
+    def stop(self) -> None:
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+
+    def run(self) -> None:
         try:
-            response = requests.post(self.url, json=self.payload, timeout=5)
-            response.raise_for_status() # 如果状态码不是 2xx，则抛出异常
-            logging.info(f"Webhook 已成功推送到 {self.url}，响应: {response.status_code}")
+            while True:
+                delivery = self._next_delivery()
+                if delivery is None:
+                    break
+                try:
+                    self._send(delivery)
+                except Exception as e:
+                    logging.error(f"[src.services.webhook_service._HostSender.run] 推送到 {delivery.url} 时发生意外错误: {e}", exc_info=True)
+        finally:
+            if self._session is not None:
+                self._session.close()
+
+    def _next_delivery(self) -> Optional[_Delivery]:
+        with self._condition:
+            while not self._stopping:
+                if not self._heap:
+                    self._condition.wait()
+                    continue
+                wait = self._heap[0][0] - time.monotonic()
+                if wait > 0:
+                    self._condition.wait(wait)
+                    continue
+                delivery = heapq.heappop(self._heap)[2]
+                if self._open_batches.get(delivery.url) is delivery:
+                    del self._open_batches[delivery.url]
+                return delivery
+            return None
+
+    def _send(self, delivery: _Delivery) -> None:
+        if self._session is None:
+            self._session = requests.Session()
+        try:
+            response = self._session.post(delivery.url, json=delivery.body(), timeout=self.service.timeout)
+            error = None if response.status_code < 400 else f"HTTP {response.status_code}"
+            retryable = response.status_code in RETRYABLE_STATUS_CODES
         except requests.exceptions.RequestException as e:
-            logging.error(f"推送 Webhook 到 {self.url} 失败: {e}")
+            error, retryable = str(e), True
+        self.service._on_delivery_result(self, delivery, error, retryable)
+
 
-class WebhookService(QObject):
+class WebhookService:
     """
     平台级共享服务，用于异步发送 Webhook (HTTP POST) 请求。
     """
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.thread_pool = QThreadPool()
-        # 设置线程池的最大线程数，以防滥用
-        self.thread_pool.setMaxThreadCount(5) 
+    def __init__(self, outbox_path: Optional[str] = None, timeout: float = DEFAULT_TIMEOUT_SECONDS,
+                 max_retries: int = DEFAULT_MAX_RETRIES, retry_base_delay: float = DEFAULT_RETRY_BASE_SECONDS,
+                 batch_window: float = DEFAULT_BATCH_WINDOW_SECONDS, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE):
+        """
+        Args:
+            outbox_path (str, optional): 发件箱数据库路径。为 None 时不支持持久化推送。
+            timeout (float): 单次请求的超时时间（秒）。
+            max_retries (int): 暂时性失败后的最大重试次数。
+            retry_base_delay (float): 首次重试前的等待时间（秒），之后每次翻倍，最长 RETRY_MAX_SECONDS。
+            batch_window (float): 批量事件的合并窗口（秒）。
+            max_batch_size (int): 单个批次最多包含的事件数。
+        """
+        self.timeout = timeout
+        self.max_retries = max(0, max_retries)
+        self.retry_base_delay = retry_base_delay
+        self.batch_window = batch_window
+        self.max_batch_size = max(1, max_batch_size)
+        self._outbox: Optional[WebhookOutbox] = None
+        if outbox_path:
+            try:
+                self._outbox = WebhookOutbox(outbox_path)
+            except sqlite3.Error as e:
+                logging.error(f"[src.services.webhook_service.WebhookService.__init__] 打开 Webhook 发件箱失败，持久化推送将不可用: {e}")
+        self._senders: Dict[str, _HostSender] = {}
+        self._lock = threading.Lock()
+        self._counters = {"queued": 0, "delivered": 0, "requests": 0, "retried": 0, "failed": 0}
+        self._shutdown = False
         logging.info("Webhook 服务 (WebhookService) 初始化完成。")
 
-    def push(self, url: str, payload: dict):
+    def push(self, url: str, payload: Any, durable: bool = False, batch: bool = False) -> bool:
         """
         异步地将一个 JSON payload 推送到指定的 URL。
-        
+
         Args:
             url (str): 目标 URL。
-            payload (dict): 要作为 JSON 发送的数据。
+            payload: 要作为 JSON 发送的数据。
+            durable (bool): 是否先写入发件箱，保证程序重启或目标长时间不可用后仍能送达。
+            batch (bool): 是否与发往同一 URL 的其他批量事件合并发送（请求体为 JSON 数组，接收方需支持）。
+
+        Returns:
+            bool: 事件是否已进入发送队列。
         """
         if not url or not url.startswith(('http://', 'https://')):
             logging.warning(f"无效的 Webhook URL: '{url}'，推送已取消。")
+            return False
+        if self._shutdown:
+            logging.warning(f"Webhook 服务已关闭，推送到 {url} 已取消。")
+            return False
+
+        outbox_id = None
+        if durable and self._outbox is not None:
+            try:
+                outbox_id = self._outbox.add(url, payload, batch)
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                logging.error(f"[src.services.webhook_service.WebhookService.push] 写入 Webhook 发件箱失败，本次推送不做持久化: {e}")
+        return self._enqueue(_WebhookEvent(url, payload, batch, outbox_id))
+
+    def replay_outbox(self) -> int:
+        """重新投递发件箱中上次未送达的事件，返回事件数量。"""
+        if self._outbox is None:
+            return 0
+        events = self._outbox.pending()
+        for row_id, url, payload, batch in events:
+            self._enqueue(_WebhookEvent(url, payload, batch, row_id))
+        if events:
+            logging.info(f"[src.services.webhook_service.WebhookService.replay_outbox] 正在重新投递发件箱中的 {len(events)} 条 Webhook 事件。")
+        return len(events)
+
+    def _enqueue(self, event: _WebhookEvent) -> bool:
+        parts = urlsplit(event.url)
+        host_key = f"{parts.scheme}://{parts.netloc}"
+        with self._lock:
+            if self._shutdown:
+                return False
+            sender = self._senders.get(host_key)
+            if sender is None:
+                sender = _HostSender(self, host_key)
+                sender.start()
+                self._senders[host_key] = sender
+            self._counters["queued"] += 1
+        sender.add_event(event)
+        return True
+
+    def _on_delivery_result(self, sender: _HostSender, delivery: _Delivery, error: Optional[str], retryable: bool) -> None:
+        """推送线程在每次请求结束后调用。"""
+        outbox_ids = [event.outbox_id for event in delivery.events if event.outbox_id is not None]
+        count = len(delivery.events)
+        with self._lock:
+            self._counters["requests"] += 1
+        if error is None:
+            with self._lock:
+                self._counters["delivered"] += count
+            if self._outbox is not None:
+                self._outbox.remove(outbox_ids)
+            logging.info(f"Webhook 已成功推送到 {delivery.url}（{count} 个事件）。")
             return
-            
-        worker = WebhookWorker(url, payload)
-        self.thread_pool.start(worker)
\ No newline at end of file
+
+        if retryable and delivery.attempt < self.max_retries and not self._shutdown:
+            delivery.attempt += 1
+            delay = min(self.retry_base_delay * (2 ** (delivery.attempt - 1)), RETRY_MAX_SECONDS)
+            delay *= random.uniform(0.8, 1.2)  # 加入抖动，避免多个事件同时重试
+            with self._lock:
+                self._counters["retried"] += 1
+            logging.warning(f"推送 Webhook 到 {delivery.url} 失败: {error}，{delay:.1f} 秒后进行第 {delivery.attempt} 次重试。")
+            sender.retry_later(delivery, delay)
+            return
+
+        with self._lock:
+            self._counters["failed"] += count
+        if not retryable and self._outbox is not None:
+            # 目标明确拒绝了请求，重试也不会成功
+            self._outbox.remove(outbox_ids)
+        suffix = "，已保留在发件箱中，下次启动时重试" if retryable and outbox_ids else ""
+        logging.error(f"推送 Webhook 到 {delivery.url} 失败: {error}{suffix}")
+
+    def stats(self) -> Dict[str, int]:
+        """返回推送计数：queued / delivered / requests / retried / failed，以及排队中和发件箱中的事件数。"""
+        with self._lock:
+            stats = dict(self._counters)
+            senders = list(self._senders.values())
+        stats["pending"] = sum(sender.pending_count() for sender in senders)
+        stats["outbox"] = self._outbox.count() if self._outbox is not None else 0
+        return stats
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """停止所有推送线程。未送达的持久化事件保留在发件箱中，其余排队事件被丢弃。"""
+        with self._lock:
+            self._shutdown = True
+            senders = list(self._senders.values())
+            self._senders.clear()
+        for sender in senders:
+            sender.stop()
+        deadline = time.monotonic() + timeout
+        for sender in senders:
+            sender.join(max(0.0, deadline - time.monotonic()))
+        if self._outbox is not None:
+            self._outbox.close()
+        logging.info(f"[src.services.webhook_service.WebhookService.shutdown] Webhook 服务已关闭，统计: {self.stats()}")
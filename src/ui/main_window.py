@@ -1,9 +1,13 @@
 # desktop_center/src/ui/main_window.py
 import logging
+from typing import Callable, Union
 # 【新增】导入 QApplication 以便访问屏幕信息
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QListWidget, 
-                               QListWidgetItem, QHBoxLayout, QStackedWidget)
-from PySide6.QtCore import QEvent, QSize
+                               QListWidgetItem, QHBoxLayout, QStackedWidget, QLabel)
+from PySide6.QtCore import QEvent, QSize, Qt, Signal
+
+# 【新增】延迟构建页面的工厂函数类型：返回页面控件，失败时返回 None
+PageFactory = Callable[[], Union[QWidget, None]]
 
 class MainWindow(QMainWindow):
     """
@@ -11,6 +15,9 @@ class MainWindow(QMainWindow):
     采用“导航-内容”布局，设计为可扩展的容器。
     它自身不实现任何具体功能页面，只提供添加和切换页面的能力。
     """
+    # 【新增】切换到另一个页面后发射，参数为页面标题
+    page_changed = Signal(str)
+
     def __init__(self, parent: QWidget = None):
         """
         初始化主窗口。
@@ -56,18 +63,26 @@ class MainWindow(QMainWindow):
         self.stacked_widget = QStackedWidget()
         main_layout.addWidget(self.stacked_widget)
 
+        # 【新增】延迟页面：行号 -> 页面工厂。首次切换到该行时才构建页面
+        self._page_factories: dict[int, PageFactory] = {}
+
         # --- 连接信号与槽 ---
-        # 当导航栏的当前项改变时，切换到对应的页面
-        self.nav_list.currentRowChanged.connect(self.stacked_widget.setCurrentIndex)
+        # 当导航栏的当前项改变时，切换到对应的页面（必要时先构建延迟页面）
+        self.nav_list.currentRowChanged.connect(self._on_current_row_changed)
     
-    def add_page(self, title: str, widget: QWidget) -> None:
+    def add_page(self, title: str, widget: Union[QWidget, PageFactory]) -> None:
         """
         向主窗口动态添加一个功能页面。
 
         Args:
             title (str): 显示在导航栏中的页面标题。
-            widget (QWidget): 要添加的功能页面的实例。
+            widget (QWidget | Callable): 要添加的功能页面的实例；
+                或一个返回页面实例的工厂函数，此时先放置占位页面，
+                直到用户第一次在导航栏中选中该页面时才调用工厂构建真实页面。
         """
+        if not isinstance(widget, QWidget):
+            self._page_factories[self.stacked_widget.count()] = widget
+            widget = self._create_placeholder(f"正在加载 {title}...")
         # 将页面实例添加到堆栈窗口中
         self.stacked_widget.addWidget(widget)
         # 将页面标题添加到导航列表
@@ -77,6 +92,46 @@ class MainWindow(QMainWindow):
         if self.nav_list.count() == 1:
             self.nav_list.setCurrentRow(0)
 
+    def _on_current_row_changed(self, row: int) -> None:
+        """切换页面；如果目标页面尚未构建，先调用其工厂函数并替换占位页面。"""
+        factory = self._page_factories.pop(row, None)
+        if factory is not None:
+            placeholder = self.stacked_widget.widget(row)
+            title = self.nav_list.item(row).text()
+            try:
+                page = factory()
+            except Exception as e:
+                logging.error(f"构建页面 '{title}' 失败: {e}", exc_info=True)
+                page = None
+            if not isinstance(page, QWidget):
+                page = self._create_placeholder(f"页面 '{title}' 加载失败，请查看日志。")
+            self.stacked_widget.removeWidget(placeholder)
+            self.stacked_widget.insertWidget(row, page)
+            placeholder.deleteLater()
+            logging.info(f"延迟页面 '{title}' 已在首次访问时构建。")
+        self.stacked_widget.setCurrentIndex(row)
+        self.page_changed.emit(self.current_page_title())
+
+    def select_page(self, title: str) -> bool:
+        """【新增】切换到标题为 `title` 的页面，找不到时返回 False。"""
+        for row in range(self.nav_list.count()):
+            if self.nav_list.item(row).text() == title:
+                self.nav_list.setCurrentRow(row)
+                return True
+        return False
+
+    def current_page_title(self) -> str:
+        """【新增】当前页面在导航栏中的标题，没有页面时返回空字符串。"""
+        item = self.nav_list.currentItem()
+        return item.text() if item is not None else ""
+
+    @staticmethod
+    def _create_placeholder(text: str) -> QWidget:
+        placeholder = QLabel(text)
+        placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        placeholder.setStyleSheet("color: #888; font-size: 14px;")
+        return placeholder
+
     def closeEvent(self, event: QEvent) -> None:
         """
         重写窗口关闭事件。
@@ -0,0 +1,112 @@
+# desktop_center/src/ui/performance_page.py
+import os
+import logging
+from datetime import datetime
+from PySide6.QtWidgets import (QWidget, QLabel, QVBoxLayout, QHBoxLayout, QPushButton,
+                               QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog, QMessageBox)
+from PySide6.QtCore import Qt, QTimer
+
+from src.utils.metrics import MetricsRegistry
+
+# 页面可见时的刷新间隔（毫秒）
+REFRESH_INTERVAL_MS = 1000
+
+
+def format_metric_value(kind: str, unit: str, snapshot: dict) -> str:
+    """把单个指标的快照格式化为表格中显示的文本。"""
+    suffix = f" {unit}" if unit else ""
+    if kind == "histogram":
+        if not snapshot["count"]:
+            return "无数据"
+        return (f"n={snapshot['count']}  平均 {snapshot['mean']:.2f}{suffix}  p50 {snapshot['p50']:g}  "
+                f"p95 {snapshot['p95']:g}  最大 {snapshot['max']:.2f}{suffix}")
+    value = snapshot["value"]
+    if value is None:
+        return "-"
+    if isinstance(value, float) and not value.is_integer():
+        return f"{value:,.2f}{suffix}"
+    return f"{int(value):,}{suffix}"
+
+
+class PerformancePageWidget(QWidget):
+    """
+    “性能”核心页面：实时展示平台指标注册表中的所有指标，并可将快照导出为 JSON。
+    只在页面可见时定时刷新，隐藏后停止计时器。
+    """
+    def __init__(self, registry: MetricsRegistry, export_dir: str, parent=None):
+        super().__init__(parent)
+        self.registry = registry
+        self.export_dir = export_dir
+
+        main_layout = QVBoxLayout(self)
+        main_layout.setContentsMargins(20, 20, 20, 20)
+        main_layout.setSpacing(15)
+
+        title_label = QLabel("性能指标")
+        title_label.setStyleSheet("font-size: 22px; font-weight: bold; margin-bottom: 10px; color: #333;")
+        main_layout.addWidget(title_label)
+
+        self.table = QTableWidget(0, 4)
+        self.table.setHorizontalHeaderLabels(["指标", "类型", "当前值", "说明"])
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)
+        main_layout.addWidget(self.table)
+
+        self.status_label = QLabel()
+        self.status_label.setStyleSheet("color: #666;")
+
+        self.export_button = QPushButton("导出快照 (JSON)")
+        self.export_button.setMinimumHeight(35)
+        self.export_button.clicked.connect(self.export_snapshot)
+
+        button_layout = QHBoxLayout()
+        button_layout.addWidget(self.status_label)
+        button_layout.addStretch()
+        button_layout.addWidget(self.export_button)
+        main_layout.addLayout(button_layout)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(REFRESH_INTERVAL_MS)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.refresh_timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.refresh_timer.stop()
+
+    def refresh(self):
+        """用注册表的最新快照重绘表格。"""
+        snapshot = self.registry.snapshot()["metrics"]
+        self.table.setRowCount(len(snapshot))
+        for row, (name, data) in enumerate(snapshot.items()):
+            cells = [name, data["type"], format_metric_value(data["type"], data["unit"], data), data["description"]]
+            for column, text in enumerate(cells):
+                item = self.table.item(row, column)
+                if item is None:
+                    item = QTableWidgetItem()
+                    self.table.setItem(row, column, item)
+                item.setText(text)
+            self.table.item(row, 2).setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        self.status_label.setText(f"共 {len(snapshot)} 项指标，更新于 {datetime.now():%H:%M:%S}")
+
+    def export_snapshot(self):
+        """将当前快照导出为 JSON 文件。"""
+        default_path = os.path.join(self.export_dir, f"metrics_{datetime.now():%Y%m%d_%H%M%S}.json")
+        path, _ = QFileDialog.getSaveFileName(self, "导出性能指标快照", default_path, "JSON 文件 (*.json)")
+        if not path:
+            return
+        if self.registry.write_json(path):
+            logging.info(f"[src.ui.performance_page.PerformancePageWidget.export_snapshot] 性能指标快照已导出: {path}")
+            QMessageBox.information(self, "导出成功", f"性能指标快照已保存到:\n{path}")
+        else:
+            QMessageBox.warning(self, "导出失败", "写入快照文件失败，请查看日志获取详情。")
@@ -2,10 +2,13 @@
 import logging
 from PySide6.QtWidgets import (QWidget, QLabel, QVBoxLayout, QGroupBox,
                                QLineEdit, QPushButton, QMessageBox, QFormLayout,
-                               QComboBox, QSpinBox, QScrollArea, QHBoxLayout)
+                               QComboBox, QSpinBox, QScrollArea, QHBoxLayout,
+                               QDialog, QPlainTextEdit, QDialogButtonBox)
 from PySide6.QtCore import Qt, QEvent
+from PySide6.QtGui import QFont
 
 from src.services.config_service import ConfigService
+from src.utils.timeline import Timeline
 
 # 【修改】元数据结构添加 "default" 字段
 SETTING_METADATA = {
@@ -14,16 +17,61 @@ SETTING_METADATA = {
         "start_minimized": {"widget": "combobox", "label": "启动时最小化", "items": ["禁用", "启用"], "map": {"启用": "true", "禁用": "false"}, "default": "false"},
         "show_startup_notification": {"widget": "combobox", "label": "显示启动通知", "items": ["禁用", "启用"], "map": {"启用": "true", "禁用": "false"}, "default": "true"},
         "enable_desktop_popup": {"widget": "combobox", "label": "桌面弹窗通知", "items": ["禁用", "启用"], "map": {"启用": "true", "禁用": "false"}, "default": "true"},
-        "popup_timeout": {"widget": "spinbox", "label": "弹窗显示时长 (秒)", "min": 1, "max": 300, "default": 10}
+        "popup_timeout": {"widget": "spinbox", "label": "弹窗显示时长 (秒)", "min": 1, "max": 300, "default": 10},
+        # 【新增】插件页面延迟加载（需重启生效）
+        "lazy_plugin_pages": {"widget": "combobox", "label": "插件页面延迟加载", "items": ["禁用", "启用"], "map": {"启用": "true", "禁用": "false"}, "default": "true"},
+        # 【新增】插件准备阶段的并发线程数（需重启生效）
+        "plugin_init_workers": {"widget": "spinbox", "label": "插件初始化线程数", "min": 1, "max": 16, "default": 4},
+        # 【新增】监视 config.ini 的外部修改并自动重新加载（需重启生效）
+        "watch_config_file": {"widget": "combobox", "label": "配置文件热重载", "items": ["禁用", "启用"], "map": {"启用": "true", "禁用": "false"}, "default": "true"}
+    },
+    # 【新增】通知合并与限流设置
+    "Notification": {
+        "merge_window_seconds": {"widget": "spinbox", "label": "相同通知合并窗口 (秒)", "min": 0, "max": 3600, "default": 10},
+        "max_per_minute": {"widget": "spinbox", "label": "每分钟最多弹窗数", "min": 1, "max": 600, "default": 20}
     },
     # 【新增】日志设置的元数据，上面的notification也是本次新添加的
     "Logging": {
-        "level": {"widget": "combobox", "label": "日志级别", "items": ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"], "default": "INFO"}
+        "level": {"widget": "combobox", "label": "日志级别", "items": ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"], "default": "INFO"},
+        # 【新增】按模块覆盖日志级别，例如 "src.services.sqlite_base_service=WARNING, src.features.window_arranger=DEBUG"
+        "module_levels": {"widget": "lineedit", "label": "模块日志级别", "default": ""},
+        "profile_imports": {"widget": "combobox", "label": "插件导入耗时分析", "items": ["禁用", "启用"], "map": {"启用": "true", "禁用": "false"}, "default": "false"},
+        # 【新增】托盘菜单“性能采样”的采样间隔，下次开始采样时生效
+        "sampling_interval_ms": {"widget": "spinbox", "label": "性能采样间隔 (毫秒)", "min": 1, "max": 1000, "default": 10},
+        # 【新增】GUI 事件循环阻塞超过该时长即记录调用栈，0 为禁用（需重启生效）
+        "stall_threshold_ms": {"widget": "spinbox", "label": "界面卡顿检测阈值 (毫秒)", "min": 0, "max": 60000, "default": 200}
     },
     # 【新增】Webhook 默认设置的元数据
     "WebhookDefaults": {
         "default_host": {"widget": "lineedit", "label": "默认推送主机", "default": "127.0.0.1"},
-        "default_port": {"widget": "spinbox", "label": "默认推送端口", "min": 1, "max": 65535, "default": 5000}
+        "default_port": {"widget": "spinbox", "label": "默认推送端口", "min": 1, "max": 65535, "default": 5000},
+        # 【新增】推送超时、重试与批量合并（需重启生效）
+        "timeout_seconds": {"widget": "spinbox", "label": "推送超时 (秒)", "min": 1, "max": 60, "default": 5},
+        "max_retries": {"widget": "spinbox", "label": "失败重试次数", "min": 0, "max": 20, "default": 5},
+        "retry_base_seconds": {"widget": "spinbox", "label": "首次重试间隔 (秒)", "min": 1, "max": 300, "default": 1},
+        "batch_window_ms": {"widget": "spinbox", "label": "批量合并窗口 (毫秒)", "min": 0, "max": 10000, "default": 200}
+    },
+    # 【新增】SQL 性能分析设置（需重启生效）
+    "Database": {
+        "profile_queries": {"widget": "combobox", "label": "SQL 性能分析", "items": ["禁用", "启用"], "map": {"启用": "true", "禁用": "false"}, "default": "false"},
+        "slow_query_ms": {"widget": "spinbox", "label": "慢查询阈值 (毫秒)", "min": 1, "max": 60000, "default": 100}
+    },
+    # 【新增】数据库在线备份设置（需重启生效）
+    "Backup": {
+        "enabled": {"widget": "combobox", "label": "定时备份", "items": ["禁用", "启用"], "map": {"启用": "true", "禁用": "false"}, "default": "true"},
+        "interval_hours": {"widget": "spinbox", "label": "备份间隔 (小时)", "min": 1, "max": 720, "default": 24},
+        "keep_count": {"widget": "spinbox", "label": "保留快照数量", "min": 1, "max": 100, "default": 7},
+        "backup_dir": {"widget": "lineedit", "label": "备份目录 (留空为默认)", "default": ""}
+    },
+    # 【新增】Excel/CSV 解析缓存设置（需重启生效）
+    "Cache": {
+        "frame_cache_enabled": {"widget": "combobox", "label": "表格解析缓存", "items": ["禁用", "启用"], "map": {"启用": "true", "禁用": "false"}, "default": "true"},
+        "frame_cache_max_mb": {"widget": "spinbox", "label": "缓存上限 (MB)", "min": 16, "max": 102400, "default": 512}
+    },
+    # 【新增】后台任务线程池设置（需重启生效）
+    "Tasks": {
+        "max_workers": {"widget": "spinbox", "label": "后台任务线程数", "min": 1, "max": 32, "default": 4},
+        "plugin_limit": {"widget": "spinbox", "label": "每个插件的并发任务数", "min": 1, "max": 32, "default": 2}
     },
 }
 
@@ -32,9 +80,10 @@ class SettingsPageWidget(QWidget):
     “设置”功能页面。
     采用“元数据驱动”和“卡片式布局”进行重构，提升了可维护性和用户体验。
     """
-    def __init__(self, config_service: ConfigService, parent=None):
+    def __init__(self, config_service: ConfigService, parent=None, startup_timeline: Timeline | None = None):
         super().__init__(parent)
         self.config_service = config_service
+        self.startup_timeline = startup_timeline
         self.editors = {}
 
         main_layout = QVBoxLayout(self)
@@ -67,14 +116,24 @@ class SettingsPageWidget(QWidget):
             QPushButton:pressed { background-color: #004578; }
         """)
         self.save_button.clicked.connect(self.save_settings)
-        main_layout.addWidget(self.save_button, 0, Qt.AlignmentFlag.AlignRight)
+
+        button_layout = QHBoxLayout()
+        # 【新增】启动报告：展示本次启动各阶段与各插件的耗时
+        if self.startup_timeline is not None:
+            self.report_button = QPushButton("查看启动报告")
+            self.report_button.setMinimumHeight(35)
+            self.report_button.clicked.connect(self.show_startup_report)
+            button_layout.addWidget(self.report_button)
+        button_layout.addStretch()
+        button_layout.addWidget(self.save_button)
+        main_layout.addLayout(button_layout)
 
         self.installEventFilter(self)
 
     def _create_setting_cards(self):
         """根据元数据动态创建所有设置卡片。"""
         # 【修改】确保新卡片按预定顺序创建
-        ordered_sections = ["General", "Logging", "WebhookDefaults"]
+        ordered_sections = ["General", "Notification", "Logging", "WebhookDefaults", "Database", "Backup", "Cache", "Tasks"]
         for section in ordered_sections:
             if section in SETTING_METADATA:
                 options_meta = SETTING_METADATA[section]
@@ -156,6 +215,22 @@ class SettingsPageWidget(QWidget):
             self._load_settings_to_ui()
         return super().eventFilter(obj, event)
 
+    def show_startup_report(self):
+        """【新增】以只读文本对话框显示启动时间线报告。"""
+        dialog = QDialog(self)
+        dialog.setWindowTitle("启动报告")
+        dialog.resize(760, 520)
+        layout = QVBoxLayout(dialog)
+        text_edit = QPlainTextEdit(self.startup_timeline.report())
+        text_edit.setReadOnly(True)
+        text_edit.setFont(QFont("Consolas", 9))
+        text_edit.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        layout.addWidget(text_edit)
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        buttons.rejected.connect(dialog.reject)
+        layout.addWidget(buttons)
+        dialog.exec()
+
     def save_settings(self):
         logging.info("尝试保存所有设置...")
         try:
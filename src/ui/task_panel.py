@@ -0,0 +1,140 @@
+# desktop_center/src/ui/task_panel.py
+import logging
+from typing import Dict
+from PySide6.QtWidgets import (QWidget, QLabel, QVBoxLayout, QHBoxLayout, QPushButton, QProgressBar,
+                               QTableWidget, QTableWidgetItem, QHeaderView)
+from PySide6.QtCore import Qt
+
+from src.services.task_manager import Task, TaskManager, TaskState
+
+COLUMNS = ["任务", "插件", "状态", "进度", "信息", "耗时", ""]
+PROGRESS_COLUMN, CANCEL_COLUMN = 3, 6
+
+
+def format_elapsed(seconds) -> str:
+    """把秒数格式化为表格中显示的耗时文本。"""
+    if seconds is None:
+        return "-"
+    if seconds < 60:
+        return f"{seconds:.1f}s"
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes}m{seconds:02d}s"
+
+
+class TaskPanelWidget(QWidget):
+    """
+    “任务”核心页面：列出所有插件提交到平台任务管理器的后台任务，显示进度并允许取消。
+    通过任务管理器的监听者接口增量更新（通知已在 GUI 线程中），不轮询。
+    """
+    def __init__(self, task_manager: TaskManager, parent=None):
+        super().__init__(parent)
+        self.task_manager = task_manager
+        # 任务 id -> 表格行号
+        self._rows: Dict[int, int] = {}
+
+        main_layout = QVBoxLayout(self)
+        main_layout.setContentsMargins(20, 20, 20, 20)
+        main_layout.setSpacing(15)
+
+        title_label = QLabel("后台任务")
+        title_label.setStyleSheet("font-size: 22px; font-weight: bold; margin-bottom: 10px; color: #333;")
+        main_layout.addWidget(title_label)
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        header = self.table.horizontalHeader()
+        for column in range(len(COLUMNS)):
+            header.setSectionResizeMode(column, QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(PROGRESS_COLUMN, QHeaderView.ResizeMode.Fixed)
+        self.table.setColumnWidth(PROGRESS_COLUMN, 160)
+        header.setSectionResizeMode(4, QHeaderView.ResizeMode.Stretch)
+        main_layout.addWidget(self.table)
+
+        self.status_label = QLabel()
+        self.status_label.setStyleSheet("color: #666;")
+
+        self.clear_button = QPushButton("清除已结束的任务")
+        self.clear_button.setMinimumHeight(35)
+        self.clear_button.clicked.connect(self.clear_finished)
+
+        button_layout = QHBoxLayout()
+        button_layout.addWidget(self.status_label)
+        button_layout.addStretch()
+        button_layout.addWidget(self.clear_button)
+        main_layout.addLayout(button_layout)
+
+        for task in self.task_manager.tasks():
+            self.update_task(task)
+        self._update_status()
+        self.task_manager.add_listener(self.update_task)
+
+    def update_task(self, task: Task):
+        """新增或刷新某个任务所在的行。"""
+        row = self._rows.get(task.id)
+        if row is None and task.done() and task not in self.task_manager.tasks():
+            return  # 已被清除的任务迟到的通知
+        if row is None:
+            row = self.table.rowCount()
+            self.table.insertRow(row)
+            self._rows[task.id] = row
+            for column in range(len(COLUMNS)):
+                if column not in (PROGRESS_COLUMN, CANCEL_COLUMN):
+                    self.table.setItem(row, column, QTableWidgetItem())
+            progress_bar = QProgressBar()
+            progress_bar.setRange(0, 1000)
+            progress_bar.setTextVisible(True)
+            self.table.setCellWidget(row, PROGRESS_COLUMN, progress_bar)
+            cancel_button = QPushButton("取消")
+            cancel_button.clicked.connect(lambda: task.cancel())
+            self.table.setCellWidget(row, CANCEL_COLUMN, cancel_button)
+
+        cells = {0: task.title, 1: task.plugin, 2: task.state.value, 4: task.message, 5: format_elapsed(task.elapsed)}
+        for column, text in cells.items():
+            self.table.item(row, column).setText(text)
+        if task.state == TaskState.FAILED and task.exception() is not None:
+            self.table.item(row, 4).setText(f"{task.message}  错误: {task.exception()}".strip())
+
+        progress_bar = self.table.cellWidget(row, PROGRESS_COLUMN)
+        if task.progress is None and task.state == TaskState.RUNNING:
+            progress_bar.setRange(0, 0)  # 无法确定进度时显示忙碌动画
+        else:
+            progress_bar.setRange(0, 1000)
+            progress_bar.setValue(int((task.progress or 0) * 1000))
+            progress_bar.setFormat(f"{(task.progress or 0) * 100:.0f}%")
+
+        cancel_button = self.table.cellWidget(row, CANCEL_COLUMN)
+        cancel_button.setEnabled(task.cancellable and not task.done() and not task.is_cancel_requested())
+        self._update_status()
+
+    def clear_finished(self):
+        """从管理器和表格中移除所有已结束的任务。"""
+        self.task_manager.clear_finished()
+        self._rows.clear()
+        self.table.setRowCount(0)
+        for task in self.task_manager.tasks():
+            self.update_task(task)
+        self._update_status()
+        logging.info("[src.ui.task_panel.TaskPanelWidget.clear_finished] 已清除已结束的后台任务。")
+
+    def _update_status(self):
+        active = self.task_manager.active_count()
+        self.status_label.setText(f"共 {self.table.rowCount()} 个任务，{active} 个正在等待或运行")
+
+
+class TaskStatusButton(QPushButton):
+    """主窗口状态栏中的后台任务指示器：显示活动任务数，点击后打开“任务”页面。"""
+
+    def __init__(self, task_manager: TaskManager, parent=None):
+        super().__init__(parent)
+        self.task_manager = task_manager
+        self.setFlat(True)
+        self.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.refresh()
+        self.task_manager.add_listener(self.refresh)
+
+    def refresh(self, task: Task = None):
+        active = self.task_manager.active_count()
+        self.setText(f"后台任务: {active} 个进行中" if active else "后台任务: 空闲")
@@ -0,0 +1,25 @@
+# desktop_center/src/utils/gui_dispatcher.py
+from typing import Callable
+from PySide6.QtCore import QObject, Signal, Slot, Qt
+
+
+class GuiDispatcher(QObject):
+    """
+    把任意线程中的可调用对象投递到 GUI 线程执行。
+
+    通过一个排队连接（QueuedConnection）的信号实现：工作线程发射信号，
+    槽函数在本对象所在线程（即创建它的 GUI 线程）的事件循环中被调用。
+    """
+    _callable_posted = Signal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._callable_posted.connect(self._invoke, Qt.QueuedConnection)
+
+    def post(self, fn: Callable[[], None]) -> None:
+        """线程安全地请求在 GUI 线程中执行 `fn`。"""
+        self._callable_posted.emit(fn)
+
+    @Slot(object)
+    def _invoke(self, fn: Callable[[], None]) -> None:
+        fn()
@@ -0,0 +1,126 @@
+# desktop_center/src/utils/import_profiler.py
+"""
+启动阶段的导入耗时分析器（类似 `python -X importtime`，但按插件汇总）。
+
+启用后临时替换 `builtins.__import__`，记录每个新导入模块的自身耗时与累计耗时，
+并把它们归属到当前的“分段”（通常是一个插件）。报告中同时列出每个分段新加载了哪些重量级依赖，
+用于确认 pandas / Flask / paramiko 等是否真的被延迟到了首次使用时。
+
+对比延迟导入前后的冷启动时间：分别以默认方式和设置环境变量 HELPSELF_EAGER_IMPORTS=1
+（让所有延迟导入代理立即导入）各启动一次，比较两份报告中的总耗时。
+"""
+import sys
+import time
+import builtins
+import importlib.util
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+# 报告中重点标出的重量级第三方库（顶层包名）
+HEAVY_PACKAGES = ("pandas", "numpy", "openpyxl", "flask", "werkzeug", "paramiko",
+                  "cryptography", "plyer", "requests", "ansi2html", "psutil")
+
+
+class ImportProfiler:
+    """按分段统计模块导入耗时。只统计调用 start() 的线程中的导入。"""
+
+    def __init__(self):
+        self.enabled = False
+        self._original_import = None
+        self._thread_id: Optional[int] = None
+        self._stack: List[float] = []
+        self._current_section = "core"
+        # 模块名 -> [自身耗时, 累计耗时, 所属分段]
+        self._modules: Dict[str, list] = {}
+        # 分段名 -> {"wall": 秒, "new_modules": set}
+        self._sections: Dict[str, dict] = {}
+
+    def start(self) -> None:
+        """开始记录导入耗时。"""
+        if self.enabled:
+            return
+        self.enabled = True
+        self._thread_id = threading.get_ident()
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._profiled_import
+
+    def stop(self) -> None:
+        """停止记录并恢复原始的导入函数。"""
+        if not self.enabled:
+            return
+        builtins.__import__ = self._original_import
+        self.enabled = False
+
+    @contextmanager
+    def section(self, name: str):
+        """把代码块中发生的导入归属到分段 `name`。未启用时几乎没有额外开销。"""
+        if not self.enabled:
+            yield
+            return
+        previous = self._current_section
+        self._current_section = name
+        before = set(sys.modules)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            stat = self._sections.setdefault(name, {"wall": 0.0, "new_modules": set()})
+            stat["wall"] += time.perf_counter() - start
+            stat["new_modules"].update(set(sys.modules) - before)
+            self._current_section = previous
+
+    def _profiled_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._original_import
+        if threading.get_ident() != self._thread_id:
+            return original(name, globals, locals, fromlist, level)
+
+        absolute = name
+        if level > 0:
+            package = (globals or {}).get('__package__') or ''
+            try:
+                absolute = importlib.util.resolve_name('.' * level + name, package)
+            except (ImportError, ValueError):
+                absolute = name
+        if absolute in sys.modules:
+            return original(name, globals, locals, fromlist, level)
+
+        self._stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            record = self._modules.setdefault(absolute, [0.0, 0.0, self._current_section])
+            record[0] += elapsed - children
+            record[1] += elapsed
+
+    def report(self, limit: int = 15) -> str:
+        """生成文本报告：各分段总耗时、新加载的重量级依赖，以及累计耗时最高的模块。"""
+        lines = ["=== 启动导入耗时分析 ===", ""]
+        total = sum(stat["wall"] for stat in self._sections.values())
+        lines.append(f"{'分段':<24}{'耗时(ms)':>12}{'新模块数':>10}  新加载的重量级依赖")
+        for name, stat in sorted(self._sections.items(), key=lambda item: item[1]["wall"], reverse=True):
+            heavy = sorted({m.split('.')[0] for m in stat["new_modules"]} & set(HEAVY_PACKAGES))
+            lines.append(f"{name:<24}{stat['wall'] * 1000:>12.1f}{len(stat['new_modules']):>10}  {', '.join(heavy) or '-'}")
+        lines.append(f"{'合计':<24}{total * 1000:>12.1f}")
+
+        lines += ["", f"--- 累计耗时最高的 {limit} 个模块 ---", f"{'累计(ms)':>10}{'自身(ms)':>10}  {'分段':<20}模块"]
+        ranked = sorted(self._modules.items(), key=lambda item: item[1][1], reverse=True)[:limit]
+        for module, (self_time, cumulative, section) in ranked:
+            lines.append(f"{cumulative * 1000:>10.1f}{self_time * 1000:>10.1f}  {section:<20}{module}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> str:
+        """单行摘要，用于写入日志。"""
+        parts = [f"{name}={stat['wall'] * 1000:.0f}ms"
+                 for name, stat in sorted(self._sections.items(), key=lambda item: item[1]["wall"], reverse=True)]
+        total = sum(stat["wall"] for stat in self._sections.values())
+        return f"导入总耗时 {total * 1000:.0f}ms: " + ", ".join(parts)
+
+
+# 全局实例
+import_profiler = ImportProfiler()
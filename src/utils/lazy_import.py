@@ -0,0 +1,80 @@
+# desktop_center/src/utils/lazy_import.py
+"""
+重量级第三方库的延迟导入。
+
+pandas、Flask、paramiko、openpyxl、plyer 等库的导入动辄数百毫秒，
+而插件模块在启动时就会被全部导入。`lazy_import` 返回一个模块代理，
+只有在第一次访问其属性时才真正执行导入，从而把这部分开销推迟到功能首次被使用时。
+
+注意：
+- 使用代理对象的模块中，若在函数签名里写了 `pd.DataFrame` 之类的注解，
+  需要 `from __future__ import annotations`，否则注解求值会提前触发导入。
+- 代理对象永远不是 None；判断库是否已安装请使用 `module_available()`。
+- 设置环境变量 HELPSELF_EAGER_IMPORTS=1 可让所有代理立即导入，用于对比延迟导入前后的启动耗时。
+"""
+import os
+import functools
+import importlib
+import importlib.util
+import threading
+from types import ModuleType
+
+
+class LazyModule(ModuleType):
+    """首次访问属性时才导入目标模块的代理。"""
+
+    def __init__(self, name: str, install_hint: str = ""):
+        super().__init__(name)
+        self.__dict__['_lazy_target'] = None
+        self.__dict__['_lazy_hint'] = install_hint
+        self.__dict__['_lazy_lock'] = threading.Lock()
+
+    def _load(self) -> ModuleType:
+        module = self.__dict__['_lazy_target']
+        if module is None:
+            with self.__dict__['_lazy_lock']:
+                module = self.__dict__['_lazy_target']
+                if module is None:
+                    try:
+                        module = importlib.import_module(self.__name__)
+                    except ImportError as e:
+                        hint = self.__dict__['_lazy_hint']
+                        raise ImportError(f"{hint or f'缺少依赖库 {self.__name__}'}: {e}") from e
+                    self.__dict__['_lazy_target'] = module
+        return module
+
+    def __getattr__(self, item: str):
+        return getattr(self._load(), item)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__['_lazy_target'] is not None else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name: str, install_hint: str = "") -> LazyModule:
+    """
+    返回模块 `name` 的延迟导入代理。
+
+    Args:
+        name (str): 完整模块名，例如 'pandas' 或 'werkzeug.exceptions'。
+        install_hint (str): 导入失败时附加在异常信息中的安装提示。
+    """
+    module = LazyModule(name, install_hint)
+    if os.environ.get("HELPSELF_EAGER_IMPORTS") == "1":
+        try:
+            module._load()
+        except ImportError:
+            pass  # 与延迟模式保持一致：缺少依赖时到首次使用才报错
+    return module
+
+
+@functools.lru_cache(maxsize=None)
+def module_available(name: str) -> bool:
+    """在不导入模块的前提下判断其是否已安装。"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
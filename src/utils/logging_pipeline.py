@@ -0,0 +1,214 @@
+# desktop_center/src/utils/logging_pipeline.py
+"""
+异步日志管道。
+
+调用 `logging.*` 的线程（GUI 线程、告警接收线程、各插件的后台线程）只负责生成日志记录并放入内存队列，
+消息插值（`msg % args`）、异常堆栈格式化、写轮转文件和写控制台都由 `QueueListener` 的单个后台线程完成，
+慢磁盘或被阻塞的控制台不会拖慢业务线程。标准库的 `QueueHandler.prepare()` 会在调用线程中格式化记录，
+因此这里使用只复制记录的 `DeferredQueueHandler`，格式化推迟到 `DeferredQueueListener.prepare()` 中进行。
+注意：参数在监听线程中才被转换为字符串，传入之后还会被修改的可变对象应先自行复制。
+
+按模块设置日志级别：项目代码统一使用根 logger（`logging.info(...)`），因此级别覆盖按记录所在的源文件
+换算出的模块名（如 `src.features.alert_center.services.alert_receiver`）匹配，最长前缀优先，例如:
+
+    [Logging]
+    level = INFO
+    module_levels = src.services.sqlite_base_service=WARNING, src.features.window_arranger=DEBUG
+
+延迟格式化：f-string 在调用 `logging.debug` 之前就会被求值，即使 DEBUG 未启用也要付出拼接代价。
+热点路径上应使用 `%s` 占位参数，开销较大的参数用 `lazy()` 包装，只有在记录真正被输出时才求值:
+
+    logging.debug("窗口快照: %s", lazy(describe_windows, windows))
+"""
+import os
+import sys
+import copy
+import queue
+import atexit
+import logging
+import logging.handlers
+import functools
+import threading
+from typing import Callable, Dict, List, Optional
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - [%(threadName)s] - %(message)s'
+
+# 项目根目录（src 的上一级），用于把源文件路径换算为模块名
+_PROJECT_ROOT = os.path.normcase(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+class lazy:
+    """延迟求值的日志参数：只有在日志记录被格式化输出时才调用 `func(*args, **kwargs)`。"""
+    __slots__ = ("func", "args", "kwargs")
+
+    def __init__(self, func: Callable, *args, **kwargs):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def __str__(self) -> str:
+        return str(self.func(*self.args, **self.kwargs))
+
+    __repr__ = __str__
+
+
+def debug_enabled() -> bool:
+    """根 logger 是否会处理 DEBUG 记录。用于包住需要先做额外计算才能记录的调试日志。"""
+    return logging.getLogger().isEnabledFor(logging.DEBUG)
+
+
+def parse_level(value: str, fallback: int = logging.INFO) -> int:
+    level = logging.getLevelName(str(value).strip().upper())
+    return level if isinstance(level, int) else fallback
+
+
+def parse_module_levels(spec: str) -> Dict[str, int]:
+    """
+    解析 "模块=级别, 模块=级别" 形式的级别覆盖配置，格式错误的条目会被忽略并记录警告。
+    """
+    levels: Dict[str, int] = {}
+    for entry in (spec or "").split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        module, sep, level_name = entry.partition("=")
+        level = logging.getLevelName(level_name.strip().upper())
+        if not sep or not module.strip() or not isinstance(level, int):
+            logging.warning(f"[src.utils.logging_pipeline.parse_module_levels] 无效的模块日志级别配置，已忽略: '{entry}'")
+            continue
+        levels[module.strip()] = level
+    return levels
+
+
+@functools.lru_cache(maxsize=1024)
+def module_name_for_path(pathname: str) -> str:
+    """把源文件路径换算为点分模块名；项目外的文件返回其不带扩展名的文件名。"""
+    path = os.path.normcase(os.path.abspath(pathname))
+    stem = os.path.splitext(path)[0]
+    if stem.startswith(_PROJECT_ROOT + os.sep):
+        stem = stem[len(_PROJECT_ROOT) + 1:]
+        if stem.endswith(os.sep + "__init__"):
+            stem = stem[:-len(os.sep + "__init__")]
+        return stem.replace(os.sep, ".")
+    return os.path.basename(stem)
+
+
+class ModuleLevelFilter(logging.Filter):
+    """按记录所在模块决定是否放行：命中最长前缀的覆盖级别，否则使用全局级别。"""
+
+    def __init__(self, level: int, module_levels: Optional[Dict[str, int]] = None):
+        super().__init__()
+        self.configure(level, module_levels)
+
+    def configure(self, level: int, module_levels: Optional[Dict[str, int]] = None) -> None:
+        self.level = level
+        # 按长度降序排列，第一个匹配的即为最长前缀
+        self._overrides = sorted((module_levels or {}).items(), key=lambda item: len(item[0]), reverse=True)
+        # 文件路径 -> 生效级别；每个实例独立缓存，重新配置时清空
+        self._cache: Dict[str, int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not self._overrides:
+            return record.levelno >= self.level
+        return record.levelno >= self._resolve(record.pathname)
+
+    def _resolve(self, pathname: str) -> int:
+        level = self._cache.get(pathname)
+        if level is None:
+            module = module_name_for_path(pathname)
+            level = next((level for prefix, level in self._overrides
+                          if module == prefix or module.startswith(prefix + ".")), self.level)
+            self._cache[pathname] = level
+        return level
+
+    @property
+    def lowest_level(self) -> int:
+        return min([self.level] + [level for _, level in self._overrides])
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """只复制记录、不做任何格式化的队列处理器，格式化留给监听线程。"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 复制一份，避免同一 logger 上的其他处理器看到被监听线程改写后的记录
+        return copy.copy(record)
+
+
+class DeferredQueueListener(logging.handlers.QueueListener):
+    """在监听线程中完成消息插值和异常堆栈格式化，再交给真正的处理器。"""
+    _exception_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            # 格式化后丢弃 exc_info，释放其引用的栈帧；处理器的 Formatter 会直接使用 exc_text
+            if not record.exc_text:
+                record.exc_text = self._exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class LoggingPipeline:
+    """
+    基于 `DeferredQueueHandler` / `DeferredQueueListener` 的日志管道。
+
+    `install()` 用一个队列处理器替换根 logger 上的处理器，格式化和真正的处理器（文件、控制台）由监听线程驱动。
+    进程退出时（atexit）或调用 `stop()` 时，队列中剩余的记录会被全部写出。
+    """
+    def __init__(self, handlers: List[logging.Handler], level: int = logging.INFO,
+                 module_levels: Optional[Dict[str, int]] = None):
+        self.handlers = handlers
+        self.queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self.queue_handler = DeferredQueueHandler(self.queue)
+        self.level_filter = ModuleLevelFilter(level, module_levels)
+        self.queue_handler.addFilter(self.level_filter)
+        self.listener = DeferredQueueListener(self.queue, *handlers, respect_handler_level=True)
+        self._lock = threading.Lock()
+        self._running = False
+
+    def install(self, logger: Optional[logging.Logger] = None) -> 'LoggingPipeline':
+        """启动监听线程并把队列处理器挂到 `logger`（默认根 logger）上。"""
+        self.logger = logger or logging.getLogger()
+        for handler in list(self.logger.handlers):
+            self.logger.removeHandler(handler)
+        self.logger.addHandler(self.queue_handler)
+        self.logger.setLevel(self.level_filter.lowest_level)
+        with self._lock:
+            if not self._running:
+                self.listener.start()
+                self._running = True
+        atexit.register(self.stop)
+        return self
+
+    def set_levels(self, level: int, module_levels: Optional[Dict[str, int]] = None) -> None:
+        """运行时调整全局级别和模块级别覆盖。"""
+        self.level_filter.configure(level, module_levels)
+        if getattr(self, "logger", None) is not None:
+            self.logger.setLevel(self.level_filter.lowest_level)
+
+    def stop(self) -> None:
+        """写出队列中剩余的记录并停止监听线程。可重复调用。"""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+        self.listener.stop()
+        for handler in self.handlers:
+            handler.flush()
+
+
+def create_default_handlers(log_file_path: str, max_bytes: int = 2 * 1024 * 1024, backup_count: int = 5) -> List[logging.Handler]:
+    """创建应用默认的处理器：轮转日志文件 + 标准输出。"""
+    formatter = logging.Formatter(LOG_FORMAT)
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_file_path,
+        maxBytes=max_bytes,
+        backupCount=backup_count,
+        encoding='utf-8',
+        mode='a'
+    )
+    stream_handler = logging.StreamHandler(sys.stdout)
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(formatter)
+    return [file_handler, stream_handler]
@@ -0,0 +1,228 @@
+# desktop_center/src/utils/metrics.py
+"""
+平台级运行指标注册表。
+
+提供三种指标:
+- Counter：只增不减的计数，例如已接收的告警数、SSH 收到的字节数。
+- Gauge：当前值，可以直接设置，也可以在读取时调用回调函数计算（例如队列长度）。
+- Histogram：耗时等数值的分布，按固定桶统计，提供 count / sum / min / max 和近似分位数。
+
+更新路径不加锁：每个线程只写自己的分片（在 GIL 下对单一写入者是安全的），
+读取时再把所有分片合并，因此在告警接收、数据库工作线程等热点路径上记录指标几乎没有开销。
+
+插件通过 `context.metrics` 访问全局注册表；没有 context 的底层服务直接使用模块级的 `metrics`:
+
+    self.context.metrics.counter("alert_center.alerts_ingested", "已接收的告警").inc()
+    with metrics.histogram("db.task_ms", "数据库任务耗时").time():
+        ...
+"""
+import os
+import json
+import time
+import bisect
+import logging
+import threading
+from datetime import datetime
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Sequence
+
+# 默认的耗时桶上界（毫秒），覆盖从亚毫秒级的内存操作到数秒的慢查询
+DEFAULT_BUCKETS_MS = (0.1, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, description: str = "", unit: str = ""):
+        self.name = name
+        self.description = description
+        self.unit = unit
+
+
+class Counter(_Metric):
+    """单调递增的计数器。"""
+    kind = "counter"
+
+    def __init__(self, name: str, description: str = "", unit: str = ""):
+        super().__init__(name, description, unit)
+        self._shards: Dict[int, List[float]] = {}
+
+    def inc(self, amount: float = 1) -> None:
+        shard = self._shards.get(threading.get_ident())
+        if shard is None:
+            shard = self._shards.setdefault(threading.get_ident(), [0])
+        shard[0] += amount
+
+    @property
+    def value(self) -> float:
+        return sum(shard[0] for shard in list(self._shards.values()))
+
+    def snapshot(self) -> Dict:
+        return {"value": self.value}
+
+
+class Gauge(_Metric):
+    """当前值。设置了回调时，每次读取都调用回调获取最新值。"""
+    kind = "gauge"
+
+    def __init__(self, name: str, description: str = "", unit: str = "", func: Optional[Callable[[], float]] = None):
+        super().__init__(name, description, unit)
+        self._value: float = 0
+        self._func = func
+
+    def set(self, value: float) -> None:
+        self._value = value
+
+    @property
+    def value(self) -> Optional[float]:
+        if self._func is None:
+            return self._value
+        try:
+            return self._func()
+        except Exception as e:
+            logging.debug("[src.utils.metrics.Gauge.value] 读取指标 '%s' 失败: %s", self.name, e)
+            return None
+
+    def snapshot(self) -> Dict:
+        return {"value": self.value}
+
+
+class _HistogramShard:
+    __slots__ = ("buckets", "count", "total", "min", "max")
+
+    def __init__(self, size: int):
+        self.buckets = [0] * size
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+
+class Histogram(_Metric):
+    """固定桶直方图。最后一个桶收纳所有超过最大上界的值。"""
+    kind = "histogram"
+
+    def __init__(self, name: str, description: str = "", unit: str = "ms", buckets: Sequence[float] = DEFAULT_BUCKETS_MS):
+        super().__init__(name, description, unit)
+        self.bounds = tuple(sorted(buckets))
+        self._shards: Dict[int, _HistogramShard] = {}
+
+    def observe(self, value: float) -> None:
+        shard = self._shards.get(threading.get_ident())
+        if shard is None:
+            shard = self._shards.setdefault(threading.get_ident(), _HistogramShard(len(self.bounds) + 1))
+        shard.buckets[bisect.bisect_left(self.bounds, value)] += 1
+        shard.count += 1
+        shard.total += value
+        if value < shard.min:
+            shard.min = value
+        if value > shard.max:
+            shard.max = value
+
+    @contextmanager
+    def time(self):
+        """记录代码块的耗时（毫秒）。"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe((time.perf_counter() - start) * 1000)
+
+    def snapshot(self) -> Dict:
+        buckets = [0] * (len(self.bounds) + 1)
+        count, total, low, high = 0, 0.0, float("inf"), float("-inf")
+        for shard in list(self._shards.values()):
+            for i, n in enumerate(shard.buckets):
+                buckets[i] += n
+            count += shard.count
+            total += shard.total
+            low, high = min(low, shard.min), max(high, shard.max)
+        if count == 0:
+            return {"count": 0, "sum": 0.0, "min": None, "max": None, "mean": None, "p50": None, "p95": None, "p99": None,
+                    "buckets": buckets}
+        return {
+            "count": count,
+            "sum": round(total, 3),
+            "min": round(low, 3),
+            "max": round(high, 3),
+            "mean": round(total / count, 3),
+            "p50": self._quantile(buckets, count, 0.50, high),
+            "p95": self._quantile(buckets, count, 0.95, high),
+            "p99": self._quantile(buckets, count, 0.99, high),
+            "buckets": buckets,
+        }
+
+    def _quantile(self, buckets: List[int], count: int, q: float, high: float) -> float:
+        """返回分位数所在桶的上界（不超过观测到的最大值）。"""
+        rank = q * count
+        seen = 0
+        for i, n in enumerate(buckets):
+            seen += n
+            if seen >= rank and n:
+                bound = self.bounds[i] if i < len(self.bounds) else high
+                return round(min(bound, high), 3)
+        return round(high, 3)
+
+
+class MetricsRegistry:
+    """按名称管理所有指标。同名指标只创建一次，重复获取返回同一个实例。"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+        self.started_at = datetime.now()
+
+    def _get_or_create(self, cls, name: str, **kwargs) -> _Metric:
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = cls(name, **kwargs)
+                    self._metrics[name] = metric
+        if not isinstance(metric, cls):
+            raise TypeError(f"指标 '{name}' 已注册为 {metric.kind}，不能再作为 {cls.kind} 使用")
+        return metric
+
+    def counter(self, name: str, description: str = "", unit: str = "") -> Counter:
+        return self._get_or_create(Counter, name, description=description, unit=unit)
+
+    def gauge(self, name: str, description: str = "", unit: str = "", func: Optional[Callable[[], float]] = None) -> Gauge:
+        gauge = self._get_or_create(Gauge, name, description=description, unit=unit)
+        if func is not None:
+            gauge._func = func
+        return gauge
+
+    def histogram(self, name: str, description: str = "", unit: str = "ms", buckets: Sequence[float] = DEFAULT_BUCKETS_MS) -> Histogram:
+        return self._get_or_create(Histogram, name, description=description, unit=unit, buckets=buckets)
+
+    def metrics(self) -> List[_Metric]:
+        """按名称排序返回所有指标。"""
+        with self._lock:
+            return sorted(self._metrics.values(), key=lambda m: m.name)
+
+    def snapshot(self) -> Dict:
+        """导出所有指标的当前值，可直接序列化为 JSON。"""
+        return {
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "captured_at": datetime.now().isoformat(timespec="seconds"),
+            "metrics": {
+                metric.name: dict(type=metric.kind, description=metric.description, unit=metric.unit, **metric.snapshot())
+                for metric in self.metrics()
+            },
+        }
+
+    def write_json(self, path: str) -> bool:
+        """把当前快照写入 JSON 文件。"""
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.snapshot(), f, ensure_ascii=False, indent=2)
+            return True
+        except OSError as e:
+            logging.error(f"[src.utils.metrics.MetricsRegistry.write_json] 写入指标快照失败: {e}")
+            return False
+
+
+# 全局实例
+metrics = MetricsRegistry()
@@ -0,0 +1,129 @@
+# desktop_center/src/utils/sampling_profiler.py
+"""
+运行期的采样式性能分析器，用于排查生产环境中的界面卡顿。
+
+启动后由一个后台线程按固定间隔调用 `sys._current_frames()`，记录所有线程（包括 GUI 线程）
+当时的调用栈，按“线程;外层函数;...;内层函数”聚合计数。停止时以 collapsed stack 格式写出，
+每行形如 `MainThread;HelpSelf.<module>;...;module.func 42`，可直接交给 flamegraph.pl、
+speedscope 或 `inferno-flamegraph` 生成火焰图。
+
+未启动时没有任何线程和钩子，对程序运行没有额外开销；启动后的开销只来自采样线程本身，
+每次采样的耗时会被统计并在停止时写入日志。
+"""
+import os
+import sys
+import time
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+# 默认采样间隔（毫秒），即 100 Hz
+DEFAULT_INTERVAL_MS = 10
+# 单个调用栈记录的最大深度，更深的部分（通常是递归）被截断
+MAX_STACK_DEPTH = 200
+
+
+def _frame_label(frame) -> str:
+    """`模块名.函数限定名`，火焰图中的一个方块。分号是 collapsed 格式的分隔符，需要替换掉。"""
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{module}.{name}".replace(";", ":").replace(" ", "_")
+
+
+class SamplingProfiler:
+    """对所有线程做栈采样，结果为 collapsed stack 计数。一次只能有一个采样会话。"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._stacks: Dict[Tuple[str, ...], int] = {}
+        self._interval = DEFAULT_INTERVAL_MS / 1000
+        self._samples = 0
+        self._sampling_seconds = 0.0
+        self._started_at: Optional[datetime] = None
+        self._started_perf = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self, interval_ms: float = DEFAULT_INTERVAL_MS) -> bool:
+        """开始采样。已在采样时返回 False。"""
+        with self._lock:
+            if self._thread is not None:
+                return False
+            self._interval = max(1.0, float(interval_ms)) / 1000
+            self._stacks = {}
+            self._samples = 0
+            self._sampling_seconds = 0.0
+            self._started_at = datetime.now()
+            self._started_perf = time.perf_counter()
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="SamplingProfiler", daemon=True)
+            self._thread.start()
+        logging.info(f"[src.utils.sampling_profiler.SamplingProfiler.start] 性能采样已开始，采样间隔 {self._interval * 1000:g} ms。")
+        return True
+
+    def stop(self, output_dir: str) -> Optional[str]:
+        """
+        停止采样并把结果写入 `output_dir` 下以开始时间命名的 .collapsed 文件。
+
+        Returns:
+            Optional[str]: 写出的文件路径；未在采样或写入失败时返回 None。
+        """
+        with self._lock:
+            thread = self._thread
+            if thread is None:
+                return None
+            self._stop_event.set()
+            thread.join()
+            self._thread = None
+
+        duration = time.perf_counter() - self._started_perf
+        overhead = self._sampling_seconds / duration * 100 if duration > 0 else 0.0
+        mean_ms = self._sampling_seconds / self._samples * 1000 if self._samples else 0.0
+        logging.info(f"[src.utils.sampling_profiler.SamplingProfiler.stop] 性能采样已停止: 时长 {duration:.1f}s，"
+                     f"采样 {self._samples} 次，不同调用栈 {len(self._stacks)} 个，"
+                     f"单次采样平均 {mean_ms:.3f} ms（约占 {overhead:.2f}% 的时间）。")
+        path = os.path.join(output_dir, f"profile_{self._started_at:%Y%m%d_%H%M%S}.collapsed")
+        return path if self.write_collapsed(path) else None
+
+    def write_collapsed(self, path: str) -> bool:
+        """把当前聚合结果按出现次数降序写成 collapsed stack 文件。"""
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                for stack, count in sorted(self._stacks.items(), key=lambda item: item[1], reverse=True):
+                    f.write(f"{';'.join(stack)} {count}\n")
+            return True
+        except OSError as e:
+            logging.error(f"[src.utils.sampling_profiler.SamplingProfiler.write_collapsed] 写入采样结果失败: {e}")
+            return False
+
+    def _run(self) -> None:
+        own_ident = threading.get_ident()
+        while not self._stop_event.wait(self._interval):
+            start = time.perf_counter()
+            self._sample(own_ident)
+            self._sampling_seconds += time.perf_counter() - start
+            self._samples += 1
+
+    def _sample(self, own_ident: int) -> None:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident:
+                continue
+            labels = []
+            while frame is not None and len(labels) < MAX_STACK_DEPTH:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            labels.append(names.get(ident, f"Thread-{ident}").replace(";", ":").replace(" ", "_"))
+            stack = tuple(reversed(labels))
+            self._stacks[stack] = self._stacks.get(stack, 0) + 1
+
+
+# 全局实例
+sampling_profiler = SamplingProfiler()
@@ -0,0 +1,191 @@
+# desktop_center/src/utils/stall_detector.py
+"""
+GUI 事件循环卡顿检测（看门狗）。
+
+后台线程每隔 `interval_ms` 通过 GuiDispatcher 向 GUI 线程投递一次“心跳”，并等待 GUI 线程回应。
+心跳超过 `threshold_ms` 仍未被处理，说明 GUI 线程正在某个槽函数中做阻塞工作：
+此时抓取 GUI 线程的调用栈，连同当前页面和调用栈中的插件名写入日志；
+心跳最终被处理时记录这次卡顿的总时长。
+
+卡顿按“调用栈中最内层的项目代码函数”归类汇总，`report()` 按累计卡顿时间排序，
+得到一份按优先级排列的阻塞热点清单，关闭时写入日志目录。卡顿次数与时长同时记录到指标注册表:
+
+- `gui.stalls`：卡顿次数；`gui.stalls.<插件名>`：按插件统计的卡顿次数
+- `gui.stall_ms`：卡顿时长分布
+"""
+import sys
+import time
+import logging
+import threading
+import traceback
+from typing import Callable, Dict, List, Optional
+
+from src.utils.metrics import MetricsRegistry, metrics as default_metrics
+
+DEFAULT_THRESHOLD_MS = 200
+DEFAULT_INTERVAL_MS = 100
+# 用于归类热点的项目代码模块前缀；入口脚本（__main__）中的函数也算项目代码，但不含其模块级代码
+PROJECT_MODULE_PREFIX = "src."
+PLUGIN_MODULE_PREFIX = "src.features."
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{frame.f_globals.get('__name__', '?')}.{name}:{frame.f_lineno}"
+
+
+def _innermost_project_frame(frame):
+    """从最内层向外找第一个属于项目代码的栈帧；找不到时返回最内层栈帧。"""
+    current = frame
+    while current is not None:
+        module = current.f_globals.get("__name__", "")
+        if module.startswith(PROJECT_MODULE_PREFIX) or (module == "__main__" and current.f_code.co_name != "<module>"):
+            return current
+        current = current.f_back
+    return frame
+
+
+def _plugin_of(frame) -> Optional[str]:
+    """调用栈中最内层的插件模块所属的插件目录名，例如 src.features.alert_center.controllers.x -> alert_center。"""
+    current = frame
+    while current is not None:
+        module = current.f_globals.get("__name__", "")
+        if module.startswith(PLUGIN_MODULE_PREFIX):
+            return module[len(PLUGIN_MODULE_PREFIX):].split(".")[0]
+        current = current.f_back
+    return None
+
+
+class EventLoopWatchdog:
+    """检测 GUI 线程事件循环的卡顿。`start()` 必须在 GUI 线程中调用。"""
+
+    def __init__(self, dispatcher: Callable[[Callable[[], None]], None], threshold_ms: float = DEFAULT_THRESHOLD_MS,
+                 interval_ms: float = DEFAULT_INTERVAL_MS, registry: Optional[MetricsRegistry] = None):
+        """
+        Args:
+            dispatcher: 把可调用对象投递到 GUI 线程执行的函数，通常为 `GuiDispatcher.post`。
+            threshold_ms: 心跳超过该时长未被处理即视为卡顿。
+            interval_ms: 两次心跳之间的间隔，同时也是检测的粒度。
+            registry: 记录卡顿指标的注册表，默认使用全局注册表。
+        """
+        self._dispatcher = dispatcher
+        self.threshold = threshold_ms / 1000
+        self.interval = min(interval_ms, threshold_ms / 2) / 1000
+        self._metrics = registry or default_metrics
+        self._stall_counter = self._metrics.counter("gui.stalls", "GUI 事件循环卡顿次数")
+        self._stall_histogram = self._metrics.histogram("gui.stall_ms", "GUI 事件循环卡顿时长", unit="ms")
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._gui_ident: Optional[int] = None
+        # 当前未被处理的心跳的投递时间；只有在为 None 时后台线程才会投递下一次心跳
+        self._pending_since: Optional[float] = None
+        # 正在进行的卡顿：{"hotspot", "plugin", "page"}，由后台线程设置，GUI 线程在心跳处理时结束
+        self._current_stall: Optional[Dict] = None
+        # 保护 _pending_since、_current_stall（后台线程与 GUI 线程都会读写）以及 _hotspots
+        self._lock = threading.Lock()
+        # 热点 -> {"count", "total_ms", "max_ms", "plugin", "pages"}
+        self._hotspots: Dict[str, Dict] = {}
+        self.active_page: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> None:
+        """开始检测。在 GUI 线程中调用，以记录 GUI 线程的标识。"""
+        if self._thread is not None:
+            return
+        self._gui_ident = threading.get_ident()
+        self._pending_since = None
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="EventLoopWatchdog", daemon=True)
+        self._thread.start()
+        logging.info(f"[src.utils.stall_detector.EventLoopWatchdog.start] GUI 卡顿检测已启动，"
+                     f"阈值 {self.threshold * 1000:g} ms，心跳间隔 {self.interval * 1000:g} ms。")
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+    def set_active_page(self, name: Optional[str]) -> None:
+        """记录当前显示的页面名称（在 GUI 线程中随页面切换调用），卡顿日志中会带上它。"""
+        self.active_page = name
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            with self._lock:
+                pending_since = self._pending_since
+                send = pending_since is None
+                if send:
+                    self._pending_since = time.perf_counter()
+                stalled = (not send and self._current_stall is None
+                           and time.perf_counter() - pending_since >= self.threshold)
+            if send:
+                self._dispatcher(self._on_heartbeat)
+            elif stalled:
+                self._capture_stall(pending_since)
+
+    def _capture_stall(self, pending_since: float) -> None:
+        """GUI 线程仍被阻塞：抓取其调用栈并记录卡顿开始。"""
+        frame = sys._current_frames().get(self._gui_ident)
+        if frame is None:
+            return
+        hotspot = _frame_label(_innermost_project_frame(frame))
+        plugin = _plugin_of(frame)
+        stack = "".join(traceback.format_stack(frame))
+        del frame
+        page = self.active_page
+        with self._lock:
+            # 抓取调用栈期间心跳可能已被处理（卡顿已结束或已开始下一次心跳），此时丢弃这次抓取
+            if self._pending_since != pending_since or self._current_stall is not None:
+                return
+            self._current_stall = {"hotspot": hotspot, "plugin": plugin, "page": page}
+            blocked_ms = (time.perf_counter() - pending_since) * 1000
+        logging.warning(f"[src.utils.stall_detector.EventLoopWatchdog] GUI 线程已阻塞 {blocked_ms:.0f} ms "
+                        f"(页面: {page or '-'}，插件: {plugin or '-'})，热点: {hotspot}\n"
+                        f"GUI 线程调用栈:\n{stack}")
+
+    def _on_heartbeat(self) -> None:
+        """在 GUI 线程中执行：心跳被处理，结束可能正在进行的卡顿。"""
+        with self._lock:
+            sent = self._pending_since
+            stall = self._current_stall
+            self._current_stall = None
+            self._pending_since = None
+        if stall is None or sent is None:
+            return
+        duration_ms = (time.perf_counter() - sent) * 1000
+        self._stall_counter.inc()
+        if stall["plugin"]:
+            self._metrics.counter(f"gui.stalls.{stall['plugin']}", f"插件 {stall['plugin']} 造成的 GUI 卡顿次数").inc()
+        self._stall_histogram.observe(duration_ms)
+        with self._lock:
+            entry = self._hotspots.setdefault(stall["hotspot"], {"count": 0, "total_ms": 0.0, "max_ms": 0.0,
+                                                                 "plugin": stall["plugin"], "pages": set()})
+            entry["count"] += 1
+            entry["total_ms"] += duration_ms
+            entry["max_ms"] = max(entry["max_ms"], duration_ms)
+            if stall["page"]:
+                entry["pages"].add(stall["page"])
+        logging.warning(f"[src.utils.stall_detector.EventLoopWatchdog] GUI 卡顿结束，共阻塞 {duration_ms:.0f} ms，热点: {stall['hotspot']}")
+
+    def hotspots(self) -> List[Dict]:
+        """按累计卡顿时间降序返回所有热点。"""
+        with self._lock:
+            items = [dict(entry, hotspot=key, pages=sorted(entry["pages"])) for key, entry in self._hotspots.items()]
+        return sorted(items, key=lambda e: e["total_ms"], reverse=True)
+
+    def report(self) -> str:
+        """按累计卡顿时间排序的阻塞热点报告。"""
+        hotspots = self.hotspots()
+        lines = [f"=== GUI 卡顿热点（阈值 {self.threshold * 1000:g} ms） ===",
+                 f"共 {sum(e['count'] for e in hotspots)} 次卡顿，{len(hotspots)} 个热点", "",
+                 f"{'累计(ms)':>10}{'次数':>6}{'最长(ms)':>10}  {'插件':<20}热点 / 页面"]
+        for e in hotspots:
+            pages = f"  [{', '.join(e['pages'])}]" if e["pages"] else ""
+            lines.append(f"{e['total_ms']:>10.0f}{e['count']:>6}{e['max_ms']:>10.0f}  {(e['plugin'] or '-'):<20}{e['hotspot']}{pages}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,150 @@
+# desktop_center/src/utils/timeline.py
+"""
+启动 / 关闭流程的时间线记录。
+
+所有时间点都取自单调时钟 `time.perf_counter()`，以相对于时间线起点的毫秒数保存，
+不受系统时间调整的影响。支持两种记录方式：
+
+- `phase(name)`：顺序阶段。开始新阶段时自动结束上一个阶段，适合 ApplicationOrchestrator 中一步接一步的流程。
+- `span(name)`：上下文管理器，可嵌套，可在任意线程中使用（例如插件的并发准备阶段）。
+
+`finish()` 之后仍可记录区间（例如延迟加载的插件页面），它们在报告中单独标出。
+"""
+import os
+import json
+import time
+import logging
+import threading
+from datetime import datetime
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+
+class Timeline:
+    """一次流程（启动或关闭）的时间线。"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.start()
+
+    def start(self) -> None:
+        """重置时间线并把当前时刻作为起点。"""
+        with self._lock:
+            self._origin = time.perf_counter()
+            self._started_at = datetime.now()
+            self._finished_ms: Optional[float] = None
+            self._spans: List[Dict] = []
+            self._phase: Optional[tuple] = None
+
+    def _now_ms(self) -> float:
+        return (time.perf_counter() - self._origin) * 1000
+
+    def _record(self, name: str, category: str, start_ms: float, end_ms: float, depth: int) -> None:
+        span = {
+            "name": name,
+            "category": category,
+            "start_ms": round(start_ms, 3),
+            "duration_ms": round(end_ms - start_ms, 3),
+            "thread": threading.current_thread().name,
+            "depth": depth,
+        }
+        with self._lock:
+            if self._finished_ms is not None:
+                span["after_finish"] = True
+            self._spans.append(span)
+
+    def phase(self, name: str, category: str = "phase") -> None:
+        """结束当前阶段（如果有）并开始一个新阶段。"""
+        now = self._now_ms()
+        self._end_phase(now)
+        self._phase = (name, category, now)
+
+    def _end_phase(self, now: float) -> None:
+        if self._phase is not None:
+            name, category, start_ms = self._phase
+            self._phase = None
+            self._record(name, category, start_ms, now, 0)
+
+    @contextmanager
+    def span(self, name: str, category: str = "core"):
+        """记录代码块的耗时。同一线程内的嵌套区间会记录嵌套深度。"""
+        depth = getattr(self._local, "depth", 0)
+        self._local.depth = depth + 1
+        start_ms = self._now_ms()
+        try:
+            yield
+        finally:
+            self._local.depth = depth
+            # 顺序阶段本身占用深度 0，区间从深度 1 开始
+            self._record(name, category, start_ms, self._now_ms(), depth + 1)
+
+    def finish(self) -> float:
+        """结束当前阶段并固定总耗时，返回总耗时（毫秒）。"""
+        now = self._now_ms()
+        self._end_phase(now)
+        with self._lock:
+            if self._finished_ms is None:
+                self._finished_ms = now
+            return self._finished_ms
+
+    @property
+    def finished(self) -> bool:
+        return self._finished_ms is not None
+
+    def to_dict(self) -> Dict:
+        """导出为可序列化为 JSON 的结构，区间按开始时间排序。"""
+        with self._lock:
+            spans = sorted(self._spans, key=lambda s: s["start_ms"])
+            total = self._finished_ms
+        return {
+            "timeline": self.name,
+            "started_at": self._started_at.isoformat(timespec="milliseconds"),
+            "total_ms": round(total, 3) if total is not None else None,
+            "spans": spans,
+        }
+
+    def write_json(self, path: str) -> bool:
+        """把时间线写入 JSON 文件。"""
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+            return True
+        except OSError as e:
+            logging.error(f"[src.utils.timeline.Timeline.write_json] 写入时间线文件失败: {e}")
+            return False
+
+    def slowest(self, limit: int = 5, category: Optional[str] = None) -> List[Dict]:
+        """返回耗时最长的区间（不含顺序阶段本身）。"""
+        with self._lock:
+            spans = [s for s in self._spans if s["category"] != "phase" and (category is None or s["category"] == category)]
+        return sorted(spans, key=lambda s: s["duration_ms"], reverse=True)[:limit]
+
+    def summary(self, limit: int = 5) -> str:
+        """单行摘要，用于写入日志。"""
+        data = self.to_dict()
+        phases = [s for s in data["spans"] if s["category"] == "phase"]
+        parts = ", ".join(f"{s['name']}={s['duration_ms']:.0f}ms" for s in phases)
+        slowest = ", ".join(f"{s['name']}={s['duration_ms']:.0f}ms" for s in self.slowest(limit))
+        total = data["total_ms"] if data["total_ms"] is not None else self._now_ms()
+        return f"{self.name} 总耗时 {total:.0f}ms；阶段: {parts or '-'}；最慢: {slowest or '-'}"
+
+    def report(self) -> str:
+        """多行文本报告，按开始时间列出所有阶段与区间。"""
+        data = self.to_dict()
+        total = data["total_ms"]
+        lines = [f"=== {self.name} 时间线 ({data['started_at']}) ===",
+                 f"总耗时: {total:.1f}ms" if total is not None else "总耗时: (未结束)", "",
+                 f"{'开始(ms)':>10}{'耗时(ms)':>10}  {'线程':<16}名称"]
+        for span in data["spans"]:
+            indent = "  " * span["depth"]
+            suffix = "  (启动完成后)" if span.get("after_finish") else ""
+            lines.append(f"{span['start_ms']:>10.1f}{span['duration_ms']:>10.1f}  {span['thread'][:16]:<16}{indent}{span['name']}{suffix}")
+        return "\n".join(lines) + "\n"
+
+
+# 全局实例
+startup_timeline = Timeline("startup")
+shutdown_timeline = Timeline("shutdown")
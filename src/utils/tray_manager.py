@@ -12,6 +12,8 @@ class TrayManager(QObject):
     这是一个独立的组件，控制着应用的显示、隐藏和退出逻辑。
     """
     quit_requested = Signal()
+    snapshot_requested = Signal()
+    profiler_toggle_requested = Signal()
 
     def __init__(self, app: QApplication, window: 'MainWindow', icon_path: str):
         """
@@ -29,6 +31,8 @@ class TrayManager(QObject):
         
         self.app = app
         self.window = window
+        # 菜单中“性能采样”的勾选状态，由应用协调器通过 set_profiling_active 同步
+        self._profiling_active = False
 
         self.window.setWindowIcon(QIcon(icon_path))
         
@@ -39,6 +43,8 @@ class TrayManager(QObject):
 
         menu = (
             MenuItem('显示主窗口', self.show_window, default=True),
+            MenuItem('立即备份数据库', self.request_snapshot),
+            MenuItem('性能采样', self.request_profiler_toggle, checked=lambda item: self._profiling_active),
             MenuItem('退出程序', self.quit_app)
         )
         
@@ -70,6 +76,21 @@ class TrayManager(QObject):
         self.window.show()
         self.window.activateWindow()
 
+    def request_snapshot(self) -> None:
+        """从托盘菜单请求立即备份所有数据库，实际操作由注册在 ActionManager 中的动作完成。"""
+        logging.info("通过托盘菜单请求立即备份数据库。")
+        self.snapshot_requested.emit()
+
+    def request_profiler_toggle(self) -> None:
+        """从托盘菜单请求开始/停止性能采样，实际操作由注册在 ActionManager 中的动作完成。"""
+        logging.info("通过托盘菜单请求切换性能采样。")
+        self.profiler_toggle_requested.emit()
+
+    def set_profiling_active(self, active: bool) -> None:
+        """【新增】同步托盘菜单中“性能采样”的勾选状态。"""
+        self._profiling_active = active
+        self.tray_icon.update_menu()
+
     def quit_app(self) -> None:
         """
         【变更】安全地请求退出整个应用程序。
@@ -0,0 +1,60 @@
+# desktop_center/tests/test_async_db_executor.py
+import sqlite3
+import threading
+
+import pytest
+
+from src.services.async_db_executor import AsyncDbExecutor, DbTaskPriority, DbTaskCancelledError
+
+
+def _count_rows(conn, table):
+    return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_submit_runs_on_worker_connection(tmp_path):
+    db_path = str(tmp_path / "memos.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE memos (id INTEGER PRIMARY KEY)")
+    conn.executemany("INSERT INTO memos VALUES (?)", [(i,) for i in range(3)])
+    conn.commit()
+    conn.close()
+
+    dispatched = []
+    executor = AsyncDbExecutor(dispatcher=lambda fn: (dispatched.append(fn), fn()))
+    try:
+        future = executor.submit(db_path, _count_rows, "memos")
+        assert future.result(timeout=5) == 3
+        failing = executor.submit(db_path, _count_rows, "missing")
+        with pytest.raises(sqlite3.OperationalError):
+            failing.result(timeout=5)
+    finally:
+        executor.shutdown()
+
+    callbacks = []
+    future.add_done_callback(callbacks.append)
+    assert callbacks == [future]
+    assert dispatched
+
+
+def test_priority_and_cancellation(tmp_path):
+    db_path = str(tmp_path / "launcher.db")
+    executor = AsyncDbExecutor()
+    gate = threading.Event()
+    order = []
+    try:
+        # 第一个任务阻塞工作线程，使后续任务在队列中排队
+        blocker = executor.submit(db_path, lambda conn: gate.wait(5))
+        background = executor.submit(db_path, lambda conn: order.append("background"), priority=DbTaskPriority.BACKGROUND)
+        cancelled = executor.submit(db_path, lambda conn: order.append("cancelled"))
+        interactive = executor.submit(db_path, lambda conn: order.append("interactive"))
+        assert cancelled.cancel()
+        gate.set()
+        background.result(timeout=5)
+        interactive.result(timeout=5)
+        assert blocker.result(timeout=5) is True
+    finally:
+        executor.shutdown()
+
+    assert order == ["interactive", "background"]
+    with pytest.raises(DbTaskCancelledError):
+        cancelled.result()
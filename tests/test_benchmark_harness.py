@@ -0,0 +1,51 @@
+# desktop_center/tests/test_benchmark_harness.py
+from benchmarks import cases  # noqa: F401  注册全部基准
+from benchmarks.harness import Benchmark, compare_results, load_results, run_benchmarks, select_benchmarks, write_results
+from benchmarks.suite import main
+
+
+def _results(**timings):
+    return {"version": 1, "results": {key: {"min_ms": ms} for key, ms in timings.items()}}
+
+
+def test_compare_flags_regressions_beyond_threshold_and_noise_floor():
+    baseline = _results(a=100.0, b=100.0, c=0.5, d=100.0, gone=1.0)
+    current = _results(a=115.0, b=130.0, c=1.2, d=60.0, new=1.0)
+    report = compare_results(baseline, current, threshold=0.2, min_delta_ms=1.0)
+
+    assert [c.key for c in report.regressions] == ["b"]   # c 变慢 140% 但绝对差值低于噪声下限
+    assert [c.key for c in report.improvements] == ["d"]
+    assert report.missing == ["gone"] and report.added == ["new"]
+    assert "回归 1 项" in report.format()
+
+
+def test_run_records_timings_fixtures_and_skips(tmp_path):
+    built = []
+
+    def func(b, n):
+        data = b.fixture("data", lambda directory: built.append(n) or list(range(n)))
+        with b.timed():
+            sum(data)
+
+    benchmarks = [Benchmark("toy.sum", func, sizes=(10, 20)),
+                  Benchmark("toy.missing", func, requires=("module_that_does_not_exist",))]
+    data = run_benchmarks(benchmarks, repeat=3)
+
+    assert set(data["results"]) == {"toy.sum[n=10]", "toy.sum[n=20]"}
+    assert len(data["results"]["toy.sum[n=10]"]["runs_ms"]) == 3
+    assert built == [10, 20]  # 共享数据按规模只构建一次
+    assert "toy.missing" in data["skipped"]
+
+    path = str(tmp_path / "result.json")
+    write_results(data, path)
+    assert load_results(path)["results"] == data["results"]
+
+
+def test_core_service_benchmarks_smoke(tmp_path):
+    """以很小的数据规模运行一遍真实的基准，并用比较命令对比两次结果。"""
+    data = run_benchmarks(select_benchmarks(["config.", "alert_db.", "custom_analysis."]), repeat=1, sizes=[200])
+    assert "alert_db.search_page[n=200]" in data["results"] and not data["skipped"]
+
+    baseline_path = str(tmp_path / "baseline.json")
+    write_results(data, baseline_path)
+    assert main(["compare", baseline_path, baseline_path]) == 0
@@ -58,4 +58,108 @@ def test_get_options_for_section(temp_config_file):
     service = ConfigService(temp_config_file)
     options = service.get_options("General")
     assert ("app_name", "Test App") in options
-    assert ("start_minimized", "true") in options
\ No newline at end of file
+    assert ("start_minimized", "true") in options
+
+def test_typed_getters_use_snapshot_and_fallbacks(temp_config_file):
+    """测试类型化读取，以及快照只在配置变化后重建。"""
+    service = ConfigService(temp_config_file)
+    snapshot = service.snapshot
+    assert service.get_bool("General", "start_minimized") is True
+    assert service.get_int("InfoService", "port") == 8080
+    assert service.get_int("General", "app_name", 42) == 42
+    assert service.get_bool("NoSection", "flag", True) is True
+    assert service.snapshot is snapshot
+
+    service.set_option("InfoService", "hosts", "a, b,,c ")
+    assert service.snapshot is not snapshot
+    assert service.get_list("InfoService", "hosts") == ["a", "b", "c"]
+    # 旧快照保持不变
+    assert snapshot.get("InfoService", "hosts") is None
+
+
+def test_subscribe_receives_only_matching_changes(temp_config_file):
+    """测试按区段/键订阅变更，值未变化时不触发通知。"""
+    service = ConfigService(temp_config_file)
+    section_changes, key_changes = [], []
+    service.subscribe(lambda *change: section_changes.append(change), section="InfoService")
+    unsubscribe = service.subscribe(lambda *change: key_changes.append(change), section="InfoService", option="port")
+
+    service.set_option("InfoService", "port", "9090")
+    service.set_option("InfoService", "port", "9090")
+    service.set_option("InfoService", "host", "0.0.0.0")
+    service.set_option("General", "app_name", "Other")
+    unsubscribe()
+    service.set_option("InfoService", "port", "7070")
+
+    assert key_changes == [("InfoService", "port", "8080", "9090")]
+    assert section_changes == [
+        ("InfoService", "port", "8080", "9090"),
+        ("InfoService", "host", "127.0.0.1", "0.0.0.0"),
+        ("InfoService", "port", "9090", "7070"),
+    ]
+
+
+def test_schedule_save_coalesces_writes(tmp_path: Path):
+    """测试延迟保存会合并多次修改，flush 会立即写出。"""
+    config_file = tmp_path / "debounced.ini"
+    service = ConfigService(str(config_file), save_delay=60)
+    for i in range(5):
+        service.set_option("Counter", "value", str(i))
+        service.schedule_save()
+    assert service.has_pending_save()
+    assert not config_file.exists()
+
+    assert service.flush() is True
+    assert not service.has_pending_save()
+    parser = configparser.ConfigParser()
+    parser.read(str(config_file))
+    assert parser.get("Counter", "value") == "4"
+
+
+def test_external_edit_is_reloaded_and_diffed(temp_config_file):
+    """测试外部修改 config.ini 后能检测到变化、重新加载并逐键通知；自身的保存不会被当作外部修改。"""
+    service = ConfigService(temp_config_file)
+    changes = []
+    service.subscribe(lambda *change: changes.append(change))
+
+    service.set_option("General", "app_name", "Saved By App")
+    service.save_config()
+    assert service.check_for_changes() == []
+    changes.clear()
+
+    Path(temp_config_file).write_text("""
+[General]
+app_name = Saved By App
+start_minimized = false
+
+[InfoService]
+host = 0.0.0.0
+
+[New]
+key = value
+""", encoding='utf-8')
+    reloaded = service.check_for_changes()
+
+    assert set(reloaded) == {
+        ("General", "start_minimized", "true", "false"),
+        ("InfoService", "host", "127.0.0.1", "0.0.0.0"),
+        ("InfoService", "port", "8080", None),
+        ("New", "key", None, "value"),
+    }
+    assert sorted(changes) == sorted(reloaded)
+    assert service.get_bool("General", "start_minimized", True) is False
+    assert service.get_value("InfoService", "port") is None
+    assert service.check_for_changes() == []
+
+def test_get_bool_accepted_spellings(tmp_path: Path):
+    """测试 get_bool 接受的写法：true/1/yes/on 为真，false/0/no/off 为假，其他值使用 fallback。"""
+    config_file = tmp_path / "config.ini"
+    spellings = {"t1": "true", "t2": "1", "t3": "Yes", "t4": " ON ", "f1": "false", "f2": "0", "f3": "no", "f4": "Off", "bad": "enabled"}
+    config_file.write_text("[Flags]\n" + "".join(f"{key} = {value}\n" for key, value in spellings.items()), encoding='utf-8')
+    service = ConfigService(str(config_file))
+    for key in ("t1", "t2", "t3", "t4"):
+        assert service.get_bool("Flags", key) is True
+    for key in ("f1", "f2", "f3", "f4"):
+        assert service.get_bool("Flags", key, True) is False
+    assert service.get_bool("Flags", "bad", True) is True
+    assert service.get_bool("Flags", "bad", False) is False
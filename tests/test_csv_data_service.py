@@ -0,0 +1,51 @@
+# desktop_center/tests/test_csv_data_service.py
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from src.services.csv_data_service import CSVDataService
+
+
+def _write_csv(path, rows):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write("id,name,score\n")
+        for i in range(rows):
+            f.write(f"{i},账号{i},{i * 10}\n")
+
+
+def test_iter_chunks_sizes_projection_and_dtype(tmp_path):
+    """测试分块读取的每块行数与总行数，以及列投影和类型提示。"""
+    path = str(tmp_path / "accounts.csv")
+    _write_csv(path, 25)
+    service = CSVDataService(path)
+
+    chunks = list(service.iter_chunks(chunk_size=10, columns=["id", "name"], dtype={"name": "string"}))
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert sum(len(chunk) for chunk in chunks) == 25
+    for chunk in chunks:
+        assert list(chunk.columns) == ["id", "name"]
+        assert chunk["name"].dtype == "string"
+    assert chunks[-1]["id"].tolist() == [20, 21, 22, 23, 24]
+
+
+def test_load_data_with_columns_and_dtype(tmp_path):
+    """测试 load_data 只读取指定列并应用类型提示。"""
+    path = str(tmp_path / "accounts.csv")
+    _write_csv(path, 5)
+
+    df = CSVDataService(path).load_data(columns=["id", "score"], dtype={"score": "Int64"})
+    assert list(df.columns) == ["id", "score"]
+    assert df["score"].dtype == "Int64"
+    assert df["score"].tolist() == [0, 10, 20, 30, 40]
+
+
+def test_validate_data_structure_reads_header_only(tmp_path, monkeypatch):
+    """测试结构验证只读取表头行，不会让 pandas 解析整个文件。"""
+    path = str(tmp_path / "accounts.csv")
+    _write_csv(path, 5)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("验证结构时不应调用 pandas 解析文件")
+
+    monkeypatch.setattr(pd, "read_csv", fail)
+    assert CSVDataService(path).validate_data_structure() is True
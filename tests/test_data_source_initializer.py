@@ -0,0 +1,84 @@
+# desktop_center/tests/test_data_source_initializer.py
+import os
+import sqlite3
+
+import pytest
+
+from src.services.data_source_initializer import DataSourceInitializerService, ValidationCache
+from src.services.generic_data_service import DataType
+from src.services.json_data_service import JSONDataService
+from src.services.sqlite_base_service import SchemaType, _probe_write_access
+
+
+@pytest.fixture
+def validations(monkeypatch):
+    """记录 validate_data_source 的实际调用次数。"""
+    calls = []
+    validate = JSONDataService.validate_data_source
+
+    def spy(self, schema_type=SchemaType.FIXED):
+        calls.append(self.file_path)
+        return validate(self, schema_type)
+
+    monkeypatch.setattr(JSONDataService, "validate_data_source", spy)
+    return calls
+
+
+def _validate(cache, path):
+    return DataSourceInitializerService()._validate_and_create_service(
+        path, DataType.JSON, SchemaType.FIXED, "test", validation_cache=cache)
+
+
+def test_cache_hit_when_file_unchanged_and_miss_after_modification(tmp_path, validations):
+    """测试文件大小与 mtime 未变化时命中缓存（重启后依然有效），文件被修改后重新验证。"""
+    path = str(tmp_path / "settings.json")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"a": 1}')
+    cache_path = str(tmp_path / "cache" / "validation_cache.json")
+
+    assert _validate(ValidationCache(cache_path), path) is not None
+    assert _validate(ValidationCache(cache_path), path) is not None
+    assert validations == [path]
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"a": 1, "b": 2}')
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert _validate(ValidationCache(cache_path), path) is not None
+    assert validations == [path, path]
+
+
+def test_failed_validation_is_not_cached(tmp_path, validations):
+    """测试验证失败的数据源不会写入缓存，每次都会重新验证。"""
+    path = str(tmp_path / "broken.json")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("{不是 JSON")
+    cache_path = str(tmp_path / "cache" / "validation_cache.json")
+    cache = ValidationCache(cache_path)
+
+    assert _validate(cache, path) is None
+    assert _validate(cache, path) is None
+    assert validations == [path, path]
+    assert not cache.is_valid(path, DataSourceInitializerService._validator_signature(
+        JSONDataService(path), None, SchemaType.FIXED))
+    assert not os.path.exists(cache_path)
+
+
+def test_write_probe(tmp_path):
+    """测试写入探测在只读连接上抛出异常；在可写数据库上不留下事务，也不改变 user_version。"""
+    path = str(tmp_path / "probe.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE t (id INTEGER)")
+    conn.execute("PRAGMA user_version = 7")
+    conn.commit()
+
+    _probe_write_access(conn)
+    assert not conn.in_transaction
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == 7
+    conn.close()
+
+    readonly = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    with pytest.raises(sqlite3.OperationalError):
+        _probe_write_access(readonly)
+    assert not readonly.in_transaction
+    readonly.close()
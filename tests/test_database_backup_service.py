@@ -0,0 +1,78 @@
+# desktop_center/tests/test_database_backup_service.py
+import os
+import sqlite3
+
+from src.services.database_backup_service import DatabaseBackupService, DatabaseRegistry
+
+
+def _create_db(path, rows):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE memos (id INTEGER PRIMARY KEY, content TEXT)")
+    conn.executemany("INSERT INTO memos (content) VALUES (?)", [(f"memo {i}" * 20,) for i in range(rows)])
+    conn.commit()
+    return conn
+
+
+def test_backup_copies_database_while_connection_is_open(tmp_path):
+    db_path = str(tmp_path / "memos.db")
+    conn = _create_db(db_path, 500)
+    registry = DatabaseRegistry()
+    registry.register(db_path, "MemoDatabaseService")
+    service = DatabaseBackupService(str(tmp_path / "backups"), registry=registry, pages_per_step=2, step_sleep=0)
+
+    created = service.backup_all(force=True)
+    # 备份完成后源库仍然可写
+    conn.execute("INSERT INTO memos (content) VALUES ('after')")
+    conn.commit()
+    conn.close()
+
+    assert len(created) == 1
+    snapshot = sqlite3.connect(created[0])
+    assert snapshot.execute("SELECT COUNT(*) FROM memos").fetchone()[0] == 500
+    snapshot.close()
+    assert not [name for name in os.listdir(os.path.dirname(created[0])) if name.endswith(".tmp")]
+
+
+def test_retention_and_schedule(tmp_path):
+    db_path = str(tmp_path / "launcher.db")
+    _create_db(db_path, 5).close()
+    registry = DatabaseRegistry()
+    registry.register(db_path)
+    service = DatabaseBackupService(str(tmp_path / "backups"), interval_hours=24, keep_count=2, registry=registry)
+
+    assert len(service.backup_all()) == 1
+    # 最新快照未过期，定时备份不会重复执行
+    assert service.backup_all() == []
+    for _ in range(3):
+        service.backup_all(force=True)
+    assert len(service.list_snapshots(db_path)) == 2
+
+    registry.unregister(db_path)
+    assert service.backup_all(force=True) == []
+
+
+def test_shared_database_stays_registered_until_last_service_closes(tmp_path):
+    """测试两个服务共享同一数据库文件时，只有最后一个关闭后才会取消注册。"""
+    from src.services.database_backup_service import database_registry
+    from src.services.sqlite_base_service import SqlDataService
+
+    class MemoService(SqlDataService):
+        def _create_tables(self):
+            self.conn.execute("CREATE TABLE IF NOT EXISTS memos (id INTEGER PRIMARY KEY)")
+
+    db_path = str(tmp_path / "shared.db")
+    key = os.path.normcase(os.path.abspath(db_path))
+    first, second = MemoService(db_path), MemoService(db_path)
+    try:
+        first.close()
+        first.close()  # 重复关闭不会释放其他实例的注册
+        assert key in database_registry.databases()
+    finally:
+        second.close()
+    assert key not in database_registry.databases()
+
+    registry = DatabaseRegistry()
+    registry.register(db_path, "A")
+    registry.register(db_path, "B")
+    registry.unregister(db_path, "A")
+    assert registry.databases() == {key: "B"}
@@ -0,0 +1,98 @@
+# desktop_center/tests/test_excel_data_service.py
+import pytest
+
+pd = pytest.importorskip("pandas")
+openpyxl = pytest.importorskip("openpyxl")
+
+from src.services.excel_data_service import ExcelDataService
+from src.services.generic_data_service import DataValidationError
+
+
+def _write_xlsx(path, rows):
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(["id", "name", "score"])
+    for i in range(rows):
+        sheet.append([i, f"账号{i}", i * 10])
+    workbook.save(path)
+
+
+def test_iter_chunks_sizes_projection_and_dtype(tmp_path):
+    """测试流式读取工作表的每块行数与总行数，以及列投影和类型提示。"""
+    path = str(tmp_path / "accounts.xlsx")
+    _write_xlsx(path, 25)
+    service = ExcelDataService(path)
+
+    chunks = list(service.iter_chunks(chunk_size=10, columns=["id", "name"], dtype={"name": "string"}))
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert sum(len(chunk) for chunk in chunks) == 25
+    for chunk in chunks:
+        assert list(chunk.columns) == ["id", "name"]
+        assert chunk["name"].dtype == "string"
+    assert chunks[-1]["id"].tolist() == [20, 21, 22, 23, 24]
+
+
+def test_load_data_with_columns_and_dtype(tmp_path):
+    """测试 load_data 只读取指定列并应用类型提示。"""
+    path = str(tmp_path / "accounts.xlsx")
+    _write_xlsx(path, 5)
+
+    df = ExcelDataService(path).load_data(columns=["id", "score"], dtype={"score": "Int64"})
+    assert list(df.columns) == ["id", "score"]
+    assert df["score"].dtype == "Int64"
+    assert df["score"].tolist() == [0, 10, 20, 30, 40]
+
+
+def test_validate_data_structure_reads_header_only(tmp_path, monkeypatch):
+    """测试结构验证以只读模式打开工作簿并只读取表头行，不会让 pandas 解析整个工作表。"""
+    path = str(tmp_path / "accounts.xlsx")
+    _write_xlsx(path, 5)
+    load_workbook = openpyxl.load_workbook
+    opened, row_limits = [], []
+
+    def spy_load_workbook(*args, **kwargs):
+        opened.append(kwargs)
+        workbook = load_workbook(*args, **kwargs)
+        sheet = workbook.worksheets[0]
+        iter_rows = sheet.iter_rows
+
+        def spy_iter_rows(*rows_args, **rows_kwargs):
+            row_limits.append(rows_kwargs.get("max_row"))
+            return iter_rows(*rows_args, **rows_kwargs)
+
+        sheet.iter_rows = spy_iter_rows
+        return workbook
+
+    def fail(*args, **kwargs):
+        raise AssertionError("验证结构时不应调用 pandas 解析文件")
+
+    monkeypatch.setattr(openpyxl, "load_workbook", spy_load_workbook)
+    monkeypatch.setattr(pd, "read_excel", fail)
+    assert ExcelDataService(path).validate_data_structure() is True
+    assert opened == [{"read_only": True}]
+    assert row_limits == [1]
+
+
+def test_iter_chunks_column_labels_match_load_data(tmp_path):
+    """测试流式读取与 load_data 的列标签一致：数字表头保持数字，空表头与重复列名按 pandas 规则命名。"""
+    path = str(tmp_path / "yearly.xlsx")
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(["name", 2023, None, "name", 2024.0])
+    for i in range(3):
+        sheet.append([f"账号{i}", i, i * 2, f"别名{i}", i * 3])
+    workbook.save(path)
+    service = ExcelDataService(path)
+
+    expected = list(service.load_data().columns)
+    chunk = next(service.iter_chunks())
+    assert list(chunk.columns) == expected
+    assert 2023 in expected and "Unnamed: 2" in expected
+
+    projected = next(service.iter_chunks(columns=[2023, "name"]))
+    assert list(projected.columns) == list(service.load_data(columns=[2023, "name"]).columns) == ["name", 2023]
+    assert projected[2023].tolist() == [0, 1, 2]
+    with pytest.raises(DataValidationError):
+        service.load_data(columns=[2025])
+    with pytest.raises(DataValidationError):
+        next(service.iter_chunks(columns=[2025]))
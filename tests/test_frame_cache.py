@@ -0,0 +1,57 @@
+# desktop_center/tests/test_frame_cache.py
+import os
+import time
+
+from src.services.frame_cache import FrameCache
+
+
+def _write(path, content):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def test_cache_hit_and_invalidation_on_source_change(tmp_path):
+    source = str(tmp_path / "accounts.csv")
+    _write(source, "a,b\n1,2\n")
+    cache = FrameCache()
+    cache.configure(str(tmp_path / "cache"))
+    calls = []
+
+    def loader():
+        calls.append(1)
+        with open(source, encoding="utf-8") as f:
+            return f.read()
+
+    assert cache.load(source, loader) == "a,b\n1,2\n"
+    assert cache.load(source, loader) == "a,b\n1,2\n"
+    assert len(calls) == 1 and cache.hits == 1
+
+    _write(source, "a,b\n1,2\n3,4\n")
+    assert cache.load(source, loader) == "a,b\n1,2\n3,4\n"
+    assert len(calls) == 2
+    # 旧签名的条目已被清理
+    assert len(os.listdir(tmp_path / "cache")) == 1
+    # 不同的工作表/参数使用独立的条目
+    cache.load(source, loader, sheet="Sheet2")
+    assert len(calls) == 3
+
+
+def test_lru_eviction_under_budget(tmp_path):
+    cache = FrameCache()
+    cache.configure(str(tmp_path / "cache"), max_bytes=2500)
+    sources = []
+    for i in range(3):
+        path = str(tmp_path / f"s{i}.xlsx")
+        _write(path, str(i))
+        sources.append(path)
+        cache.load(path, lambda: b"x" * 1000)
+        time.sleep(0.02)  # 保证各条目的访问时间可区分
+        # 再次访问第一个条目，使其成为最近使用
+        cache.load(sources[0], lambda: b"x" * 1000)
+        time.sleep(0.02)
+
+    hits_before = cache.hits
+    cache.load(sources[0], lambda: b"x" * 1000)
+    assert cache.hits == hits_before + 1
+    cache.load(sources[1], lambda: b"x" * 1000)
+    assert cache.hits == hits_before + 1
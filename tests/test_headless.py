@@ -0,0 +1,48 @@
+# desktop_center/tests/test_headless.py
+import configparser
+import json
+import os
+import socket
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("PySide6.QtCore")
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 在子进程中组装无界面平台，输出加载的插件和已导入的重量级模块
+_SCRIPT = """
+import json, sys
+from src.core.headless import HeadlessOrchestrator
+orchestrator = HeadlessOrchestrator(argv=[])
+loaded = [p.name() for p in orchestrator.plugin_manager.plugins]
+heavy = sorted(m for m in sys.modules if m in ("PySide6.QtWidgets", "PySide6.QtGui", "pandas"))
+orchestrator.shutdown()
+print(json.dumps({"plugins": loaded, "heavy": heavy}))
+"""
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_headless_mode_loads_only_headless_plugins_without_widgets(tmp_path):
+    """测试无界面模式只加载声明了 headless 的插件，且不导入 QtWidgets / QtGui / pandas。"""
+    data_dir = tmp_path / "HelpSelf"
+    data_dir.mkdir()
+    config = configparser.ConfigParser()
+    config.read(os.path.join(PROJECT_ROOT, "config.ini"), encoding="utf-8")
+    config["alert_center"].update(host="127.0.0.1", port=str(_free_port()))
+    with open(data_dir / "config.ini", "w", encoding="utf-8") as f:
+        config.write(f)
+
+    env = dict(os.environ, HOME=str(tmp_path), USERPROFILE=str(tmp_path))
+    result = subprocess.run([sys.executable, "-c", _SCRIPT], cwd=PROJECT_ROOT, env=env,
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    output = json.loads(result.stdout.strip().splitlines()[-1])
+    assert output == {"plugins": ["alert_center"], "heavy": []}
@@ -0,0 +1,50 @@
+# desktop_center/tests/test_json_data_service_journal.py
+import json
+
+from src.services.json_data_service import JSONDataService
+
+
+def test_patches_are_journaled_and_replayed(tmp_path):
+    path = str(tmp_path / "settings.json")
+    service = JSONDataService(path)
+    assert service.save_data({"groups": [{"name": "a"}], "theme": "light"})
+
+    assert service.apply_patch([{"op": "replace", "path": "/theme", "value": "dark"}])
+    assert service.apply_patch([{"op": "add", "path": "/groups/-", "value": {"name": "b"}}])
+    # 基础文件未被重写，改动只存在于补丁日志中
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f)["theme"] == "light"
+
+    expected = {"groups": [{"name": "a"}, {"name": "b"}], "theme": "dark"}
+    assert JSONDataService(path).load_data() == expected
+
+    assert service.compact()
+    assert service.journal.size() == 0
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f) == expected
+
+
+def test_invalid_patch_and_stale_journal(tmp_path):
+    path = str(tmp_path / "data.json")
+    service = JSONDataService(path)
+    service.save_data({"a": 1})
+    assert not service.apply_patch([{"op": "replace", "path": "/missing", "value": 2}])
+    assert service.journal.size() == 0
+
+    service.apply_patch([{"op": "add", "path": "/b", "value": 2}])
+    # 模拟合并时在清空日志之前崩溃：基础文件已包含改动，残留日志不应被重复应用
+    journal_text = open(service.journal.journal_path, encoding="utf-8").read()
+    service.compact()
+    with open(service.journal.journal_path, "w", encoding="utf-8") as f:
+        f.write(journal_text + '{"ops": [{"op": "add", "path": "/c"')
+    assert JSONDataService(path).load_data() == {"a": 1, "b": 2}
+
+
+def test_automatic_compaction(tmp_path):
+    path = str(tmp_path / "big.json")
+    service = JSONDataService(path, compact_min_bytes=200)
+    service.save_data({"items": []})
+    for i in range(20):
+        assert service.apply_patch([{"op": "add", "path": "/items/-", "value": i}])
+    assert service.journal.size() < 200
+    assert JSONDataService(path).load_data() == {"items": list(range(20))}
@@ -0,0 +1,43 @@
+# desktop_center/tests/test_lazy_import.py
+import sys
+
+import pytest
+
+from src.utils.import_profiler import ImportProfiler
+from src.utils.lazy_import import lazy_import, module_available
+
+
+def _make_module(tmp_path, monkeypatch, name, body="VALUE = 42\n"):
+    (tmp_path / f"{name}.py").write_text(body, encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, name, raising=False)
+
+
+def test_lazy_module_imports_on_first_attribute_access(tmp_path, monkeypatch):
+    _make_module(tmp_path, monkeypatch, "helpself_lazy_target")
+    proxy = lazy_import("helpself_lazy_target")
+    assert "helpself_lazy_target" not in sys.modules
+    assert proxy.VALUE == 42
+    assert "helpself_lazy_target" in sys.modules
+
+    missing = lazy_import("helpself_missing_module", "请安装 helpself_missing_module")
+    assert not module_available("helpself_missing_module")
+    with pytest.raises(ImportError, match="请安装"):
+        missing.anything
+
+
+def test_import_profiler_attributes_imports_to_sections(tmp_path, monkeypatch):
+    _make_module(tmp_path, monkeypatch, "helpself_profiled_dep")
+    _make_module(tmp_path, monkeypatch, "helpself_profiled_plugin", "import helpself_profiled_dep\n")
+    profiler = ImportProfiler()
+    profiler.start()
+    try:
+        with profiler.section("demo_plugin"):
+            __import__("helpself_profiled_plugin")
+    finally:
+        profiler.stop()
+
+    report = profiler.report()
+    assert "demo_plugin" in report
+    assert "helpself_profiled_dep" in report
+    assert "demo_plugin" in profiler.summary()
@@ -0,0 +1,83 @@
+# desktop_center/tests/test_logging_pipeline.py
+import logging
+import threading
+
+from src.utils.logging_pipeline import LoggingPipeline, ModuleLevelFilter, lazy, module_name_for_path, parse_module_levels
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+class _FormattingListHandler(_ListHandler):
+    def emit(self, record):
+        self.messages.append(self.format(record))
+
+
+def test_module_levels_and_lazy_arguments():
+    """测试模块级别覆盖、运行时调整级别，以及被过滤的记录不会对 lazy 参数求值。"""
+    assert module_name_for_path(__file__) == "tests.test_logging_pipeline"
+    assert parse_module_levels("tests=debug, bad, src.services=NOPE") == {"tests": logging.DEBUG}
+
+    handler = _ListHandler()
+    logger = logging.getLogger("helpself.test_logging_pipeline")
+    logger.propagate = False
+    pipeline = LoggingPipeline([handler], level=logging.WARNING, module_levels={"tests.test_logging_pipeline": logging.DEBUG}).install(logger)
+    calls = []
+
+    def expensive(value):
+        calls.append(value)
+        return value * 2
+
+    try:
+        logger.debug("覆盖生效: %s", lazy(expensive, 1))
+        pipeline.set_levels(logging.WARNING, {"tests": logging.ERROR})
+        logger.warning("被模块级别过滤: %s", lazy(expensive, 2))
+        logger.error("错误: %s", lazy(expensive, 3))
+    finally:
+        pipeline.stop()
+        logger.removeHandler(pipeline.queue_handler)
+
+    assert handler.messages == ["覆盖生效: 2", "错误: 6"]
+    assert calls == [1, 3]
+
+
+def test_module_level_filters_do_not_share_cache():
+    """测试每个过滤器独立缓存模块级别，重新配置后缓存失效。"""
+    record = logging.LogRecord("x", logging.INFO, __file__, 1, "消息", None, None)
+    quiet = ModuleLevelFilter(logging.DEBUG, {"tests": logging.ERROR})
+    verbose = ModuleLevelFilter(logging.ERROR, {"tests": logging.DEBUG})
+    assert not quiet.filter(record)
+    assert verbose.filter(record)
+
+    quiet.configure(logging.DEBUG, {"tests.test_logging_pipeline": logging.INFO})
+    assert quiet.filter(record)
+
+
+def test_formatting_runs_on_listener_thread():
+    """测试消息插值与异常堆栈格式化在监听线程中进行，调用线程只负责入队。"""
+    handler = _FormattingListHandler()
+    logger = logging.getLogger("helpself.test_logging_pipeline.deferred")
+    logger.propagate = False
+    pipeline = LoggingPipeline([handler], level=logging.INFO).install(logger)
+    threads = []
+
+    try:
+        logger.info("线程: %s", lazy(lambda: threads.append(threading.current_thread().name) or "ok"))
+        try:
+            raise ValueError("坏数据")
+        except ValueError:
+            logger.exception("处理失败")
+    finally:
+        pipeline.stop()
+        logger.removeHandler(pipeline.queue_handler)
+
+    assert threads and threads[0] != threading.current_thread().name
+    assert handler.messages[0] == "线程: ok"
+    assert handler.messages[1].startswith("处理失败\nTraceback")
+    assert "ValueError: 坏数据" in handler.messages[1]
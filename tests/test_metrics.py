@@ -0,0 +1,45 @@
+# desktop_center/tests/test_metrics.py
+import json
+import threading
+
+import pytest
+
+from src.utils.metrics import MetricsRegistry
+
+
+def test_counters_histograms_and_snapshot(tmp_path):
+    """测试多线程计数、直方图统计与分位数、回调式瞬时值以及 JSON 快照导出。"""
+    registry = MetricsRegistry()
+    counter = registry.counter("alerts", "告警数")
+
+    def work():
+        for _ in range(1000):
+            counter.inc()
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert registry.counter("alerts") is counter
+    assert counter.value == 4000
+
+    histogram = registry.histogram("insert_ms", buckets=(1, 10, 100))
+    for value in [0.5] * 90 + [50] * 9 + [500]:
+        histogram.observe(value)
+    stats = histogram.snapshot()
+    assert stats["count"] == 100 and stats["min"] == 0.5 and stats["max"] == 500
+    assert (stats["p50"], stats["p95"], stats["p99"]) == (1, 100, 100)
+    assert stats["buckets"] == [90, 0, 9, 1]
+
+    queue = []
+    registry.gauge("queue", func=lambda: len(queue))
+    queue.extend([1, 2])
+    with pytest.raises(TypeError):
+        registry.histogram("alerts")
+
+    path = tmp_path / "metrics.json"
+    assert registry.write_json(str(path))
+    exported = json.loads(path.read_text(encoding="utf-8"))["metrics"]
+    assert list(exported) == ["alerts", "insert_ms", "queue"]
+    assert exported["alerts"]["value"] == 4000 and exported["queue"] == {"type": "gauge", "description": "", "unit": "", "value": 2}
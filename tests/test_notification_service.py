@@ -0,0 +1,88 @@
+# desktop_center/tests/test_notification_service.py
+import threading
+from pathlib import Path
+
+import pytest
+
+from src.services.config_service import ConfigService
+from src.services.notification_service import NotificationService
+
+
+@pytest.fixture
+def config_service(tmp_path: Path) -> ConfigService:
+    config_file = tmp_path / "config.ini"
+    config_file.write_text("""
+[General]
+enable_desktop_popup = true
+popup_timeout = 7
+
+[Notification]
+merge_window_seconds = 10
+max_per_minute = 3
+""", encoding='utf-8')
+    return ConfigService(str(config_file))
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_identical_notifications_are_merged_and_rate_limited(config_service):
+    """测试相同通知在排队期间及合并窗口内被合并，超过速率上限的通知被丢弃。"""
+    clock = FakeClock()
+    shown = []
+    release = threading.Event()
+
+    def notifier(title, message, timeout):
+        shown.append((title, message, timeout))
+        release.wait(5)
+
+    service = NotificationService("App", "missing.ico", config_service, notifier=notifier, clock=clock)
+    try:
+        # 第一条通知占住分发线程，随后的相同通知在队列中合并
+        assert service.show("A", "first")
+        assert service.wait_idle()
+        assert service.show("B", "burst")
+        assert not service.show("B", "burst")
+        assert not service.show("B", "burst")
+        release.set()
+        assert service.wait_idle()
+
+        # 合并窗口内刚弹出过的相同通知不会再次弹出
+        assert not service.show("A", "first")
+        # 窗口已满 (3 条/分钟)：C 入队后被丢弃
+        assert service.show("C", "third")
+        assert service.wait_idle()
+        assert service.show("D", "fourth")
+        assert service.wait_idle()
+        assert not service.show("X", "off", enable_popup=False)
+
+        stats = service.stats()
+    finally:
+        service.shutdown()
+
+    assert [s[0] for s in shown] == ["A", "B (×3)", "C"]
+    assert shown[0][2] == 7
+    assert stats == {"shown": 3, "merged": 3, "dropped": 1, "disabled": 1, "failed": 0, "pending": 0}
+
+
+def test_settings_follow_config_changes(config_service):
+    """测试全局弹窗开关变化后无需重新读取配置即可生效。"""
+    shown = []
+    service = NotificationService("App", "missing.ico", config_service,
+                                  notifier=lambda **kwargs: shown.append(kwargs))
+    try:
+        config_service.set_option("General", "enable_desktop_popup", "false")
+        assert not service.show("A", "muted")
+        config_service.set_option("General", "enable_desktop_popup", "true")
+        config_service.set_option("General", "popup_timeout", "3")
+        assert service.show("A", "loud")
+        assert service.wait_idle()
+    finally:
+        service.shutdown()
+
+    assert shown == [{"title": "A", "message": "loud", "timeout": 3}]
@@ -0,0 +1,76 @@
+# desktop_center/tests/test_plugin_discovery.py
+import json
+import os
+
+from src.core.plugin_discovery import PluginIndex, parse_manifest, resolve_load_order
+
+
+def _make_plugin(root, package, manifest=None):
+    plugin_dir = root / package
+    plugin_dir.mkdir()
+    (plugin_dir / "plugin.py").write_text("", encoding="utf-8")
+    if manifest is not None:
+        (plugin_dir / "plugin.json").write_text(json.dumps(manifest), encoding="utf-8")
+
+
+def test_parse_manifest_entry_and_defaults():
+    manifest = parse_manifest("memo_pad", {"name": "memo_pad", "entry": "plugin:MemoPadPlugin"})
+    assert manifest.entry_module == "plugin"
+    assert manifest.entry_class == "MemoPadPlugin"
+    assert manifest.priority == 100
+    assert manifest.module_name() == "src.features.memo_pad.plugin"
+    assert manifest.background is False
+    assert parse_manifest("alert_center", {"name": "alert_center", "background": True}).background is True
+    assert manifest.headless is False
+    assert parse_manifest("alert_center", {"name": "alert_center", "headless": True}).headless is True
+
+
+def test_discover_uses_cache_and_falls_back_without_manifest(tmp_path):
+    root = tmp_path / "features"
+    root.mkdir()
+    _make_plugin(root, "alpha", {"name": "alpha", "entry": "plugin:AlphaPlugin", "priority": 120})
+    _make_plugin(root, "legacy")
+    (root / "__pycache__").mkdir()
+    (root / "not_a_plugin").mkdir()
+    cache_path = str(tmp_path / "cache" / "plugin_index.json")
+
+    manifests = PluginIndex(cache_path).discover(str(root))
+    assert [m.package for m in manifests] == ["alpha", "legacy"]
+    assert manifests[0].priority == 120
+    assert manifests[1].has_manifest is False and manifests[1].entry_class is None
+    assert os.path.exists(cache_path)
+
+    # 清单未变化时从缓存读取：改写缓存中的优先级，应原样返回
+    with open(cache_path, encoding="utf-8") as f:
+        data = json.load(f)
+    data["entries"]["alpha"]["manifest"]["priority"] = 999
+    with open(cache_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    assert PluginIndex(cache_path).discover(str(root))[0].priority == 999
+
+    # 清单变化后重新解析
+    (root / "alpha" / "plugin.json").write_text(
+        json.dumps({"name": "alpha", "entry": "plugin:AlphaPlugin", "priority": 50}), encoding="utf-8")
+    assert PluginIndex(cache_path).discover(str(root))[0].priority == 50
+
+
+def test_resolve_load_order_respects_dependencies_and_priority():
+    names = ["c", "a", "b", "d"]
+    order, skipped = resolve_load_order(names, {"c": ["b"], "a": [], "b": ["a"]})
+    assert order == ["a", "b", "c", "d"]
+    assert skipped == {}
+
+
+def test_resolve_load_order_skips_missing_and_cyclic_dependencies():
+    names = ["a", "b", "c", "d", "e"]
+    order, skipped = resolve_load_order(names, {"a": ["missing"], "b": ["a"], "c": ["d"], "d": ["c"]})
+    assert order == ["e"]
+    assert set(skipped) == {"a", "b", "c", "d"}
+
+
+def test_plugins_with_startup_services_are_not_deferred():
+    """启动时就要运行后台服务的插件必须声明 background，否则延迟加载页面会让服务不再自动启动。"""
+    features = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "features")
+    for name in ("alert_center", "window_arranger"):
+        with open(os.path.join(features, name, "plugin.json"), encoding="utf-8") as f:
+            assert parse_manifest(name, json.load(f)).background is True
@@ -0,0 +1,81 @@
+# desktop_center/tests/test_query_profiler.py
+import sqlite3
+
+import pytest
+
+from src.services.sqlite_base_service import QueryProfiler, connect_database, query_profiler
+
+
+@pytest.fixture
+def profiler():
+    """启用全局分析器并在测试结束后恢复其原有配置与统计。"""
+    enabled, threshold = query_profiler.enabled, query_profiler.slow_threshold_ms
+    query_profiler.reset()
+    yield query_profiler
+    query_profiler.configure(enabled, threshold)
+    query_profiler.reset()
+
+
+def _create_db(path, rows=50):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT, price REAL)")
+    conn.executemany("INSERT INTO items (name, price) VALUES (?, ?)", [(f"item {i}", i * 1.5) for i in range(rows)])
+    conn.commit()
+    conn.close()
+
+
+def test_normalize_sql_groups_literals():
+    """测试字面量、IN 列表与空白被归一化，同类语句得到相同的键。"""
+    a = QueryProfiler.normalize_sql("SELECT *  FROM items\n WHERE name = 'a''b' AND price > 10.5 AND id IN (1, 2, 3);")
+    b = QueryProfiler.normalize_sql("SELECT * FROM items WHERE name = 'x' AND price > 3 AND id IN (7)")
+    assert a == b == "SELECT * FROM items WHERE name = ? AND price > ? AND id IN (...)"
+
+
+def test_slow_threshold_captures_query_plan_and_suggests_index(tmp_path, profiler):
+    """测试超过阈值的语句会采集 EXPLAIN QUERY PLAN，全表扫描时给出 WHERE 列上的索引建议。"""
+    db_path = str(tmp_path / "items.db")
+    _create_db(db_path)
+
+    profiler.configure(True, slow_threshold_ms=10_000)
+    conn = connect_database(db_path)
+    conn.execute("SELECT * FROM items WHERE name = ?", ("item 1",)).fetchall()
+    assert profiler.snapshot()[0]["plan"] is None
+    assert profiler.snapshot()[0]["slow_count"] == 0
+
+    profiler.configure(True, slow_threshold_ms=0)
+    conn.execute("SELECT * FROM items WHERE name = ?", ("item 2",)).fetchall()
+    conn.close()
+
+    stat = profiler.snapshot()[0]
+    assert stat["sql"] == "SELECT * FROM items WHERE name = ?"
+    assert stat["database"] == "items.db"
+    assert stat["count"] == 2 and stat["slow_count"] >= 1
+    assert any(detail.startswith("SCAN") for detail in stat["plan"])
+    assert profiler.suggest_indexes(stat) == ['CREATE INDEX IF NOT EXISTS idx_items_name ON "items" (name);']
+
+
+def test_report_orders_statements_by_total_time(profiler):
+    """测试报告按总耗时降序排列，并受 limit 限制。"""
+    profiler.configure(True, slow_threshold_ms=10_000)
+    conn = sqlite3.connect(":memory:")
+    profiler.record(conn, "SELECT 1", (), 1.0, "a.db")
+    profiler.record(conn, "SELECT name FROM t WHERE id = 5", (), 30.0, "b.db")
+    profiler.record(conn, "SELECT name FROM t WHERE id = 6", (), 30.0, "b.db")
+    profiler.record(conn, "DELETE FROM t", (), 5.0, "c.db")
+    conn.close()
+
+    lines = [line for line in profiler.report().splitlines() if line.startswith("#")]
+    assert [line.split("]")[0] for line in lines] == ["#1 [b.db", "#2 [c.db", "#3 [a.db"]
+    assert "次数: 2, 总耗时: 60.0 ms" in lines[0]
+    assert len([line for line in profiler.report(limit=1).splitlines() if line.startswith("#")]) == 1
+
+
+def test_connect_database_returns_plain_connection_when_disabled(tmp_path, profiler):
+    """测试分析器未启用时返回普通 sqlite3 连接，且不记录任何语句。"""
+    profiler.configure(False)
+    conn = connect_database(str(tmp_path / "plain.db"))
+    conn.execute("SELECT 1").fetchall()
+    assert type(conn) is sqlite3.Connection
+    assert type(conn.cursor()) is sqlite3.Cursor
+    conn.close()
+    assert profiler.snapshot() == []
@@ -0,0 +1,58 @@
+# desktop_center/tests/test_rate_spike_detector.py
+import pytest
+from src.features.alert_center.services.rate_spike_detector import RateSpikeDetector
+
+
+class FakeClock:
+    """可手动推进的时钟，用于让检测器在测试中行为确定。"""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def _feed_steady_traffic(detector, clock, windows: int, per_window: int):
+    for _ in range(windows):
+        for _ in range(per_window):
+            detector.observe("CPU", "10.0.0.1")
+        clock.now += detector.window_seconds
+
+
+def test_detects_spike_after_warmup(clock):
+    """稳定流量后出现突增时应返回突增信息，且同一窗口只触发一次。"""
+    detector = RateSpikeDetector(window_seconds=10, sigma=3, min_count=5, warmup_windows=3, clock=clock)
+    _feed_steady_traffic(detector, clock, windows=5, per_window=2)
+
+    results = [detector.observe("CPU", "10.0.0.1") for _ in range(20)]
+    spikes = [r for r in results if r]
+    assert len(spikes) == 1
+    assert spikes[0]["type"] == "CPU"
+    assert spikes[0]["source_ip"] == "10.0.0.1"
+    assert spikes[0]["count"] > spikes[0]["threshold"]
+
+
+def test_steady_traffic_does_not_trigger(clock):
+    """流量稳定时不应产生任何突增。"""
+    detector = RateSpikeDetector(window_seconds=10, sigma=3, min_count=5, clock=clock)
+    for _ in range(10):
+        for _ in range(4):
+            assert detector.observe("Disk", "10.0.0.2") is None
+        clock.now += 10
+
+
+def test_state_is_bounded_and_idle_keys_evicted(clock):
+    """跟踪的键数量不超过上限，空闲键会被淘汰。"""
+    detector = RateSpikeDetector(max_keys=3, idle_timeout=60, clock=clock)
+    for i in range(10):
+        detector.observe("Net", f"10.0.1.{i}")
+    assert len(detector) == 3
+
+    clock.now += 120
+    detector.observe("Net", "10.0.2.1")
+    assert len(detector) == 1
@@ -0,0 +1,32 @@
+# desktop_center/tests/test_request_payload.py
+import io
+import gzip
+import zlib
+import pytest
+from src.features.alert_center.services.request_payload import (
+    read_request_body, PayloadTooLargeError, UnsupportedEncodingError
+)
+
+PAYLOAD = b'{"type": "Backup", "message": "' + b"x" * 5000 + b'"}'
+
+
+@pytest.mark.parametrize("encoding, body", [
+    (None, PAYLOAD),
+    ("gzip", gzip.compress(PAYLOAD)),
+    ("deflate", zlib.compress(PAYLOAD)),
+    ("deflate", zlib.compress(PAYLOAD)[2:-4]),  # 裸 deflate 流（无 zlib 头）
+])
+def test_decodes_supported_encodings(encoding, body):
+    assert read_request_body(io.BytesIO(body), encoding, max_bytes=len(PAYLOAD)) == PAYLOAD
+
+
+def test_rejects_oversized_decompressed_body():
+    """压缩后很小、解压后超限的请求体（压缩炸弹）应被拒绝。"""
+    bomb = gzip.compress(b"\0" * (10 * 1024 * 1024))
+    with pytest.raises(PayloadTooLargeError):
+        read_request_body(io.BytesIO(bomb), "gzip", max_bytes=1024 * 1024)
+
+
+def test_rejects_unknown_encoding():
+    with pytest.raises(UnsupportedEncodingError):
+        read_request_body(io.BytesIO(b"abc"), "br", max_bytes=1024)
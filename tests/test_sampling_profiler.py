@@ -0,0 +1,38 @@
+# desktop_center/tests/test_sampling_profiler.py
+import time
+import threading
+
+from src.utils.sampling_profiler import SamplingProfiler
+
+
+def _busy_worker(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_samples_all_threads_and_writes_collapsed_stacks(tmp_path):
+    profiler = SamplingProfiler()
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy_worker, args=(stop,), name="busy worker")
+    worker.start()
+    try:
+        assert profiler.start(interval_ms=1)
+        assert not profiler.start()  # 同一时间只能有一个采样会话
+        time.sleep(0.2)
+        path = profiler.stop(str(tmp_path))
+    finally:
+        stop.set()
+        worker.join()
+
+    assert not profiler.running
+    assert profiler.stop(str(tmp_path)) is None
+    lines = open(path, encoding="utf-8").read().splitlines()
+    assert lines
+    stacks = {}
+    for line in lines:
+        stack, count = line.rsplit(" ", 1)
+        stacks[stack] = int(count)
+    worker_stacks = [s for s in stacks if s.startswith("busy_worker;") and "test_sampling_profiler._busy_worker" in s]
+    assert worker_stacks
+    # 采样线程自身不出现在结果中
+    assert not any(s.startswith("SamplingProfiler;") for s in stacks)
@@ -0,0 +1,53 @@
+# desktop_center/tests/test_stall_detector.py
+import queue
+import threading
+import time
+
+from src.utils.metrics import MetricsRegistry
+from src.utils.stall_detector import EventLoopWatchdog
+
+
+def _blocking_slot():
+    time.sleep(0.3)
+
+
+def test_watchdog_records_stall_with_gui_stack_and_metrics():
+    """以测试线程模拟 GUI 事件循环：处理心跳之间执行一次阻塞 300 ms 的“槽函数”。"""
+    events = queue.Queue()
+    registry = MetricsRegistry()
+    watchdog = EventLoopWatchdog(events.put, threshold_ms=100, interval_ms=20, registry=registry)
+    watchdog.start()
+    watchdog.set_active_page("告警中心")
+
+    def process_events(seconds):
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            try:
+                events.get(timeout=0.01)()
+            except queue.Empty:
+                pass
+
+    try:
+        process_events(0.2)
+        _blocking_slot()
+        process_events(0.2)
+    finally:
+        watchdog.stop()
+
+    hotspots = watchdog.hotspots()
+    assert len(hotspots) == 1
+    assert "test_stall_detector._blocking_slot" in hotspots[0]["hotspot"]
+    assert hotspots[0]["pages"] == ["告警中心"] and hotspots[0]["max_ms"] >= 200
+    assert registry.counter("gui.stalls").value == 1
+    assert registry.histogram("gui.stall_ms").snapshot()["count"] == 1
+    assert "_blocking_slot" in watchdog.report()
+
+
+def test_capture_after_heartbeat_processed_is_discarded():
+    """测试心跳在抓取调用栈期间已被处理时，迟到的抓取不会留下一个永不结束的卡顿。"""
+    watchdog = EventLoopWatchdog(lambda fn: None, threshold_ms=50, interval_ms=10, registry=MetricsRegistry())
+    watchdog._gui_ident = threading.get_ident()
+    watchdog._pending_since = sent = time.perf_counter() - 1
+    watchdog._on_heartbeat()
+    watchdog._capture_stall(sent)
+    assert watchdog._current_stall is None
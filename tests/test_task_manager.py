@@ -0,0 +1,87 @@
+# desktop_center/tests/test_task_manager.py
+import threading
+
+import pytest
+
+from src.services.task_manager import TaskCancelledError, TaskManager, TaskState
+
+
+def test_plugin_limit_bounds_concurrency_within_the_shared_pool():
+    """测试每个插件的并发上限在共享线程池内生效，且结果按提交的任务返回。"""
+    manager = TaskManager(max_workers=3, plugin_limit=1)
+    manager.set_plugin_limit("b", 2)
+    lock = threading.Lock()
+    running, peak = {"a": 0, "b": 0}, {"a": 0, "b": 0}
+    release = threading.Event()
+
+    def job(task, plugin):
+        with lock:
+            running[plugin] += 1
+            peak[plugin] = max(peak[plugin], running[plugin])
+        release.wait(5)
+        with lock:
+            running[plugin] -= 1
+        return plugin
+
+    tasks = [manager.submit(plugin, f"{plugin}{i}", job, plugin) for i in range(3) for plugin in ("a", "b")]
+    threading.Timer(0.2, release.set).start()
+    assert [task.result(timeout=5) for task in tasks] == ["a", "b"] * 3
+    assert peak == {"a": 1, "b": 2}
+    manager.shutdown()
+
+
+def test_progress_cancel_and_failure_are_reported_to_listeners():
+    """测试进度、排队中与运行中任务的取消以及失败都会结束任务并通知监听者。"""
+    manager = TaskManager(max_workers=1)
+    started, events = threading.Event(), []
+    manager.add_listener(lambda task: events.append((task.title, task.state)))
+
+    def long_job(task):
+        started.set()
+        for i in range(1000):
+            task.check_cancelled()
+            task.report_progress(i, 1000, f"第 {i} 步")
+            threading.Event().wait(0.01)
+
+    def failing_job(task):
+        raise ValueError("boom")
+
+    long_task = manager.submit("p", "long", long_job)
+    queued = manager.submit("p", "queued", failing_job)
+    assert started.wait(5)
+    assert queued.cancel()  # 还在排队，立即取消
+    assert long_task.cancel()
+    with pytest.raises(TaskCancelledError):
+        long_task.result(timeout=5)
+    assert long_task.state == TaskState.CANCELLED and 0 <= long_task.progress < 1
+    assert queued.state == TaskState.CANCELLED and queued.started_at is None
+
+    failed = manager.submit("p", "failing", failing_job)
+    done = threading.Event()
+    failed.add_done_callback(lambda task: done.set())
+    with pytest.raises(ValueError):
+        failed.result(timeout=5)
+    assert done.wait(5) and failed.state == TaskState.FAILED
+    assert ("long", TaskState.RUNNING) in events and ("failing", TaskState.FAILED) in events
+    assert manager.active_count() == 0
+    manager.shutdown()
+    with pytest.raises(RuntimeError):
+        manager.submit("p", "late", failing_job)
+
+
+def test_game_data_copy_failure_ends_task_as_failed(tmp_path):
+    """测试游戏数据汇总中的复制失败会让后台任务以失败结束，而不是报告成功。"""
+    from src.features.Game_data.services.game_data_service import GameDataService
+
+    (tmp_path / "A" / "角色配置" / "hero").mkdir(parents=True)
+    (tmp_path / "all").mkdir()
+    (tmp_path / "all" / "hero").write_text("不是目录", encoding="utf-8")  # 目标位置被同名文件占用
+    service = GameDataService(db_path=str(tmp_path / "accounts.db"))
+    manager = TaskManager(max_workers=1)
+
+    task = manager.submit("game_data", "汇总角色配置",
+                          lambda task: service.aggregate_files(str(tmp_path), {"A": ["hero"]}, task=task))
+    with pytest.raises(OSError):
+        task.result(timeout=5)
+    assert task.state == TaskState.FAILED
+    manager.shutdown()
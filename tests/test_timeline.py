@@ -0,0 +1,39 @@
+# desktop_center/tests/test_timeline.py
+import json
+import threading
+
+from src.utils.timeline import Timeline
+
+
+def test_phases_spans_and_json_export(tmp_path):
+    timeline = Timeline("startup")
+    timeline.phase("1.1 env")
+    with timeline.span("outer"):
+        with timeline.span("inner", "plugin"):
+            pass
+
+    def prepare():
+        with timeline.span("prepare:x", "plugin"):
+            pass
+
+    worker = threading.Thread(target=prepare, name="PluginPrepare_0")
+    worker.start()
+    worker.join()
+    timeline.phase("2.0 plugins")
+    total = timeline.finish()
+    with timeline.span("initialize:lazy", "plugin"):
+        pass
+
+    data = timeline.to_dict()
+    by_name = {s["name"]: s for s in data["spans"]}
+    assert data["total_ms"] == round(total, 3)
+    assert by_name["1.1 env"]["category"] == "phase" and by_name["1.1 env"]["depth"] == 0
+    assert by_name["outer"]["depth"] == 1 and by_name["inner"]["depth"] == 2
+    assert by_name["prepare:x"]["thread"] == "PluginPrepare_0" and by_name["prepare:x"]["depth"] == 1
+    assert by_name["2.0 plugins"]["start_ms"] >= by_name["1.1 env"]["start_ms"]
+    assert by_name["initialize:lazy"]["after_finish"] is True
+    assert "startup 总耗时" in timeline.summary()
+
+    path = tmp_path / "logs" / "startup_timeline.json"
+    assert timeline.write_json(str(path))
+    assert json.loads(path.read_text(encoding="utf-8"))["timeline"] == "startup"
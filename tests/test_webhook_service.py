@@ -0,0 +1,103 @@
+# desktop_center/tests/test_webhook_service.py
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.services.webhook_service import WebhookOutbox, WebhookService
+
+pytest.importorskip("requests")
+
+
+class _RecordingServer(ThreadingHTTPServer):
+    """本地测试服务器：记录请求体和连接，按预设的状态码序列响应（用完后返回 200）。"""
+    daemon_threads = True
+
+    def __init__(self, statuses=()):
+        super().__init__(("127.0.0.1", 0), _RecordingHandler)
+        self.statuses = list(statuses)
+        self.bodies = []
+        self.connections = set()
+        self.received = threading.Condition()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/alert"
+
+    def wait_for(self, count, timeout=5):
+        with self.received:
+            return self.received.wait_for(lambda: len(self.bodies) >= count, timeout)
+
+
+class _RecordingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server = self.server
+        with server.received:
+            status = server.statuses.pop(0) if server.statuses else 200
+            server.connections.add(self.client_address)
+            if status == 200:
+                server.bodies.append(body)
+            server.received.notify_all()
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = _RecordingServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_keep_alive_batching_and_retry(server):
+    """测试同一主机复用连接、批量事件合并为数组，以及 5xx 后按退避重试。"""
+    service = WebhookService(retry_base_delay=0.01, batch_window=0.1)
+    try:
+        server.statuses = [503]
+        assert service.push(server.url, {"n": 1})
+        assert server.wait_for(1)
+        assert service.push(server.url, {"n": 2})
+        assert server.wait_for(2)
+        for n in range(3, 6):
+            service.push(server.url, {"n": n}, batch=True)
+        assert server.wait_for(3)
+    finally:
+        service.shutdown()
+    stats = service.stats()
+
+    assert server.bodies == [{"n": 1}, {"n": 2}, [{"n": 3}, {"n": 4}, {"n": 5}]]
+    assert len(server.connections) == 1
+    assert stats["delivered"] == 5 and stats["retried"] == 1 and stats["requests"] == 4
+
+
+def test_durable_events_survive_restart(server, tmp_path):
+    """测试目标不可用时持久化事件保留在发件箱中，重启后重新投递并在成功后删除。"""
+    outbox_path = str(tmp_path / "webhook_outbox.db")
+    server.statuses = [503, 503]
+    service = WebhookService(outbox_path=outbox_path, max_retries=1, retry_base_delay=0.01)
+    service.push(server.url, {"event": "lost?"}, durable=True)
+    service.push("http://127.0.0.1:9/unused", {"event": "ignored"})
+    with server.received:
+        assert server.received.wait_for(lambda: not server.statuses, 5)
+    service.shutdown()
+    assert [row[2] for row in WebhookOutbox(outbox_path).pending()] == [{"event": "lost?"}]
+
+    restarted = WebhookService(outbox_path=outbox_path)
+    try:
+        assert restarted.replay_outbox() == 1
+        assert server.wait_for(1)
+    finally:
+        restarted.shutdown()
+    assert server.bodies == [{"event": "lost?"}]
+    assert WebhookOutbox(outbox_path).pending() == []